@@ -1,6 +1,8 @@
 from __future__ import annotations
 
+import asyncio
 from abc import ABC, abstractmethod
+from datetime import datetime, timezone
 from enum import Enum
 import os
 from dotenv import load_dotenv
@@ -24,6 +26,7 @@ from .constants import (
     DEFAULT_MAX_ENTITY_TOKENS,
     DEFAULT_MAX_RELATION_TOKENS,
     DEFAULT_MAX_TOTAL_TOKENS,
+    DEFAULT_MAX_EDGES_PER_ENTITY,
     DEFAULT_HISTORY_TURNS,
     DEFAULT_OLLAMA_MODEL_NAME,
     DEFAULT_OLLAMA_MODEL_TAG,
@@ -129,6 +132,13 @@ class QueryParam:
     )
     """Maximum total tokens budget for the entire query context (entities + relations + chunks + system prompt)."""
 
+    max_edges_per_entity: int = int(
+        os.getenv("MAX_EDGES_PER_ENTITY", str(DEFAULT_MAX_EDGES_PER_ENTITY))
+    )
+    """Maximum number of edges expanded from each retrieved entity, highest ranked first.
+    Bounds the work spent on hub nodes linked to most of the graph. 0 expands all edges.
+    """
+
     hl_keywords: list[str] = field(default_factory=list)
     """List of high-level keywords to prioritize in retrieval."""
 
@@ -168,6 +178,25 @@ class QueryParam:
     containing citation information for the retrieved content.
     """
 
+    speculative_retrieval: bool = (
+        os.getenv("SPECULATIVE_RETRIEVAL", "false").lower() == "true"
+    )
+    """Start the query embedding, mix mode chunk search and an entity search on the raw query
+    while keywords are extracted instead of afterwards. Raw query entities are added after
+    the keyword matched entities.
+    """
+
+    geo_center: tuple[float, float] | None = None
+    """(latitude, longitude) of the search area, used together with geo_radius_km."""
+
+    geo_radius_km: float | None = None
+    """Only retrieve entities, relations and chunks located within this distance of geo_center."""
+
+    geo_bbox: tuple[float, float, float, float] | None = None
+    """(min_lat, min_lon, max_lat, max_lon) search area. Takes precedence over geo_center.
+    Geo filters require a spatial index built with LightRAG.abuild_geo_index().
+    """
+
 
 @dataclass
 class StorageNameSpace(ABC):
@@ -527,6 +556,47 @@ class BaseGraphStorage(StorageNameSpace, ABC):
             result[node_id] = edges if edges is not None else []
         return result
 
+    async def get_nodes_top_edges_batch(
+        self, node_ids: list[str], max_edges: int
+    ) -> dict[str, list[tuple[str, str]]]:
+        """Get the highest ranked edges of each node, at most max_edges per node
+
+        Edges are ranked as local retrieval ranks them: by edge degree (sum of
+        both endpoint degrees), then by weight. max_edges <= 0 returns all edges.
+
+        Default implementation ranks the full edge lists of nodes with more than
+        max_edges edges. Override this method in storage backends that can keep
+        the ranking precomputed.
+        """
+        nodes_edges = await self.get_nodes_edges_batch(node_ids)
+        if max_edges <= 0:
+            return nodes_edges
+
+        hub_edges = {
+            node_id: edges
+            for node_id, edges in nodes_edges.items()
+            if len(edges) > max_edges
+        }
+        if not hub_edges:
+            return nodes_edges
+
+        pairs = list(
+            {tuple(sorted(edge)) for edges in hub_edges.values() for edge in edges}
+        )
+        edge_data, edge_degrees = await asyncio.gather(
+            self.get_edges_batch([{"src": src, "tgt": tgt} for src, tgt in pairs]),
+            self.edge_degrees_batch(pairs),
+        )
+
+        def rank(edge: tuple[str, str]) -> tuple[int, float]:
+            pair = tuple(sorted(edge))
+            weight = (edge_data.get(pair) or {}).get("weight", 1.0)
+            return edge_degrees.get(pair, 0), float(weight)
+
+        for node_id, edges in hub_edges.items():
+            nodes_edges[node_id] = sorted(edges, key=rank, reverse=True)[:max_edges]
+        return nodes_edges
+
     @abstractmethod
     async def upsert_node(self, node_id: str, node_data: dict[str, str]) -> None:
         """Insert a new node or update an existing node in the graph.
@@ -783,6 +853,41 @@ class DocStatusStorage(BaseKVStorage, ABC):
             Returns the same format as get_by_ids method
         """
 
+    async def update_status_batch(
+        self,
+        doc_ids: list[str],
+        status: DocStatus,
+        error_msg: str | None = None,
+        metadata: dict[str, Any] | None = None,
+    ) -> None:
+        """Move many documents to a new status in one write
+
+        Only status, error_msg, updated_at and, when given, metadata change;
+        the other fields are kept. Unknown document IDs are ignored. Backends
+        that can update rows in place should override this with a single
+        statement.
+
+        Args:
+            doc_ids: IDs of the documents to update
+            status: New status of the documents
+            error_msg: Error message to store, None clears it
+            metadata: Replacement metadata, None keeps the current metadata
+        """
+        if not doc_ids:
+            return
+        updated_at = datetime.now(timezone.utc).isoformat()
+        updates: dict[str, dict[str, Any]] = {}
+        for doc_id, record in zip(doc_ids, await self.get_by_ids(doc_ids)):
+            if not record:
+                continue
+            record = dict(record)
+            record.update(status=status, error_msg=error_msg, updated_at=updated_at)
+            if metadata is not None:
+                record["metadata"] = metadata
+            updates[doc_id] = record
+        if updates:
+            await self.upsert(updates)
+
 
 class StoragesStatus(str, Enum):
     """Storages status"""
@@ -15,10 +15,27 @@ DEFAULT_SUMMARY_LANGUAGE = "English"  # Default language for document processing
 DEFAULT_MAX_GLEANING = 1
 DEFAULT_ENTITY_NAME_MAX_LENGTH = 256
 
+# Micro-batched entity extraction: chunks packed into one LLM prompt (1 disables packing)
+DEFAULT_ENTITY_EXTRACT_BATCH_SIZE = 1
+# Maximum total chunk tokens packed into one extraction prompt
+DEFAULT_ENTITY_EXTRACT_BATCH_MAX_TOKENS = 3000
+# Seconds a chunk waits for other chunks to share its extraction prompt
+DEFAULT_ENTITY_EXTRACT_BATCH_WAIT = 0.2
+
+# Seconds an embedding request waits for concurrent requests to share its batch (0 disables coalescing)
+DEFAULT_EMBEDDING_COALESCE_WAIT = 0
+# Maximum total tokens of one coalesced embedding batch (0 for no limit)
+DEFAULT_EMBEDDING_COALESCE_MAX_TOKENS = 0
+
 # Number of description fragments to trigger LLM summary
 DEFAULT_FORCE_LLM_SUMMARY_ON_MERGE = 8
 # Max description token size to trigger LLM summary
 DEFAULT_SUMMARY_MAX_TOKENS = 1200
+# Fragments merged since the last LLM summary, relative to the fragments it covers,
+# that trigger a summary refresh (0 re-summarizes on every merge over the limits above)
+DEFAULT_DESCRIPTION_SUMMARY_DRIFT = 0
+# Most recent description fragments kept next to the rolling summary
+DEFAULT_DESCRIPTION_RESERVOIR_SIZE = 16
 # Recommended LLM summary output length in tokens
 DEFAULT_SUMMARY_LENGTH_RECOMMENDED = 600
 # Maximum token size sent to LLM for summary
@@ -49,7 +66,28 @@ DEFAULT_MAX_RELATION_TOKENS = 8000
 DEFAULT_MAX_TOTAL_TOKENS = 30000
 DEFAULT_COSINE_THRESHOLD = 0.2
 DEFAULT_RELATED_CHUNK_NUMBER = 5
+# Max edges expanded per entity in local retrieval, highest (degree, weight) first (0 = no cap)
+DEFAULT_MAX_EDGES_PER_ENTITY = 0
 DEFAULT_KG_CHUNK_PICK_METHOD = "VECTOR"
+# Max number of decoded chunk vectors cached per chunks_vdb for VECTOR chunk picking
+DEFAULT_CHUNK_VECTOR_CACHE_SIZE = 50000
+
+# Geo-spatial retrieval filter
+DEFAULT_GEO_CELL_SIZE = 0.1  # Grid cell size in degrees (~11 km of latitude)
+DEFAULT_GEO_MAX_CANDIDATES = (
+    20000  # Above this many region vectors, filter an index query instead
+)
+DEFAULT_GEO_OVERFETCH_FACTOR = 10  # top_k multiplier for the filtered index query
+
+# Semantic query cache (reuses cached results of similar queries, opt-in)
+DEFAULT_SEMANTIC_CACHE_THRESHOLD = 0.95  # Minimum cosine similarity of query embeddings
+DEFAULT_SEMANTIC_CACHE_TTL = 86400  # Seconds an entry can be reused
+DEFAULT_SEMANTIC_CACHE_MAX_ENTRIES = 10000
+
+# Local keyword extraction (matches graph entity names in queries, opt-in)
+DEFAULT_LOCAL_KEYWORDS_MIN_COVERAGE = 0.6  # Share of query words matched, else LLM
+# Entity types whose matched names are also high-level keywords
+DEFAULT_LOCAL_KEYWORDS_HL_TYPES = ["category", "google_type", "concept"]
 
 # TODO: Deprated. All conversation_history messages is send to LLM.
 DEFAULT_HISTORY_TURNS = 0
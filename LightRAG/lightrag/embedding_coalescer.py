@@ -0,0 +1,198 @@
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass, field
+from functools import wraps
+from typing import Any, Callable
+
+import numpy as np
+
+from .constants import (
+    DEFAULT_EMBEDDING_COALESCE_MAX_TOKENS,
+    DEFAULT_EMBEDDING_COALESCE_WAIT,
+)
+from .utils import Tokenizer
+
+
+@dataclass
+class _EmbeddingRequest:
+    future: asyncio.Future
+    rows: list[Any]
+    remaining: int
+
+
+@dataclass
+class _PendingText:
+    text: str
+    tokens: int
+    priority: int | None
+    waiters: list[tuple[_EmbeddingRequest, int]] = field(default_factory=list)
+
+
+def _set_future(future: asyncio.Future, result=None, exception=None) -> None:
+    if future.done():  # Waiting caller was cancelled
+        return
+    if exception is not None:
+        future.set_exception(exception)
+    else:
+        future.set_result(result)
+
+
+class EmbeddingCoalescer:
+    """Merges the embedding requests of concurrent callers into shared batches.
+
+    Texts requested within `max_wait` seconds of each other, by any storage or
+    query, are sent together in batches of at most `batch_size` texts and
+    `max_tokens` tokens (0 for no token limit). A text already waiting or being
+    embedded is not sent again: every caller asking for it gets the same row.
+    Texts longer than the embedding model's `max_token_size` are sent on their
+    own, so a rejected text does not fail the requests of other callers.
+
+    Batches are grouped by the `_priority` of their callers and passed on with
+    it, so the priority queue of priority_limit_async_func_call still orders
+    them. A pending text requested again with a higher priority is promoted.
+    """
+
+    def __init__(
+        self,
+        func: Callable,
+        batch_size: int,
+        max_tokens: int = DEFAULT_EMBEDDING_COALESCE_MAX_TOKENS,
+        max_wait: float = DEFAULT_EMBEDDING_COALESCE_WAIT,
+        tokenizer: Tokenizer | None = None,
+    ):
+        self.func = func
+        self.batch_size = max(1, batch_size)
+        self.max_tokens = max_tokens
+        self.max_wait = max_wait
+        self.tokenizer = tokenizer
+        self.text_max_tokens = getattr(func, "max_token_size", None)
+        # Texts waiting for a batch, and all texts not embedded yet by text
+        self._pending: dict[str, _PendingText] = {}
+        self._pending_tokens = 0
+        self._inflight: dict[str, _PendingText] = {}
+        self._timer: asyncio.TimerHandle | None = None
+        self._tasks: set[asyncio.Task] = set()
+
+    def as_embedding_func(self) -> Callable:
+        """Embedding function routed through the coalescer
+
+        Keeps the attributes (embedding_dim, max_token_size) of the wrapped
+        function. Calls with other keyword arguments bypass the coalescer.
+        """
+
+        @wraps(self.func)
+        async def coalesced_func(texts, *args, _priority=None, **kwargs):
+            if args or kwargs or not isinstance(texts, (list, tuple)) or not texts:
+                if _priority is not None:
+                    kwargs["_priority"] = _priority
+                return await self.func(texts, *args, **kwargs)
+            return await self._submit(list(texts), _priority)
+
+        return coalesced_func
+
+    def _count_tokens(self, text: str) -> int:
+        if self.tokenizer is None or not (self.max_tokens or self.text_max_tokens):
+            return 0
+        return len(self.tokenizer.encode(text))
+
+    async def _submit(self, texts: list[str], priority: int | None) -> np.ndarray:
+        loop = asyncio.get_running_loop()
+        request = _EmbeddingRequest(
+            future=loop.create_future(), rows=[None] * len(texts), remaining=len(texts)
+        )
+
+        for i, text in enumerate(texts):
+            entry = self._inflight.get(text)
+            if entry is None:
+                entry = _PendingText(text, self._count_tokens(text), priority)
+                self._inflight[text] = entry
+                self._pending[text] = entry
+                self._pending_tokens += entry.tokens
+            elif (
+                text in self._pending
+                and priority is not None
+                and (entry.priority is None or priority < entry.priority)
+            ):
+                entry.priority = priority
+            entry.waiters.append((request, i))
+
+        if len(self._pending) >= self.batch_size or (
+            self.max_tokens and self._pending_tokens >= self.max_tokens
+        ):
+            self._flush()
+        elif self._pending and self._timer is None:
+            self._timer = loop.call_later(self.max_wait, self._flush)
+
+        return await request.future
+
+    def _split(self, entries: list[_PendingText]) -> list[list[_PendingText]]:
+        batches: list[list[_PendingText]] = []
+        batch: list[_PendingText] = []
+        batch_tokens = 0
+        for entry in entries:
+            if self.text_max_tokens and entry.tokens > self.text_max_tokens:
+                batches.append([entry])
+                continue
+            if batch and (
+                len(batch) >= self.batch_size
+                or (self.max_tokens and batch_tokens + entry.tokens > self.max_tokens)
+            ):
+                batches.append(batch)
+                batch, batch_tokens = [], 0
+            batch.append(entry)
+            batch_tokens += entry.tokens
+        if batch:
+            batches.append(batch)
+        return batches
+
+    def _flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if not self._pending:
+            return
+
+        by_priority: dict[int | None, list[_PendingText]] = {}
+        for entry in self._pending.values():
+            by_priority.setdefault(entry.priority, []).append(entry)
+        self._pending = {}
+        self._pending_tokens = 0
+
+        for priority, entries in by_priority.items():
+            for batch in self._split(entries):
+                task = asyncio.create_task(self._send(batch, priority))
+                self._tasks.add(task)
+                task.add_done_callback(self._tasks.discard)
+
+    async def _send(self, batch: list[_PendingText], priority: int | None) -> None:
+        kwargs = {} if priority is None else {"_priority": priority}
+        try:
+            embeddings = await self.func([entry.text for entry in batch], **kwargs)
+            if len(embeddings) != len(batch):
+                raise ValueError(
+                    f"Embedding batch of {len(batch)} texts returned {len(embeddings)} rows"
+                )
+        except BaseException as e:
+            for entry in batch:
+                self._release(entry)
+                for request, _ in entry.waiters:
+                    if isinstance(e, asyncio.CancelledError):
+                        request.future.cancel()
+                    else:
+                        _set_future(request.future, exception=e)
+            if not isinstance(e, Exception):
+                raise
+            return
+
+        for entry, row in zip(batch, embeddings):
+            self._release(entry)
+            for request, i in entry.waiters:
+                request.rows[i] = row
+                request.remaining -= 1
+                if request.remaining == 0:
+                    _set_future(request.future, result=np.array(request.rows))
+
+    def _release(self, entry: _PendingText) -> None:
+        if self._inflight.get(entry.text) is entry:
+            del self._inflight[entry.text]
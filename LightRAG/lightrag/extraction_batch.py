@@ -0,0 +1,231 @@
+from __future__ import annotations
+
+import asyncio
+import re
+from dataclasses import dataclass, field
+from typing import Any, Callable
+
+from .constants import (
+    DEFAULT_ENTITY_EXTRACT_BATCH_MAX_TOKENS,
+    DEFAULT_ENTITY_EXTRACT_BATCH_SIZE,
+    DEFAULT_ENTITY_EXTRACT_BATCH_WAIT,
+)
+from .prompt import PROMPTS
+from .utils import logger, remove_think_tags, sanitize_text_for_encoding
+
+
+def split_batched_extraction_result(
+    result: str,
+    chunk_delimiter: str = "<|CHUNK|>",
+    completion_delimiter: str = "<|COMPLETE|>",
+) -> dict[str, str]:
+    """Split a packed extraction response into per-section extraction results
+
+    Each section starts with a `{chunk_delimiter}<label>` header line. Sections are
+    returned as standalone results ending with the completion delimiter, so they parse
+    and cache exactly like single-chunk responses. When the response was cut off
+    (no completion delimiter), the last section may be incomplete and is dropped.
+
+    Returns:
+        dict mapping section label -> extraction result text, in response order
+    """
+    sections: dict[str, list[str]] = {}
+    parts = re.split(re.escape(chunk_delimiter), result, flags=re.IGNORECASE)
+    completion_pattern = re.compile(re.escape(completion_delimiter), re.IGNORECASE)
+    for part in parts[1:]:
+        label, _, records = part.partition("\n")
+        label = label.strip()
+        if not label:
+            continue
+        records = completion_pattern.sub("", records).strip()
+        sections.setdefault(label, [])
+        if records:
+            sections[label].append(records)
+
+    if sections and not completion_pattern.search(result):
+        sections.popitem()
+
+    return {
+        label: "\n".join(records + [completion_delimiter])
+        for label, records in sections.items()
+    }
+
+
+@dataclass
+class _ExtractionRequest:
+    content: str
+    tokens: int
+    llm_func: Callable
+    context_base: dict[str, Any]
+    user_prompt: str
+    system_prompt: str | None
+    kwargs: dict[str, Any]
+    future: asyncio.Future = field(default=None)
+
+
+def _set_future(future: asyncio.Future, result=None, exception=None) -> None:
+    if future.done():  # Waiting chunk task was cancelled
+        return
+    if exception is not None:
+        future.set_exception(exception)
+    else:
+        future.set_result(result)
+
+
+class EntityExtractionBatcher:
+    """Packs the entity extraction calls of several short chunks into one LLM prompt.
+
+    Chunks keep calling use_llm_func_with_cache with their own prompt and pass the
+    function returned by llm_func_for() as the LLM function: cache hits never reach
+    the batcher, and the per-chunk response is cached under the chunk's own prompt
+    and chunk id, so rebuilds and later non-batched runs reuse it unchanged.
+
+    Cache misses arriving within `max_wait` seconds of each other, from any of the
+    documents being processed in parallel, are sent as one prompt with per-chunk
+    delimiters and the response is split back per chunk. Chunks missing from the
+    response are extracted on their own.
+    """
+
+    def __init__(
+        self,
+        batch_size: int = DEFAULT_ENTITY_EXTRACT_BATCH_SIZE,
+        max_tokens: int = DEFAULT_ENTITY_EXTRACT_BATCH_MAX_TOKENS,
+        max_wait: float = DEFAULT_ENTITY_EXTRACT_BATCH_WAIT,
+    ):
+        self.batch_size = batch_size
+        self.max_tokens = max_tokens
+        self.max_wait = max_wait
+        self._pending: list[_ExtractionRequest] = []
+        self._pending_tokens = 0
+        self._timer: asyncio.TimerHandle | None = None
+        self._tasks: set[asyncio.Task] = set()
+
+    def llm_func_for(
+        self,
+        use_llm_func: Callable,
+        context_base: dict[str, Any],
+        content: str,
+        tokens: int,
+    ) -> Callable:
+        """LLM function extracting one chunk through the batcher
+
+        Args:
+            use_llm_func: LLM function used for packed and fallback calls
+            context_base: Prompt formatting values of extract_entities
+            content: Chunk text
+            tokens: Chunk token count, counted against max_tokens
+        """
+        if tokens >= self.max_tokens:
+            return use_llm_func
+
+        async def _llm_func(user_prompt: str, system_prompt: str = None, **kwargs):
+            request = _ExtractionRequest(
+                content=content,
+                tokens=tokens,
+                llm_func=use_llm_func,
+                context_base=context_base,
+                user_prompt=user_prompt,
+                system_prompt=system_prompt,
+                kwargs=kwargs,
+            )
+            return await self._submit(request)
+
+        return _llm_func
+
+    async def _submit(self, request: _ExtractionRequest) -> str:
+        loop = asyncio.get_running_loop()
+        request.future = loop.create_future()
+
+        if self._pending and self._pending_tokens + request.tokens > self.max_tokens:
+            self._flush()
+        self._pending.append(request)
+        self._pending_tokens += request.tokens
+
+        if len(self._pending) >= self.batch_size:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.max_wait, self._flush)
+
+        return await request.future
+
+    def _flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if not self._pending:
+            return
+
+        batch = self._pending
+        self._pending = []
+        self._pending_tokens = 0
+
+        task = asyncio.create_task(self._send(batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _send(self, batch: list[_ExtractionRequest]) -> None:
+        # Skip chunks whose extraction was cancelled while waiting
+        batch = [request for request in batch if not request.future.done()]
+        sections = {}
+        if len(batch) > 1:
+            try:
+                sections = await self._extract_packed(batch)
+            except Exception as e:
+                for request in batch:
+                    _set_future(request.future, exception=e)
+                return
+
+        missing = [request for i, request in enumerate(batch) if i not in sections]
+        if missing and len(batch) > 1:
+            logger.warning(
+                f"Packed extraction returned {len(sections)}/{len(batch)} chunks, "
+                f"extracting {len(missing)} on their own"
+            )
+        for i, result in sections.items():
+            _set_future(batch[i].future, result=result)
+
+        await asyncio.gather(*(self._extract_single(request) for request in missing))
+
+    async def _extract_packed(self, batch: list[_ExtractionRequest]) -> dict[int, str]:
+        context_base = batch[0].context_base
+        chunk_delimiter = PROMPTS["DEFAULT_CHUNK_DELIMITER"]
+        completion_delimiter = context_base["completion_delimiter"]
+
+        input_text = "\n\n".join(
+            f"{chunk_delimiter}{i}\n{sanitize_text_for_encoding(request.content)}"
+            for i, request in enumerate(batch, start=1)
+        )
+        system_prompt = PROMPTS["entity_extraction_system_prompt"].format(
+            **{**context_base, "input_text": input_text}
+        )
+        user_prompt = PROMPTS["entity_extraction_batch_user_prompt"].format(
+            **{
+                **context_base,
+                "chunk_delimiter": chunk_delimiter,
+                "chunk_count": len(batch),
+            }
+        )
+
+        result = await batch[0].llm_func(user_prompt, system_prompt=system_prompt)
+        sections = split_batched_extraction_result(
+            remove_think_tags(result), chunk_delimiter, completion_delimiter
+        )
+
+        labels = {str(i): i - 1 for i in range(1, len(batch) + 1)}
+        return {
+            labels[label]: section
+            for label, section in sections.items()
+            if label in labels
+        }
+
+    async def _extract_single(self, request: _ExtractionRequest) -> None:
+        try:
+            result = await request.llm_func(
+                request.user_prompt,
+                system_prompt=request.system_prompt,
+                **request.kwargs,
+            )
+        except Exception as e:
+            _set_future(request.future, exception=e)
+        else:
+            _set_future(request.future, result=result)
@@ -0,0 +1,226 @@
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass, field
+
+from .base import QueryParam
+from .constants import DEFAULT_GEO_CELL_SIZE
+from .utils import compute_mdhash_id, load_json, logger, write_json
+
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEGREE_LAT = 111.32
+
+
+def haversine_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """Great-circle distance between two points in kilometers"""
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    dphi = phi2 - phi1
+    dlambda = math.radians(lon2 - lon1)
+    a = (
+        math.sin(dphi / 2) ** 2
+        + math.cos(phi1) * math.cos(phi2) * math.sin(dlambda / 2) ** 2
+    )
+    return 2 * EARTH_RADIUS_KM * math.asin(math.sqrt(min(a, 1.0)))
+
+
+def has_geo_filter(query_param: QueryParam) -> bool:
+    """Whether the query restricts retrieval to a region"""
+    return query_param.geo_bbox is not None or (
+        query_param.geo_center is not None and query_param.geo_radius_km is not None
+    )
+
+
+def geo_cache_key(query_param: QueryParam) -> str:
+    """Region part of the query cache key, empty when no region is set"""
+    if not has_geo_filter(query_param):
+        return ""
+    if query_param.geo_bbox is not None:
+        return f"bbox:{tuple(query_param.geo_bbox)}"
+    return f"radius:{tuple(query_param.geo_center)}:{query_param.geo_radius_km}"
+
+
+@dataclass
+class GeoFilter:
+    """Retrieval candidates located inside a query region.
+
+    Entities and relations are located through the chunks they were extracted from:
+    an entity is inside the region if any of its source chunks is.
+    """
+
+    chunk_ids: set[str] = field(default_factory=set)
+    entity_names: set[str] = field(default_factory=set)
+    relation_pairs: set[tuple[str, str]] = field(default_factory=set)
+
+    def entity_vdb_ids(self) -> dict[str, str]:
+        """Map entity vector ids to entity names"""
+        return {
+            compute_mdhash_id(name, prefix="ent-"): name for name in self.entity_names
+        }
+
+    def relation_vdb_ids(self) -> dict[str, tuple[str, str]]:
+        """Map relation vector ids to (src_id, tgt_id) pairs
+
+        Relation vectors are stored under the id of the direction they were
+        inserted in (custom KGs keep their edge direction), so both orderings
+        of every pair are candidates.
+        """
+        return {
+            compute_mdhash_id(first + second, prefix="rel-"): (src, tgt)
+            for src, tgt in self.relation_pairs
+            for first, second in ((src, tgt), (tgt, src))
+        }
+
+
+class GeoIndex:
+    """Uniform grid index over geo-located chunks.
+
+    Chunks are bucketed into cells of `cell_size` degrees, so a radius or
+    bounding box query only inspects the cells it overlaps. Entities and
+    relations are attached to chunk ids and resolved through them.
+    """
+
+    def __init__(self, cell_size: float = DEFAULT_GEO_CELL_SIZE):
+        self.cell_size = cell_size
+        self._points: dict[str, tuple[float, float]] = {}
+        self._cells: dict[tuple[int, int], set[str]] = {}
+        self._chunk_entities: dict[str, set[str]] = {}
+        self._chunk_relations: dict[str, set[tuple[str, str]]] = {}
+
+    def __len__(self) -> int:
+        return len(self._points)
+
+    def _cell(self, lat: float, lon: float) -> tuple[int, int]:
+        return (
+            math.floor(lat / self.cell_size),
+            math.floor(lon / self.cell_size),
+        )
+
+    def add_chunk(self, chunk_id: str, lat: float, lon: float) -> None:
+        previous = self._points.get(chunk_id)
+        if previous is not None:
+            self._cells[self._cell(*previous)].discard(chunk_id)
+        self._points[chunk_id] = (lat, lon)
+        self._cells.setdefault(self._cell(lat, lon), set()).add(chunk_id)
+
+    def link_entity(self, entity_name: str, chunk_ids: list[str]) -> int:
+        """Attach an entity to its located source chunks, returning how many matched"""
+        linked = 0
+        for chunk_id in chunk_ids:
+            if chunk_id in self._points:
+                self._chunk_entities.setdefault(chunk_id, set()).add(entity_name)
+                linked += 1
+        return linked
+
+    def link_relation(self, src_id: str, tgt_id: str, chunk_ids: list[str]) -> int:
+        """Attach a relation to its located source chunks, returning how many matched"""
+        pair = (src_id, tgt_id) if src_id <= tgt_id else (tgt_id, src_id)
+        linked = 0
+        for chunk_id in chunk_ids:
+            if chunk_id in self._points:
+                self._chunk_relations.setdefault(chunk_id, set()).add(pair)
+                linked += 1
+        return linked
+
+    def _chunks_in_cells(
+        self, min_lat: float, min_lon: float, max_lat: float, max_lon: float
+    ):
+        min_cell = self._cell(min_lat, min_lon)
+        max_cell = self._cell(max_lat, max_lon)
+        cell_count = (max_cell[0] - min_cell[0] + 1) * (max_cell[1] - min_cell[1] + 1)
+        if cell_count > len(self._cells):
+            # Region is larger than the populated area: walk occupied cells instead
+            for (cell_lat, cell_lon), chunk_ids in self._cells.items():
+                if (
+                    min_cell[0] <= cell_lat <= max_cell[0]
+                    and min_cell[1] <= cell_lon <= max_cell[1]
+                ):
+                    yield from chunk_ids
+            return
+        for cell_lat in range(min_cell[0], max_cell[0] + 1):
+            for cell_lon in range(min_cell[1], max_cell[1] + 1):
+                yield from self._cells.get((cell_lat, cell_lon), ())
+
+    def chunks_in_bbox(
+        self, min_lat: float, min_lon: float, max_lat: float, max_lon: float
+    ) -> set[str]:
+        """Chunk ids inside a bounding box (no antimeridian wrap-around)"""
+        result = set()
+        for chunk_id in self._chunks_in_cells(min_lat, min_lon, max_lat, max_lon):
+            lat, lon = self._points[chunk_id]
+            if min_lat <= lat <= max_lat and min_lon <= lon <= max_lon:
+                result.add(chunk_id)
+        return result
+
+    def chunks_within(self, lat: float, lon: float, radius_km: float) -> set[str]:
+        """Chunk ids within radius_km of a center point"""
+        dlat = radius_km / KM_PER_DEGREE_LAT
+        dlon = radius_km / max(KM_PER_DEGREE_LAT * math.cos(math.radians(lat)), 1e-6)
+        result = set()
+        for chunk_id in self._chunks_in_cells(
+            lat - dlat, lon - dlon, lat + dlat, lon + dlon
+        ):
+            point_lat, point_lon = self._points[chunk_id]
+            if haversine_km(lat, lon, point_lat, point_lon) <= radius_km:
+                result.add(chunk_id)
+        return result
+
+    def resolve(self, query_param: QueryParam) -> GeoFilter | None:
+        """Resolve the region of a query to candidate chunks, entities and relations
+
+        Returns:
+            None when the query has no region, otherwise a GeoFilter (possibly empty)
+        """
+        if not has_geo_filter(query_param):
+            return None
+
+        if query_param.geo_bbox is not None:
+            chunk_ids = self.chunks_in_bbox(*query_param.geo_bbox)
+        else:
+            lat, lon = query_param.geo_center
+            chunk_ids = self.chunks_within(lat, lon, query_param.geo_radius_km)
+
+        geo_filter = GeoFilter(chunk_ids=chunk_ids)
+        for chunk_id in chunk_ids:
+            geo_filter.entity_names.update(self._chunk_entities.get(chunk_id, ()))
+            geo_filter.relation_pairs.update(self._chunk_relations.get(chunk_id, ()))
+
+        logger.info(
+            f"Geo filter: {len(chunk_ids)}/{len(self._points)} chunks, "
+            f"{len(geo_filter.entity_names)} entities, {len(geo_filter.relation_pairs)} relations"
+        )
+        return geo_filter
+
+    def save(self, file_name: str) -> None:
+        write_json(
+            {
+                "cell_size": self.cell_size,
+                "chunks": {k: list(v) for k, v in self._points.items()},
+                "chunk_entities": {
+                    k: sorted(v) for k, v in self._chunk_entities.items()
+                },
+                "chunk_relations": {
+                    k: sorted(list(pair) for pair in v)
+                    for k, v in self._chunk_relations.items()
+                },
+            },
+            file_name,
+        )
+
+    @classmethod
+    def load(
+        cls, file_name: str, cell_size: float = DEFAULT_GEO_CELL_SIZE
+    ) -> "GeoIndex":
+        """Load an index saved with save(), or return an empty index"""
+        data = load_json(file_name)
+        if not data:
+            return cls(cell_size=cell_size)
+
+        index = cls(cell_size=data.get("cell_size", cell_size))
+        for chunk_id, (lat, lon) in data.get("chunks", {}).items():
+            index.add_chunk(chunk_id, lat, lon)
+        for chunk_id, names in data.get("chunk_entities", {}).items():
+            index._chunk_entities[chunk_id] = set(names)
+        for chunk_id, pairs in data.get("chunk_relations", {}).items():
+            index._chunk_relations[chunk_id] = {tuple(pair) for pair in pairs}
+        logger.info(f"Loaded geo index with {len(index)} chunks from {file_name}")
+        return index
@@ -0,0 +1,199 @@
+from __future__ import annotations
+
+import re
+from collections import deque
+
+from .base import BaseGraphStorage
+from .constants import (
+    DEFAULT_LOCAL_KEYWORDS_HL_TYPES,
+    DEFAULT_LOCAL_KEYWORDS_MIN_COVERAGE,
+)
+from .utils import logger
+
+# Words that carry no retrieval meaning and do not count against coverage
+_STOPWORDS = frozenset(
+    """
+    a about all an and any anything are around at be best can could do does
+    find for from get give good great have how i in is it list me most my near
+    nearby of on or please recommend show some tell than that the there these
+    thing this those to top visit want what where which who why with would you
+    """.split()
+)
+
+
+def _stem(token: str) -> str:
+    """Crude plural folding, applied to both entity names and queries"""
+    if len(token) > 4 and token.endswith("ies"):
+        return token[:-3] + "y"
+    if len(token) > 4 and token.endswith(("ches", "shes", "sses", "xes", "zes")):
+        return token[:-2]
+    if (
+        len(token) > 3
+        and token.endswith("s")
+        and not token.endswith(("ss", "us", "is"))
+    ):
+        return token[:-1]
+    return token
+
+
+def tokenize(text: str) -> list[str]:
+    """Lowercased, plural-folded word tokens (underscores split words)"""
+    return [_stem(token) for token in re.findall(r"[^\W_]+", text.lower())]
+
+
+class EntityKeywordIndex:
+    """Extracts query keywords by matching graph entity names, without the LLM.
+
+    Entity names are inserted token by token into an Aho-Corasick automaton, so
+    one pass over the query finds every entity named in it on word boundaries.
+    Overlapping matches are resolved longest first ("new york city" over
+    "york"). All matched entities become low-level keywords; entities whose type
+    is in `hl_entity_types` (categories, types of places) are also high-level
+    keywords.
+
+    `extract()` returns None when the matched names cover less than
+    `min_coverage` of the query's meaningful words, so queries about things the
+    graph does not name still go through LLM keyword extraction.
+    """
+
+    def __init__(
+        self,
+        hl_entity_types: list[str] | None = None,
+        min_coverage: float = DEFAULT_LOCAL_KEYWORDS_MIN_COVERAGE,
+    ):
+        self.hl_entity_types = {
+            entity_type.lower()
+            for entity_type in (
+                DEFAULT_LOCAL_KEYWORDS_HL_TYPES
+                if hl_entity_types is None
+                else hl_entity_types
+            )
+        }
+        self.min_coverage = min_coverage
+        # Automaton nodes: token transitions, failure link, entities ending here
+        self._goto: list[dict[str, int]] = [{}]
+        self._fail: list[int] = [0]
+        self._outputs: list[list[int]] = [[]]
+        self._names: list[str] = []
+        self._lengths: list[int] = []
+        self._high_level: list[bool] = []
+        self._built = True
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    @classmethod
+    async def from_graph(
+        cls,
+        graph: BaseGraphStorage,
+        hl_entity_types: list[str] | None = None,
+        min_coverage: float = DEFAULT_LOCAL_KEYWORDS_MIN_COVERAGE,
+    ) -> EntityKeywordIndex:
+        """Index the names of all nodes in the knowledge graph"""
+        index = cls(hl_entity_types, min_coverage)
+        for node in await graph.get_all_nodes():
+            index.add(str(node["id"]), node.get("entity_type") or "")
+        index.build()
+        logger.info(f"Built keyword index of {len(index)} entity names")
+        return index
+
+    def add(self, name: str, entity_type: str = "") -> None:
+        """Add an entity name; call build() before matching"""
+        tokens = tokenize(name)
+        if all(token in _STOPWORDS for token in tokens):
+            return
+
+        state = 0
+        for token in tokens:
+            next_state = self._goto[state].get(token)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto[state][token] = next_state
+                self._goto.append({})
+                self._fail.append(0)
+                self._outputs.append([])
+            state = next_state
+
+        self._outputs[state].append(len(self._names))
+        self._names.append(name)
+        self._lengths.append(len(tokens))
+        self._high_level.append(entity_type.lower() in self.hl_entity_types)
+        self._built = False
+
+    def build(self) -> None:
+        """Compute failure links breadth first and merge outputs along them"""
+        queue = deque(self._goto[0].values())
+        for state in queue:
+            self._fail[state] = 0
+        while queue:
+            state = queue.popleft()
+            for token, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fail = self._fail[state]
+                while fail and token not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[next_state] = self._goto[fail].get(token, 0)
+                self._outputs[next_state] = (
+                    self._outputs[next_state] + self._outputs[self._fail[next_state]]
+                )
+        self._built = True
+
+    def _matches(self, tokens: list[str]) -> list[tuple[int, int, int]]:
+        """(start, end, entity) of every entity name found in tokens"""
+        matches = []
+        state = 0
+        for position, token in enumerate(tokens):
+            while state and token not in self._goto[state]:
+                state = self._fail[state]
+            state = self._goto[state].get(token, 0)
+            for entity in self._outputs[state]:
+                length = self._lengths[entity]
+                matches.append((position + 1 - length, position + 1, entity))
+        return matches
+
+    def extract(
+        self, query: str, mode: str = "hybrid"
+    ) -> tuple[list[str], list[str]] | None:
+        """High- and low-level keywords of a query, or None to fall back to the LLM"""
+        if not self._built:
+            self.build()
+
+        tokens = tokenize(query)
+        content_positions = {
+            position for position, token in enumerate(tokens) if token not in _STOPWORDS
+        }
+        if not content_positions:
+            return None
+
+        # Longest matches first, then leftmost; names sharing a span are all kept
+        covered: dict[int, tuple[int, int]] = {}
+        selected: list[tuple[int, int, int]] = []
+        for start, end, entity in sorted(
+            self._matches(tokens), key=lambda m: (m[0] - m[1], m[0])
+        ):
+            span = covered.get(start)
+            if span is None and not any(p in covered for p in range(start, end)):
+                covered.update((p, (start, end)) for p in range(start, end))
+                selected.append((start, end, entity))
+            elif span == (start, end):
+                selected.append((start, end, entity))
+
+        coverage = len(content_positions & covered.keys()) / len(content_positions)
+        if coverage < self.min_coverage:
+            logger.debug(
+                f"Local keyword coverage {coverage:.2f} too low, using LLM extraction"
+            )
+            return None
+
+        hl_keywords, ll_keywords = [], []
+        for _, _, entity in sorted(selected):
+            name = self._names[entity]
+            if name not in ll_keywords:
+                ll_keywords.append(name)
+            if self._high_level[entity] and name not in hl_keywords:
+                hl_keywords.append(name)
+
+        # Global mode only searches relations by high-level keywords
+        if mode == "global" and not hl_keywords:
+            return None
+        return hl_keywords, ll_keywords
@@ -18,6 +18,89 @@ from .shared_storage import (
 # You must manually install faiss-cpu or faiss-gpu before using FAISS vector db
 import faiss  # type: ignore
 
+# Tombstoned share of the index that triggers a compaction on save
+DEFAULT_FAISS_COMPACT_RATIO = 0.2
+
+# Index types selectable with faiss_index_type in vector_db_storage_cls_kwargs
+FAISS_INDEX_TYPES = ("FLAT", "HNSW", "IVF", "IVFPQ")
+# Training vectors needed per IVF list (and per PQ centroid); smaller indexes stay
+# flat (exact) until then
+FAISS_IVF_TRAIN_POINTS_PER_LIST = 39
+
+
+def _index_type_of(index) -> str:
+    if isinstance(index, faiss.IndexHNSW):
+        return "HNSW"
+    if isinstance(index, faiss.IndexIVFPQ):
+        return "IVFPQ"
+    if isinstance(index, faiss.IndexIVF):
+        return "IVF"
+    return "FLAT"
+
+
+class _Float16Vectors:
+    """
+    Float16 copy of the indexed vectors, one row per Faiss id.
+    Rows saved to disk are memory-mapped, rows added since are kept in memory.
+    """
+
+    def __init__(self, dim: int):
+        self.dim = dim
+        self._base = np.empty((0, dim), dtype=np.float16)
+        self._appended: list[np.ndarray] = []
+        self._appended_rows = 0
+        self.dirty = False
+
+    def __len__(self) -> int:
+        return len(self._base) + self._appended_rows
+
+    def append(self, vectors: np.ndarray) -> None:
+        self._appended.append(vectors.astype(np.float16))
+        self._appended_rows += len(vectors)
+        self.dirty = True
+
+    def get(self, rows, dtype=np.float32) -> np.ndarray:
+        rows = np.asarray(rows, dtype=np.int64)
+        if len(self._appended) > 1:
+            self._appended = [np.concatenate(self._appended)]
+        base_rows = len(self._base)
+        in_base = rows < base_rows
+        result = np.empty((len(rows), self.dim), dtype=dtype)
+        result[in_base] = self._base[rows[in_base]]
+        if not in_base.all():
+            result[~in_base] = self._appended[0][rows[~in_base] - base_rows]
+        return result
+
+    def keep(self, rows) -> None:
+        """Keep only the given rows, renumbered in order"""
+        self._base = self.get(rows, dtype=np.float16)
+        self._appended = []
+        self._appended_rows = 0
+        self.dirty = True
+
+    def load(self, file_name: str) -> None:
+        self._base = np.load(file_name, mmap_mode="r")
+        self._appended = []
+        self._appended_rows = 0
+        self.dirty = False
+
+    def save(self, file_name: str) -> None:
+        if not self.dirty:
+            return
+        tmp_file = file_name + ".tmp.npy"
+        out = np.lib.format.open_memmap(
+            tmp_file, mode="w+", dtype=np.float16, shape=(len(self), self.dim)
+        )
+        out[: len(self._base)] = self._base
+        row = len(self._base)
+        for block in self._appended:
+            out[row : row + len(block)] = block
+            row += len(block)
+        out.flush()
+        del out
+        os.replace(tmp_file, file_name)
+        self.load(file_name)
+
 
 @final
 @dataclass
@@ -53,18 +136,62 @@ class FaissVectorDBStorage(BaseVectorStorage):
             workspace_dir, f"faiss_index_{self.namespace}.index"
         )
         self._meta_file = self._faiss_index_file + ".meta.json"
+        self._vectors_file = self._faiss_index_file + ".vectors.npy"
 
         self._max_batch_size = self.global_config["embedding_batch_num"]
         # Embedding dimension (e.g. 768) must match your embedding function
         self._dim = self.embedding_func.embedding_dim
 
-        # Create an empty Faiss index for inner product (useful for normalized vectors = cosine similarity).
-        # If you have a large number of vectors, you might want IVF or other indexes.
-        # For demonstration, we use a simple IndexFlatIP.
-        self._index = faiss.IndexFlatIP(self._dim)
+        # Index type: FLAT (exact IndexFlatIP), HNSW graph, IVF or IVF-PQ lists.
+        # All use inner product on normalized vectors (= cosine similarity).
+        self._index_type = str(
+            kwargs.get("faiss_index_type", os.getenv("FAISS_INDEX_TYPE", "FLAT"))
+        ).upper()
+        if self._index_type not in FAISS_INDEX_TYPES:
+            raise ValueError(
+                f"Invalid faiss_index_type '{self._index_type}', expected one of {FAISS_INDEX_TYPES}"
+            )
+        self._hnsw_m = int(kwargs.get("faiss_hnsw_m", os.getenv("FAISS_HNSW_M", 32)))
+        self._hnsw_ef_construction = int(
+            kwargs.get(
+                "faiss_hnsw_ef_construction",
+                os.getenv("FAISS_HNSW_EF_CONSTRUCTION", 200),
+            )
+        )
+        self._hnsw_ef_search = int(
+            kwargs.get("faiss_hnsw_ef_search", os.getenv("FAISS_HNSW_EF_SEARCH", 64))
+        )
+        # 0 picks sqrt(number of vectors) lists when the index is trained
+        self._ivf_nlist = int(
+            kwargs.get("faiss_ivf_nlist", os.getenv("FAISS_IVF_NLIST", 0))
+        )
+        self._ivf_nprobe = int(
+            kwargs.get("faiss_ivf_nprobe", os.getenv("FAISS_IVF_NPROBE", 16))
+        )
+        # 0 picks one sub-quantizer per 8 or more dimensions
+        self._pq_m = int(kwargs.get("faiss_pq_m", os.getenv("FAISS_PQ_M", 0)))
+        self._pq_nbits = int(
+            kwargs.get("faiss_pq_nbits", os.getenv("FAISS_PQ_NBITS", 8))
+        )
+        # IVF-PQ scores are approximate: fetch this many times top_k and rescore
+        self._pq_refine = int(
+            kwargs.get("faiss_pq_refine", os.getenv("FAISS_PQ_REFINE", 4))
+        )
+
+        self._index = self._new_index()
+        # Float16 vectors by faiss_id, used to rescore, rebuild and return vectors
+        self._vectors = _Float16Vectors(self._dim)
         # Keep a local store for metadata, IDs, etc.
         # Maps <int faiss_id> → metadata (including your original ID).
         self._id_to_meta = {}
+        # Maps <custom id> → faiss_id of its live vector
+        self._custom_id_to_fid: dict[str, int] = {}
+        # Faiss ids of deleted or replaced vectors still in the index, skipped by
+        # queries and dropped when they exceed compact_ratio of the index
+        self._tombstones: set[int] = set()
+        self._compact_ratio = float(
+            os.getenv("FAISS_COMPACT_RATIO", DEFAULT_FAISS_COMPACT_RATIO)
+        )
 
         self._load_faiss_index()
 
@@ -89,8 +216,6 @@ class FaissVectorDBStorage(BaseVectorStorage):
                     f"[{self.workspace}] Process {os.getpid()} FAISS reloading {self.namespace} due to update by another process"
                 )
                 # Reload data
-                self._index = faiss.IndexFlatIP(self._dim)
-                self._id_to_meta = {}
                 self._load_faiss_index()
                 self.storage_updated.value = False
             return self._index
@@ -152,11 +277,10 @@ class FaissVectorDBStorage(BaseVectorStorage):
         faiss.normalize_L2(embeddings)
 
         # Upsert logic:
-        # 1. Identify which vectors to remove if they exist
-        # 2. Remove them
-        # 3. Add the new vectors
+        # 1. Tombstone the current vectors of existing IDs
+        # 2. Add the new vectors
         existing_ids_to_remove = []
-        for meta, emb in zip(list_data, embeddings):
+        for meta in list_data:
             faiss_internal_id = self._find_faiss_id_by_custom_id(meta["__id__"])
             if faiss_internal_id is not None:
                 existing_ids_to_remove.append(faiss_internal_id)
@@ -168,13 +292,14 @@ class FaissVectorDBStorage(BaseVectorStorage):
         index = await self._get_index()
         start_idx = index.ntotal
         index.add(embeddings)
+        # Keep a float16 copy so the index can be rebuilt if something is removed
+        self._vectors.append(embeddings)
 
-        # Step 3: Store metadata + vector for each new ID
+        # Step 3: Store metadata for each new ID
         for i, meta in enumerate(list_data):
             fid = start_idx + i
-            # Store the raw vector so we can rebuild if something is removed
-            meta["__vector__"] = embeddings[i].tolist()
-            self._id_to_meta.update({fid: meta})
+            self._id_to_meta[fid] = meta
+            self._custom_id_to_fid[meta["__id__"]] = fid
 
         logger.debug(
             f"[{self.workspace}] Upserted {len(list_data)} vectors into Faiss index."
@@ -198,34 +323,53 @@ class FaissVectorDBStorage(BaseVectorStorage):
 
         faiss.normalize_L2(embedding)  # we do in-place normalization
 
-        # Perform the similarity search
+        # Perform the similarity search, fetching extra results to make up for
+        # tombstoned vectors among the nearest ones
         index = await self._get_index()
-        distances, indices = index.search(embedding, top_k)
+        search_k = top_k + len(self._tombstones)
+        if isinstance(index, faiss.IndexIVFPQ):
+            search_k *= self._pq_refine
+        search_k = min(search_k, index.ntotal)
+        if search_k <= 0:
+            return []
+        if isinstance(index, faiss.IndexHNSW):
+            index.hnsw.efSearch = max(self._hnsw_ef_search, search_k)
+        elif isinstance(index, faiss.IndexIVF):
+            index.nprobe = self._ivf_nprobe
+        distances, indices = index.search(embedding, search_k)
 
         distances = distances[0]
         indices = indices[0]
+        if isinstance(index, faiss.IndexIVFPQ):
+            # Replace the quantized scores with exact ones from the stored vectors
+            indices = indices[indices >= 0]
+            distances = self._vectors.get(indices) @ embedding[0]
+            order = np.argsort(-distances)
+            distances, indices = distances[order], indices[order]
 
         results = []
         for dist, idx in zip(distances, indices):
             if idx == -1:
                 # Faiss returns -1 if no neighbor
                 continue
+            if idx in self._tombstones:
+                continue
 
             # Cosine similarity threshold
             if dist < self.cosine_better_than_threshold:
                 continue
 
             meta = self._id_to_meta.get(idx, {})
-            # Filter out __vector__ from query results to avoid returning large vector data
-            filtered_meta = {k: v for k, v in meta.items() if k != "__vector__"}
             results.append(
                 {
-                    **filtered_meta,
+                    **meta,
                     "id": meta.get("__id__"),
                     "distance": float(dist),
                     "created_at": meta.get("__created_at__"),
                 }
             )
+            if len(results) >= top_k:
+                break
 
         return results
 
@@ -301,44 +445,142 @@ class FaissVectorDBStorage(BaseVectorStorage):
         """
         Return the Faiss internal ID for a given custom ID, or None if not found.
         """
-        for fid, meta in self._id_to_meta.items():
-            if meta.get("__id__") == custom_id:
-                return fid
-        return None
+        return self._custom_id_to_fid.get(custom_id)
+
+    def _rebuild_id_maps(self):
+        """
+        Rebuild the custom ID map and tombstones from the loaded metadata.
+        Index positions without metadata are vectors deleted before the last save.
+        """
+        self._custom_id_to_fid = {
+            meta["__id__"]: fid for fid, meta in self._id_to_meta.items()
+        }
+        self._tombstones = set(range(self._index.ntotal)) - self._id_to_meta.keys()
 
     async def _remove_faiss_ids(self, fid_list):
         """
         Remove a list of internal Faiss IDs from the index.
-        Because IndexFlatIP doesn't support 'removals',
-        we rebuild the index excluding those vectors.
+        Flat and HNSW indexes don't support cheap removals, so the vectors are
+        only tombstoned here and dropped by the next compaction.
+        """
+        async with self._storage_lock:
+            for fid in fid_list:
+                meta = self._id_to_meta.pop(fid, None)
+                if meta is None:
+                    continue
+                if self._custom_id_to_fid.get(meta["__id__"]) == fid:
+                    del self._custom_id_to_fid[meta["__id__"]]
+                self._tombstones.add(fid)
+
+    def _ivf_nlist_for(self, count: int) -> int:
         """
-        keep_fids = [fid for fid in self._id_to_meta if fid not in fid_list]
+        Number of IVF lists to train on count vectors, 0 if there are too few to train.
+        """
+        nlist = self._ivf_nlist or max(1, int(np.sqrt(count)))
+        min_count = nlist * FAISS_IVF_TRAIN_POINTS_PER_LIST
+        if self._index_type == "IVFPQ":
+            # Each PQ codebook has 2**nbits centroids to train as well
+            min_count = max(
+                min_count, FAISS_IVF_TRAIN_POINTS_PER_LIST * 2**self._pq_nbits
+            )
+        return nlist if count >= min_count else 0
 
-        # Rebuild the index
-        vectors_to_keep = []
-        new_id_to_meta = {}
-        for new_fid, old_fid in enumerate(keep_fids):
-            vec_meta = self._id_to_meta[old_fid]
-            vectors_to_keep.append(vec_meta["__vector__"])  # stored as list
-            new_id_to_meta[new_fid] = vec_meta
+    def _new_index(self, training_vectors: np.ndarray | None = None):
+        """
+        Create an empty index of the configured type.
+        IVF indexes are trained on training_vectors; without enough of them an
+        exact IndexFlatIP is used until the next rebuild.
+        """
+        if self._index_type == "HNSW":
+            index = faiss.IndexHNSWFlat(
+                self._dim, self._hnsw_m, faiss.METRIC_INNER_PRODUCT
+            )
+            index.hnsw.efConstruction = self._hnsw_ef_construction
+            index.hnsw.efSearch = self._hnsw_ef_search
+            return index
+
+        count = 0 if training_vectors is None else len(training_vectors)
+        nlist = self._ivf_nlist_for(count) if self._index_type != "FLAT" else 0
+        if not nlist:
+            return faiss.IndexFlatIP(self._dim)
+
+        quantizer = faiss.IndexFlatIP(self._dim)
+        if self._index_type == "IVFPQ":
+            pq_m = self._pq_m or next(
+                (self._dim // d for d in range(8, self._dim + 1) if self._dim % d == 0),
+                1,
+            )
+            index = faiss.IndexIVFPQ(
+                quantizer,
+                self._dim,
+                nlist,
+                pq_m,
+                self._pq_nbits,
+                faiss.METRIC_INNER_PRODUCT,
+            )
+        else:
+            index = faiss.IndexIVFFlat(
+                quantizer, self._dim, nlist, faiss.METRIC_INNER_PRODUCT
+            )
+        index.train(training_vectors)
+        logger.info(
+            f"[{self.workspace}] Trained Faiss {self._index_type} index for {self.namespace} with {nlist} lists on {count} vectors"
+        )
+        return index
 
-        async with self._storage_lock:
-            # Re-init index
-            self._index = faiss.IndexFlatIP(self._dim)
-            if vectors_to_keep:
-                arr = np.array(vectors_to_keep, dtype=np.float32)
-                self._index.add(arr)
+    def _needs_new_index(self) -> bool:
+        """
+        Whether the index type differs from the configured one, e.g. after a
+        configuration change or once a flat index has enough vectors to train IVF.
+        """
+        index_type = _index_type_of(self._index)
+        if index_type == self._index_type:
+            return False
+        if self._index_type in ("IVF", "IVFPQ") and index_type == "FLAT":
+            return bool(self._ivf_nlist_for(len(self._id_to_meta)))
+        return True
+
+    def _compact_faiss_index(self):
+        """
+        Rebuild the index without tombstoned vectors once they exceed
+        compact_ratio of the index, renumbering the remaining Faiss IDs.
+        Also switches to the configured index type when _needs_new_index().
+        """
+        ntotal = self._index.ntotal
+        new_index = self._needs_new_index()
+        if not new_index and (
+            not self._tombstones
+            or len(self._tombstones) <= ntotal * self._compact_ratio
+        ):
+            return
 
-            self._id_to_meta = new_id_to_meta
+        keep_fids = sorted(self._id_to_meta)
+        self._vectors.keep(keep_fids)
+        vectors = self._vectors.get(range(len(keep_fids)))
+        if new_index:
+            self._index = self._new_index(vectors)
+        else:
+            self._index.reset()
+        if keep_fids:
+            self._index.add(vectors)
+        self._id_to_meta = {
+            new_fid: self._id_to_meta[old_fid]
+            for new_fid, old_fid in enumerate(keep_fids)
+        }
+        self._rebuild_id_maps()
+        logger.debug(
+            f"[{self.workspace}] Rebuilt Faiss {_index_type_of(self._index)} index {self.namespace}: {ntotal} -> {self._index.ntotal} vectors"
+        )
 
     def _save_faiss_index(self):
         """
-        Save the current Faiss index + metadata to disk so it can persist across runs.
+        Save the current Faiss index + vectors + metadata to disk so it can persist across runs.
         """
+        self._vectors.save(self._vectors_file)
         faiss.write_index(self._index, self._faiss_index_file)
 
         # Save metadata dict to JSON. Convert all keys to strings for JSON storage.
-        # _id_to_meta is { int: { '__id__': doc_id, '__vector__': [float,...], ... } }
+        # _id_to_meta is { int: { '__id__': doc_id, '__created_at__': ..., ... } }
         # We'll keep the int -> dict, but JSON requires string keys.
         serializable_dict = {}
         for fid, meta in self._id_to_meta.items():
@@ -349,13 +591,19 @@ class FaissVectorDBStorage(BaseVectorStorage):
 
     def _load_faiss_index(self):
         """
-        Load the Faiss index + metadata from disk if it exists,
+        Load the Faiss index + vectors + metadata from disk if it exists,
         and rebuild in-memory structures so we can query.
+        Metadata of older versions holds each vector as a JSON list under
+        __vector__; those move to the float16 vector file on the next save.
         """
+        self._index = self._new_index()
+        self._vectors = _Float16Vectors(self._dim)
+        self._id_to_meta = {}
         if not os.path.exists(self._faiss_index_file):
             logger.warning(
                 f"[{self.workspace}] No existing Faiss index file found for {self.namespace}"
             )
+            self._rebuild_id_maps()
             return
 
         try:
@@ -371,6 +619,25 @@ class FaissVectorDBStorage(BaseVectorStorage):
                 fid = int(fid_str)
                 self._id_to_meta[fid] = meta
 
+            # Load vectors
+            if os.path.exists(self._vectors_file):
+                self._vectors.load(self._vectors_file)
+            else:
+                vectors = np.zeros((self._index.ntotal, self._dim), dtype=np.float32)
+                for fid, meta in self._id_to_meta.items():
+                    if "__vector__" in meta:
+                        vectors[fid] = meta.pop("__vector__")
+                self._vectors.append(vectors)
+            if len(self._vectors) < self._index.ntotal:
+                raise ValueError(
+                    f"{self._vectors_file} holds {len(self._vectors)} of {self._index.ntotal} vectors"
+                )
+
+            self._rebuild_id_maps()
+            # Switch to the configured index type if it changed
+            if self._needs_new_index():
+                self._compact_faiss_index()
+
             logger.info(
                 f"[{self.workspace}] Faiss index loaded with {self._index.ntotal} vectors from {self._faiss_index_file}"
             )
@@ -379,8 +646,10 @@ class FaissVectorDBStorage(BaseVectorStorage):
                 f"[{self.workspace}] Failed to load Faiss index or metadata: {e}"
             )
             logger.warning(f"[{self.workspace}] Starting with an empty Faiss index.")
-            self._index = faiss.IndexFlatIP(self._dim)
+            self._index = self._new_index()
+            self._vectors = _Float16Vectors(self._dim)
             self._id_to_meta = {}
+            self._rebuild_id_maps()
 
     async def index_done_callback(self) -> None:
         async with self._storage_lock:
@@ -390,8 +659,6 @@ class FaissVectorDBStorage(BaseVectorStorage):
                 logger.warning(
                     f"[{self.workspace}] Storage for FAISS {self.namespace} was updated by another process, reloading..."
                 )
-                self._index = faiss.IndexFlatIP(self._dim)
-                self._id_to_meta = {}
                 self._load_faiss_index()
                 self.storage_updated.value = False
                 return False  # Return error
@@ -399,7 +666,9 @@ class FaissVectorDBStorage(BaseVectorStorage):
         # Acquire lock and perform persistence
         async with self._storage_lock:
             try:
-                # Save data to disk
+                # Drop tombstoned vectors if there are many or train the configured
+                # index type once there are enough vectors, then save data to disk
+                self._compact_faiss_index()
                 self._save_faiss_index()
                 # Notify other processes that data has been updated
                 await set_all_update_flags(self.namespace, workspace=self.workspace)
@@ -432,10 +701,8 @@ class FaissVectorDBStorage(BaseVectorStorage):
         if not metadata:
             return None
 
-        # Filter out __vector__ from metadata to avoid returning large vector data
-        filtered_metadata = {k: v for k, v in metadata.items() if k != "__vector__"}
         return {
-            **filtered_metadata,
+            **metadata,
             "id": metadata.get("__id__"),
             "created_at": metadata.get("__created_at__"),
         }
@@ -459,12 +726,8 @@ class FaissVectorDBStorage(BaseVectorStorage):
             if fid is not None:
                 metadata = self._id_to_meta.get(fid)
                 if metadata:
-                    # Filter out __vector__ from metadata to avoid returning large vector data
-                    filtered_metadata = {
-                        k: v for k, v in metadata.items() if k != "__vector__"
-                    }
                     record = {
-                        **filtered_metadata,
+                        **metadata,
                         "id": metadata.get("__id__"),
                         "created_at": metadata.get("__created_at__"),
                     }
@@ -485,17 +748,18 @@ class FaissVectorDBStorage(BaseVectorStorage):
         if not ids:
             return {}
 
-        vectors_dict = {}
+        # Find the Faiss internal IDs for the custom IDs
+        found = {}
         for id in ids:
-            # Find the Faiss internal ID for the custom ID
             fid = self._find_faiss_id_by_custom_id(id)
-            if fid is not None and fid in self._id_to_meta:
-                metadata = self._id_to_meta[fid]
-                # Get the stored vector from metadata
-                if "__vector__" in metadata:
-                    vectors_dict[id] = metadata["__vector__"]
+            if fid is not None:
+                found[id] = fid
+        if not found:
+            return {}
 
-        return vectors_dict
+        # Read the stored float16 vectors in one go
+        vectors = self._vectors.get(list(found.values()))
+        return {id: vector.tolist() for id, vector in zip(found, vectors)}
 
     async def drop(self) -> dict[str, str]:
         """Drop all vector data from storage and clean up resources
@@ -515,17 +779,16 @@ class FaissVectorDBStorage(BaseVectorStorage):
         """
         try:
             async with self._storage_lock:
-                # Reset the index
-                self._index = faiss.IndexFlatIP(self._dim)
-                self._id_to_meta = {}
-
                 # Remove storage files if they exist
-                if os.path.exists(self._faiss_index_file):
-                    os.remove(self._faiss_index_file)
-                if os.path.exists(self._meta_file):
-                    os.remove(self._meta_file)
+                for file_name in (
+                    self._faiss_index_file,
+                    self._meta_file,
+                    self._vectors_file,
+                ):
+                    if os.path.exists(file_name):
+                        os.remove(file_name)
 
-                self._id_to_meta = {}
+                # Reset the index
                 self._load_faiss_index()
 
                 # Notify other processes
@@ -14,6 +14,7 @@ from lightrag.utils import (
     get_pinyin_sort_key,
 )
 from lightrag.exceptions import StorageNotInitializedError
+from .json_record_log import JsonRecordLog
 from .shared_storage import (
     get_namespace_data,
     get_namespace_lock,
@@ -42,6 +43,10 @@ class JsonDocStatusStorage(DocStatusStorage):
 
         os.makedirs(workspace_dir, exist_ok=True)
         self._file_name = os.path.join(workspace_dir, f"kv_store_{self.namespace}.json")
+        # Append-only record log replacing the JSON file with KV_STORAGE_FORMAT=log
+        self._log = JsonRecordLog.from_env(
+            self._file_name, self.namespace, self.workspace
+        )
         self._data = None
         self._storage_lock = None
         self.storage_updated = None
@@ -54,6 +59,8 @@ class JsonDocStatusStorage(DocStatusStorage):
         self.storage_updated = await get_update_flag(
             self.namespace, workspace=self.workspace
         )
+        if self._log is not None:
+            await self._log.attach()
         async with get_data_init_lock():
             # check need_init must before get_namespace_data
             need_init = await try_initialize_namespace(
@@ -63,8 +70,14 @@ class JsonDocStatusStorage(DocStatusStorage):
                 self.namespace, workspace=self.workspace
             )
             if need_init:
-                loaded_data = load_json(self._file_name) or {}
+                if self._log is not None and self._log.exists():
+                    loaded_data = self._log.load()
+                else:
+                    loaded_data = load_json(self._file_name) or {}
                 async with self._storage_lock:
+                    if self._log is not None and not self._log.exists():
+                        # First load with the log format: import the JSON file
+                        loaded_data.update(self._log.write_all(loaded_data))
                     self._data.update(loaded_data)
                     logger.info(
                         f"[{self.workspace}] Process {os.getpid()} doc status load {self.namespace} with {len(loaded_data)} records"
@@ -159,6 +172,13 @@ class JsonDocStatusStorage(DocStatusStorage):
         return result
 
     async def index_done_callback(self) -> None:
+        if self._log is not None:
+            # Append only the records changed since the last flush
+            await self._log.persist(
+                self._data, self._storage_lock, self.storage_updated
+            )
+            return
+
         async with self._storage_lock:
             if self.storage_updated.value:
                 data_dict = (
@@ -202,6 +222,8 @@ class JsonDocStatusStorage(DocStatusStorage):
                 if "chunks_list" not in doc_data:
                     doc_data["chunks_list"] = []
             self._data.update(data)
+            if self._log is not None:
+                self._log.mark(data)
             await set_all_update_flags(self.namespace, workspace=self.workspace)
 
         await self.index_done_callback()
@@ -354,6 +376,8 @@ class JsonDocStatusStorage(DocStatusStorage):
                 result = self._data.pop(doc_id, None)
                 if result is not None:
                     any_deleted = True
+                    if self._log is not None:
+                        self._log.mark([doc_id])
 
             if any_deleted:
                 await set_all_update_flags(self.namespace, workspace=self.workspace)
@@ -395,6 +419,8 @@ class JsonDocStatusStorage(DocStatusStorage):
         try:
             async with self._storage_lock:
                 self._data.clear()
+                if self._log is not None:
+                    self._log.reset()
                 await set_all_update_flags(self.namespace, workspace=self.workspace)
 
             await self.index_done_callback()
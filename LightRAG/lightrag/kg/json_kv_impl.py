@@ -11,6 +11,7 @@ from lightrag.utils import (
     write_json,
 )
 from lightrag.exceptions import StorageNotInitializedError
+from .json_record_log import JsonRecordLog
 from .shared_storage import (
     get_namespace_data,
     get_namespace_lock,
@@ -37,6 +38,10 @@ class JsonKVStorage(BaseKVStorage):
 
         os.makedirs(workspace_dir, exist_ok=True)
         self._file_name = os.path.join(workspace_dir, f"kv_store_{self.namespace}.json")
+        # Append-only record log replacing the JSON file with KV_STORAGE_FORMAT=log
+        self._log = JsonRecordLog.from_env(
+            self._file_name, self.namespace, self.workspace
+        )
 
         self._data = None
         self._storage_lock = None
@@ -50,6 +55,8 @@ class JsonKVStorage(BaseKVStorage):
         self.storage_updated = await get_update_flag(
             self.namespace, workspace=self.workspace
         )
+        if self._log is not None:
+            await self._log.attach()
         async with get_data_init_lock():
             # check need_init must before get_namespace_data
             need_init = await try_initialize_namespace(
@@ -59,7 +66,10 @@ class JsonKVStorage(BaseKVStorage):
                 self.namespace, workspace=self.workspace
             )
             if need_init:
-                loaded_data = load_json(self._file_name) or {}
+                if self._log is not None and self._log.exists():
+                    loaded_data = self._log.load()
+                else:
+                    loaded_data = load_json(self._file_name) or {}
                 async with self._storage_lock:
                     # Migrate legacy cache structure if needed
                     if self.namespace.endswith("_cache"):
@@ -67,6 +77,9 @@ class JsonKVStorage(BaseKVStorage):
                             loaded_data
                         )
 
+                    if self._log is not None and not self._log.exists():
+                        # First load with the log format: import the JSON file
+                        loaded_data.update(self._log.write_all(loaded_data))
                     self._data.update(loaded_data)
                     data_count = len(loaded_data)
 
@@ -75,6 +88,13 @@ class JsonKVStorage(BaseKVStorage):
                     )
 
     async def index_done_callback(self) -> None:
+        if self._log is not None:
+            # Append only the records changed since the last flush
+            await self._log.persist(
+                self._data, self._storage_lock, self.storage_updated
+            )
+            return
+
         async with self._storage_lock:
             if self.storage_updated.value:
                 data_dict = (
@@ -174,6 +194,8 @@ class JsonKVStorage(BaseKVStorage):
                 v["_id"] = k
 
             self._data.update(data)
+            if self._log is not None:
+                self._log.mark(data)
             await set_all_update_flags(self.namespace, workspace=self.workspace)
 
     async def delete(self, ids: list[str]) -> None:
@@ -195,6 +217,8 @@ class JsonKVStorage(BaseKVStorage):
                 result = self._data.pop(doc_id, None)
                 if result is not None:
                     any_deleted = True
+                    if self._log is not None:
+                        self._log.mark([doc_id])
 
             if any_deleted:
                 await set_all_update_flags(self.namespace, workspace=self.workspace)
@@ -225,6 +249,8 @@ class JsonKVStorage(BaseKVStorage):
         try:
             async with self._storage_lock:
                 self._data.clear()
+                if self._log is not None:
+                    self._log.reset()
                 await set_all_update_flags(self.namespace, workspace=self.workspace)
 
             await self.index_done_callback()
@@ -300,3 +326,5 @@ class JsonKVStorage(BaseKVStorage):
         """
         if self.namespace.endswith("_cache"):
             await self.index_done_callback()
+        if self._log is not None:
+            await self._log.wait_compaction()
@@ -0,0 +1,354 @@
+"""
+Append-only record log persisting JsonKVStorage and JsonDocStatusStorage.
+
+With KV_STORAGE_FORMAT=log, kv_store_<namespace>.json is replaced by
+kv_store_<namespace>.log: one JSON record per line, {"k": key, "v": value} for an
+upsert and {"k": key, "d": 1} for a delete, replayed in order on load. A flush
+appends the records of the keys changed since the previous flush instead of
+rewriting the whole namespace.
+
+An offset index (key -> offset and length of its latest record) is shared by all
+worker processes. Once the file outgrows its live records by
+KV_LOG_COMPACT_RATIO, the live byte ranges are copied into a new file in a
+background thread; records appended meanwhile are carried over before the new
+file replaces the old one.
+
+JSON stays the import / export format: an existing JSON file is imported when no
+log exists yet, and a log can be exported with
+    python -m lightrag.kg.json_record_log kv_store_<namespace>.log [output.json]
+"""
+
+import asyncio
+import json
+import os
+from typing import Any
+
+from lightrag.utils import SanitizingJSONEncoder, logger, write_json
+from .shared_storage import clear_all_update_flags, get_namespace_data
+
+# On-disk format of the JSON KV and doc status storages: json (default) or log
+KV_STORAGE_FORMATS = ("json", "log")
+DEFAULT_KV_STORAGE_FORMAT = "json"
+# Compact once the log file is this many times the size of its live records
+DEFAULT_KV_LOG_COMPACT_RATIO = 2.0
+# Logs smaller than this are never compacted
+KV_LOG_COMPACT_MIN_BYTES = 1 << 20
+_COPY_BUFFER_BYTES = 1 << 20
+
+
+def _encode_record(key: str, value: Any) -> tuple[bytes, Any]:
+    """Log line of one record, and the value as stored if it had to be sanitized"""
+    record = {"k": key, "d": 1} if value is None else {"k": key, "v": value}
+    try:
+        return (json.dumps(record, ensure_ascii=False) + "\n").encode("utf-8"), None
+    except (UnicodeEncodeError, UnicodeDecodeError) as e:
+        logger.debug(f"Direct JSON encoding failed, using sanitizing encoder: {e}")
+    line = json.dumps(record, ensure_ascii=False, cls=SanitizingJSONEncoder)
+    return (line + "\n").encode("utf-8"), json.loads(line).get("v")
+
+
+def read_record_log(
+    file_name: str,
+) -> tuple[dict[str, Any], dict[str, tuple[int, int]], int]:
+    """Replay a log file
+
+    Returns:
+        The records, the offset index and the end offset of the last complete
+        record (a record cut off by a crash is ignored).
+    """
+    data: dict[str, Any] = {}
+    index: dict[str, tuple[int, int]] = {}
+    offset = 0
+    with open(file_name, "rb") as f:
+        for line in f:
+            if not line.endswith(b"\n"):
+                break
+            try:
+                record = json.loads(line)
+            except ValueError:
+                break
+            key = record["k"]
+            if record.get("d"):
+                data.pop(key, None)
+                index.pop(key, None)
+            else:
+                data[key] = record["v"]
+                index[key] = (offset, len(line))
+            offset += len(line)
+    return data, index, offset
+
+
+class JsonRecordLog:
+    """Log file of one storage namespace, see the module docstring
+
+    Apart from persist and the background compaction, methods must be called
+    while holding the storage's namespace lock.
+    """
+
+    def __init__(self, file_name: str, namespace: str, workspace: str):
+        self.file_name = file_name
+        self.namespace = namespace
+        self.workspace = workspace
+        self.compact_ratio = float(
+            os.getenv("KV_LOG_COMPACT_RATIO", DEFAULT_KV_LOG_COMPACT_RATIO)
+        )
+        # Shared by all processes: offset index, keys changed since the last
+        # flush, and size / live bytes / generation of the file
+        self._index = None
+        self._dirty = None
+        self._state = None
+        self._compaction: asyncio.Task | None = None
+
+    @classmethod
+    def from_env(
+        cls, json_file_name: str, namespace: str, workspace: str
+    ) -> "JsonRecordLog | None":
+        """Log next to the JSON file if KV_STORAGE_FORMAT=log, otherwise None"""
+        storage_format = os.getenv(
+            "KV_STORAGE_FORMAT", DEFAULT_KV_STORAGE_FORMAT
+        ).lower()
+        if storage_format not in KV_STORAGE_FORMATS:
+            raise ValueError(
+                f"Invalid KV_STORAGE_FORMAT '{storage_format}', expected one of {KV_STORAGE_FORMATS}"
+            )
+        if storage_format == "json":
+            return None
+        return cls(os.path.splitext(json_file_name)[0] + ".log", namespace, workspace)
+
+    async def attach(self) -> None:
+        """Get the shared index and state of the namespace"""
+        self._index = await get_namespace_data(
+            f"{self.namespace}_log_index", workspace=self.workspace
+        )
+        self._dirty = await get_namespace_data(
+            f"{self.namespace}_log_dirty", workspace=self.workspace
+        )
+        self._state = await get_namespace_data(
+            f"{self.namespace}_log_state", workspace=self.workspace
+        )
+
+    def exists(self) -> bool:
+        return os.path.exists(self.file_name)
+
+    def _set_index(self, index: dict[str, tuple[int, int]], size: int) -> None:
+        self._index.clear()
+        self._index.update(index)
+        self._state.update(
+            size=size,
+            live=sum(length for _, length in index.values()),
+            generation=self._state.get("generation", 0) + 1,
+        )
+
+    def load(self) -> dict[str, Any]:
+        """Replay the log into a dict, dropping a record cut off by a crash"""
+        data, index, size = read_record_log(self.file_name)
+        if os.path.getsize(self.file_name) > size:
+            logger.warning(
+                f"[{self.workspace}] Dropping incomplete last record of {self.file_name}"
+            )
+            with open(self.file_name, "r+b") as f:
+                f.truncate(size)
+        self._set_index(index, size)
+        self._dirty.clear()
+        return data
+
+    def write_all(self, data: dict[str, Any]) -> dict[str, Any]:
+        """Write a new log holding all records (import of a JSON file)
+
+        Returns:
+            The values that had to be sanitized, by key
+        """
+        tmp_file = self.file_name + ".tmp"
+        index, sanitized, offset = {}, {}, 0
+        with open(tmp_file, "wb") as f:
+            for key, value in data.items():
+                line, cleaned = _encode_record(key, value)
+                if cleaned is not None:
+                    sanitized[key] = cleaned
+                f.write(line)
+                index[key] = (offset, len(line))
+                offset += len(line)
+        os.replace(tmp_file, self.file_name)
+        self._set_index(index, offset)
+        self._dirty.clear()
+        return sanitized
+
+    def mark(self, keys) -> None:
+        """Record keys upserted or deleted since the last flush"""
+        self._dirty.update(dict.fromkeys(keys, True))
+
+    def flush(self, data) -> int:
+        """Append the records of the changed keys, returns the number of records
+
+        Values that had to be sanitized are replaced in data.
+        """
+        keys = list(self._dirty.keys())
+        if not keys:
+            return 0
+        lines, sanitized = [], {}
+        for key in keys:
+            value = data.get(key)
+            if value is None and key not in self._index:
+                continue  # Added and deleted again since the last flush
+            line, cleaned = _encode_record(key, value)
+            if cleaned is not None:
+                sanitized[key] = cleaned
+            lines.append((key, value is None, line))
+
+        with open(self.file_name, "ab") as f:
+            offset = f.tell()
+            for _, _, line in lines:
+                f.write(line)
+
+        updates, deleted, live = {}, [], self._state.get("live", 0)
+        index = self._index
+        for key, is_delete, line in lines:
+            previous = index.get(key)
+            if previous is not None:
+                live -= previous[1]
+            if is_delete:
+                if previous is not None:
+                    deleted.append(key)
+            else:
+                updates[key] = (offset, len(line))
+                live += len(line)
+            offset += len(line)
+        for key in deleted:
+            index.pop(key, None)
+        index.update(updates)
+        self._state.update(size=offset, live=live)
+        for key in keys:
+            self._dirty.pop(key, None)
+        if sanitized:
+            logger.info(
+                f"[{self.workspace}] Sanitized {len(sanitized)} records of {self.namespace}"
+            )
+            data.update(sanitized)
+        return len(lines)
+
+    async def persist(self, data, storage_lock, storage_updated) -> None:
+        """Flush the changes of all processes, then compact in the background if needed
+
+        Called by index_done_callback without holding the lock: a compaction task
+        started while holding it would inherit the lock context.
+        """
+        async with storage_lock:
+            if storage_updated.value:
+                count = self.flush(data)
+                logger.debug(
+                    f"[{self.workspace}] Process {os.getpid()} appended {count} records to {self.namespace}"
+                )
+                await clear_all_update_flags(self.namespace, workspace=self.workspace)
+        self.maybe_compact(storage_lock)
+
+    def reset(self) -> None:
+        """Empty the log (drop)"""
+        with open(self.file_name, "wb"):
+            pass
+        self._set_index({}, 0)
+        self._dirty.clear()
+
+    def maybe_compact(self, storage_lock) -> None:
+        """Start a background compaction if the file has outgrown its live records"""
+        if self._compaction is not None and not self._compaction.done():
+            return
+        size = self._state.get("size", 0)
+        if size < KV_LOG_COMPACT_MIN_BYTES or size <= self.compact_ratio * max(
+            self._state.get("live", 0), 1
+        ):
+            return
+        self._compaction = asyncio.create_task(self._compact(storage_lock))
+
+    async def wait_compaction(self) -> None:
+        if self._compaction is not None:
+            await self._compaction
+            self._compaction = None
+
+    def _copy_records(
+        self, entries: list[tuple[str, tuple[int, int]]], tmp_file: str
+    ) -> dict[str, tuple[int, int]]:
+        """Copy the given records into tmp_file, returns their new offsets"""
+        new_index, offset = {}, 0
+        with open(self.file_name, "rb") as src, open(tmp_file, "wb") as dst:
+            for key, (start, length) in entries:
+                src.seek(start)
+                dst.write(src.read(length))
+                new_index[key] = (offset, length)
+                offset += length
+        return new_index
+
+    async def _compact(self, storage_lock) -> None:
+        async with storage_lock:
+            if self._state.get("compacting"):
+                return  # Already compacting in another process
+            self._state["compacting"] = True
+            generation = self._state.get("generation", 0)
+            end = self._state.get("size", 0)
+            entries = sorted(self._index.items(), key=lambda item: item[1][0])
+
+        tmp_file = self.file_name + ".compact"
+        try:
+            new_index = await asyncio.to_thread(self._copy_records, entries, tmp_file)
+        except Exception as e:
+            logger.error(f"[{self.workspace}] Error compacting {self.file_name}: {e}")
+            async with storage_lock:
+                self._state["compacting"] = False
+            return
+
+        async with storage_lock:
+            try:
+                if self._state.get("generation", 0) != generation:
+                    os.remove(tmp_file)  # Dropped or rewritten meanwhile
+                    return
+                # Carry over the records flushed since the copy started
+                tail_start = sum(length for _, length in new_index.values())
+                with open(self.file_name, "rb") as src, open(tmp_file, "ab") as dst:
+                    src.seek(end)
+                    while chunk := src.read(_COPY_BUFFER_BYTES):
+                        dst.write(chunk)
+                    size = dst.tell()
+                index = {
+                    key: (
+                        (tail_start + start - end, length)
+                        if start >= end
+                        else new_index[key]
+                    )
+                    for key, (start, length) in self._index.items()
+                }
+                old_size = self._state.get("size", 0)
+                os.replace(tmp_file, self.file_name)
+                self._set_index(index, size)
+                logger.info(
+                    f"[{self.workspace}] Compacted {self.namespace} log from {old_size} to {size} bytes"
+                )
+            except Exception as e:
+                logger.error(
+                    f"[{self.workspace}] Error compacting {self.file_name}: {e}"
+                )
+            finally:
+                self._state["compacting"] = False
+
+
+def export_json(log_file: str, json_file: str) -> int:
+    """Write the records of a log file as a JSON storage file"""
+    data, _, _ = read_record_log(log_file)
+    write_json(data, json_file)
+    return len(data)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="Export a KV storage record log as a JSON file"
+    )
+    parser.add_argument("log_file", help="kv_store_<namespace>.log")
+    parser.add_argument(
+        "json_file",
+        nargs="?",
+        help="Output file (default: the log file name with .json)",
+    )
+    args = parser.parse_args()
+    json_file = args.json_file or os.path.splitext(args.log_file)[0] + ".json"
+    count = export_json(args.log_file, json_file)
+    print(f"Exported {count} records to {json_file}")
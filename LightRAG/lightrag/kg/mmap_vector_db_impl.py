@@ -0,0 +1,698 @@
+import asyncio
+import glob
+import json
+import os
+import sqlite3
+import time
+from typing import Any, final
+from dataclasses import dataclass
+import numpy as np
+
+from lightrag.utils import (
+    logger,
+    compute_mdhash_id,
+)
+
+from lightrag.base import BaseVectorStorage
+from .shared_storage import (
+    get_namespace_lock,
+    get_update_flag,
+    set_all_update_flags,
+)
+
+# Deleted or replaced share of the vector file that triggers a compaction on save
+DEFAULT_MMAP_VECTOR_COMPACT_RATIO = 0.2
+# Rows converted to float32 at a time when scoring a query
+SCORE_BLOCK_ROWS = 16384
+# Ids per SQL statement in id lookups
+SQL_BATCH_SIZE = 500
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS vectors (
+    id TEXT PRIMARY KEY,
+    row INTEGER NOT NULL,
+    created_at INTEGER,
+    meta TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS vectors_row ON vectors (row);
+CREATE TABLE IF NOT EXISTS info (
+    key TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+"""
+
+
+@final
+@dataclass
+class MmapVectorDBStorage(BaseVectorStorage):
+    """
+    Local vector storage with memory-mapped float16 vectors.
+
+    Normalized embeddings are stored as raw float16 rows in
+    vdb_<namespace>.<epoch>.f16, memory-mapped read-only so every worker process
+    shares the same page cache. Id, creation time and meta fields of each row are
+    kept in a SQLite side table (vdb_<namespace>.sqlite) and only read for the
+    rows a query returns. Upserts append rows, replaced and deleted rows are
+    skipped until the file is compacted on save into the next epoch's file.
+    """
+
+    def __post_init__(self):
+        # Initialize basic attributes
+        self._db = None
+        self._storage_lock = None
+        self.storage_updated = None
+
+        # Use global config value if specified, otherwise use default
+        kwargs = self.global_config.get("vector_db_storage_cls_kwargs", {})
+        cosine_threshold = kwargs.get("cosine_better_than_threshold")
+        if cosine_threshold is None:
+            raise ValueError(
+                "cosine_better_than_threshold must be specified in vector_db_storage_cls_kwargs"
+            )
+        self.cosine_better_than_threshold = cosine_threshold
+        self._compact_ratio = float(
+            os.getenv("MMAP_VECTOR_COMPACT_RATIO", DEFAULT_MMAP_VECTOR_COMPACT_RATIO)
+        )
+
+        working_dir = self.global_config["working_dir"]
+        if self.workspace:
+            # Include workspace in the file path for data isolation
+            workspace_dir = os.path.join(working_dir, self.workspace)
+            self.final_namespace = f"{self.workspace}_{self.namespace}"
+        else:
+            # Default behavior when workspace is empty
+            self.final_namespace = self.namespace
+            self.workspace = ""
+            workspace_dir = working_dir
+
+        os.makedirs(workspace_dir, exist_ok=True)
+        self._file_prefix = os.path.join(workspace_dir, f"vdb_{self.namespace}")
+        self._db_file = self._file_prefix + ".sqlite"
+        # NanoVectorDB file migrated on first load
+        self._nano_file = self._file_prefix + ".json"
+
+        self._max_batch_size = self.global_config["embedding_batch_num"]
+        self._dim = self.embedding_func.embedding_dim
+
+        # Rows of the vector file, rows upserted since the last save and the
+        # rows still referenced by the side table
+        self._epoch = 0
+        self._vectors = np.empty((0, self._dim), dtype=np.float16)
+        self._pending: list[np.ndarray] = []
+        self._alive = np.zeros(0, dtype=bool)
+
+    async def initialize(self):
+        """Initialize storage data"""
+        # Get the update flag for cross-process update notification
+        self.storage_updated = await get_update_flag(
+            self.namespace, workspace=self.workspace
+        )
+        # Get the storage lock for use in other methods
+        self._storage_lock = get_namespace_lock(
+            self.namespace, workspace=self.workspace
+        )
+        async with self._storage_lock:
+            self._load()
+
+    def _vectors_file(self, epoch: int) -> str:
+        return f"{self._file_prefix}.{epoch}.f16"
+
+    def _connect(self) -> sqlite3.Connection:
+        db = sqlite3.connect(self._db_file, check_same_thread=False)
+        # Readers in other processes are not blocked by the uncommitted upserts
+        db.execute("PRAGMA journal_mode=WAL")
+        db.executescript(_SCHEMA)
+        return db
+
+    def _load(self) -> None:
+        """(Re)open the side table and map the vector file of its epoch"""
+        if self._db is not None:
+            self._db.close()
+        self._db = self._connect()
+        info = dict(self._db.execute("SELECT key, value FROM info"))
+        if "dim" not in info:
+            self._create()
+            info = dict(self._db.execute("SELECT key, value FROM info"))
+        if info["dim"] != self._dim:
+            raise ValueError(
+                f"Embedding dim mismatch, expected: {self._dim}, but loaded: {info['dim']}"
+            )
+        self._epoch = info["epoch"]
+        self._pending = []
+
+        file_name = self._vectors_file(self._epoch)
+        rows = (
+            os.path.getsize(file_name) // (self._dim * 2)
+            if os.path.exists(file_name)
+            else 0
+        )
+        if rows:
+            self._vectors = np.memmap(
+                file_name, dtype=np.float16, mode="r", shape=(rows, self._dim)
+            )
+        else:
+            self._vectors = np.empty((0, self._dim), dtype=np.float16)
+
+        self._alive = np.zeros(rows, dtype=bool)
+        live_rows = np.fromiter(
+            (row for (row,) in self._db.execute("SELECT row FROM vectors")),
+            dtype=np.int64,
+        )
+        self._alive[live_rows[live_rows < rows]] = True
+        logger.debug(
+            f"[{self.workspace}] Mapped {int(self._alive.sum())} vectors of {self.namespace} ({rows} rows)"
+        )
+
+    def _create(self) -> None:
+        """Initialize an empty side table, importing the NanoVectorDB file if there is one"""
+        self._db.executemany(
+            "INSERT OR REPLACE INTO info (key, value) VALUES (?, ?)",
+            [("dim", self._dim), ("epoch", 0)],
+        )
+        if os.path.exists(self._nano_file):
+            from nano_vectordb.dbs import load_storage
+
+            storage = load_storage(self._nano_file)
+            if storage["embedding_dim"] != self._dim:
+                raise ValueError(
+                    f"Embedding dim mismatch, expected: {self._dim}, but loaded: {storage['embedding_dim']}"
+                )
+            vectors = storage["matrix"].astype(np.float32)
+            norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+            vectors = vectors / np.where(norms == 0, 1, norms)
+            with open(self._vectors_file(0), "wb") as f:
+                f.write(vectors.astype(np.float16).tobytes())
+            self._db.executemany(
+                "INSERT OR REPLACE INTO vectors (id, row, created_at, meta) VALUES (?, ?, ?, ?)",
+                (
+                    (
+                        dp["__id__"],
+                        row,
+                        dp.get("__created_at__"),
+                        json.dumps(
+                            {
+                                k: v
+                                for k, v in dp.items()
+                                if not k.startswith("__") and k != "vector"
+                            },
+                            ensure_ascii=False,
+                        ),
+                    )
+                    for row, dp in enumerate(storage["data"])
+                ),
+            )
+            logger.info(
+                f"[{self.workspace}] Migrated {len(storage['data'])} vectors of {self.namespace} from {self._nano_file}"
+            )
+        self._db.commit()
+
+    async def _get_db(self) -> sqlite3.Connection:
+        """Check if the storage should be reloaded"""
+        # Acquire lock to prevent concurrent read and write
+        async with self._storage_lock:
+            # Check if data needs to be reloaded
+            if self.storage_updated.value:
+                logger.info(
+                    f"[{self.workspace}] Process {os.getpid()} reloading {self.namespace} due to update by another process"
+                )
+                self._load()
+                # Reset update flag
+                self.storage_updated.value = False
+
+            return self._db
+
+    def _rows_of(self, ids: list[str]) -> dict[str, int]:
+        rows = {}
+        for i in range(0, len(ids), SQL_BATCH_SIZE):
+            batch = ids[i : i + SQL_BATCH_SIZE]
+            rows.update(
+                self._db.execute(
+                    f"SELECT id, row FROM vectors WHERE id IN ({','.join('?' * len(batch))})",
+                    batch,
+                )
+            )
+        return rows
+
+    def _get_vectors(self, rows: np.ndarray) -> np.ndarray:
+        """float32 vectors of the given rows, from the mapped file or the pending upserts"""
+        if len(self._pending) > 1:
+            self._pending = [np.concatenate(self._pending)]
+        file_rows = len(self._vectors)
+        in_file = rows < file_rows
+        result = np.empty((len(rows), self._dim), dtype=np.float32)
+        result[in_file] = self._vectors[rows[in_file]]
+        if not in_file.all():
+            result[~in_file] = self._pending[0][rows[~in_file] - file_rows]
+        return result
+
+    def _scores(self, query: np.ndarray) -> np.ndarray:
+        """Cosine similarity of the query with every row, -inf for dead rows"""
+        parts = [
+            self._vectors[start : start + SCORE_BLOCK_ROWS].astype(np.float32) @ query
+            for start in range(0, len(self._vectors), SCORE_BLOCK_ROWS)
+        ]
+        parts += [block.astype(np.float32) @ query for block in self._pending]
+        if not parts:
+            return np.empty(0, dtype=np.float32)
+        scores = np.concatenate(parts)
+        scores[~self._alive] = -np.inf
+        return scores
+
+    def _delete_ids(self, ids: list[str]) -> int:
+        rows = self._rows_of(ids)
+        if rows:
+            self._alive[list(rows.values())] = False
+            found = list(rows)
+            for i in range(0, len(found), SQL_BATCH_SIZE):
+                batch = found[i : i + SQL_BATCH_SIZE]
+                self._db.execute(
+                    f"DELETE FROM vectors WHERE id IN ({','.join('?' * len(batch))})",
+                    batch,
+                )
+        return len(rows)
+
+    async def upsert(self, data: dict[str, dict[str, Any]]) -> None:
+        """
+        Importance notes:
+        1. Changes will be persisted to disk during the next index_done_callback
+        2. Only one process should updating the storage at a time before index_done_callback,
+           KG-storage-log should be used to avoid data corruption
+        """
+        # logger.debug(f"[{self.workspace}] Inserting {len(data)} to {self.namespace}")
+        if not data:
+            return
+
+        current_time = int(time.time())
+        contents = [v["content"] for v in data.values()]
+        batches = [
+            contents[i : i + self._max_batch_size]
+            for i in range(0, len(contents), self._max_batch_size)
+        ]
+
+        # Execute embedding outside of lock to avoid long lock times
+        embedding_tasks = [self.embedding_func(batch) for batch in batches]
+        embeddings_list = await asyncio.gather(*embedding_tasks)
+
+        embeddings = np.concatenate(embeddings_list).astype(np.float32)
+        if len(embeddings) != len(data):
+            # sometimes the embedding is not returned correctly. just log it.
+            logger.error(
+                f"[{self.workspace}] embedding is not 1-1 with data, {len(embeddings)} != {len(data)}"
+            )
+            return
+
+        norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+        embeddings /= np.where(norms == 0, 1, norms)
+
+        db = await self._get_db()
+        # Replaced rows stay in the vector file until the next compaction
+        ids = list(data)
+        old_rows = list(self._rows_of(ids).values())
+        self._alive[old_rows] = False
+
+        first_row = len(self._alive)
+        self._pending.append(embeddings.astype(np.float16))
+        self._alive = np.concatenate([self._alive, np.ones(len(ids), dtype=bool)])
+        db.executemany(
+            "INSERT OR REPLACE INTO vectors (id, row, created_at, meta) VALUES (?, ?, ?, ?)",
+            (
+                (
+                    k,
+                    first_row + i,
+                    current_time,
+                    json.dumps(
+                        {k1: v1 for k1, v1 in v.items() if k1 in self.meta_fields},
+                        ensure_ascii=False,
+                    ),
+                )
+                for i, (k, v) in enumerate(data.items())
+            ),
+        )
+
+    @staticmethod
+    def _record(id: str, created_at: int | None, meta: str) -> dict[str, Any]:
+        return {
+            "__id__": id,
+            "__created_at__": created_at,
+            **json.loads(meta),
+            "id": id,
+            "created_at": created_at,
+        }
+
+    def _records_of_rows(self, rows: list[int]) -> dict[int, dict[str, Any]] | None:
+        """Records of the given rows, None if another process compacted the file"""
+        # Read the epoch and the rows from one snapshot of the side table
+        own_transaction = self._db.in_transaction
+        if not own_transaction:
+            self._db.execute("BEGIN")
+        try:
+            (epoch,) = self._db.execute(
+                "SELECT value FROM info WHERE key = 'epoch'"
+            ).fetchone()
+            if epoch != self._epoch:
+                return None
+            records = {}
+            for i in range(0, len(rows), SQL_BATCH_SIZE):
+                batch = rows[i : i + SQL_BATCH_SIZE]
+                for row, id, created_at, meta in self._db.execute(
+                    "SELECT row, id, created_at, meta FROM vectors"
+                    f" WHERE row IN ({','.join('?' * len(batch))})",
+                    batch,
+                ):
+                    records[row] = self._record(id, created_at, meta)
+            return records
+        finally:
+            if not own_transaction:
+                self._db.commit()
+
+    async def query(
+        self, query: str, top_k: int, query_embedding: list[float] = None
+    ) -> list[dict[str, Any]]:
+        # Use provided embedding or compute it
+        if query_embedding is not None:
+            embedding = query_embedding
+        else:
+            # Execute embedding outside of lock to avoid improve cocurrent
+            embedding = await self.embedding_func(
+                [query], _priority=5
+            )  # higher priority for query
+            embedding = embedding[0]
+
+        embedding = np.asarray(embedding, dtype=np.float32)
+        norm = np.linalg.norm(embedding)
+        if norm > 0:
+            embedding = embedding / norm
+
+        await self._get_db()
+        for _ in range(2):
+            scores = self._scores(embedding)
+            candidates = np.flatnonzero(scores >= self.cosine_better_than_threshold)
+            if 0 < top_k < len(candidates):
+                candidates = candidates[
+                    np.argpartition(-scores[candidates], top_k - 1)[:top_k]
+                ]
+            candidates = candidates[np.argsort(-scores[candidates])][:top_k]
+            records = self._records_of_rows(candidates.tolist())
+            if records is not None:
+                break
+            # Compacted by another process since the last reload
+            self._load()
+        else:
+            return []
+
+        return [
+            {**records[row], "distance": float(scores[row])}
+            for row in candidates
+            if row in records
+        ]
+
+    @property
+    async def client_storage(self):
+        db = await self._get_db()
+        return {
+            "embedding_dim": self._dim,
+            "data": [
+                self._record(id, created_at, meta)
+                for id, created_at, meta in db.execute(
+                    "SELECT id, created_at, meta FROM vectors ORDER BY row"
+                )
+            ],
+        }
+
+    async def delete(self, ids: list[str]):
+        """Delete vectors with specified IDs
+
+        Importance notes:
+        1. Changes will be persisted to disk during the next index_done_callback
+        2. Only one process should updating the storage at a time before index_done_callback,
+           KG-storage-log should be used to avoid data corruption
+
+        Args:
+            ids: List of vector IDs to be deleted
+        """
+        try:
+            await self._get_db()
+            deleted_count = self._delete_ids(list(ids))
+            logger.debug(
+                f"[{self.workspace}] Successfully deleted {deleted_count} vectors from {self.namespace}"
+            )
+        except Exception as e:
+            logger.error(
+                f"[{self.workspace}] Error while deleting vectors from {self.namespace}: {e}"
+            )
+
+    async def delete_entity(self, entity_name: str) -> None:
+        """
+        Importance notes:
+        1. Changes will be persisted to disk during the next index_done_callback
+        2. Only one process should updating the storage at a time before index_done_callback,
+           KG-storage-log should be used to avoid data corruption
+        """
+
+        try:
+            entity_id = compute_mdhash_id(entity_name, prefix="ent-")
+            logger.debug(
+                f"[{self.workspace}] Attempting to delete entity {entity_name} with ID {entity_id}"
+            )
+
+            await self._get_db()
+            if self._delete_ids([entity_id]):
+                logger.debug(
+                    f"[{self.workspace}] Successfully deleted entity {entity_name}"
+                )
+            else:
+                logger.debug(
+                    f"[{self.workspace}] Entity {entity_name} not found in storage"
+                )
+        except Exception as e:
+            logger.error(f"[{self.workspace}] Error deleting entity {entity_name}: {e}")
+
+    async def delete_entity_relation(self, entity_name: str) -> None:
+        """
+        Importance notes:
+        1. Changes will be persisted to disk during the next index_done_callback
+        2. Only one process should updating the storage at a time before index_done_callback,
+           KG-storage-log should be used to avoid data corruption
+        """
+
+        try:
+            db = await self._get_db()
+            ids_to_delete = [
+                id
+                for (id,) in db.execute(
+                    "SELECT id FROM vectors WHERE json_extract(meta, '$.src_id') = ?"
+                    " OR json_extract(meta, '$.tgt_id') = ?",
+                    (entity_name, entity_name),
+                )
+            ]
+            logger.debug(
+                f"[{self.workspace}] Found {len(ids_to_delete)} relations for entity {entity_name}"
+            )
+
+            if ids_to_delete:
+                self._delete_ids(ids_to_delete)
+                logger.debug(
+                    f"[{self.workspace}] Deleted {len(ids_to_delete)} relations for {entity_name}"
+                )
+            else:
+                logger.debug(
+                    f"[{self.workspace}] No relations found for entity {entity_name}"
+                )
+        except Exception as e:
+            logger.error(
+                f"[{self.workspace}] Error deleting relations for {entity_name}: {e}"
+            )
+
+    def _save(self) -> None:
+        """Append the pending rows to the vector file, commit, compact if needed"""
+        if self._pending:
+            file_rows = len(self._vectors)
+            with open(self._vectors_file(self._epoch), "ab") as f:
+                # Drop rows written by an interrupted save that was never committed
+                f.truncate(file_rows * self._dim * 2)
+                for block in self._pending:
+                    f.write(block.tobytes())
+                f.flush()
+                os.fsync(f.fileno())
+        self._db.commit()
+
+        dead_rows = len(self._alive) - int(self._alive.sum())
+        if dead_rows and dead_rows > self._compact_ratio * len(self._alive):
+            self._compact()
+        self._load()
+
+    def _compact(self) -> None:
+        """Rewrite the live rows into the next epoch's vector file"""
+        self._load()
+        live_rows = np.flatnonzero(self._alive)
+        epoch = self._epoch + 1
+        file_name = self._vectors_file(epoch)
+        with open(file_name, "wb") as f:
+            for start in range(0, len(live_rows), SCORE_BLOCK_ROWS):
+                f.write(
+                    self._vectors[live_rows[start : start + SCORE_BLOCK_ROWS]].tobytes()
+                )
+            f.flush()
+            os.fsync(f.fileno())
+
+        # Rows only move down, so renumbering in order never hits an unmoved row
+        self._db.executemany(
+            "UPDATE vectors SET row = ? WHERE row = ?",
+            (
+                (new_row, old_row)
+                for new_row, old_row in enumerate(live_rows.tolist())
+                if new_row != old_row
+            ),
+        )
+        self._db.execute("UPDATE info SET value = ? WHERE key = 'epoch'", (epoch,))
+        self._db.commit()
+        self._remove_old_vector_files(epoch)
+        logger.info(
+            f"[{self.workspace}] Compacted {self.namespace} vectors from {len(self._alive)} to {len(live_rows)} rows"
+        )
+
+    def _remove_old_vector_files(self, epoch: int) -> None:
+        # Processes still mapping an old file keep reading it until they reload
+        for file_name in glob.glob(glob.escape(self._file_prefix) + ".*.f16"):
+            if file_name != self._vectors_file(epoch):
+                os.remove(file_name)
+
+    async def index_done_callback(self) -> bool:
+        """Save data to disk"""
+        async with self._storage_lock:
+            # Check if storage was updated by another process
+            if self.storage_updated.value:
+                # Storage was updated by another process, reload data instead of saving
+                logger.warning(
+                    f"[{self.workspace}] Storage for {self.namespace} was updated by another process, reloading..."
+                )
+                self._db.rollback()
+                self._load()
+                # Reset update flag
+                self.storage_updated.value = False
+                return False  # Return error
+
+        # Acquire lock and perform persistence
+        async with self._storage_lock:
+            try:
+                # Save data to disk
+                self._save()
+                # Notify other processes that data has been updated
+                await set_all_update_flags(self.namespace, workspace=self.workspace)
+                # Reset own update flag to avoid self-reloading
+                self.storage_updated.value = False
+                return True  # Return success
+            except Exception as e:
+                logger.error(
+                    f"[{self.workspace}] Error saving data for {self.namespace}: {e}"
+                )
+                return False  # Return error
+
+        return True  # Return success
+
+    async def get_by_id(self, id: str) -> dict[str, Any] | None:
+        """Get vector data by its ID
+
+        Args:
+            id: The unique identifier of the vector
+
+        Returns:
+            The vector data if found, or None if not found
+        """
+        result = await self.get_by_ids([id])
+        return result[0] if result else None
+
+    async def get_by_ids(self, ids: list[str]) -> list[dict[str, Any]]:
+        """Get multiple vector data by their IDs
+
+        Args:
+            ids: List of unique identifiers
+
+        Returns:
+            List of vector data objects that were found
+        """
+        if not ids:
+            return []
+
+        db = await self._get_db()
+        result_map: dict[str, dict[str, Any]] = {}
+        for i in range(0, len(ids), SQL_BATCH_SIZE):
+            batch = [str(id) for id in ids[i : i + SQL_BATCH_SIZE]]
+            for id, created_at, meta in db.execute(
+                "SELECT id, created_at, meta FROM vectors"
+                f" WHERE id IN ({','.join('?' * len(batch))})",
+                batch,
+            ):
+                result_map[id] = self._record(id, created_at, meta)
+
+        return [result_map.get(str(requested_id)) for requested_id in ids]
+
+    async def get_vectors_by_ids(self, ids: list[str]) -> dict[str, list[float]]:
+        """Get vectors by their IDs, returning only ID and vector data for efficiency
+
+        Args:
+            ids: List of unique identifiers
+
+        Returns:
+            Dictionary mapping IDs to their vector embeddings
+            Format: {id: [vector_values], ...}
+        """
+        if not ids:
+            return {}
+
+        db = await self._get_db()
+        (epoch,) = db.execute("SELECT value FROM info WHERE key = 'epoch'").fetchone()
+        if epoch != self._epoch:
+            # Compacted by another process since the last reload
+            self._load()
+        # Rows committed by another process after the last reload are not mapped yet
+        rows = {
+            id: row
+            for id, row in self._rows_of(list(ids)).items()
+            if row < len(self._alive)
+        }
+        if not rows:
+            return {}
+        vectors = self._get_vectors(np.array(list(rows.values()), dtype=np.int64))
+        return {id: vector.tolist() for id, vector in zip(rows, vectors)}
+
+    async def drop(self) -> dict[str, str]:
+        """Drop all vector data from storage and clean up resources
+
+        This method will:
+        1. Remove all rows of the side table and start a new, empty vector file
+        2. Remove the vector files of earlier epochs
+        3. Update flags to notify other processes
+        4. Changes is persisted to disk immediately
+
+        This method is intended for use in scenarios where all data needs to be removed,
+
+        Returns:
+            dict[str, str]: Operation status and message
+            - On success: {"status": "success", "message": "data dropped"}
+            - On failure: {"status": "error", "message": "<error details>"}
+        """
+        try:
+            async with self._storage_lock:
+                # Other processes keep their mapped file until they reload
+                epoch = self._epoch + 1
+                self._db.execute("DELETE FROM vectors")
+                self._db.execute(
+                    "UPDATE info SET value = ? WHERE key = 'epoch'", (epoch,)
+                )
+                self._db.commit()
+                self._remove_old_vector_files(epoch)
+                self._load()
+
+                # Notify other processes that data has been updated
+                await set_all_update_flags(self.namespace, workspace=self.workspace)
+                # Reset own update flag to avoid self-reloading
+                self.storage_updated.value = False
+
+                logger.info(
+                    f"[{self.workspace}] Process {os.getpid()} drop {self.namespace}(file:{self._db_file})"
+                )
+            return {"status": "success", "message": "data dropped"}
+        except Exception as e:
+            logger.error(f"[{self.workspace}] Error dropping {self.namespace}: {e}")
+            return {"status": "error", "message": str(e)}
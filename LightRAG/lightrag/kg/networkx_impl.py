@@ -1,3 +1,4 @@
+import heapq
 import os
 from dataclasses import dataclass
 from typing import final
@@ -19,6 +20,167 @@ from dotenv import load_dotenv
 # the OS environment variables take precedence over the .env file
 load_dotenv(dotenv_path=".env", override=False)
 
+# On-disk format for graph snapshots: graphml (default) or msgpack
+NETWORKX_STORAGE_FORMATS = ("graphml", "msgpack")
+DEFAULT_NETWORKX_STORAGE_FORMAT = "graphml"
+# Maximum number of delta log operations before a full snapshot is rewritten
+DEFAULT_NETWORKX_DELTA_MAX_OPS = 100000
+
+
+def _load_msgpack():
+    import pipmaster as pm
+
+    if not pm.is_installed("msgpack"):
+        pm.install("msgpack")
+
+    import msgpack  # type: ignore
+
+    return msgpack
+
+
+def write_msgpack_graph(graph: nx.Graph, file_name: str) -> None:
+    """Write a columnar msgpack snapshot of the graph.
+
+    Nodes and edges are stored once as flat lists; every attribute becomes a
+    column aligned with those lists, with None marking an absent attribute.
+    The file is written to a temporary path and renamed into place so readers
+    never observe a partially written snapshot.
+    """
+    msgpack = _load_msgpack()
+
+    nodes = list(graph.nodes)
+    node_index = {node: i for i, node in enumerate(nodes)}
+    node_attrs: dict[str, list] = {}
+    for i, (_, data) in enumerate(graph.nodes(data=True)):
+        for key, value in data.items():
+            column = node_attrs.get(key)
+            if column is None:
+                column = node_attrs[key] = [None] * len(nodes)
+            column[i] = value
+
+    edge_count = graph.number_of_edges()
+    edge_src = [0] * edge_count
+    edge_tgt = [0] * edge_count
+    edge_attrs: dict[str, list] = {}
+    for i, (u, v, data) in enumerate(graph.edges(data=True)):
+        edge_src[i] = node_index[u]
+        edge_tgt[i] = node_index[v]
+        for key, value in data.items():
+            column = edge_attrs.get(key)
+            if column is None:
+                column = edge_attrs[key] = [None] * edge_count
+            column[i] = value
+
+    payload = {
+        "version": 1,
+        "nodes": nodes,
+        "node_attrs": node_attrs,
+        "edge_src": edge_src,
+        "edge_tgt": edge_tgt,
+        "edge_attrs": edge_attrs,
+    }
+    tmp_file = f"{file_name}.tmp"
+    with open(tmp_file, "wb") as f:
+        f.write(msgpack.packb(payload, use_bin_type=True))
+    os.replace(tmp_file, file_name)
+
+
+def read_msgpack_graph(file_name: str) -> nx.Graph | None:
+    """Read a snapshot written by write_msgpack_graph, or None if missing"""
+    if not os.path.exists(file_name):
+        return None
+    msgpack = _load_msgpack()
+
+    with open(file_name, "rb") as f:
+        payload = msgpack.unpackb(f.read(), raw=False, strict_map_key=False)
+
+    nodes = payload["nodes"]
+    node_data = [{} for _ in nodes]
+    for key, column in payload["node_attrs"].items():
+        for i, value in enumerate(column):
+            if value is not None:
+                node_data[i][key] = value
+
+    edge_src = payload["edge_src"]
+    edge_tgt = payload["edge_tgt"]
+    edge_data = [{} for _ in edge_src]
+    for key, column in payload["edge_attrs"].items():
+        for i, value in enumerate(column):
+            if value is not None:
+                edge_data[i][key] = value
+
+    graph = nx.Graph()
+    graph.add_nodes_from(zip(nodes, node_data))
+    graph.add_edges_from(
+        (nodes[s], nodes[t], data) for s, t, data in zip(edge_src, edge_tgt, edge_data)
+    )
+    return graph
+
+
+def append_delta_log(ops: list[list], file_name: str) -> None:
+    """Append graph mutation records to the delta log"""
+    msgpack = _load_msgpack()
+    packer = msgpack.Packer(use_bin_type=True)
+    with open(file_name, "ab") as f:
+        f.write(b"".join(packer.pack(op) for op in ops))
+        f.flush()
+        os.fsync(f.fileno())
+
+
+def replay_delta_log(
+    graph: nx.Graph, file_name: str, workspace="_", offset: int = 0
+) -> tuple[int, int]:
+    """Apply the records of a delta log to the graph, starting at byte offset
+
+    Returns the number of records applied and the offset just past the last
+    one, from which a later replay can pick up the records appended since.
+
+    A torn record at the tail of the log (an interrupted append) is dropped by
+    truncating the log, so that later appends start on a record boundary.
+    """
+    if not os.path.exists(file_name):
+        return 0, 0
+    msgpack = _load_msgpack()
+
+    applied = 0
+    with open(file_name, "rb") as f:
+        f.seek(offset)
+        unpacker = msgpack.Unpacker(f, raw=False, strict_map_key=False)
+        try:
+            for op in unpacker:
+                _apply_delta_op(graph, op)
+                applied += 1
+        except (ValueError, msgpack.UnpackException) as e:
+            logger.warning(
+                f"[{workspace}] Invalid record in delta log {file_name} after {applied} operations: {e}"
+            )
+        # Offset just past the last record that was decoded
+        valid_size = offset + unpacker.tell()
+
+    if valid_size < os.path.getsize(file_name):
+        logger.warning(
+            f"[{workspace}] Truncating torn tail of delta log {file_name} at byte {valid_size}"
+        )
+        with open(file_name, "r+b") as f:
+            f.truncate(valid_size)
+    return applied, valid_size
+
+
+def _apply_delta_op(graph: nx.Graph, op: list) -> None:
+    kind = op[0]
+    if kind == "upsert_node":
+        graph.add_node(op[1], **op[2])
+    elif kind == "upsert_edge":
+        graph.add_edge(op[1], op[2], **op[3])
+    elif kind == "delete_node":
+        if graph.has_node(op[1]):
+            graph.remove_node(op[1])
+    elif kind == "delete_edge":
+        if graph.has_edge(op[1], op[2]):
+            graph.remove_edge(op[1], op[2])
+    else:
+        raise ValueError(f"Unknown delta log operation: {kind}")
+
 
 @final
 @dataclass
@@ -50,21 +212,46 @@ class NetworkXStorage(BaseGraphStorage):
         self._graphml_xml_file = os.path.join(
             workspace_dir, f"graph_{self.namespace}.graphml"
         )
+        self._msgpack_file = os.path.join(
+            workspace_dir, f"graph_{self.namespace}.msgpack"
+        )
+        self._delta_log_file = os.path.join(
+            workspace_dir, f"graph_{self.namespace}.delta.msgpack"
+        )
+
+        self._storage_format = os.getenv(
+            "NETWORKX_STORAGE_FORMAT", DEFAULT_NETWORKX_STORAGE_FORMAT
+        ).lower()
+        if self._storage_format not in NETWORKX_STORAGE_FORMATS:
+            raise ValueError(
+                f"Invalid NETWORKX_STORAGE_FORMAT '{self._storage_format}', expected one of {NETWORKX_STORAGE_FORMATS}"
+            )
+        self._delta_log_enabled = self._storage_format == "msgpack" and os.getenv(
+            "NETWORKX_DELTA_LOG", "false"
+        ).lower() in ("true", "1", "yes")
+        self._delta_max_ops = int(
+            os.getenv("NETWORKX_DELTA_MAX_OPS", DEFAULT_NETWORKX_DELTA_MAX_OPS)
+        )
+        # Operations recorded since the last persist, and operations already in the delta log
+        self._pending_ops: list[list] = []
+        self._delta_ops = 0
+        # Whether the graph changed since the last persist
+        self._dirty = False
+        # Snapshot and delta log position the in-memory graph reflects, so changes
+        # persisted by another process can be replayed instead of reloading
+        self._snapshot_version: tuple[int, int, int] | None = None
+        self._delta_offset = 0
+
+        # Cache of ranked edge lists of hub nodes: node -> (max_edges, edges), ranked
+        # lazily by get_nodes_top_edges_batch and dropped by writes touching the hub
+        self._top_edges: dict[str, tuple[int, list[tuple[str, str]]]] = {}
+
         self._storage_lock = None
         self.storage_updated = None
         self._graph = None
 
         # Load initial graph
-        preloaded_graph = NetworkXStorage.load_nx_graph(self._graphml_xml_file)
-        if preloaded_graph is not None:
-            logger.info(
-                f"[{self.workspace}] Loaded graph from {self._graphml_xml_file} with {preloaded_graph.number_of_nodes()} nodes, {preloaded_graph.number_of_edges()} edges"
-            )
-        else:
-            logger.info(
-                f"[{self.workspace}] Created new empty graph file: {self._graphml_xml_file}"
-            )
-        self._graph = preloaded_graph or nx.Graph()
+        self._graph = self._load_graph()
 
     async def initialize(self):
         """Initialize storage data"""
@@ -77,19 +264,161 @@ class NetworkXStorage(BaseGraphStorage):
             self.namespace, workspace=self.workspace
         )
 
+    @property
+    def _graph_file(self) -> str:
+        if self._storage_format == "msgpack":
+            return self._msgpack_file
+        return self._graphml_xml_file
+
+    def _load_graph(self) -> nx.Graph:
+        """Load the graph snapshot in the configured format and replay its delta log
+
+        A msgpack store without a snapshot is migrated from an existing GraphML
+        file, so switching formats keeps the data built so far.
+        """
+        self._pending_ops = []
+        self._delta_ops = 0
+        self._dirty = False
+        self._snapshot_version = None
+        self._delta_offset = 0
+
+        if self._storage_format == "graphml":
+            graph = NetworkXStorage.load_nx_graph(self._graphml_xml_file)
+        else:
+            graph = read_msgpack_graph(self._msgpack_file)
+            if graph is None and os.path.exists(self._graphml_xml_file):
+                graph = NetworkXStorage.load_nx_graph(self._graphml_xml_file)
+                write_msgpack_graph(graph, self._msgpack_file)
+                logger.info(
+                    f"[{self.workspace}] Migrated graph from {self._graphml_xml_file} to {self._msgpack_file}"
+                )
+            if graph is not None:
+                self._snapshot_version = self._get_snapshot_version()
+                self._delta_ops, self._delta_offset = replay_delta_log(
+                    graph, self._delta_log_file, self.workspace
+                )
+
+        if graph is not None:
+            logger.info(
+                f"[{self.workspace}] Loaded graph from {self._graph_file} with {graph.number_of_nodes()} nodes, {graph.number_of_edges()} edges"
+                + (f", {self._delta_ops} delta operations" if self._delta_ops else "")
+            )
+        else:
+            logger.info(
+                f"[{self.workspace}] Created new empty graph file: {self._graph_file}"
+            )
+        return graph or nx.Graph()
+
+    def _get_snapshot_version(self) -> tuple[int, int, int] | None:
+        """Identity of the msgpack snapshot on disk, changed by every rewrite"""
+        try:
+            stat = os.stat(self._msgpack_file)
+        except FileNotFoundError:
+            return None
+        return stat.st_ino, stat.st_mtime_ns, stat.st_size
+
+    def _reload_graph(self) -> None:
+        """Bring the graph up to date with changes persisted by another process
+
+        If the other process only appended to the delta log, the records after
+        the last replayed offset are applied to the graph in memory. A rewritten
+        snapshot, the graphml format or unsaved local changes need a full reload.
+        """
+        if (
+            self._delta_log_enabled
+            and not self._dirty
+            and self._snapshot_version is not None
+            and self._snapshot_version == self._get_snapshot_version()
+        ):
+            log_size = (
+                os.path.getsize(self._delta_log_file)
+                if os.path.exists(self._delta_log_file)
+                else 0
+            )
+            if log_size >= self._delta_offset:
+                applied, self._delta_offset = replay_delta_log(
+                    self._graph,
+                    self._delta_log_file,
+                    self.workspace,
+                    self._delta_offset,
+                )
+                self._delta_ops += applied
+                logger.info(
+                    f"[{self.workspace}] Process {os.getpid()} replayed {applied} delta operations from {self._delta_log_file}"
+                )
+                return
+
+        logger.info(
+            f"[{self.workspace}] Process {os.getpid()} reloading graph {self._graph_file} due to modifications by another process"
+        )
+        self._graph = self._load_graph()
+
+    def _record_op(self, *op) -> None:
+        self._dirty = True
+        if self._delta_log_enabled:
+            self._pending_ops.append(list(op))
+
+    def _persist_graph(self) -> None:
+        """Write pending changes to disk
+
+        With the delta log enabled, changes are appended to the log until it
+        exceeds NETWORKX_DELTA_MAX_OPS; then a full snapshot is written and the
+        log is truncated.
+        """
+        if self._storage_format == "graphml":
+            NetworkXStorage.write_nx_graph(
+                self._graph, self._graphml_xml_file, self.workspace
+            )
+            return
+
+        if (
+            self._delta_log_enabled
+            and os.path.exists(self._msgpack_file)
+            and self._delta_ops + len(self._pending_ops) <= self._delta_max_ops
+        ):
+            if self._pending_ops:
+                append_delta_log(self._pending_ops, self._delta_log_file)
+                self._delta_ops += len(self._pending_ops)
+                self._delta_offset = os.path.getsize(self._delta_log_file)
+                logger.debug(
+                    f"[{self.workspace}] Appended {len(self._pending_ops)} operations to {self._delta_log_file}"
+                )
+        else:
+            logger.info(
+                f"[{self.workspace}] Writing graph with {self._graph.number_of_nodes()} nodes, {self._graph.number_of_edges()} edges"
+            )
+            write_msgpack_graph(self._graph, self._msgpack_file)
+            if os.path.exists(self._delta_log_file):
+                os.remove(self._delta_log_file)
+            self._delta_ops = 0
+            self._delta_offset = 0
+            self._snapshot_version = self._get_snapshot_version()
+        self._pending_ops = []
+        self._dirty = False
+
+    async def export_graphml(self, file_name: str | None = None) -> str:
+        """Export the current graph as GraphML
+
+        Args:
+            file_name: Target path, defaults to the GraphML file in the workspace directory
+
+        Returns:
+            The path of the written GraphML file
+        """
+        graph = await self._get_graph()
+        file_name = file_name or self._graphml_xml_file
+        async with self._storage_lock:
+            NetworkXStorage.write_nx_graph(graph, file_name, self.workspace)
+        return file_name
+
     async def _get_graph(self):
         """Check if the storage should be reloaded"""
         # Acquire lock to prevent concurrent read and write
         async with self._storage_lock:
             # Check if data needs to be reloaded
             if self.storage_updated.value:
-                logger.info(
-                    f"[{self.workspace}] Process {os.getpid()} reloading graph {self._graphml_xml_file} due to modifications by another process"
-                )
-                # Reload data
-                self._graph = (
-                    NetworkXStorage.load_nx_graph(self._graphml_xml_file) or nx.Graph()
-                )
+                self._reload_graph()
+                self._top_edges.clear()
                 # Reset update flag
                 self.storage_updated.value = False
 
@@ -109,7 +438,7 @@ class NetworkXStorage(BaseGraphStorage):
 
     async def node_degree(self, node_id: str) -> int:
         graph = await self._get_graph()
-        return graph.degree(node_id)
+        return graph.degree(node_id) if graph.has_node(node_id) else 0
 
     async def edge_degree(self, src_id: str, tgt_id: str) -> int:
         graph = await self._get_graph()
@@ -129,6 +458,120 @@ class NetworkXStorage(BaseGraphStorage):
             return list(graph.edges(source_node_id))
         return None
 
+    # Batch reads fetch the graph (and take the storage lock) once per batch
+    # instead of once per item as the BaseGraphStorage defaults do
+
+    async def get_nodes_batch(self, node_ids: list[str]) -> dict[str, dict]:
+        graph = await self._get_graph()
+        nodes = graph.nodes
+        return {node_id: nodes[node_id] for node_id in node_ids if node_id in nodes}
+
+    async def node_degrees_batch(self, node_ids: list[str]) -> dict[str, int]:
+        graph = await self._get_graph()
+        degree = graph.degree
+        return {
+            node_id: degree[node_id] if node_id in graph else 0 for node_id in node_ids
+        }
+
+    async def edge_degrees_batch(
+        self, edge_pairs: list[tuple[str, str]]
+    ) -> dict[tuple[str, str], int]:
+        graph = await self._get_graph()
+        degree = graph.degree
+        result = {}
+        for src_id, tgt_id in edge_pairs:
+            src_degree = degree[src_id] if src_id in graph else 0
+            tgt_degree = degree[tgt_id] if tgt_id in graph else 0
+            result[(src_id, tgt_id)] = src_degree + tgt_degree
+        return result
+
+    async def get_edges_batch(
+        self, pairs: list[dict[str, str]]
+    ) -> dict[tuple[str, str], dict]:
+        graph = await self._get_graph()
+        adj = graph.adj
+        result = {}
+        for pair in pairs:
+            src_id = pair["src"]
+            tgt_id = pair["tgt"]
+            edge = adj[src_id].get(tgt_id) if src_id in adj else None
+            if edge is not None:
+                result[(src_id, tgt_id)] = edge
+        return result
+
+    async def get_nodes_edges_batch(
+        self, node_ids: list[str]
+    ) -> dict[str, list[tuple[str, str]]]:
+        graph = await self._get_graph()
+        adj = graph.adj
+        return {
+            node_id: [(node_id, neighbor) for neighbor in adj[node_id]]
+            if node_id in adj
+            else []
+            for node_id in node_ids
+        }
+
+    async def get_nodes_top_edges_batch(
+        self, node_ids: list[str], max_edges: int
+    ) -> dict[str, list[tuple[str, str]]]:
+        """Get the highest ranked edges of each node, at most max_edges per node
+
+        Only hub nodes (more than max_edges edges) are ranked. Their ranked lists
+        are computed on first use and kept until a write changes the degree of the
+        hub or of one of its neighbors, so repeated queries touching a hub do not
+        scan its full neighborhood again.
+        """
+        graph = await self._get_graph()
+        adj = graph.adj
+        result = {}
+        for node_id in node_ids:
+            if node_id not in adj:
+                result[node_id] = []
+            elif max_edges <= 0 or len(adj[node_id]) <= max_edges:
+                result[node_id] = [(node_id, neighbor) for neighbor in adj[node_id]]
+            else:
+                cached = self._top_edges.get(node_id)
+                if cached is None or cached[0] < max_edges:
+                    cached = (
+                        max_edges,
+                        self._rank_node_edges(graph, node_id, max_edges),
+                    )
+                    self._top_edges[node_id] = cached
+                result[node_id] = cached[1][:max_edges]
+        return result
+
+    @staticmethod
+    def _rank_node_edges(
+        graph: nx.Graph, node_id: str, max_edges: int
+    ) -> list[tuple[str, str]]:
+        """Top max_edges edges of a node by (edge degree, weight)"""
+        degree = graph.degree
+        node_degree = degree[node_id]
+        ranked = heapq.nlargest(
+            max_edges,
+            graph.adj[node_id].items(),
+            key=lambda item: (
+                node_degree + degree[item[0]],
+                float(item[1].get("weight", 1.0)),
+            ),
+        )
+        return [(node_id, neighbor) for neighbor, _ in ranked]
+
+    def _invalidate_top_edges(self, graph: nx.Graph, *node_ids: str) -> None:
+        """Drop ranked edge lists affected by an edge change between node_ids
+
+        Changing an edge changes the degree of its endpoints, which re-ranks the
+        edges of the endpoints and of every hub adjacent to them.
+        """
+        if not self._top_edges:
+            return
+        adj = graph.adj
+        for hub in list(self._top_edges):
+            if hub in node_ids or any(
+                node_id in adj and hub in adj[node_id] for node_id in node_ids
+            ):
+                del self._top_edges[hub]
+
     async def upsert_node(self, node_id: str, node_data: dict[str, str]) -> None:
         """
         Importance notes:
@@ -138,6 +581,7 @@ class NetworkXStorage(BaseGraphStorage):
         """
         graph = await self._get_graph()
         graph.add_node(node_id, **node_data)
+        self._record_op("upsert_node", node_id, dict(node_data))
 
     async def upsert_edge(
         self, source_node_id: str, target_node_id: str, edge_data: dict[str, str]
@@ -150,6 +594,8 @@ class NetworkXStorage(BaseGraphStorage):
         """
         graph = await self._get_graph()
         graph.add_edge(source_node_id, target_node_id, **edge_data)
+        self._invalidate_top_edges(graph, source_node_id, target_node_id)
+        self._record_op("upsert_edge", source_node_id, target_node_id, dict(edge_data))
 
     async def delete_node(self, node_id: str) -> None:
         """
@@ -161,6 +607,9 @@ class NetworkXStorage(BaseGraphStorage):
         graph = await self._get_graph()
         if graph.has_node(node_id):
             graph.remove_node(node_id)
+            # Degree changes of all former neighbors re-rank too many lists to track
+            self._top_edges.clear()
+            self._record_op("delete_node", node_id)
             logger.debug(f"[{self.workspace}] Node {node_id} deleted from the graph")
         else:
             logger.warning(
@@ -182,6 +631,8 @@ class NetworkXStorage(BaseGraphStorage):
         for node in nodes:
             if graph.has_node(node):
                 graph.remove_node(node)
+                self._top_edges.clear()
+                self._record_op("delete_node", node)
 
     async def remove_edges(self, edges: list[tuple[str, str]]):
         """Delete multiple edges
@@ -198,6 +649,8 @@ class NetworkXStorage(BaseGraphStorage):
         for source, target in edges:
             if graph.has_edge(source, target):
                 graph.remove_edge(source, target)
+                self._invalidate_top_edges(graph, source, target)
+                self._record_op("delete_edge", source, target)
 
     async def get_all_labels(self) -> list[str]:
         """
@@ -509,20 +962,22 @@ class NetworkXStorage(BaseGraphStorage):
                 logger.info(
                     f"[{self.workspace}] Graph was updated by another process, reloading..."
                 )
-                self._graph = (
-                    NetworkXStorage.load_nx_graph(self._graphml_xml_file) or nx.Graph()
-                )
+                self._reload_graph()
+                self._top_edges.clear()
                 # Reset update flag
                 self.storage_updated.value = False
                 return False  # Return error
 
+            # Nothing changed since the last persist: skip the write and do not
+            # make other processes reload
+            if not self._dirty:
+                return True
+
         # Acquire lock and perform persistence
         async with self._storage_lock:
             try:
                 # Save data to disk
-                NetworkXStorage.write_nx_graph(
-                    self._graph, self._graphml_xml_file, self.workspace
-                )
+                self._persist_graph()
                 # Notify other processes that data has been updated
                 await set_all_update_flags(self.namespace, workspace=self.workspace)
                 # Reset own update flag to avoid self-reloading
@@ -551,19 +1006,30 @@ class NetworkXStorage(BaseGraphStorage):
         try:
             async with self._storage_lock:
                 # delete _client_file_name
-                if os.path.exists(self._graphml_xml_file):
-                    os.remove(self._graphml_xml_file)
+                for file_name in (
+                    self._graphml_xml_file,
+                    self._msgpack_file,
+                    self._delta_log_file,
+                ):
+                    if os.path.exists(file_name):
+                        os.remove(file_name)
                 self._graph = nx.Graph()
+                self._top_edges.clear()
+                self._pending_ops = []
+                self._delta_ops = 0
+                self._dirty = False
+                self._snapshot_version = None
+                self._delta_offset = 0
                 # Notify other processes that data has been updated
                 await set_all_update_flags(self.namespace, workspace=self.workspace)
                 # Reset own update flag to avoid self-reloading
                 self.storage_updated.value = False
                 logger.info(
-                    f"[{self.workspace}] Process {os.getpid()} drop graph file:{self._graphml_xml_file}"
+                    f"[{self.workspace}] Process {os.getpid()} drop graph file:{self._graph_file}"
                 )
             return {"status": "success", "message": "data dropped"}
         except Exception as e:
             logger.error(
-                f"[{self.workspace}] Error dropping graph file:{self._graphml_xml_file}: {e}"
+                f"[{self.workspace}] Error dropping graph file:{self._graph_file}: {e}"
             )
             return {"status": "error", "message": str(e)}
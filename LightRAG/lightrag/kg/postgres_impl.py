@@ -9,6 +9,7 @@ from typing import Any, Awaitable, Callable, TypeVar, Union, final
 import numpy as np
 import configparser
 import ssl
+import struct
 import itertools
 
 from lightrag.types import KnowledgeGraph, KnowledgeGraphNode, KnowledgeGraphEdge
@@ -32,7 +33,8 @@ from ..base import (
     DocStatusStorage,
 )
 from ..namespace import NameSpace, is_namespace
-from ..utils import logger
+from ..constants import GRAPH_FIELD_SEP
+from ..utils import compute_mdhash_id, logger
 from ..kg.shared_storage import get_data_init_lock
 
 import pipmaster as pm
@@ -52,6 +54,46 @@ load_dotenv(dotenv_path=".env", override=False)
 
 T = TypeVar("T")
 
+# Default number of rows sent per executemany round trip
+DEFAULT_PG_UPSERT_BATCH_SIZE = 500
+
+
+def encode_pg_vector(value: Any) -> bytes:
+    """Encode an embedding into pgvector's binary wire format.
+
+    Layout: uint16 dimension, uint16 unused, then big-endian float32 values.
+    Text literals such as "[0.1,0.2]" are accepted for backward compatibility.
+    """
+    if isinstance(value, str):
+        value = json.loads(value)
+    vector = np.asarray(value, dtype=">f4").ravel()
+    return struct.pack(">HH", vector.shape[0], 0) + vector.tobytes()
+
+
+def decode_pg_vector(data: bytes) -> np.ndarray:
+    """Decode pgvector's binary wire format into a float32 NumPy array."""
+    dim, _ = struct.unpack_from(">HH", data)
+    return np.frombuffer(data, dtype=">f4", count=dim, offset=4).astype(np.float32)
+
+
+def _vector_to_list(record: dict[str, Any]) -> dict[str, Any]:
+    """Convert a decoded content_vector to a JSON serializable list."""
+    if isinstance(record.get("content_vector"), np.ndarray):
+        record["content_vector"] = record["content_vector"].tolist()
+    return record
+
+
+class PGBatchWriteError(Exception):
+    """Raised when rows of a batched write could not be written."""
+
+    def __init__(self, failed_ids: list[Any], cause: Exception | None = None) -> None:
+        self.failed_ids = failed_ids
+        self.cause = cause
+        preview = ", ".join(str(id_) for id_ in failed_ids[:20])
+        if len(failed_ids) > 20:
+            preview += f", ... ({len(failed_ids)} total)"
+        super().__init__(f"Failed to write ids: {preview}; last error: {cause!r}")
+
 
 class PostgreSQLDB:
     def __init__(self, config: dict[str, Any], **kwargs: Any):
@@ -87,6 +129,11 @@ class PostgreSQLDB:
         # Statement LRU cache size (keep as-is, allow None for optional configuration)
         self.statement_cache_size = config.get("statement_cache_size")
 
+        # Number of rows sent per round trip by executemany
+        self.upsert_batch_size = int(
+            config.get("upsert_batch_size") or DEFAULT_PG_UPSERT_BATCH_SIZE
+        )
+
         if self.user is None or self.password is None or self.database is None:
             raise ValueError("Missing database user, password, or database")
 
@@ -253,7 +300,9 @@ class PostgreSQLDB:
         )
 
         async def _create_pool_once() -> None:
-            pool = await asyncpg.create_pool(**connection_params)  # type: ignore
+            pool = await asyncpg.create_pool(
+                **connection_params, init=self.configure_vector_codec
+            )  # type: ignore
             try:
                 async with pool.acquire() as connection:
                     await self.configure_vector_extension(connection)
@@ -379,6 +428,32 @@ class PostgreSQLDB:
             logger.warning(f"Could not create VECTOR extension: {e}")
             # Don't raise - let the system continue without vector extension
 
+    @staticmethod
+    async def configure_vector_codec(connection: asyncpg.Connection) -> None:
+        """Register a binary codec for pgvector's vector type on a new connection.
+
+        Embeddings are then sent and received as NumPy float32 arrays instead of
+        text literals, so query SQL no longer embeds the vector and asyncpg's
+        statement cache can reuse one prepared statement per query template.
+        """
+        schema_sql = """SELECT n.nspname FROM pg_type t
+                        JOIN pg_namespace n ON n.oid = t.typnamespace
+                        WHERE t.typname = 'vector' LIMIT 1"""
+        schema = await connection.fetchval(schema_sql)
+        if schema is None:
+            await PostgreSQLDB.configure_vector_extension(connection)
+            schema = await connection.fetchval(schema_sql)
+        if schema is None:
+            logger.warning("PostgreSQL, vector type not found, binary codec not set")
+            return
+        await connection.set_type_codec(
+            "vector",
+            schema=schema,
+            encoder=encode_pg_vector,
+            decoder=decode_pg_vector,
+            format="binary",
+        )
+
     @staticmethod
     async def configure_age_extension(connection: asyncpg.Connection) -> None:
         """Create AGE extension if it doesn't exist for graph operations."""
@@ -1402,7 +1477,7 @@ class PostgreSQLDB:
             "VCHORDRQ": f"""
                 CREATE INDEX {{vector_index_name}}
                 ON {{k}} USING vchordrq (content_vector vector_cosine_ops)
-                {f'WITH (options = $${self.vchordrq_build_options}$$)' if self.vchordrq_build_options else ''}
+                {f"WITH (options = $${self.vchordrq_build_options}$$)" if self.vchordrq_build_options else ""}
             """,
         }
 
@@ -1514,6 +1589,65 @@ class PostgreSQLDB:
             logger.error(f"PostgreSQL database,\nsql:{sql},\ndata:{data},\nerror:{e}")
             raise
 
+    async def executemany(
+        self,
+        sql: str,
+        rows: list[dict[str, Any]],
+        batch_size: int | None = None,
+        id_key: str = "id",
+    ) -> None:
+        """Execute one statement for many parameter rows, one round trip per batch.
+
+        Each batch runs in its own transaction. If a batch fails, its rows are
+        retried one by one to find the failing ones; the IDs of all rows that
+        could not be written are reported in a single PGBatchWriteError.
+
+        Args:
+            sql: Statement with positional parameters in row value order.
+            rows: Parameter dicts, all with the same key order.
+            batch_size: Rows per round trip, defaults to upsert_batch_size.
+            id_key: Row key used to report failed rows.
+
+        Raises:
+            PGBatchWriteError: If any row could not be written.
+        """
+        if not rows:
+            return
+        batch_size = batch_size or self.upsert_batch_size
+        failed_ids: list[Any] = []
+        last_error: Exception | None = None
+
+        for start in range(0, len(rows), batch_size):
+            batch = [tuple(row.values()) for row in rows[start : start + batch_size]]
+
+            async def _operation(connection: asyncpg.Connection) -> None:
+                async with connection.transaction():
+                    await connection.executemany(sql, batch)
+
+            try:
+                await self._run_with_retry(_operation)
+                continue
+            except Exception as e:
+                logger.warning(
+                    f"PostgreSQL, batch write of {len(batch)} rows failed, retrying row by row: {e!r}"
+                )
+
+            for row, values in zip(rows[start : start + batch_size], batch):
+
+                async def _row_operation(connection: asyncpg.Connection) -> None:
+                    await connection.execute(sql, *values)
+
+                try:
+                    await self._run_with_retry(_row_operation)
+                except Exception as e:
+                    failed_ids.append(row.get(id_key))
+                    last_error = e
+
+        if failed_ids:
+            error = PGBatchWriteError(failed_ids, last_error)
+            logger.error(f"PostgreSQL database,\nsql:{sql},\nerror:{error}")
+            raise error
+
 
 class ClientManager:
     _instances: dict[str, Any] = {"db": None, "ref_count": 0}
@@ -1617,6 +1751,16 @@ class ClientManager:
                 "POSTGRES_STATEMENT_CACHE_SIZE",
                 config.get("postgres", "statement_cache_size", fallback=None),
             ),
+            "upsert_batch_size": int(
+                os.environ.get(
+                    "POSTGRES_UPSERT_BATCH_SIZE",
+                    config.get(
+                        "postgres",
+                        "upsert_batch_size",
+                        fallback=DEFAULT_PG_UPSERT_BATCH_SIZE,
+                    ),
+                )
+            ),
             # Connection retry configuration
             "connection_retry_attempts": min(
                 10,
@@ -1996,11 +2140,12 @@ class PGKVStorage(BaseKVStorage):
         if not data:
             return
 
+        rows: list[dict[str, Any]] = []
         if is_namespace(self.namespace, NameSpace.KV_STORE_TEXT_CHUNKS):
             # Get current UTC time and convert to naive datetime for database storage
             current_time = datetime.datetime.now(timezone.utc).replace(tzinfo=None)
+            upsert_sql = SQL_TEMPLATES["upsert_text_chunk"]
             for k, v in data.items():
-                upsert_sql = SQL_TEMPLATES["upsert_text_chunk"]
                 _data = {
                     "workspace": self.workspace,
                     "id": k,
@@ -2013,20 +2158,20 @@ class PGKVStorage(BaseKVStorage):
                     "create_time": current_time,
                     "update_time": current_time,
                 }
-                await self.db.execute(upsert_sql, _data)
+                rows.append(_data)
         elif is_namespace(self.namespace, NameSpace.KV_STORE_FULL_DOCS):
+            upsert_sql = SQL_TEMPLATES["upsert_doc_full"]
             for k, v in data.items():
-                upsert_sql = SQL_TEMPLATES["upsert_doc_full"]
                 _data = {
                     "id": k,
                     "content": v["content"],
                     "doc_name": v.get("file_path", ""),  # Map file_path to doc_name
                     "workspace": self.workspace,
                 }
-                await self.db.execute(upsert_sql, _data)
+                rows.append(_data)
         elif is_namespace(self.namespace, NameSpace.KV_STORE_LLM_RESPONSE_CACHE):
+            upsert_sql = SQL_TEMPLATES["upsert_llm_response_cache"]
             for k, v in data.items():
-                upsert_sql = SQL_TEMPLATES["upsert_llm_response_cache"]
                 _data = {
                     "workspace": self.workspace,
                     "id": k,  # Use flattened key as id
@@ -2040,13 +2185,12 @@ class PGKVStorage(BaseKVStorage):
                     if v.get("queryparam")
                     else None,
                 }
-
-                await self.db.execute(upsert_sql, _data)
+                rows.append(_data)
         elif is_namespace(self.namespace, NameSpace.KV_STORE_FULL_ENTITIES):
             # Get current UTC time and convert to naive datetime for database storage
             current_time = datetime.datetime.now(timezone.utc).replace(tzinfo=None)
+            upsert_sql = SQL_TEMPLATES["upsert_full_entities"]
             for k, v in data.items():
-                upsert_sql = SQL_TEMPLATES["upsert_full_entities"]
                 _data = {
                     "workspace": self.workspace,
                     "id": k,
@@ -2055,12 +2199,12 @@ class PGKVStorage(BaseKVStorage):
                     "create_time": current_time,
                     "update_time": current_time,
                 }
-                await self.db.execute(upsert_sql, _data)
+                rows.append(_data)
         elif is_namespace(self.namespace, NameSpace.KV_STORE_FULL_RELATIONS):
             # Get current UTC time and convert to naive datetime for database storage
             current_time = datetime.datetime.now(timezone.utc).replace(tzinfo=None)
+            upsert_sql = SQL_TEMPLATES["upsert_full_relations"]
             for k, v in data.items():
-                upsert_sql = SQL_TEMPLATES["upsert_full_relations"]
                 _data = {
                     "workspace": self.workspace,
                     "id": k,
@@ -2069,12 +2213,12 @@ class PGKVStorage(BaseKVStorage):
                     "create_time": current_time,
                     "update_time": current_time,
                 }
-                await self.db.execute(upsert_sql, _data)
+                rows.append(_data)
         elif is_namespace(self.namespace, NameSpace.KV_STORE_ENTITY_CHUNKS):
             # Get current UTC time and convert to naive datetime for database storage
             current_time = datetime.datetime.now(timezone.utc).replace(tzinfo=None)
+            upsert_sql = SQL_TEMPLATES["upsert_entity_chunks"]
             for k, v in data.items():
-                upsert_sql = SQL_TEMPLATES["upsert_entity_chunks"]
                 _data = {
                     "workspace": self.workspace,
                     "id": k,
@@ -2083,12 +2227,12 @@ class PGKVStorage(BaseKVStorage):
                     "create_time": current_time,
                     "update_time": current_time,
                 }
-                await self.db.execute(upsert_sql, _data)
+                rows.append(_data)
         elif is_namespace(self.namespace, NameSpace.KV_STORE_RELATION_CHUNKS):
             # Get current UTC time and convert to naive datetime for database storage
             current_time = datetime.datetime.now(timezone.utc).replace(tzinfo=None)
+            upsert_sql = SQL_TEMPLATES["upsert_relation_chunks"]
             for k, v in data.items():
-                upsert_sql = SQL_TEMPLATES["upsert_relation_chunks"]
                 _data = {
                     "workspace": self.workspace,
                     "id": k,
@@ -2097,7 +2241,11 @@ class PGKVStorage(BaseKVStorage):
                     "create_time": current_time,
                     "update_time": current_time,
                 }
-                await self.db.execute(upsert_sql, _data)
+                rows.append(_data)
+
+        if rows:
+            # One round trip per batch instead of one per record
+            await self.db.executemany(upsert_sql, rows)
 
     async def index_done_callback(self) -> None:
         # PG handles persistence automatically
@@ -2223,7 +2371,7 @@ class PGVectorStorage(BaseVectorStorage):
                 "chunk_order_index": item["chunk_order_index"],
                 "full_doc_id": item["full_doc_id"],
                 "content": item["content"],
-                "content_vector": json.dumps(item["__vector__"].tolist()),
+                "content_vector": item["__vector__"],
                 "file_path": item["file_path"],
                 "create_time": current_time,
                 "update_time": current_time,
@@ -2251,7 +2399,7 @@ class PGVectorStorage(BaseVectorStorage):
             "id": item["__id__"],
             "entity_name": item["entity_name"],
             "content": item["content"],
-            "content_vector": json.dumps(item["__vector__"].tolist()),
+            "content_vector": item["__vector__"],
             "chunk_ids": chunk_ids,
             "file_path": item.get("file_path", None),
             "create_time": current_time,
@@ -2275,7 +2423,7 @@ class PGVectorStorage(BaseVectorStorage):
             "source_id": item["src_id"],
             "target_id": item["tgt_id"],
             "content": item["content"],
-            "content_vector": json.dumps(item["__vector__"].tolist()),
+            "content_vector": item["__vector__"],
             "chunk_ids": chunk_ids,
             "file_path": item.get("file_path", None),
             "create_time": current_time,
@@ -2309,6 +2457,7 @@ class PGVectorStorage(BaseVectorStorage):
         embeddings = np.concatenate(embeddings_list)
         for i, d in enumerate(list_data):
             d["__vector__"] = embeddings[i]
+        rows: list[dict[str, Any]] = []
         for item in list_data:
             if is_namespace(self.namespace, NameSpace.VECTOR_STORE_CHUNKS):
                 upsert_sql, data = self._upsert_chunks(item, current_time)
@@ -2318,8 +2467,10 @@ class PGVectorStorage(BaseVectorStorage):
                 upsert_sql, data = self._upsert_relationships(item, current_time)
             else:
                 raise ValueError(f"{self.namespace} is not supported")
+            rows.append(data)
 
-            await self.db.execute(upsert_sql, data)
+        # One round trip per batch instead of one per record
+        await self.db.executemany(upsert_sql, rows)
 
     #################### query method ###############
     async def query(
@@ -2333,13 +2484,14 @@ class PGVectorStorage(BaseVectorStorage):
             )  # higher priority for query
             embedding = embeddings[0]
 
-        embedding_string = ",".join(map(str, embedding))
-
-        sql = SQL_TEMPLATES[self.namespace].format(embedding_string=embedding_string)
+        # The embedding is bound as a binary vector parameter, so the SQL text is
+        # constant per namespace and its prepared statement is reused
+        sql = SQL_TEMPLATES[self.namespace]
         params = {
             "workspace": self.workspace,
             "closer_than_threshold": 1 - self.cosine_better_than_threshold,
             "top_k": top_k,
+            "embedding": np.asarray(embedding, dtype=np.float32),
         }
         results = await self.db.query(sql, params=list(params.values()), multirows=True)
         return results
@@ -2440,7 +2592,7 @@ class PGVectorStorage(BaseVectorStorage):
         try:
             result = await self.db.query(query, list(params.values()))
             if result:
-                return dict(result)
+                return _vector_to_list(dict(result))
             return None
         except Exception as e:
             logger.error(
@@ -2481,7 +2633,7 @@ class PGVectorStorage(BaseVectorStorage):
             for record in results:
                 if record is None:
                     continue
-                record_dict = dict(record)
+                record_dict = _vector_to_list(dict(record))
                 row_id = record_dict.get("id")
                 if row_id is not None:
                     id_map[str(row_id)] = record_dict
@@ -2496,7 +2648,7 @@ class PGVectorStorage(BaseVectorStorage):
             )
             return []
 
-    async def get_vectors_by_ids(self, ids: list[str]) -> dict[str, list[float]]:
+    async def get_vectors_by_ids(self, ids: list[str]) -> dict[str, np.ndarray]:
         """Get vectors by their IDs, returning only ID and vector data for efficiency
 
         Args:
@@ -2504,7 +2656,7 @@ class PGVectorStorage(BaseVectorStorage):
 
         Returns:
             Dictionary mapping IDs to their vector embeddings
-            Format: {id: [vector_values], ...}
+            Format: {id: np.ndarray(float32), ...}
         """
         if not ids:
             return {}
@@ -2516,25 +2668,17 @@ class PGVectorStorage(BaseVectorStorage):
             )
             return {}
 
-        ids_str = ",".join([f"'{id}'" for id in ids])
-        query = f"SELECT id, content_vector FROM {table_name} WHERE workspace=$1 AND id IN ({ids_str})"
-        params = {"workspace": self.workspace}
+        query = f"SELECT id, content_vector FROM {table_name} WHERE workspace=$1 AND id = ANY($2)"
+        params = {"workspace": self.workspace, "ids": list(ids)}
 
         try:
             results = await self.db.query(query, list(params.values()), multirows=True)
             vectors_dict = {}
 
             for result in results:
-                if result and "content_vector" in result and "id" in result:
-                    try:
-                        # Parse JSON string to get vector as list of floats
-                        vector_data = json.loads(result["content_vector"])
-                        if isinstance(vector_data, list):
-                            vectors_dict[result["id"]] = vector_data
-                    except (json.JSONDecodeError, TypeError) as e:
-                        logger.warning(
-                            f"[{self.workspace}] Failed to parse vector data for ID {result['id']}: {e}"
-                        )
+                if result and result.get("content_vector") is not None:
+                    # Decoded by the binary vector codec registered on the pool
+                    vectors_dict[result["id"]] = result["content_vector"]
 
             return vectors_dict
         except Exception as e:
@@ -3142,14 +3286,14 @@ class PGDocStatusStorage(DocStatusStorage):
                   error_msg = EXCLUDED.error_msg,
                   created_at = EXCLUDED.created_at,
                   updated_at = EXCLUDED.updated_at"""
+        rows = []
         for k, v in data.items():
             # Remove timezone information, store utc time in db
             created_at = parse_datetime(v.get("created_at"))
             updated_at = parse_datetime(v.get("updated_at"))
 
             # chunks_count, chunks_list, track_id, metadata, and error_msg are optional
-            await self.db.execute(
-                sql,
+            rows.append(
                 {
                     "workspace": self.workspace,
                     "id": k,
@@ -3166,9 +3310,41 @@ class PGDocStatusStorage(DocStatusStorage):
                     "error_msg": v.get("error_msg"),  # Add error_msg support
                     "created_at": created_at,  # Use the converted datetime object
                     "updated_at": updated_at,  # Use the converted datetime object
-                },
+                }
             )
 
+        # One round trip per batch, so bulk enqueues do not pay per-document latency
+        await self.db.executemany(sql, rows)
+
+    async def update_status_batch(
+        self,
+        doc_ids: list[str],
+        status: DocStatus,
+        error_msg: str | None = None,
+        metadata: dict[str, Any] | None = None,
+    ) -> None:
+        """Move many documents to a new status with a single UPDATE statement"""
+        if not doc_ids:
+            return
+        # Metadata is only replaced when given, other columns are kept
+        sql = """UPDATE LIGHTRAG_DOC_STATUS
+                 SET status = $3,
+                     error_msg = $4,
+                     metadata = COALESCE($5::jsonb, metadata),
+                     updated_at = $6
+                 WHERE workspace = $1 AND id = ANY($2)"""
+        await self.db.execute(
+            sql,
+            {
+                "workspace": self.workspace,
+                "ids": list(doc_ids),
+                "status": status,
+                "error_msg": error_msg,
+                "metadata": json.dumps(metadata) if metadata is not None else None,
+                "updated_at": datetime.datetime.now(timezone.utc).replace(tzinfo=None),
+            },
+        )
+
     async def drop(self) -> dict[str, str]:
         """Drop the storage"""
         try:
@@ -4735,6 +4911,420 @@ class PGGraphStorage(BaseGraphStorage):
             return {"status": "error", "message": str(e)}
 
 
+@final
+@dataclass
+class PGRelationalGraphStorage(BaseGraphStorage):
+    """Knowledge graph on plain PostgreSQL tables, without the AGE extension.
+
+    Nodes live in LIGHTRAG_GRAPH_NODES keyed by entity name, edges in
+    LIGHTRAG_GRAPH_EDGES. The graph is undirected: every edge is stored once with
+    its endpoints in sorted order, under an ID derived from that pair, and
+    neighborhood queries look at both endpoint columns. Node and edge properties
+    are JSONB and merged on upsert, matching NetworkXStorage. All API workers
+    read the same tables, so nothing has to be reloaded when another process
+    writes to the graph.
+    """
+
+    db: PostgreSQLDB = field(default=None)
+
+    @staticmethod
+    def _edge_key(source_node_id: str, target_node_id: str) -> tuple[str, str, str]:
+        """(edge id, source, target) of the undirected edge between two nodes"""
+        source, target = sorted((source_node_id, target_node_id))
+        return (
+            compute_mdhash_id(f"{source}{GRAPH_FIELD_SEP}{target}", prefix="edge-"),
+            source,
+            target,
+        )
+
+    @staticmethod
+    def _load_properties(properties: Any) -> dict[str, Any]:
+        if isinstance(properties, str):
+            return json.loads(properties)
+        return dict(properties or {})
+
+    async def initialize(self):
+        async with get_data_init_lock():
+            if self.db is None:
+                self.db = await ClientManager.get_client()
+
+            # Implement workspace priority: PostgreSQLDB.workspace > self.workspace > "default"
+            if self.db.workspace:
+                # Use PostgreSQLDB's workspace (highest priority)
+                self.workspace = self.db.workspace
+            elif hasattr(self, "workspace") and self.workspace:
+                # Use storage class's workspace (medium priority)
+                pass
+            else:
+                # Use "default" for compatibility (lowest priority)
+                self.workspace = "default"
+
+            # Neighborhood lookups go through either endpoint column
+            for column in ("source_id", "target_id"):
+                await self.db.execute(
+                    f"CREATE INDEX IF NOT EXISTS idx_lightrag_graph_edges_workspace_{column} "
+                    f"ON LIGHTRAG_GRAPH_EDGES (workspace, {column})"
+                )
+
+    async def finalize(self):
+        if self.db is not None:
+            await ClientManager.release_client(self.db)
+            self.db = None
+
+    async def index_done_callback(self) -> None:
+        # PG handles persistence automatically
+        pass
+
+    async def has_node(self, node_id: str) -> bool:
+        sql = SQL_TEMPLATES["graph_has_node"]
+        result = await self.db.query(sql, [self.workspace, node_id])
+        return result is not None
+
+    async def has_edge(self, source_node_id: str, target_node_id: str) -> bool:
+        edge_id, _, _ = self._edge_key(source_node_id, target_node_id)
+        sql = SQL_TEMPLATES["graph_has_edge"]
+        result = await self.db.query(sql, [self.workspace, edge_id])
+        return result is not None
+
+    async def node_degree(self, node_id: str) -> int:
+        return (await self.node_degrees_batch([node_id]))[node_id]
+
+    async def edge_degree(self, src_id: str, tgt_id: str) -> int:
+        return (await self.edge_degrees_batch([(src_id, tgt_id)]))[(src_id, tgt_id)]
+
+    async def get_node(self, node_id: str) -> dict[str, str] | None:
+        return (await self.get_nodes_batch([node_id])).get(node_id)
+
+    async def get_edge(
+        self, source_node_id: str, target_node_id: str
+    ) -> dict[str, str] | None:
+        edges = await self.get_edges_batch(
+            [{"src": source_node_id, "tgt": target_node_id}]
+        )
+        return edges.get((source_node_id, target_node_id))
+
+    async def get_node_edges(self, source_node_id: str) -> list[tuple[str, str]] | None:
+        edges = (await self.get_nodes_edges_batch([source_node_id]))[source_node_id]
+        if not edges and not await self.has_node(source_node_id):
+            return None
+        return edges
+
+    # Batch reads are one set-based statement each, whatever the batch size
+
+    async def get_nodes_batch(self, node_ids: list[str]) -> dict[str, dict]:
+        if not node_ids:
+            return {}
+        sql = SQL_TEMPLATES["graph_get_nodes"]
+        rows = await self.db.query(
+            sql, [self.workspace, list(node_ids)], multirows=True
+        )
+        return {row["id"]: self._load_properties(row["properties"]) for row in rows}
+
+    async def node_degrees_batch(self, node_ids: list[str]) -> dict[str, int]:
+        if not node_ids:
+            return {}
+        sql = SQL_TEMPLATES["graph_node_degrees"]
+        rows = await self.db.query(
+            sql, [self.workspace, list(set(node_ids))], multirows=True
+        )
+        degrees = {row["node_id"]: row["degree"] for row in rows}
+        return {node_id: degrees.get(node_id, 0) for node_id in node_ids}
+
+    async def edge_degrees_batch(
+        self, edge_pairs: list[tuple[str, str]]
+    ) -> dict[tuple[str, str], int]:
+        degrees = await self.node_degrees_batch(
+            list({node_id for pair in edge_pairs for node_id in pair})
+        )
+        return {
+            (src_id, tgt_id): degrees[src_id] + degrees[tgt_id]
+            for src_id, tgt_id in edge_pairs
+        }
+
+    async def get_edges_batch(
+        self, pairs: list[dict[str, str]]
+    ) -> dict[tuple[str, str], dict]:
+        if not pairs:
+            return {}
+        edge_ids = {
+            (pair["src"], pair["tgt"]): self._edge_key(pair["src"], pair["tgt"])[0]
+            for pair in pairs
+        }
+        sql = SQL_TEMPLATES["graph_get_edges"]
+        rows = await self.db.query(
+            sql, [self.workspace, list(set(edge_ids.values()))], multirows=True
+        )
+        properties = {
+            row["id"]: self._load_properties(row["properties"]) for row in rows
+        }
+        # Both orientations of a requested pair resolve to the same stored edge
+        return {
+            pair: dict(properties[edge_id])
+            for pair, edge_id in edge_ids.items()
+            if edge_id in properties
+        }
+
+    async def get_nodes_edges_batch(
+        self, node_ids: list[str]
+    ) -> dict[str, list[tuple[str, str]]]:
+        result: dict[str, list[tuple[str, str]]] = {node_id: [] for node_id in node_ids}
+        if not node_ids:
+            return result
+        sql = SQL_TEMPLATES["graph_get_nodes_edges"]
+        rows = await self.db.query(sql, [self.workspace, list(result)], multirows=True)
+        for row in rows:
+            result[row["node_id"]].append((row["node_id"], row["neighbor_id"]))
+        return result
+
+    async def get_nodes_top_edges_batch(
+        self, node_ids: list[str], max_edges: int
+    ) -> dict[str, list[tuple[str, str]]]:
+        """Get the highest ranked edges of each node, at most max_edges per node
+
+        Ranking happens in the database with a window function, so hub nodes
+        send back only their top max_edges edges instead of their whole
+        neighborhood.
+        """
+        if max_edges <= 0:
+            return await self.get_nodes_edges_batch(node_ids)
+        result: dict[str, list[tuple[str, str]]] = {node_id: [] for node_id in node_ids}
+        if not node_ids:
+            return result
+        sql = SQL_TEMPLATES["graph_get_nodes_top_edges"]
+        rows = await self.db.query(
+            sql, [self.workspace, list(result), max_edges], multirows=True
+        )
+        for row in rows:
+            result[row["node_id"]].append((row["node_id"], row["neighbor_id"]))
+        return result
+
+    async def upsert_node(self, node_id: str, node_data: dict[str, str]) -> None:
+        """Insert a node or merge node_data into the properties of an existing one"""
+        sql = SQL_TEMPLATES["graph_upsert_node"]
+        await self.db.execute(
+            sql,
+            {
+                "workspace": self.workspace,
+                "id": node_id,
+                "properties": json.dumps(node_data),
+                "update_time": datetime.datetime.now(timezone.utc).replace(tzinfo=None),
+            },
+        )
+
+    async def upsert_edge(
+        self, source_node_id: str, target_node_id: str, edge_data: dict[str, str]
+    ) -> None:
+        """Insert an edge or merge edge_data into the properties of an existing one"""
+        edge_id, source, target = self._edge_key(source_node_id, target_node_id)
+        sql = SQL_TEMPLATES["graph_upsert_edge"]
+        await self.db.execute(
+            sql,
+            {
+                "workspace": self.workspace,
+                "id": edge_id,
+                "source_id": source,
+                "target_id": target,
+                "properties": json.dumps(edge_data),
+                "update_time": datetime.datetime.now(timezone.utc).replace(tzinfo=None),
+            },
+        )
+
+    async def delete_node(self, node_id: str) -> None:
+        """Delete a node and all its edges"""
+        await self.remove_nodes([node_id])
+        logger.debug(f"[{self.workspace}] Node {node_id} deleted from the graph")
+
+    async def remove_nodes(self, nodes: list[str]):
+        """Delete multiple nodes and all their edges in one statement
+
+        Args:
+            nodes: List of node IDs to be deleted
+        """
+        if not nodes:
+            return
+        sql = SQL_TEMPLATES["graph_remove_nodes"]
+        await self.db.execute(sql, {"workspace": self.workspace, "ids": list(nodes)})
+
+    async def remove_edges(self, edges: list[tuple[str, str]]):
+        """Delete multiple edges in one statement
+
+        Args:
+            edges: List of edges to be deleted, each edge is a (source, target) tuple
+        """
+        if not edges:
+            return
+        edge_ids = list({self._edge_key(source, target)[0] for source, target in edges})
+        sql = SQL_TEMPLATES["graph_remove_edges"]
+        await self.db.execute(sql, {"workspace": self.workspace, "ids": edge_ids})
+
+    async def get_all_labels(self) -> list[str]:
+        """
+        Get all node labels in the graph
+        Returns:
+            [label1, label2, ...]  # Alphabetically sorted label list
+        """
+        sql = SQL_TEMPLATES["graph_get_all_labels"]
+        rows = await self.db.query(sql, [self.workspace], multirows=True)
+        return [row["id"] for row in rows]
+
+    async def get_popular_labels(self, limit: int = 300) -> list[str]:
+        """Get popular labels by node degree (most connected entities)"""
+        sql = SQL_TEMPLATES["graph_get_popular_labels"]
+        rows = await self.db.query(sql, [self.workspace, limit], multirows=True)
+        labels = [row["id"] for row in rows]
+        logger.debug(
+            f"[{self.workspace}] Retrieved {len(labels)} popular labels (limit: {limit})"
+        )
+        return labels
+
+    async def search_labels(self, query: str, limit: int = 50) -> list[str]:
+        """Search labels with fuzzy matching, scored as NetworkXStorage scores them"""
+        query_lower = query.lower().strip()
+        if not query_lower:
+            return []
+        # Match the query literally, LIKE wildcards in it are escaped
+        pattern = re.sub(r"([\\%_])", r"\\\1", query_lower)
+        sql = SQL_TEMPLATES["graph_search_labels"]
+        params = [
+            self.workspace,
+            f"%{pattern}%",  # Contains match
+            query_lower,  # Exact match
+            f"{pattern}%",  # Prefix match
+            f"% {pattern}%",  # Word boundary (space)
+            f"%\\_{pattern}%",  # Word boundary (underscore)
+            limit,
+        ]
+        rows = await self.db.query(sql, params, multirows=True)
+        labels = [row["id"] for row in rows]
+        logger.debug(
+            f"[{self.workspace}] Search query '{query}' returned {len(labels)} results (limit: {limit})"
+        )
+        return labels
+
+    async def get_knowledge_graph(
+        self,
+        node_label: str,
+        max_depth: int = 3,
+        max_nodes: int = None,
+    ) -> KnowledgeGraph:
+        """
+        Retrieve a connected subgraph of nodes where the label includes the specified `node_label`.
+
+        The neighborhood is expanded breadth first by a recursive CTE. When more
+        than max_nodes nodes are reachable within max_depth, the closest ones are
+        kept, preferring high-degree nodes at the same depth.
+
+        Args:
+            node_label: Label of the starting node, * means all nodes
+            max_depth: Maximum depth of the subgraph, Defaults to 3
+            max_nodes: Maximum nodes to return, Defaults to global_config max_graph_nodes
+
+        Returns:
+            KnowledgeGraph object containing nodes and edges, with an is_truncated flag
+            indicating whether the graph was truncated due to max_nodes limit
+        """
+        if max_nodes is None:
+            max_nodes = self.global_config.get("max_graph_nodes", 1000)
+        else:
+            # Limit max_nodes to not exceed global_config max_graph_nodes
+            max_nodes = min(max_nodes, self.global_config.get("max_graph_nodes", 1000))
+
+        # One extra row tells whether the subgraph was truncated
+        if node_label == "*":
+            sql = SQL_TEMPLATES["graph_get_top_degree_nodes"]
+            rows = await self.db.query(
+                sql, [self.workspace, max_nodes + 1], multirows=True
+            )
+        else:
+            sql = SQL_TEMPLATES["graph_bfs_nodes"]
+            rows = await self.db.query(
+                sql,
+                [self.workspace, node_label, max_depth, max_nodes + 1],
+                multirows=True,
+            )
+            if not rows:
+                logger.warning(
+                    f"[{self.workspace}] Node {node_label} not found in the graph"
+                )
+                return KnowledgeGraph()
+
+        result = KnowledgeGraph()
+        if len(rows) > max_nodes:
+            result.is_truncated = True
+            rows = rows[:max_nodes]
+            logger.info(
+                f"[{self.workspace}] Graph truncated: max_nodes limit {max_nodes} reached"
+            )
+
+        node_ids = [row["id"] for row in rows]
+        for row in rows:
+            result.nodes.append(
+                KnowledgeGraphNode(
+                    id=row["id"],
+                    labels=[row["id"]],
+                    properties=self._load_properties(row["properties"]),
+                )
+            )
+
+        sql = SQL_TEMPLATES["graph_get_subgraph_edges"]
+        for row in await self.db.query(sql, [self.workspace, node_ids], multirows=True):
+            result.edges.append(
+                KnowledgeGraphEdge(
+                    id=f"{row['source_id']}-{row['target_id']}",
+                    type="DIRECTED",
+                    source=row["source_id"],
+                    target=row["target_id"],
+                    properties=self._load_properties(row["properties"]),
+                )
+            )
+
+        logger.info(
+            f"[{self.workspace}] Subgraph query successful | Node count: {len(result.nodes)} | Edge count: {len(result.edges)}"
+        )
+        return result
+
+    async def get_all_nodes(self) -> list[dict]:
+        """Get all nodes in the graph.
+
+        Returns:
+            A list of all nodes, where each node is a dictionary of its properties
+        """
+        sql = SQL_TEMPLATES["graph_get_all_nodes"]
+        rows = await self.db.query(sql, [self.workspace], multirows=True)
+        nodes = []
+        for row in rows:
+            node = self._load_properties(row["properties"])
+            node["id"] = row["id"]
+            nodes.append(node)
+        return nodes
+
+    async def get_all_edges(self) -> list[dict]:
+        """Get all edges in the graph.
+
+        Returns:
+            A list of all edges, where each edge is a dictionary of its properties
+        """
+        sql = SQL_TEMPLATES["graph_get_all_edges"]
+        rows = await self.db.query(sql, [self.workspace], multirows=True)
+        edges = []
+        for row in rows:
+            edge = self._load_properties(row["properties"])
+            edge["source"] = row["source_id"]
+            edge["target"] = row["target_id"]
+            edges.append(edge)
+        return edges
+
+    async def drop(self) -> dict[str, str]:
+        """Drop the storage"""
+        try:
+            sql = SQL_TEMPLATES["graph_drop_workspace"]
+            await self.db.execute(sql, {"workspace": self.workspace})
+            return {"status": "success", "message": "data dropped"}
+        except Exception as e:
+            logger.error(f"[{self.workspace}] Error dropping graph: {e}")
+            return {"status": "error", "message": str(e)}
+
+
 # Note: Order matters! More specific namespaces (e.g., "full_entities") must come before
 # more general ones (e.g., "entities") because is_namespace() uses endswith() matching
 NAMESPACE_TABLE_MAP = {
@@ -4906,6 +5496,28 @@ TABLES = {
                     CONSTRAINT LIGHTRAG_RELATION_CHUNKS_PK PRIMARY KEY (workspace, id)
                     )"""
     },
+    "LIGHTRAG_GRAPH_NODES": {
+        "ddl": """CREATE TABLE LIGHTRAG_GRAPH_NODES (
+                    workspace VARCHAR(255) NOT NULL,
+                    id VARCHAR(512) NOT NULL,
+                    properties JSONB NOT NULL DEFAULT '{}'::jsonb,
+                    create_time TIMESTAMP(0) DEFAULT CURRENT_TIMESTAMP,
+                    update_time TIMESTAMP(0) DEFAULT CURRENT_TIMESTAMP,
+                    CONSTRAINT LIGHTRAG_GRAPH_NODES_PK PRIMARY KEY (workspace, id)
+                    )"""
+    },
+    "LIGHTRAG_GRAPH_EDGES": {
+        "ddl": """CREATE TABLE LIGHTRAG_GRAPH_EDGES (
+                    workspace VARCHAR(255) NOT NULL,
+                    id VARCHAR(255) NOT NULL,
+                    source_id VARCHAR(512) NOT NULL,
+                    target_id VARCHAR(512) NOT NULL,
+                    properties JSONB NOT NULL DEFAULT '{}'::jsonb,
+                    create_time TIMESTAMP(0) DEFAULT CURRENT_TIMESTAMP,
+                    update_time TIMESTAMP(0) DEFAULT CURRENT_TIMESTAMP,
+                    CONSTRAINT LIGHTRAG_GRAPH_EDGES_PK PRIMARY KEY (workspace, id)
+                    )"""
+    },
 }
 
 
@@ -5089,8 +5701,8 @@ SQL_TEMPLATES = {
                             EXTRACT(EPOCH FROM r.create_time)::BIGINT AS created_at
                      FROM LIGHTRAG_VDB_RELATION r
                      WHERE r.workspace = $1
-                       AND r.content_vector <=> '[{embedding_string}]'::vector < $2
-                     ORDER BY r.content_vector <=> '[{embedding_string}]'::vector
+                       AND r.content_vector <=> $4::vector < $2
+                     ORDER BY r.content_vector <=> $4::vector
                      LIMIT $3;
                      """,
     "entities": """
@@ -5098,8 +5710,8 @@ SQL_TEMPLATES = {
                        EXTRACT(EPOCH FROM e.create_time)::BIGINT AS created_at
                 FROM LIGHTRAG_VDB_ENTITY e
                 WHERE e.workspace = $1
-                  AND e.content_vector <=> '[{embedding_string}]'::vector < $2
-                ORDER BY e.content_vector <=> '[{embedding_string}]'::vector
+                  AND e.content_vector <=> $4::vector < $2
+                ORDER BY e.content_vector <=> $4::vector
                 LIMIT $3;
                 """,
     "chunks": """
@@ -5109,10 +5721,185 @@ SQL_TEMPLATES = {
                      EXTRACT(EPOCH FROM c.create_time)::BIGINT AS created_at
               FROM LIGHTRAG_VDB_CHUNKS c
               WHERE c.workspace = $1
-                AND c.content_vector <=> '[{embedding_string}]'::vector < $2
-              ORDER BY c.content_vector <=> '[{embedding_string}]'::vector
+                AND c.content_vector <=> $4::vector < $2
+              ORDER BY c.content_vector <=> $4::vector
               LIMIT $3;
               """,
+    # Relational graph storage (PGRelationalGraphStorage)
+    "graph_has_node": """SELECT 1 AS found FROM LIGHTRAG_GRAPH_NODES
+        WHERE workspace = $1 AND id = $2
+       """,
+    "graph_has_edge": """SELECT 1 AS found FROM LIGHTRAG_GRAPH_EDGES
+        WHERE workspace = $1 AND id = $2
+       """,
+    "graph_get_nodes": """SELECT id, properties FROM LIGHTRAG_GRAPH_NODES
+        WHERE workspace = $1 AND id = ANY($2)
+       """,
+    "graph_get_edges": """SELECT id, properties FROM LIGHTRAG_GRAPH_EDGES
+        WHERE workspace = $1 AND id = ANY($2)
+       """,
+    "graph_node_degrees": """SELECT node_id, count(*) AS degree
+        FROM (
+            SELECT source_id AS node_id FROM LIGHTRAG_GRAPH_EDGES
+            WHERE workspace = $1 AND source_id = ANY($2)
+            UNION ALL
+            SELECT target_id FROM LIGHTRAG_GRAPH_EDGES
+            WHERE workspace = $1 AND target_id = ANY($2)
+        ) incident
+        GROUP BY node_id
+       """,
+    "graph_get_nodes_edges": """SELECT source_id AS node_id, target_id AS neighbor_id
+        FROM LIGHTRAG_GRAPH_EDGES WHERE workspace = $1 AND source_id = ANY($2)
+        UNION ALL
+        SELECT target_id, source_id
+        FROM LIGHTRAG_GRAPH_EDGES WHERE workspace = $1 AND target_id = ANY($2)
+       """,
+    # Edges of nodes with more than $3 edges are ranked by edge degree, then weight
+    "graph_get_nodes_top_edges": """WITH incident AS (
+            SELECT source_id AS node_id, target_id AS neighbor_id, properties
+            FROM LIGHTRAG_GRAPH_EDGES WHERE workspace = $1 AND source_id = ANY($2)
+            UNION ALL
+            SELECT target_id, source_id, properties
+            FROM LIGHTRAG_GRAPH_EDGES WHERE workspace = $1 AND target_id = ANY($2)
+        ),
+        node_degrees AS (
+            SELECT node_id, count(*) AS degree FROM incident GROUP BY node_id
+        ),
+        ranked AS (
+            SELECT i.node_id, i.neighbor_id,
+                   row_number() OVER (
+                       PARTITION BY i.node_id
+                       ORDER BY s.edge_degree DESC, s.weight DESC
+                   ) AS edge_rank
+            FROM incident i
+            JOIN node_degrees d ON d.node_id = i.node_id
+            CROSS JOIN LATERAL (
+                SELECT CASE WHEN d.degree > $3 THEN d.degree
+                           + (SELECT count(*) FROM LIGHTRAG_GRAPH_EDGES e
+                              WHERE e.workspace = $1 AND e.source_id = i.neighbor_id)
+                           + (SELECT count(*) FROM LIGHTRAG_GRAPH_EDGES e
+                              WHERE e.workspace = $1 AND e.target_id = i.neighbor_id)
+                       ELSE 0 END AS edge_degree,
+                       COALESCE((i.properties->>'weight')::float8, 1.0) AS weight
+            ) s
+        )
+        SELECT node_id, neighbor_id FROM ranked
+        WHERE edge_rank <= $3
+        ORDER BY node_id, edge_rank
+       """,
+    "graph_upsert_node": """INSERT INTO LIGHTRAG_GRAPH_NODES
+        (workspace, id, properties, create_time, update_time)
+        VALUES ($1, $2, $3::jsonb, $4, $4)
+        ON CONFLICT (workspace, id) DO UPDATE SET
+            properties = LIGHTRAG_GRAPH_NODES.properties || EXCLUDED.properties,
+            update_time = EXCLUDED.update_time
+       """,
+    "graph_upsert_edge": """INSERT INTO LIGHTRAG_GRAPH_EDGES
+        (workspace, id, source_id, target_id, properties, create_time, update_time)
+        VALUES ($1, $2, $3, $4, $5::jsonb, $6, $6)
+        ON CONFLICT (workspace, id) DO UPDATE SET
+            properties = LIGHTRAG_GRAPH_EDGES.properties || EXCLUDED.properties,
+            update_time = EXCLUDED.update_time
+       """,
+    "graph_remove_nodes": """WITH removed_edges AS (
+            DELETE FROM LIGHTRAG_GRAPH_EDGES
+            WHERE workspace = $1 AND (source_id = ANY($2) OR target_id = ANY($2))
+        )
+        DELETE FROM LIGHTRAG_GRAPH_NODES WHERE workspace = $1 AND id = ANY($2)
+       """,
+    "graph_remove_edges": """DELETE FROM LIGHTRAG_GRAPH_EDGES
+        WHERE workspace = $1 AND id = ANY($2)
+       """,
+    "graph_get_all_labels": """SELECT id FROM LIGHTRAG_GRAPH_NODES
+        WHERE workspace = $1 ORDER BY id
+       """,
+    "graph_get_popular_labels": """SELECT n.id
+        FROM LIGHTRAG_GRAPH_NODES n
+        LEFT JOIN (
+            SELECT node_id, count(*) AS degree
+            FROM (
+                SELECT source_id AS node_id FROM LIGHTRAG_GRAPH_EDGES WHERE workspace = $1
+                UNION ALL
+                SELECT target_id FROM LIGHTRAG_GRAPH_EDGES WHERE workspace = $1
+            ) incident
+            GROUP BY node_id
+        ) d ON d.node_id = n.id
+        WHERE n.workspace = $1
+        ORDER BY COALESCE(d.degree, 0) DESC, n.id ASC
+        LIMIT $2
+       """,
+    "graph_search_labels": """SELECT id FROM (
+            SELECT id,
+                   CASE WHEN lower(id) = $3 THEN 1000
+                        WHEN lower(id) LIKE $4 THEN 500
+                        ELSE 100 - length(id)
+                             + CASE WHEN lower(id) LIKE $5 OR lower(id) LIKE $6
+                                    THEN 50 ELSE 0 END
+                   END AS score
+            FROM LIGHTRAG_GRAPH_NODES
+            WHERE workspace = $1 AND lower(id) LIKE $2
+        ) scored
+        ORDER BY score DESC, id ASC
+        LIMIT $7
+       """,
+    "graph_get_top_degree_nodes": """SELECT n.id, n.properties
+        FROM LIGHTRAG_GRAPH_NODES n
+        LEFT JOIN (
+            SELECT node_id, count(*) AS degree
+            FROM (
+                SELECT source_id AS node_id FROM LIGHTRAG_GRAPH_EDGES WHERE workspace = $1
+                UNION ALL
+                SELECT target_id FROM LIGHTRAG_GRAPH_EDGES WHERE workspace = $1
+            ) incident
+            GROUP BY node_id
+        ) d ON d.node_id = n.id
+        WHERE n.workspace = $1
+        ORDER BY COALESCE(d.degree, 0) DESC, n.id ASC
+        LIMIT $2
+       """,
+    # Breadth-first expansion from $2 up to depth $3; nodes are ordered by depth,
+    # then degree, so LIMIT $4 keeps the closest and best connected ones
+    "graph_bfs_nodes": """WITH RECURSIVE adjacency AS NOT MATERIALIZED (
+            SELECT source_id AS node_id, target_id AS neighbor_id
+            FROM LIGHTRAG_GRAPH_EDGES WHERE workspace = $1
+            UNION ALL
+            SELECT target_id, source_id
+            FROM LIGHTRAG_GRAPH_EDGES WHERE workspace = $1
+        ),
+        bfs (node_id, depth) AS (
+            SELECT id::text, 0
+            FROM LIGHTRAG_GRAPH_NODES WHERE workspace = $1 AND id = $2
+            UNION
+            SELECT a.neighbor_id::text, b.depth + 1
+            FROM bfs b JOIN adjacency a ON a.node_id = b.node_id
+            WHERE b.depth < $3
+        ),
+        reached AS (
+            SELECT node_id, min(depth) AS depth FROM bfs GROUP BY node_id
+        )
+        SELECT n.id, n.properties
+        FROM reached r
+        JOIN LIGHTRAG_GRAPH_NODES n ON n.workspace = $1 AND n.id = r.node_id
+        ORDER BY r.depth,
+                 (SELECT count(*) FROM adjacency a WHERE a.node_id = r.node_id) DESC,
+                 n.id
+        LIMIT $4
+       """,
+    "graph_get_subgraph_edges": """SELECT source_id, target_id, properties
+        FROM LIGHTRAG_GRAPH_EDGES
+        WHERE workspace = $1 AND source_id = ANY($2) AND target_id = ANY($2)
+       """,
+    "graph_get_all_nodes": """SELECT id, properties FROM LIGHTRAG_GRAPH_NODES
+        WHERE workspace = $1
+       """,
+    "graph_get_all_edges": """SELECT source_id, target_id, properties
+        FROM LIGHTRAG_GRAPH_EDGES WHERE workspace = $1
+       """,
+    "graph_drop_workspace": """WITH removed_edges AS (
+            DELETE FROM LIGHTRAG_GRAPH_EDGES WHERE workspace = $1
+        )
+        DELETE FROM LIGHTRAG_GRAPH_NODES WHERE workspace = $1
+       """,
     # DROP tables
     "drop_specifiy_table_workspace": """
         DELETE FROM {table_name} WHERE workspace=$1
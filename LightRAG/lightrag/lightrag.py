@@ -29,6 +29,8 @@ from lightrag.exceptions import PipelineCancelledException
 from lightrag.constants import (
     DEFAULT_MAX_GLEANING,
     DEFAULT_FORCE_LLM_SUMMARY_ON_MERGE,
+    DEFAULT_DESCRIPTION_SUMMARY_DRIFT,
+    DEFAULT_DESCRIPTION_RESERVOIR_SIZE,
     DEFAULT_TOP_K,
     DEFAULT_CHUNK_TOP_K,
     DEFAULT_MAX_ENTITY_TOKENS,
@@ -53,6 +55,18 @@ from lightrag.constants import (
     DEFAULT_SOURCE_IDS_LIMIT_METHOD,
     DEFAULT_MAX_FILE_PATHS,
     DEFAULT_FILE_PATH_MORE_PLACEHOLDER,
+    DEFAULT_GEO_CELL_SIZE,
+    DEFAULT_GEO_MAX_CANDIDATES,
+    DEFAULT_SEMANTIC_CACHE_THRESHOLD,
+    DEFAULT_SEMANTIC_CACHE_TTL,
+    DEFAULT_SEMANTIC_CACHE_MAX_ENTRIES,
+    DEFAULT_LOCAL_KEYWORDS_MIN_COVERAGE,
+    DEFAULT_LOCAL_KEYWORDS_HL_TYPES,
+    DEFAULT_ENTITY_EXTRACT_BATCH_SIZE,
+    DEFAULT_ENTITY_EXTRACT_BATCH_MAX_TOKENS,
+    DEFAULT_ENTITY_EXTRACT_BATCH_WAIT,
+    DEFAULT_EMBEDDING_COALESCE_WAIT,
+    DEFAULT_EMBEDDING_COALESCE_MAX_TOKENS,
 )
 from lightrag.utils import get_env_value
 
@@ -68,6 +82,7 @@ from lightrag.kg.shared_storage import (
     get_default_workspace,
     set_default_workspace,
     get_namespace_lock,
+    get_update_flag,
 )
 
 from lightrag.base import (
@@ -85,6 +100,15 @@ from lightrag.base import (
     QueryResult,
 )
 from lightrag.namespace import NameSpace
+from lightrag.geo_index import GeoIndex
+from lightrag.extraction_batch import EntityExtractionBatcher
+from lightrag.embedding_coalescer import EmbeddingCoalescer
+from lightrag.semantic_cache import (
+    SemanticQueryCache,
+    bump_semantic_cache_generation,
+    get_semantic_cache_generation,
+)
+from lightrag.keyword_index import EntityKeywordIndex
 from lightrag.operate import (
     chunking_by_token_size,
     extract_entities,
@@ -203,6 +227,16 @@ class LightRAG:
     )
     """Method for selecting text chunks: 'WEIGHT' for weight-based selection, 'VECTOR' for embedding similarity-based selection."""
 
+    geo_cell_size: float = field(
+        default=get_env_value("GEO_CELL_SIZE", DEFAULT_GEO_CELL_SIZE, float)
+    )
+    """Grid cell size in degrees of the spatial index used by QueryParam geo filters."""
+
+    geo_max_candidates: int = field(
+        default=get_env_value("GEO_MAX_CANDIDATES", DEFAULT_GEO_MAX_CANDIDATES, int)
+    )
+    """Maximum number of in-region vectors scored directly; larger regions filter an index query instead."""
+
     # Entity extraction
     # ---
 
@@ -211,12 +245,49 @@ class LightRAG:
     )
     """Maximum number of entity extraction attempts for ambiguous content."""
 
+    entity_extract_batch_size: int = field(
+        default=get_env_value(
+            "ENTITY_EXTRACT_BATCH_SIZE", DEFAULT_ENTITY_EXTRACT_BATCH_SIZE, int
+        )
+    )
+    """Maximum number of short chunks packed into one entity extraction prompt (1 disables packing)."""
+
+    entity_extract_batch_max_tokens: int = field(
+        default=get_env_value(
+            "ENTITY_EXTRACT_BATCH_MAX_TOKENS",
+            DEFAULT_ENTITY_EXTRACT_BATCH_MAX_TOKENS,
+            int,
+        )
+    )
+    """Maximum total chunk tokens of one packed extraction prompt; larger chunks are extracted alone."""
+
+    entity_extract_batch_wait: float = field(
+        default=get_env_value(
+            "ENTITY_EXTRACT_BATCH_WAIT", DEFAULT_ENTITY_EXTRACT_BATCH_WAIT, float
+        )
+    )
+    """Seconds a chunk waits for other chunks to share its extraction prompt."""
+
     force_llm_summary_on_merge: int = field(
         default=get_env_value(
             "FORCE_LLM_SUMMARY_ON_MERGE", DEFAULT_FORCE_LLM_SUMMARY_ON_MERGE, int
         )
     )
 
+    description_summary_drift: float = field(
+        default=get_env_value(
+            "DESCRIPTION_SUMMARY_DRIFT", DEFAULT_DESCRIPTION_SUMMARY_DRIFT, float
+        )
+    )
+    """Share of new description fragments, relative to those covered by the rolling summary, that triggers a summary refresh (0 disables incremental aggregation)."""
+
+    description_reservoir_size: int = field(
+        default=get_env_value(
+            "DESCRIPTION_RESERVOIR_SIZE", DEFAULT_DESCRIPTION_RESERVOIR_SIZE, int
+        )
+    )
+    """Most recent description fragments kept next to the rolling summary."""
+
     # Text chunking
     # ---
 
@@ -290,6 +361,20 @@ class LightRAG:
     )
     """Maximum number of concurrent embedding function calls."""
 
+    embedding_coalesce_wait: float = field(
+        default=get_env_value(
+            "EMBEDDING_COALESCE_WAIT", DEFAULT_EMBEDDING_COALESCE_WAIT, float
+        )
+    )
+    """Seconds an embedding request waits for concurrent requests to share its batch (0 disables coalescing)."""
+
+    embedding_coalesce_max_tokens: int = field(
+        default=get_env_value(
+            "EMBEDDING_COALESCE_MAX_TOKENS", DEFAULT_EMBEDDING_COALESCE_MAX_TOKENS, int
+        )
+    )
+    """Maximum total tokens of one coalesced embedding batch (0 for no limit)."""
+
     embedding_cache_config: dict[str, Any] = field(
         default_factory=lambda: {
             "enabled": False,
@@ -368,6 +453,49 @@ class LightRAG:
     enable_llm_cache_for_entity_extract: bool = field(default=True)
     """If True, enables caching for entity extraction steps to reduce LLM costs."""
 
+    enable_semantic_cache: bool = field(
+        default=get_env_value("ENABLE_SEMANTIC_CACHE", False, bool)
+    )
+    """If True, queries reuse cached keywords and answers of similar earlier queries (requires enable_llm_cache)."""
+
+    semantic_cache_threshold: float = field(
+        default=get_env_value(
+            "SEMANTIC_CACHE_THRESHOLD", DEFAULT_SEMANTIC_CACHE_THRESHOLD, float
+        )
+    )
+    """Minimum cosine similarity between query embeddings for a semantic cache hit."""
+
+    semantic_cache_ttl: int = field(
+        default=get_env_value("SEMANTIC_CACHE_TTL", DEFAULT_SEMANTIC_CACHE_TTL, int)
+    )
+    """Seconds a semantic cache entry can be reused."""
+
+    semantic_cache_max_entries: int = field(
+        default=get_env_value(
+            "SEMANTIC_CACHE_MAX_ENTRIES", DEFAULT_SEMANTIC_CACHE_MAX_ENTRIES, int
+        )
+    )
+    """Maximum number of queries in the semantic cache; the oldest are replaced first."""
+
+    enable_local_keywords: bool = field(
+        default=get_env_value("ENABLE_LOCAL_KEYWORDS", False, bool)
+    )
+    """If True, query keywords are matched against graph entity names before asking the LLM."""
+
+    local_keywords_min_coverage: float = field(
+        default=get_env_value(
+            "LOCAL_KEYWORDS_MIN_COVERAGE", DEFAULT_LOCAL_KEYWORDS_MIN_COVERAGE, float
+        )
+    )
+    """Minimum share of meaningful query words matched by entity names; below it the LLM extracts keywords."""
+
+    local_keywords_hl_types: list[str] = field(
+        default_factory=lambda: get_env_value(
+            "LOCAL_KEYWORDS_HL_TYPES", DEFAULT_LOCAL_KEYWORDS_HL_TYPES, list
+        )
+    )
+    """Entity types whose matched names are also used as high-level keywords."""
+
     # Extensions
     # ---
 
@@ -472,6 +600,42 @@ class LightRAG:
             logger.info(f"Creating working directory {self.working_dir}")
             os.makedirs(self.working_dir)
 
+        # Spatial index for geo-filtered queries, built by abuild_geo_index()
+        self._geo_index_file = os.path.join(
+            self.working_dir, self.workspace or "", "geo_index.json"
+        )
+        self.geo_index = GeoIndex.load(
+            self._geo_index_file, cell_size=self.geo_cell_size
+        )
+
+        # Packs extraction prompts of short chunks across documents processed in parallel
+        self.extraction_batcher = (
+            EntityExtractionBatcher(
+                batch_size=self.entity_extract_batch_size,
+                max_tokens=self.entity_extract_batch_max_tokens,
+                max_wait=self.entity_extract_batch_wait,
+            )
+            if self.entity_extract_batch_size > 1
+            else None
+        )
+
+        # Maps query embeddings to cached results, cleared when documents change
+        self.semantic_cache = (
+            SemanticQueryCache(
+                similarity_threshold=self.semantic_cache_threshold,
+                ttl=self.semantic_cache_ttl,
+                max_entries=self.semantic_cache_max_entries,
+            )
+            if self.enable_semantic_cache
+            else None
+        )
+
+        # Entity name index for local keyword extraction, built on first query and
+        # rebuilt after graph changes of any process (see _get_keyword_index)
+        self.keyword_index: EntityKeywordIndex | None = None
+        self._keyword_index_updated = None
+        self._keyword_index_generation: str | None = None
+
         # Verify storage implementation compatibility and environment variables
         storage_configs = [
             ("KV_STORAGE", self.kv_storage),
@@ -541,6 +705,16 @@ class LightRAG:
             queue_name="Embedding func",
         )(self.embedding_func)
 
+        # Step 3: Merge embedding requests of concurrent callers into shared batches
+        if self.embedding_coalesce_wait > 0:
+            self.embedding_func = EmbeddingCoalescer(
+                self.embedding_func,
+                batch_size=self.embedding_batch_num,
+                max_tokens=self.embedding_coalesce_max_tokens,
+                max_wait=self.embedding_coalesce_wait,
+                tokenizer=self.tokenizer,
+            ).as_embedding_func()
+
         # Initialize all storages
         self.key_string_value_json_storage_cls: type[BaseKVStorage] = (
             self._get_storage_class(self.kv_storage)
@@ -1477,11 +1651,18 @@ class LightRAG:
         failed_docs_to_preserve = []
         successful_deletions = 0
 
-        # Check each document's data consistency
+        # Check each document's data consistency, reading full_docs in one batch
+        doc_ids = list(to_process_docs)
+        docs_with_content = {
+            doc_id
+            for doc_id, content_data in zip(
+                doc_ids, await self.full_docs.get_by_ids(doc_ids)
+            )
+            if content_data
+        }
         for doc_id, status_doc in to_process_docs.items():
             # Check if corresponding content exists in full_docs
-            content_data = await self.full_docs.get_by_id(doc_id)
-            if not content_data:
+            if doc_id not in docs_with_content:
                 # Check if this is a failed document that should be preserved
                 if (
                     hasattr(status_doc, "status")
@@ -1551,39 +1732,29 @@ class LightRAG:
         #     pipeline_status["history_messages"].append(final_message)
 
         # Reset PROCESSING and FAILED documents that pass consistency checks to PENDING status
-        docs_to_reset = {}
-        reset_count = 0
+        docs_to_reset = []
 
         for doc_id, status_doc in to_process_docs.items():
             # Check if document has corresponding content in full_docs (consistency check)
-            content_data = await self.full_docs.get_by_id(doc_id)
-            if content_data:  # Document passes consistency check
+            if doc_id in docs_with_content:  # Document passes consistency check
                 # Check if document is in PROCESSING or FAILED status
                 if hasattr(status_doc, "status") and status_doc.status in [
                     DocStatus.PROCESSING,
                     DocStatus.FAILED,
                 ]:
-                    # Prepare document for status reset to PENDING
-                    docs_to_reset[doc_id] = {
-                        "status": DocStatus.PENDING,
-                        "content_summary": status_doc.content_summary,
-                        "content_length": status_doc.content_length,
-                        "created_at": status_doc.created_at,
-                        "updated_at": datetime.now(timezone.utc).isoformat(),
-                        "file_path": getattr(status_doc, "file_path", "unknown_source"),
-                        "track_id": getattr(status_doc, "track_id", ""),
-                        # Clear any error messages and processing metadata
-                        "error_msg": "",
-                        "metadata": {},
-                    }
+                    docs_to_reset.append(doc_id)
 
                     # Update the status in to_process_docs as well
                     status_doc.status = DocStatus.PENDING
-                    reset_count += 1
+        reset_count = len(docs_to_reset)
 
         # Update doc_status storage if there are documents to reset
         if docs_to_reset:
-            await self.doc_status.upsert(docs_to_reset)
+            # One status transition for all documents, clearing any error
+            # messages and processing metadata
+            await self.doc_status.update_status_batch(
+                docs_to_reset, DocStatus.PENDING, error_msg="", metadata={}
+            )
 
             async with pipeline_status_lock:
                 reset_message = f"Reset {reset_count} documents from PROCESSING/FAILED to PENDING status"
@@ -2167,6 +2338,7 @@ class LightRAG:
                 pipeline_status_lock=pipeline_status_lock,
                 llm_response_cache=self.llm_response_cache,
                 text_chunks_storage=self.text_chunks,
+                extraction_batcher=self.extraction_batcher,
             )
             return chunk_results
         except Exception as e:
@@ -2180,6 +2352,11 @@ class LightRAG:
     async def _insert_done(
         self, pipeline_status=None, pipeline_status_lock=None
     ) -> None:
+        # Semantic caches of other processes (e.g. a query server) are cleared
+        # once they see the new generation, persisted with the LLM cache below
+        if self.llm_response_cache is not None:
+            await bump_semantic_cache_generation(self.llm_response_cache)
+
         tasks = [
             cast(StorageNameSpace, storage_inst).index_done_callback()
             for storage_inst in [  # type: ignore
@@ -2200,6 +2377,9 @@ class LightRAG:
         ]
         await asyncio.gather(*tasks)
 
+        # Cached results of similar queries may not reflect the changed documents
+        if self.semantic_cache is not None:
+            self.semantic_cache.clear()
         log_message = "In memory DB persist to disk"
         logger.info(log_message)
 
@@ -2208,6 +2388,81 @@ class LightRAG:
                 pipeline_status["latest_message"] = log_message
                 pipeline_status["history_messages"].append(log_message)
 
+    def build_geo_index(
+        self,
+        doc_locations: dict[str, tuple[float, float]] | None = None,
+        chunk_locations: dict[str, tuple[float, float]] | None = None,
+    ) -> dict[str, int]:
+        loop = always_get_an_event_loop()
+        return loop.run_until_complete(
+            self.abuild_geo_index(doc_locations, chunk_locations)
+        )
+
+    async def abuild_geo_index(
+        self,
+        doc_locations: dict[str, tuple[float, float]] | None = None,
+        chunk_locations: dict[str, tuple[float, float]] | None = None,
+    ) -> dict[str, int]:
+        """Rebuild the spatial index used by QueryParam geo filters
+
+        Chunks of each document in doc_locations are located at the document
+        coordinates (resolved through doc status chunks_list). chunk_locations
+        locates chunks directly, e.g. chunks inserted with ainsert_custom_kg,
+        which have no doc status. Entities and relations are then linked to the
+        located chunks listed in their source_id.
+
+        Args:
+            doc_locations: {doc_id: (latitude, longitude)}
+            chunk_locations: {chunk_id: (latitude, longitude)}
+
+        Returns:
+            Counts of located chunks, entities and relations
+        """
+        index = GeoIndex(cell_size=self.geo_cell_size)
+        for chunk_id, (lat, lon) in (chunk_locations or {}).items():
+            index.add_chunk(chunk_id, lat, lon)
+
+        doc_ids = list(doc_locations or {})
+        batch_size = 500
+        for i in range(0, len(doc_ids), batch_size):
+            batch = doc_ids[i : i + batch_size]
+            statuses = await self.doc_status.get_by_ids(batch) or [None] * len(batch)
+            for doc_id, status in zip(batch, statuses):
+                if not status:
+                    continue
+                chunk_ids = (
+                    status.get("chunks_list")
+                    if isinstance(status, dict)
+                    else status.chunks_list
+                )
+                lat, lon = doc_locations[doc_id]
+                for chunk_id in chunk_ids or []:
+                    index.add_chunk(chunk_id, lat, lon)
+
+        entity_count = 0
+        for node in await self.chunk_entity_relation_graph.get_all_nodes():
+            chunk_ids = (node.get("source_id") or "").split(GRAPH_FIELD_SEP)
+            if index.link_entity(node["id"], chunk_ids):
+                entity_count += 1
+
+        relation_count = 0
+        for edge in await self.chunk_entity_relation_graph.get_all_edges():
+            chunk_ids = (edge.get("source_id") or "").split(GRAPH_FIELD_SEP)
+            if index.link_relation(edge["source"], edge["target"], chunk_ids):
+                relation_count += 1
+
+        os.makedirs(os.path.dirname(self._geo_index_file), exist_ok=True)
+        index.save(self._geo_index_file)
+        self.geo_index = index
+
+        stats = {
+            "chunks": len(index),
+            "entities": entity_count,
+            "relations": relation_count,
+        }
+        logger.info(f"Built geo index: {stats}")
+        return stats
+
     def insert_custom_kg(
         self, custom_kg: dict[str, Any], full_doc_id: str = None
     ) -> None:
@@ -2597,7 +2852,13 @@ class LightRAG:
             model_func=param.model_func,
             user_prompt=param.user_prompt,
             enable_rerank=param.enable_rerank,
+            max_edges_per_entity=param.max_edges_per_entity,
+            speculative_retrieval=param.speculative_retrieval,
+            geo_center=param.geo_center,
+            geo_radius_km=param.geo_radius_km,
+            geo_bbox=param.geo_bbox,
         )
+        geo_filter = self.geo_index.resolve(data_param)
 
         query_result = None
 
@@ -2614,6 +2875,9 @@ class LightRAG:
                 hashing_kv=self.llm_response_cache,
                 system_prompt=None,
                 chunks_vdb=self.chunks_vdb,
+                geo_filter=geo_filter,
+                semantic_cache=self.semantic_cache,
+                keyword_index=await self._get_keyword_index(),
             )
         elif data_param.mode == "naive":
             logger.debug(f"[aquery_data] Using naive_query for mode: {data_param.mode}")
@@ -2624,6 +2888,8 @@ class LightRAG:
                 global_config,
                 hashing_kv=self.llm_response_cache,
                 system_prompt=None,
+                geo_filter=geo_filter,
+                semantic_cache=self.semantic_cache,
             )
         elif data_param.mode == "bypass":
             logger.debug("[aquery_data] Using bypass mode")
@@ -2698,6 +2964,7 @@ class LightRAG:
 
         try:
             query_result = None
+            geo_filter = self.geo_index.resolve(param)
 
             if param.mode in ["local", "global", "hybrid", "mix"]:
                 query_result = await kg_query(
@@ -2711,6 +2978,9 @@ class LightRAG:
                     hashing_kv=self.llm_response_cache,
                     system_prompt=system_prompt,
                     chunks_vdb=self.chunks_vdb,
+                    geo_filter=geo_filter,
+                    semantic_cache=self.semantic_cache,
+                    keyword_index=await self._get_keyword_index(),
                 )
             elif param.mode == "naive":
                 query_result = await naive_query(
@@ -2720,6 +2990,8 @@ class LightRAG:
                     global_config,
                     hashing_kv=self.llm_response_cache,
                     system_prompt=system_prompt,
+                    geo_filter=geo_filter,
+                    semantic_cache=self.semantic_cache,
                 )
             elif param.mode == "bypass":
                 # Bypass mode: directly use LLM without knowledge retrieval
@@ -2833,6 +3105,40 @@ class LightRAG:
         loop = always_get_an_event_loop()
         return loop.run_until_complete(self.aquery_llm(query, param, system_prompt))
 
+    async def _get_keyword_index(self) -> EntityKeywordIndex | None:
+        """Entity name index for local keyword extraction, None when disabled"""
+        if not self.enable_local_keywords:
+            return None
+        graph = self.chunk_entity_relation_graph
+        if self._keyword_index_updated is None:
+            # Set along with the graph storage's own flag whenever a process
+            # (this one or another worker) persists graph changes
+            self._keyword_index_updated = await get_update_flag(
+                graph.namespace, workspace=graph.workspace
+            )
+        # Separate programs (e.g. an import script) sharing the graph in a database
+        # set no flags, but replace the document generation in the LLM cache
+        generation = (
+            await get_semantic_cache_generation(self.llm_response_cache)
+            if self.llm_response_cache is not None
+            else None
+        )
+        if (
+            self.keyword_index is None
+            or self._keyword_index_updated.value
+            or generation != self._keyword_index_generation
+        ):
+            if self.keyword_index is not None:
+                logger.info("Rebuilding entity keyword index, graph changed")
+            self._keyword_index_updated.value = False
+            self._keyword_index_generation = generation
+            self.keyword_index = await EntityKeywordIndex.from_graph(
+                graph,
+                hl_entity_types=self.local_keywords_hl_types,
+                min_coverage=self.local_keywords_min_coverage,
+            )
+        return self.keyword_index
+
     async def _query_done(self):
         await self.llm_response_cache.index_done_callback()
 
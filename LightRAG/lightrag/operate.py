@@ -5,6 +5,7 @@ from pathlib import Path
 import asyncio
 import json
 import json_repair
+import numpy as np
 from typing import Any, AsyncIterator, overload, Literal
 from collections import Counter, defaultdict
 
@@ -36,6 +37,7 @@ from lightrag.utils import (
     fix_tuple_delimiter_corruption,
     convert_to_user_format,
     generate_reference_list_from_chunks,
+    generate_cache_key,
     apply_source_ids_limit,
     merge_source_ids,
     make_relation_chunk_key,
@@ -64,7 +66,13 @@ from lightrag.constants import (
     DEFAULT_FILE_PATH_MORE_PLACEHOLDER,
     DEFAULT_MAX_FILE_PATHS,
     DEFAULT_ENTITY_NAME_MAX_LENGTH,
+    DEFAULT_GEO_MAX_CANDIDATES,
+    DEFAULT_GEO_OVERFETCH_FACTOR,
 )
+from lightrag.geo_index import GeoFilter, geo_cache_key
+from lightrag.extraction_batch import EntityExtractionBatcher
+from lightrag.semantic_cache import SemanticQueryCache
+from lightrag.keyword_index import EntityKeywordIndex
 from lightrag.kg.shared_storage import get_storage_keyed_lock
 import time
 from dotenv import load_dotenv
@@ -1094,6 +1102,7 @@ async def _rebuild_single_entity(
         file_paths: list[str],
         source_chunk_ids: list[str],
         truncation_info: str = "",
+        aggregation: dict | None = None,
     ):
         try:
             # Update entity in graph storage (critical path)
@@ -1107,6 +1116,7 @@ async def _rebuild_single_entity(
                 else current_entity.get("file_path", "unknown_source"),
                 "created_at": int(time.time()),
                 "truncate": truncation_info,
+                **(aggregation or {}),
             }
             await knowledge_graph_inst.upsert_node(entity_name, updated_entity_data)
 
@@ -1199,12 +1209,13 @@ async def _rebuild_single_entity(
         description_list = list(dict.fromkeys(relationship_descriptions))
 
         # Generate final description from relationships or fallback to current
+        aggregation = None
         if description_list:
-            final_description, _ = await _handle_entity_relation_summary(
+            final_description, aggregation = await _rebuild_descriptions(
                 "Entity",
                 entity_name,
                 description_list,
-                GRAPH_FIELD_SEP,
+                current_entity,
                 global_config,
                 llm_response_cache=llm_response_cache,
             )
@@ -1217,6 +1228,7 @@ async def _rebuild_single_entity(
             entity_type,
             file_paths,
             limited_chunk_ids,
+            aggregation=aggregation,
         )
         return
 
@@ -1272,12 +1284,13 @@ async def _rebuild_single_entity(
     )
 
     # Generate final description from entities or fallback to current
+    aggregation = None
     if description_list:
-        final_description, _ = await _handle_entity_relation_summary(
+        final_description, aggregation = await _rebuild_descriptions(
             "Entity",
             entity_name,
             description_list,
-            GRAPH_FIELD_SEP,
+            current_entity,
             global_config,
             llm_response_cache=llm_response_cache,
         )
@@ -1297,6 +1310,7 @@ async def _rebuild_single_entity(
         file_paths_list,
         limited_chunk_ids,
         truncation_info,
+        aggregation,
     )
 
     # Log rebuild completion with truncation info
@@ -1432,12 +1446,13 @@ async def _rebuild_single_relationship(
     weight = sum(weights) if weights else current_relationship.get("weight", 1.0)
 
     # Generate final description from relations or fallback to current
+    aggregation = None
     if description_list:
-        final_description, _ = await _handle_entity_relation_summary(
+        final_description, aggregation = await _rebuild_descriptions(
             "Relation",
             f"{src}-{tgt}",
             description_list,
-            GRAPH_FIELD_SEP,
+            current_relationship,
             global_config,
             llm_response_cache=llm_response_cache,
         )
@@ -1465,6 +1480,7 @@ async def _rebuild_single_relationship(
         if file_paths_list
         else current_relationship.get("file_path", "unknown_source"),
         "truncate": truncation_info,
+        **(aggregation or {}),
     }
 
     # Ensure both endpoint nodes exist before writing the edge back
@@ -1590,6 +1606,188 @@ async def _rebuild_single_relationship(
             pipeline_status["history_messages"].append(status_message)
 
 
+async def _aggregate_descriptions(
+    description_type: str,
+    entity_or_relation_name: str,
+    already_description: list[str],
+    already_data: dict | None,
+    new_descriptions: list[str],
+    global_config: dict,
+    llm_response_cache: BaseKVStorage | None = None,
+) -> tuple[str, bool, dict]:
+    """Merge new description fragments into a stored description.
+
+    Without description_summary_drift, all fragments go through
+    _handle_entity_relation_summary as before. With it, the description is a
+    rolling LLM summary followed by a bounded reservoir of the most recent
+    fragments, so a merge costs the same however many fragments an entity has:
+    1. Until there is a summary, fragments accumulate as before and are
+       summarized once they exceed force_llm_summary_on_merge or summary_max_tokens
+    2. Afterwards, new fragments only join the reservoir, which keeps the newest
+       description_reservoir_size fragments that fit in summary_max_tokens
+    3. The summary is refreshed from itself and the reservoir once the fragments
+       merged since it reach description_summary_drift times the fragments it
+       covers (and at least force_llm_summary_on_merge)
+
+    Counts are kept in the summarized_fragments and pending_fragments properties.
+
+    Returns:
+        Tuple of (description, llm_was_used, properties to store with it)
+    """
+    drift = global_config.get("description_summary_drift") or 0
+    if drift <= 0:
+        description, llm_was_used = await _handle_entity_relation_summary(
+            description_type,
+            entity_or_relation_name,
+            already_description + new_descriptions,
+            GRAPH_FIELD_SEP,
+            global_config,
+            llm_response_cache,
+        )
+        return (
+            description,
+            llm_was_used,
+            _reset_aggregation(already_data, description),
+        )
+
+    tokenizer: Tokenizer = global_config["tokenizer"]
+    summary_max_tokens = global_config["summary_max_tokens"]
+    force_llm_summary_on_merge = global_config["force_llm_summary_on_merge"]
+    reservoir_size = max(
+        global_config["description_reservoir_size"], force_llm_summary_on_merge
+    )
+
+    already_data = already_data or {}
+    summarized = int(already_data.get("summarized_fragments") or 0)
+    pending = already_data.get("pending_fragments")
+    # Descriptions stored without these properties hold unsummarized fragments only
+    pending = len(already_description) if pending is None else int(pending)
+    if summarized and already_description:
+        summary, reservoir = already_description[0], already_description[1:]
+    else:
+        summary, reservoir = None, list(already_description)
+    pending += len(new_descriptions)
+    reservoir += new_descriptions
+
+    if summary is None:
+        # First summary, over all fragments collected so far
+        if len(reservoir) >= force_llm_summary_on_merge or (
+            sum(len(tokenizer.encode(desc)) for desc in reservoir) >= summary_max_tokens
+        ):
+            description, llm_was_used = await _handle_entity_relation_summary(
+                description_type,
+                entity_or_relation_name,
+                reservoir,
+                GRAPH_FIELD_SEP,
+                global_config,
+                llm_response_cache,
+            )
+            if llm_was_used:
+                return (
+                    description,
+                    True,
+                    {"summarized_fragments": pending, "pending_fragments": 0},
+                )
+    elif reservoir and pending >= max(force_llm_summary_on_merge, drift * summarized):
+        description = await _summarize_descriptions(
+            description_type,
+            entity_or_relation_name,
+            [summary] + reservoir[-reservoir_size:],
+            global_config,
+            llm_response_cache,
+        )
+        return (
+            description,
+            True,
+            {"summarized_fragments": summarized + pending, "pending_fragments": 0},
+        )
+
+    # Keep the newest fragments that fit next to the summary
+    budget = summary_max_tokens - (len(tokenizer.encode(summary)) if summary else 0)
+    kept, kept_tokens = [], 0
+    for desc in reversed(reservoir[-reservoir_size:]):
+        desc_tokens = len(tokenizer.encode(desc))
+        if kept and kept_tokens + desc_tokens > budget:
+            break
+        kept.append(desc)
+        kept_tokens += desc_tokens
+    description = GRAPH_FIELD_SEP.join(([summary] if summary else []) + kept[::-1])
+    return (
+        description,
+        False,
+        {"summarized_fragments": summarized, "pending_fragments": pending},
+    )
+
+
+def _reset_aggregation(current_data: dict | None, description: str) -> dict:
+    """Aggregation properties of a description written without a rolling summary
+
+    Only returned for records that already carry them, so that stale counts are
+    overwritten; the description is then treated as unsummarized fragments.
+    """
+    if not current_data or "summarized_fragments" not in current_data:
+        return {}
+    return {
+        "summarized_fragments": 0,
+        "pending_fragments": len(description.split(GRAPH_FIELD_SEP)),
+    }
+
+
+async def _rebuild_descriptions(
+    description_type: str,
+    entity_or_relation_name: str,
+    description_list: list[str],
+    current_data: dict,
+    global_config: dict,
+    llm_response_cache: BaseKVStorage | None = None,
+) -> tuple[str, dict]:
+    """Description of an entity/relation rebuilt from all its remaining fragments
+
+    With description_summary_drift, the rolling summary is started afresh from
+    the newest description_reservoir_size fragments (one bounded summary
+    instead of a map-reduce over every fragment) and covers all of them.
+
+    Returns:
+        Tuple of (description, aggregation properties to store with it)
+    """
+    drift = global_config.get("description_summary_drift") or 0
+    if drift <= 0:
+        description, _ = await _handle_entity_relation_summary(
+            description_type,
+            entity_or_relation_name,
+            description_list,
+            GRAPH_FIELD_SEP,
+            global_config,
+            llm_response_cache,
+        )
+        return description, _reset_aggregation(current_data, description)
+
+    reservoir_size = max(
+        global_config["description_reservoir_size"],
+        global_config["force_llm_summary_on_merge"],
+    )
+    description, llm_was_used, aggregation = await _aggregate_descriptions(
+        description_type,
+        entity_or_relation_name,
+        [],
+        None,
+        description_list[-reservoir_size:],
+        global_config,
+        llm_response_cache,
+    )
+    if llm_was_used:
+        aggregation = {
+            "summarized_fragments": len(description_list),
+            "pending_fragments": 0,
+        }
+    else:
+        aggregation = {
+            "summarized_fragments": 0,
+            "pending_fragments": len(description_list),
+        }
+    return description, aggregation
+
+
 async def _merge_nodes_then_upsert(
     entity_name: str,
     nodes_data: list[dict],
@@ -1730,11 +1928,12 @@ async def _merge_nodes_then_upsert(
                 raise PipelineCancelledException("User cancelled during entity summary")
 
     # 8. Get summary description an LLM usage status
-    description, llm_was_used = await _handle_entity_relation_summary(
+    description, llm_was_used, aggregation = await _aggregate_descriptions(
         "Entity",
         entity_name,
-        description_list,
-        GRAPH_FIELD_SEP,
+        already_description,
+        already_node,
+        sorted_descriptions,
         global_config,
         llm_response_cache,
     )
@@ -1840,6 +2039,7 @@ async def _merge_nodes_then_upsert(
         file_path=file_path,
         created_at=int(time.time()),
         truncate=truncation_info,
+        **aggregation,
     )
     await knowledge_graph_inst.upsert_node(
         entity_name,
@@ -2059,11 +2259,12 @@ async def _merge_edges_then_upsert(
                 )
 
     # 8. Get summary description an LLM usage status
-    description, llm_was_used = await _handle_entity_relation_summary(
+    description, llm_was_used, aggregation = await _aggregate_descriptions(
         "Relation",
         f"({src_id}, {tgt_id})",
-        description_list,
-        GRAPH_FIELD_SEP,
+        already_description,
+        already_edge,
+        sorted_descriptions,
         global_config,
         llm_response_cache,
     )
@@ -2343,6 +2544,7 @@ async def _merge_edges_then_upsert(
             file_path=file_path,
             created_at=edge_created_at,
             truncate=truncation_info,
+            **aggregation,
         ),
     )
 
@@ -2772,6 +2974,7 @@ async def extract_entities(
     pipeline_status_lock=None,
     llm_response_cache: BaseKVStorage | None = None,
     text_chunks_storage: BaseKVStorage | None = None,
+    extraction_batcher: EntityExtractionBatcher | None = None,
 ) -> list:
     # Check for cancellation at the start of entity extraction
     if pipeline_status is not None and pipeline_status_lock is not None:
@@ -2842,9 +3045,16 @@ async def extract_entities(
             "entity_continue_extraction_user_prompt"
         ].format(**{**context_base, "input_text": content})
 
+        # Initial extraction of short chunks may be packed with other chunks
+        initial_llm_func = use_llm_func
+        if extraction_batcher is not None:
+            initial_llm_func = extraction_batcher.llm_func_for(
+                use_llm_func, context_base, content, chunk_dp.get("tokens", 0)
+            )
+
         final_result, timestamp = await use_llm_func_with_cache(
             entity_extraction_user_prompt,
-            use_llm_func,
+            initial_llm_func,
             system_prompt=entity_extraction_system_prompt,
             llm_response_cache=llm_response_cache,
             cache_type="extract",
@@ -3021,6 +3231,9 @@ async def kg_query(
     hashing_kv: BaseKVStorage | None = None,
     system_prompt: str | None = None,
     chunks_vdb: BaseVectorStorage = None,
+    geo_filter: GeoFilter | None = None,
+    semantic_cache: SemanticQueryCache | None = None,
+    keyword_index: EntityKeywordIndex | None = None,
 ) -> QueryResult | None:
     """
     Execute knowledge graph query and return unified QueryResult object.
@@ -3036,6 +3249,9 @@ async def kg_query(
         hashing_kv: Cache storage
         system_prompt: System prompt
         chunks_vdb: Document chunks vector database
+        geo_filter: Region filter resolved from query_param geo fields
+        semantic_cache: Optional index reusing cached results of similar queries
+        keyword_index: Optional entity name index extracting keywords without the LLM
 
     Returns:
         QueryResult | None: Unified query result object containing:
@@ -3062,9 +3278,54 @@ async def kg_query(
         # Apply higher priority (5) to query relation LLM function
         use_model_func = partial(use_model_func, _priority=5)
 
-    hl_keywords, ll_keywords = await get_keywords_from_query(
-        query, query_param, global_config, hashing_kv
+    # The query embedding is shared by semantic cache lookups and retrieval. It is
+    # only computed up front when retrieval embeds the query anyway; otherwise
+    # semantic lookups embed it after an exact cache miss.
+    query_embedding = None
+    retrieval_embeds_query = chunks_vdb is not None or (
+        text_chunks_db.global_config.get(
+            "kg_chunk_pick_method", DEFAULT_KG_CHUNK_PICK_METHOD
+        )
+        == "VECTOR"
     )
+    if (
+        semantic_cache is not None
+        and semantic_cache.enabled_for(hashing_kv)
+        and (retrieval_embeds_query or query_param.speculative_retrieval)
+    ):
+        try:
+            query_embedding = await semantic_cache.embed(hashing_kv, query)
+        except Exception as e:
+            logger.warning(f"Failed to pre-compute query embedding: {e}")
+
+    # Retrieval that needs no keywords overlaps with keyword extraction
+    speculative_task = None
+    if query_param.speculative_retrieval and not (
+        query_param.hl_keywords or query_param.ll_keywords
+    ):
+        speculative_task = asyncio.create_task(
+            _speculative_search(
+                query,
+                knowledge_graph_inst,
+                entities_vdb,
+                text_chunks_db,
+                query_param,
+                chunks_vdb,
+                geo_filter,
+                query_embedding,
+            )
+        )
+
+    keywords_start = time.perf_counter()
+    try:
+        hl_keywords, ll_keywords = await get_keywords_from_query(
+            query, query_param, global_config, hashing_kv, semantic_cache, keyword_index
+        )
+    except BaseException:
+        if speculative_task is not None:
+            speculative_task.cancel()
+        raise
+    timings = {"keywords": time.perf_counter() - keywords_start}
 
     logger.debug(f"High-level keywords: {hl_keywords}")
     logger.debug(f"Low-level  keywords: {ll_keywords}")
@@ -3079,11 +3340,19 @@ async def kg_query(
             logger.warning(f"Forced low_level_keywords to origin query: {query}")
             ll_keywords = [query]
         else:
+            if speculative_task is not None:
+                speculative_task.cancel()
             return QueryResult(content=PROMPTS["fail_response"])
 
     ll_keywords_str = ", ".join(ll_keywords) if ll_keywords else ""
     hl_keywords_str = ", ".join(hl_keywords) if hl_keywords else ""
 
+    retrieval_start = time.perf_counter()
+    speculative_result = None
+    if speculative_task is not None:
+        speculative_result = await speculative_task
+        timings["speculative_search"] = speculative_result["elapsed"]
+
     # Build query context (unified interface)
     context_result = await _build_query_context(
         query,
@@ -3095,12 +3364,19 @@ async def kg_query(
         text_chunks_db,
         query_param,
         chunks_vdb,
+        geo_filter,
+        query_embedding,
+        speculative_result,
     )
 
     if context_result is None:
         logger.info("[kg_query] No query context could be built; returning no-result.")
         return None
 
+    # Stage timings in seconds; speculative_search overlaps with keywords
+    timings["retrieval"] = time.perf_counter() - retrieval_start
+    context_result.raw_data.setdefault("metadata", {})["timings"] = timings
+
     # Return different content based on query parameters
     if query_param.only_need_context and not query_param.only_need_prompt:
         return QueryResult(
@@ -3149,11 +3425,17 @@ async def kg_query(
         ll_keywords_str,
         query_param.user_prompt or "",
         query_param.enable_rerank,
+        geo_cache_key(query_param),
     )
 
+    generation_start = time.perf_counter()
     cached_result = await handle_cache(
         hashing_kv, args_hash, user_query, query_param.mode, cache_type="query"
     )
+    if cached_result is None and semantic_cache is not None:
+        cached_result = await semantic_cache.lookup(
+            hashing_kv, query, query_param, "query"
+        )
 
     if cached_result is not None:
         cached_response, _ = cached_result  # Extract content, ignore timestamp
@@ -3195,6 +3477,15 @@ async def kg_query(
                     queryparam=queryparam_dict,
                 ),
             )
+            if semantic_cache is not None and isinstance(response, str):
+                await semantic_cache.add(
+                    hashing_kv,
+                    query,
+                    query_param,
+                    "query",
+                    generate_cache_key(query_param.mode, "query", args_hash),
+                )
+    timings["generation"] = time.perf_counter() - generation_start
 
     # Return unified result based on actual response type
     if isinstance(response, str):
@@ -3225,18 +3516,24 @@ async def get_keywords_from_query(
     query_param: QueryParam,
     global_config: dict[str, str],
     hashing_kv: BaseKVStorage | None = None,
+    semantic_cache: SemanticQueryCache | None = None,
+    keyword_index: EntityKeywordIndex | None = None,
 ) -> tuple[list[str], list[str]]:
     """
     Retrieves high-level and low-level keywords for RAG operations.
 
     This function checks if keywords are already provided in query parameters,
-    and if not, extracts them from the query text using LLM.
+    and if not, matches the entity names of keyword_index in the query text.
+    Without an index, or when it covers too little of the query, keywords are
+    extracted from the query text using LLM.
 
     Args:
         query: The user's query text
         query_param: Query parameters that may contain pre-defined keywords
         global_config: Global configuration dictionary
         hashing_kv: Optional key-value storage for caching results
+        semantic_cache: Optional index reusing keywords of similar queries
+        keyword_index: Optional entity name index for LLM-free extraction
 
     Returns:
         A tuple containing (high_level_keywords, low_level_keywords)
@@ -3245,9 +3542,17 @@ async def get_keywords_from_query(
     if query_param.hl_keywords or query_param.ll_keywords:
         return query_param.hl_keywords, query_param.ll_keywords
 
+    if keyword_index is not None:
+        local_keywords = keyword_index.extract(query, query_param.mode)
+        if local_keywords is not None:
+            logger.info(
+                f"Local keywords: hl={local_keywords[0]}, ll={local_keywords[1]}"
+            )
+            return local_keywords
+
     # Extract keywords using extract_keywords_only function which already supports conversation history
     hl_keywords, ll_keywords = await extract_keywords_only(
-        query, query_param, global_config, hashing_kv
+        query, query_param, global_config, hashing_kv, semantic_cache
     )
     return hl_keywords, ll_keywords
 
@@ -3257,6 +3562,7 @@ async def extract_keywords_only(
     param: QueryParam,
     global_config: dict[str, str],
     hashing_kv: BaseKVStorage | None = None,
+    semantic_cache: SemanticQueryCache | None = None,
 ) -> tuple[list[str], list[str]]:
     """
     Extract high-level and low-level keywords from the given 'text' using the LLM.
@@ -3272,6 +3578,8 @@ async def extract_keywords_only(
     cached_result = await handle_cache(
         hashing_kv, args_hash, text, param.mode, cache_type="keywords"
     )
+    if cached_result is None and semantic_cache is not None:
+        cached_result = await semantic_cache.lookup(hashing_kv, text, param, "keywords")
     if cached_result is not None:
         cached_response, _ = cached_result  # Extract content, ignore timestamp
         try:
@@ -3357,15 +3665,95 @@ async def extract_keywords_only(
                     queryparam=queryparam_dict,
                 ),
             )
+            if semantic_cache is not None:
+                await semantic_cache.add(
+                    hashing_kv,
+                    text,
+                    param,
+                    "keywords",
+                    generate_cache_key(param.mode, "keywords", args_hash),
+                )
 
     return hl_keywords, ll_keywords
 
 
+async def _query_vdb_in_region(
+    vdb: BaseVectorStorage,
+    query: str,
+    top_k: int,
+    candidate_ids: list[str],
+    query_embedding: list[float] = None,
+    result_id=lambda r: r.get("id"),
+) -> list[dict]:
+    """
+    Vector search restricted to the candidate ids of a geo filter.
+
+    The candidate vectors are fetched and scored directly instead of searching
+    the whole index. Regions holding more than geo_max_candidates vectors fall
+    back to an over-fetching index query whose results are filtered by id.
+
+    Args:
+        vdb: Vector storage to search
+        query: Query text, embedded unless query_embedding is given
+        top_k: Number of results to return
+        candidate_ids: Vector ids inside the region
+        query_embedding: Optional pre-computed query embedding
+        result_id: Maps an index query result to its vector id (fallback path only)
+
+    Returns:
+        Results ordered by similarity, each with "id" and "distance" plus the
+        stored fields returned by get_by_ids
+    """
+    if not candidate_ids:
+        return []
+
+    max_candidates = vdb.global_config.get(
+        "geo_max_candidates", DEFAULT_GEO_MAX_CANDIDATES
+    )
+    if len(candidate_ids) > max_candidates:
+        candidate_set = set(candidate_ids)
+        results = await vdb.query(
+            query,
+            top_k=top_k * DEFAULT_GEO_OVERFETCH_FACTOR,
+            query_embedding=query_embedding,
+        )
+        filtered = []
+        for r in results:
+            vdb_id = result_id(r)
+            if vdb_id in candidate_set:
+                filtered.append({**r, "id": vdb_id})
+        return filtered[:top_k]
+
+    if query_embedding is None:
+        query_embedding = (await vdb.embedding_func([query]))[0]
+
+    vectors = await vdb.get_vectors_by_ids(candidate_ids)
+    if not vectors:
+        return []
+
+    ids = list(vectors)
+    matrix = np.asarray([vectors[i] for i in ids], dtype=np.float32)
+    query_vec = np.asarray(query_embedding, dtype=np.float32)
+    norms = np.linalg.norm(matrix, axis=1) * np.linalg.norm(query_vec)
+    scores = (matrix @ query_vec) / np.maximum(norms, 1e-12)
+
+    passing = np.flatnonzero(scores > vdb.cosine_better_than_threshold)
+    order = passing[np.argsort(-scores[passing], kind="stable")][:top_k]
+    top_ids = [ids[i] for i in order]
+
+    records = {r["id"]: r for r in await vdb.get_by_ids(top_ids) if r and r.get("id")}
+    return [
+        {**records.get(vdb_id, {}), "id": vdb_id, "distance": float(scores[i])}
+        for vdb_id, i in zip(top_ids, order)
+    ]
+
+
 async def _get_vector_context(
     query: str,
     chunks_vdb: BaseVectorStorage,
     query_param: QueryParam,
     query_embedding: list[float] = None,
+    geo_filter: GeoFilter | None = None,
 ) -> list[dict]:
     """
     Retrieve text chunks from the vector database without reranking or truncation.
@@ -3378,6 +3766,7 @@ async def _get_vector_context(
         chunks_vdb: Vector database containing document chunks
         query_param: Query parameters including chunk_top_k and ids
         query_embedding: Optional pre-computed query embedding to avoid redundant embedding calls
+        geo_filter: Optional region filter, only chunks inside the region are scored
 
     Returns:
         List of text chunks with metadata
@@ -3387,9 +3776,18 @@ async def _get_vector_context(
         search_top_k = query_param.chunk_top_k or query_param.top_k
         cosine_threshold = chunks_vdb.cosine_better_than_threshold
 
-        results = await chunks_vdb.query(
-            query, top_k=search_top_k, query_embedding=query_embedding
-        )
+        if geo_filter is not None:
+            results = await _query_vdb_in_region(
+                chunks_vdb,
+                query,
+                search_top_k,
+                list(geo_filter.chunk_ids),
+                query_embedding,
+            )
+        else:
+            results = await chunks_vdb.query(
+                query, top_k=search_top_k, query_embedding=query_embedding
+            )
         if not results:
             logger.info(
                 f"Naive query: 0 chunks (chunk_top_k:{search_top_k} cosine:{cosine_threshold})"
@@ -3418,6 +3816,62 @@ async def _get_vector_context(
         return []
 
 
+async def _speculative_search(
+    query: str,
+    knowledge_graph_inst: BaseGraphStorage,
+    entities_vdb: BaseVectorStorage,
+    text_chunks_db: BaseKVStorage,
+    query_param: QueryParam,
+    chunks_vdb: BaseVectorStorage = None,
+    geo_filter: GeoFilter | None = None,
+    query_embedding: list[float] | None = None,
+) -> dict[str, Any]:
+    """
+    Retrieval that only needs the raw query, started while keywords are extracted.
+
+    Embeds the query, runs the mix mode chunk vector search and searches
+    entities with the query text itself. _perform_kg_search reuses the results
+    once the keywords arrive.
+    """
+    start = time.perf_counter()
+    if query_embedding is None and text_chunks_db.embedding_func:
+        try:
+            query_embedding = (await text_chunks_db.embedding_func([query]))[0]
+        except Exception as e:
+            logger.warning(f"Failed to pre-compute query embedding: {e}")
+
+    async def no_results():
+        return None
+
+    entity_search = (
+        _get_node_data(
+            query,
+            knowledge_graph_inst,
+            entities_vdb,
+            query_param,
+            geo_filter,
+            query_embedding,
+        )
+        if query_param.mode in ["local", "hybrid", "mix"]
+        else no_results()
+    )
+    chunk_search = (
+        _get_vector_context(query, chunks_vdb, query_param, query_embedding, geo_filter)
+        if query_param.mode == "mix" and chunks_vdb
+        else no_results()
+    )
+    query_nodes, vector_chunks = await asyncio.gather(entity_search, chunk_search)
+    query_entities, query_relations = query_nodes or ([], [])
+
+    return {
+        "query_embedding": query_embedding,
+        "query_entities": query_entities,
+        "query_relations": query_relations,
+        "vector_chunks": vector_chunks,
+        "elapsed": time.perf_counter() - start,
+    }
+
+
 async def _perform_kg_search(
     query: str,
     ll_keywords: str,
@@ -3428,10 +3882,19 @@ async def _perform_kg_search(
     text_chunks_db: BaseKVStorage,
     query_param: QueryParam,
     chunks_vdb: BaseVectorStorage = None,
+    geo_filter: GeoFilter | None = None,
+    query_embedding: list[float] | None = None,
+    speculative_result: dict[str, Any] | None = None,
 ) -> dict[str, Any]:
     """
     Pure search logic that retrieves raw entities, relations, and vector chunks.
     No token truncation or formatting - just raw search results.
+    When geo_filter is set, entity, relation and chunk searches only consider
+    candidates located inside the query region. A query_embedding computed by
+    the caller is reused instead of embedding the query again.
+    With a speculative_result from _speculative_search, its embedding and
+    vector chunks are reused and its raw query entities are merged after the
+    keyword matched ones.
     """
 
     # Initialize result containers
@@ -3447,12 +3910,21 @@ async def _perform_kg_search(
     # Track chunk sources and metadata for final logging
     chunk_tracking = {}  # chunk_id -> {source, frequency, order}
 
+    if speculative_result is not None:
+        if query_embedding is None:
+            query_embedding = speculative_result["query_embedding"]
+        if ll_keywords == query:
+            ll_keywords = ""  # Keywords fell back to the query, already searched
+
     # Pre-compute query embedding once for all vector operations
     kg_chunk_pick_method = text_chunks_db.global_config.get(
         "kg_chunk_pick_method", DEFAULT_KG_CHUNK_PICK_METHOD
     )
-    query_embedding = None
-    if query and (kg_chunk_pick_method == "VECTOR" or chunks_vdb):
+    if (
+        query_embedding is None
+        and query
+        and (kg_chunk_pick_method == "VECTOR" or chunks_vdb)
+    ):
         actual_embedding_func = text_chunks_db.embedding_func
         if actual_embedding_func:
             try:
@@ -3472,6 +3944,7 @@ async def _perform_kg_search(
             knowledge_graph_inst,
             entities_vdb,
             query_param,
+            geo_filter,
         )
 
     elif query_param.mode == "global" and len(hl_keywords) > 0:
@@ -3480,6 +3953,7 @@ async def _perform_kg_search(
             knowledge_graph_inst,
             relationships_vdb,
             query_param,
+            geo_filter,
         )
 
     else:  # hybrid or mix mode
@@ -3489,6 +3963,7 @@ async def _perform_kg_search(
                 knowledge_graph_inst,
                 entities_vdb,
                 query_param,
+                geo_filter,
             )
         if len(hl_keywords) > 0:
             global_relations, global_entities = await _get_edge_data(
@@ -3496,16 +3971,24 @@ async def _perform_kg_search(
                 knowledge_graph_inst,
                 relationships_vdb,
                 query_param,
+                geo_filter,
             )
 
         # Get vector chunks for mix mode
         if query_param.mode == "mix" and chunks_vdb:
-            vector_chunks = await _get_vector_context(
-                query,
-                chunks_vdb,
-                query_param,
-                query_embedding,
-            )
+            if (
+                speculative_result is not None
+                and speculative_result["vector_chunks"] is not None
+            ):
+                vector_chunks = speculative_result["vector_chunks"]
+            else:
+                vector_chunks = await _get_vector_context(
+                    query,
+                    chunks_vdb,
+                    query_param,
+                    query_embedding,
+                    geo_filter,
+                )
             # Track vector chunks with source metadata
             for i, chunk in enumerate(vector_chunks):
                 chunk_id = chunk.get("chunk_id") or chunk.get("id")
@@ -3518,6 +4001,11 @@ async def _perform_kg_search(
                 else:
                     logger.warning(f"Vector chunk missing chunk_id: {chunk}")
 
+    # Entities found with the raw query rank after the keyword matched ones
+    if speculative_result is not None:
+        local_entities = local_entities + speculative_result["query_entities"]
+        local_relations = local_relations + speculative_result["query_relations"]
+
     # Round-robin merge entities
     final_entities = []
     seen_entities = set()
@@ -4053,6 +4541,9 @@ async def _build_query_context(
     text_chunks_db: BaseKVStorage,
     query_param: QueryParam,
     chunks_vdb: BaseVectorStorage = None,
+    geo_filter: GeoFilter | None = None,
+    query_embedding: list[float] | None = None,
+    speculative_result: dict[str, Any] | None = None,
 ) -> QueryContextResult | None:
     """
     Main query context building function using the new 4-stage architecture:
@@ -4076,6 +4567,9 @@ async def _build_query_context(
         text_chunks_db,
         query_param,
         chunks_vdb,
+        geo_filter,
+        query_embedding,
+        speculative_result,
     )
 
     if not search_result["final_entities"] and not search_result["final_relations"]:
@@ -4168,13 +4662,30 @@ async def _get_node_data(
     knowledge_graph_inst: BaseGraphStorage,
     entities_vdb: BaseVectorStorage,
     query_param: QueryParam,
+    geo_filter: GeoFilter | None = None,
+    query_embedding: list[float] | None = None,
 ):
     # get similar entities
     logger.info(
         f"Query nodes: {query} (top_k:{query_param.top_k}, cosine:{entities_vdb.cosine_better_than_threshold})"
     )
 
-    results = await entities_vdb.query(query, top_k=query_param.top_k)
+    if geo_filter is not None:
+        entity_names = geo_filter.entity_vdb_ids()
+        results = await _query_vdb_in_region(
+            entities_vdb,
+            query,
+            query_param.top_k,
+            list(entity_names),
+            query_embedding=query_embedding,
+            result_id=lambda r: compute_mdhash_id(r["entity_name"], prefix="ent-"),
+        )
+        for r in results:
+            r["entity_name"] = entity_names[r["id"]]
+    else:
+        results = await entities_vdb.query(
+            query, top_k=query_param.top_k, query_embedding=query_embedding
+        )
 
     if not len(results):
         return [], []
@@ -4227,7 +4738,10 @@ async def _find_most_related_edges_from_entities(
     knowledge_graph_inst: BaseGraphStorage,
 ):
     node_names = [dp["entity_name"] for dp in node_datas]
-    batch_edges_dict = await knowledge_graph_inst.get_nodes_edges_batch(node_names)
+    # Hub entities only contribute their highest ranked edges
+    batch_edges_dict = await knowledge_graph_inst.get_nodes_top_edges_batch(
+        node_names, query_param.max_edges_per_entity
+    )
 
     all_edges = []
     seen = set()
@@ -4441,12 +4955,27 @@ async def _get_edge_data(
     knowledge_graph_inst: BaseGraphStorage,
     relationships_vdb: BaseVectorStorage,
     query_param: QueryParam,
+    geo_filter: GeoFilter | None = None,
 ):
     logger.info(
         f"Query edges: {keywords} (top_k:{query_param.top_k}, cosine:{relationships_vdb.cosine_better_than_threshold})"
     )
 
-    results = await relationships_vdb.query(keywords, top_k=query_param.top_k)
+    if geo_filter is not None:
+        relation_pairs = geo_filter.relation_vdb_ids()
+        results = await _query_vdb_in_region(
+            relationships_vdb,
+            keywords,
+            query_param.top_k,
+            list(relation_pairs),
+            result_id=lambda r: compute_mdhash_id(
+                r["src_id"] + r["tgt_id"], prefix="rel-"
+            ),
+        )
+        for r in results:
+            r["src_id"], r["tgt_id"] = relation_pairs[r["id"]]
+    else:
+        results = await relationships_vdb.query(keywords, top_k=query_param.top_k)
 
     if not len(results):
         return [], []
@@ -4737,6 +5266,8 @@ async def naive_query(
     hashing_kv: BaseKVStorage | None = None,
     system_prompt: str | None = None,
     return_raw_data: Literal[True] = True,
+    geo_filter: GeoFilter | None = None,
+    semantic_cache: SemanticQueryCache | None = None,
 ) -> dict[str, Any]: ...
 
 
@@ -4749,6 +5280,8 @@ async def naive_query(
     hashing_kv: BaseKVStorage | None = None,
     system_prompt: str | None = None,
     return_raw_data: Literal[False] = False,
+    geo_filter: GeoFilter | None = None,
+    semantic_cache: SemanticQueryCache | None = None,
 ) -> str | AsyncIterator[str]: ...
 
 
@@ -4759,6 +5292,8 @@ async def naive_query(
     global_config: dict[str, str],
     hashing_kv: BaseKVStorage | None = None,
     system_prompt: str | None = None,
+    geo_filter: GeoFilter | None = None,
+    semantic_cache: SemanticQueryCache | None = None,
 ) -> QueryResult | None:
     """
     Execute naive query and return unified QueryResult object.
@@ -4770,6 +5305,8 @@ async def naive_query(
         global_config: Global configuration
         hashing_kv: Cache storage
         system_prompt: System prompt
+        geo_filter: Region filter resolved from query_param geo fields
+        semantic_cache: Optional index reusing cached results of similar queries
 
     Returns:
         QueryResult | None: Unified query result object containing:
@@ -4796,7 +5333,16 @@ async def naive_query(
         logger.error("Tokenizer not found in global configuration.")
         return QueryResult(content=PROMPTS["fail_response"])
 
-    chunks = await _get_vector_context(query, chunks_vdb, query_param, None)
+    query_embedding = None
+    if semantic_cache is not None and semantic_cache.enabled_for(hashing_kv):
+        try:
+            query_embedding = await semantic_cache.embed(hashing_kv, query)
+        except Exception as e:
+            logger.warning(f"Failed to pre-compute query embedding: {e}")
+
+    chunks = await _get_vector_context(
+        query, chunks_vdb, query_param, query_embedding, geo_filter
+    )
 
     if chunks is None or len(chunks) == 0:
         logger.info(
@@ -4933,10 +5479,15 @@ async def naive_query(
         query_param.max_total_tokens,
         query_param.user_prompt or "",
         query_param.enable_rerank,
+        geo_cache_key(query_param),
     )
     cached_result = await handle_cache(
         hashing_kv, args_hash, user_query, query_param.mode, cache_type="query"
     )
+    if cached_result is None and semantic_cache is not None:
+        cached_result = await semantic_cache.lookup(
+            hashing_kv, query, query_param, "query"
+        )
     if cached_result is not None:
         cached_response, _ = cached_result  # Extract content, ignore timestamp
         logger.info(
@@ -4975,6 +5526,14 @@ async def naive_query(
                     queryparam=queryparam_dict,
                 ),
             )
+            if semantic_cache is not None and isinstance(response, str):
+                await semantic_cache.add(
+                    hashing_kv,
+                    query,
+                    query_param,
+                    "query",
+                    generate_cache_key(query_param.mode, "query", args_hash),
+                )
 
     # Return unified result based on actual response type
     if isinstance(response, str):
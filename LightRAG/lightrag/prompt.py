@@ -7,6 +7,7 @@ PROMPTS: dict[str, Any] = {}
 # All delimiters must be formatted as "<|UPPER_CASE_STRING|>"
 PROMPTS["DEFAULT_TUPLE_DELIMITER"] = "<|#|>"
 PROMPTS["DEFAULT_COMPLETION_DELIMITER"] = "<|COMPLETE|>"
+PROMPTS["DEFAULT_CHUNK_DELIMITER"] = "<|CHUNK|>"
 
 PROMPTS["entity_extraction_system_prompt"] = """---Role---
 You are a Knowledge Graph Specialist responsible for extracting entities and relationships from the input text.
@@ -98,6 +99,21 @@ Based on the last extraction task, identify and extract any **missed or incorrec
 <Output>
 """
 
+PROMPTS["entity_extraction_batch_user_prompt"] = """---Task---
+Extract entities and relationships from each of the {chunk_count} sections of the input text to be processed.
+
+---Instructions---
+1.  **Independent Sections:** The input text consists of {chunk_count} unrelated sections. Each section starts with a header line made of `{chunk_delimiter}` followed by the section number (e.g. `{chunk_delimiter}1`). Extract entities and relationships from each section separately, as if it were the only text provided.
+2.  **Output Grouping:** For each section, in order, output its header line exactly as given, followed by the entities and relationships extracted from that section. Output the header line even if nothing can be extracted from the section.
+3.  **Repeated Entities:** If an entity or relationship appears in several sections, output it under every section in which it appears, described using only the information of that section.
+4.  **Strict Adherence to Format:** Strictly adhere to all format requirements for entity and relationship lists, including output order, field delimiters, and proper noun handling, as specified in the system prompt.
+5.  **Output Content Only:** Output *only* the section header lines and the extracted lists of entities and relationships. Do not include any introductory or concluding remarks, explanations, or additional text.
+6.  **Completion Signal:** Output `{completion_delimiter}` as the final line, once, after all sections have been processed.
+7.  **Output Language:** Ensure the output language is {language}. Proper nouns (e.g., personal names, place names, organization names) must be kept in their original language and not translated.
+
+<Output>
+"""
+
 PROMPTS["entity_extraction_examples"] = [
     """<Input Text>
 ```
@@ -0,0 +1,228 @@
+from __future__ import annotations
+
+import time
+import uuid
+from collections import OrderedDict
+
+import numpy as np
+
+from .base import BaseKVStorage, QueryParam
+from .constants import (
+    DEFAULT_SEMANTIC_CACHE_MAX_ENTRIES,
+    DEFAULT_SEMANTIC_CACHE_THRESHOLD,
+    DEFAULT_SEMANTIC_CACHE_TTL,
+)
+from .geo_index import geo_cache_key
+from .utils import compute_args_hash, generate_cache_key, logger
+
+# Number of recent query embeddings kept, so one query is embedded once
+_EMBEDDING_MEMO_SIZE = 64
+# LLM cache entry holding a token replaced on every document change, shared by
+# all processes using the same LLM cache storage
+SEMANTIC_CACHE_GENERATION_KEY = generate_cache_key("default", "generation", "documents")
+
+
+async def bump_semantic_cache_generation(hashing_kv: BaseKVStorage) -> None:
+    """Invalidate the semantic caches of all processes after documents changed"""
+    await hashing_kv.upsert(
+        {
+            SEMANTIC_CACHE_GENERATION_KEY: {
+                "original_prompt": "",
+                "return": uuid.uuid4().hex,
+                "cache_type": "generation",
+                "create_time": int(time.time()),
+            }
+        }
+    )
+
+
+async def get_semantic_cache_generation(hashing_kv: BaseKVStorage) -> str | None:
+    """Token of the latest document change, None before the first one"""
+    entry = await hashing_kv.get_by_id(SEMANTIC_CACHE_GENERATION_KEY)
+    return entry.get("return") if entry else None
+
+
+def semantic_cache_scope(query_param: QueryParam, cache_type: str) -> str:
+    """QueryParam fields a cached result must share with a similar query
+
+    Keywords only depend on the query text and mode. Answers also depend on
+    every retrieval and response setting that is part of the exact cache key.
+    """
+    if cache_type == "keywords":
+        return compute_args_hash(cache_type, query_param.mode)
+    return compute_args_hash(
+        cache_type,
+        query_param.mode,
+        query_param.response_type,
+        query_param.top_k,
+        query_param.chunk_top_k,
+        query_param.max_entity_tokens,
+        query_param.max_relation_tokens,
+        query_param.max_total_tokens,
+        query_param.user_prompt or "",
+        query_param.enable_rerank,
+        geo_cache_key(query_param),
+    )
+
+
+class SemanticQueryCache:
+    """Finds cached keyword and query results of earlier, similarly phrased queries.
+
+    The exact LLM cache (handle_cache/save_to_cache) only hits when the query
+    text is identical. This index maps query embeddings to the flattened keys
+    of exact cache entries, so a paraphrase whose embedding has a cosine
+    similarity of at least `similarity_threshold` with an earlier query of the
+    same scope reuses its cached result. Content stays in the LLM cache storage.
+
+    The index lives in memory, holds at most `max_entries` queries (oldest are
+    overwritten first) and ignores entries older than `ttl` seconds. Inserting or
+    deleting documents replaces a generation token in the LLM cache storage; the
+    index is cleared when it sees a new token, so a query server notices imports
+    run by another process.
+    """
+
+    def __init__(
+        self,
+        similarity_threshold: float = DEFAULT_SEMANTIC_CACHE_THRESHOLD,
+        ttl: int = DEFAULT_SEMANTIC_CACHE_TTL,
+        max_entries: int = DEFAULT_SEMANTIC_CACHE_MAX_ENTRIES,
+    ):
+        self.similarity_threshold = similarity_threshold
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._embeddings: OrderedDict[str, np.ndarray] = OrderedDict()
+        self._generation: str | None = None
+        self.clear()
+
+    def __len__(self) -> int:
+        return self._size
+
+    def clear(self) -> None:
+        """Forget all entries, e.g. after the indexed documents changed"""
+        self._matrix: np.ndarray | None = None
+        self._scopes = np.zeros(self.max_entries, dtype=np.int64)
+        self._created_at = np.zeros(self.max_entries, dtype=np.float64)
+        self._cache_keys: list[str | None] = [None] * self.max_entries
+        self._texts: list[str | None] = [None] * self.max_entries
+        self._scope_ids: dict[str, int] = {}
+        self._size = 0
+        self._next = 0
+
+    @staticmethod
+    def enabled_for(hashing_kv: BaseKVStorage | None) -> bool:
+        """Entries point into the query LLM cache, so it must be enabled"""
+        return hashing_kv is not None and bool(
+            hashing_kv.global_config.get("enable_llm_cache")
+        )
+
+    async def _sync_generation(self, hashing_kv: BaseKVStorage) -> None:
+        """Clear the index if documents changed since its entries were added"""
+        generation = await get_semantic_cache_generation(hashing_kv)
+        if generation != self._generation:
+            if self._size:
+                logger.info("Semantic cache cleared, documents changed")
+            self.clear()
+            self._generation = generation
+
+    async def embed(self, hashing_kv: BaseKVStorage, text: str) -> np.ndarray:
+        """Embedding of a query, computed once per recent query
+
+        The raw embedding is returned so retrieval can reuse it as query embedding.
+        """
+        vector = self._embeddings.get(text)
+        if vector is not None:
+            self._embeddings.move_to_end(text)
+            return vector
+
+        embedding = await hashing_kv.embedding_func([text])
+        vector = np.asarray(embedding[0], dtype=np.float32)
+        self._embeddings[text] = vector
+        if len(self._embeddings) > _EMBEDDING_MEMO_SIZE:
+            self._embeddings.popitem(last=False)
+        return vector
+
+    async def _normalized_embedding(
+        self, hashing_kv: BaseKVStorage, text: str
+    ) -> np.ndarray:
+        vector = await self.embed(hashing_kv, text)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm > 0 else vector
+
+    async def lookup(
+        self,
+        hashing_kv: BaseKVStorage | None,
+        text: str,
+        query_param: QueryParam,
+        cache_type: str,
+    ) -> tuple[str, int] | None:
+        """Cached result of the most similar earlier query in the same scope
+
+        Returns:
+            (content, create_time) like handle_cache, or None when no earlier
+            query is similar enough
+        """
+        if not self.enabled_for(hashing_kv) or self._matrix is None:
+            return None
+        await self._sync_generation(hashing_kv)
+        scope_id = self._scope_ids.get(semantic_cache_scope(query_param, cache_type))
+        if scope_id is None:
+            return None
+
+        try:
+            vector = await self._normalized_embedding(hashing_kv, text)
+        except Exception as e:
+            logger.warning(f"Semantic cache lookup skipped, embedding failed: {e}")
+            return None
+
+        size = self._size
+        scores = self._matrix[:size] @ vector
+        valid = (self._scopes[:size] == scope_id) & (
+            self._created_at[:size] >= time.time() - self.ttl
+        )
+        scores = np.where(valid, scores, -np.inf)
+        best = int(np.argmax(scores))
+        if scores[best] < self.similarity_threshold:
+            return None
+
+        cache_entry = await hashing_kv.get_by_id(self._cache_keys[best])
+        if not cache_entry:
+            # Exact cache entry was cleared, drop the dangling index entry
+            self._created_at[best] = 0
+            return None
+
+        logger.info(
+            f" == Semantic cache == {cache_type} hit ({scores[best]:.3f}): "
+            f"'{text[:60]}' ~ '{self._texts[best][:60]}'"
+        )
+        return cache_entry["return"], cache_entry.get("create_time", 0)
+
+    async def add(
+        self,
+        hashing_kv: BaseKVStorage | None,
+        text: str,
+        query_param: QueryParam,
+        cache_type: str,
+        cache_key: str,
+    ) -> None:
+        """Index a query whose result was saved under cache_key in hashing_kv"""
+        if not self.enabled_for(hashing_kv):
+            return
+        try:
+            vector = await self._normalized_embedding(hashing_kv, text)
+        except Exception as e:
+            logger.warning(f"Semantic cache entry skipped, embedding failed: {e}")
+            return
+        await self._sync_generation(hashing_kv)
+
+        if self._matrix is None:
+            self._matrix = np.zeros((self.max_entries, len(vector)), dtype=np.float32)
+        scope = semantic_cache_scope(query_param, cache_type)
+
+        slot = self._next
+        self._matrix[slot] = vector
+        self._scopes[slot] = self._scope_ids.setdefault(scope, len(self._scope_ids))
+        self._created_at[slot] = time.time()
+        self._cache_keys[slot] = cache_key
+        self._texts[slot] = text
+        self._next = (slot + 1) % self.max_entries
+        self._size = min(self._size + 1, self.max_entries)
@@ -13,6 +13,7 @@ import os
 import re
 import time
 import uuid
+from collections import OrderedDict
 from dataclasses import dataclass
 from datetime import datetime
 from functools import wraps
@@ -40,6 +41,7 @@ from lightrag.constants import (
     DEFAULT_SOURCE_IDS_LIMIT_METHOD,
     VALID_SOURCE_IDS_LIMIT_METHODS,
     SOURCE_IDS_LIMIT_METHOD_FIFO,
+    DEFAULT_CHUNK_VECTOR_CACHE_SIZE,
 )
 
 # Precompile regex pattern for JSON sanitization (module-level, compiled once)
@@ -2402,6 +2404,82 @@ def pick_by_weighted_polling(
     return selected_chunks
 
 
+def _normalize_vector(vector) -> np.ndarray:
+    """Convert a vector to a float32 unit vector (zero vectors stay zero)"""
+    vector = np.asarray(vector, dtype=np.float32).ravel()
+    norm = np.linalg.norm(vector)
+    return vector / norm if norm > 0 else vector
+
+
+class VectorLRUCache:
+    """LRU cache of decoded, unit-normalized embedding vectors keyed by ID.
+
+    Chunk IDs are content hashes, so a cached vector stays valid for as long as
+    the embedding model of the owning storage is unchanged.
+    """
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._vectors: OrderedDict[str, np.ndarray] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._vectors)
+
+    def get_many(self, ids: list[str]) -> tuple[dict[str, np.ndarray], list[str]]:
+        """Look up vectors by ID
+
+        Returns:
+            Tuple of (found vectors by ID, list of missing IDs)
+        """
+        found: dict[str, np.ndarray] = {}
+        missing: list[str] = []
+        for id_ in ids:
+            vector = self._vectors.get(id_)
+            if vector is None:
+                missing.append(id_)
+            else:
+                self._vectors.move_to_end(id_)
+                found[id_] = vector
+        self.hits += len(found)
+        self.misses += len(missing)
+        return found, missing
+
+    def put_many(self, vectors: dict[str, Any]) -> dict[str, np.ndarray]:
+        """Normalize and cache vectors, evicting least recently used entries
+
+        Returns:
+            The normalized vectors by ID
+        """
+        normalized = {id_: _normalize_vector(vector) for id_, vector in vectors.items()}
+        for id_, vector in normalized.items():
+            self._vectors[id_] = vector
+            self._vectors.move_to_end(id_)
+        while len(self._vectors) > self.max_size:
+            self._vectors.popitem(last=False)
+        return normalized
+
+    def clear(self) -> None:
+        self._vectors.clear()
+
+    def stats(self) -> dict[str, int]:
+        return {"size": len(self._vectors), "hits": self.hits, "misses": self.misses}
+
+
+def get_chunk_vector_cache(chunks_vdb: "BaseVectorStorage") -> VectorLRUCache:
+    """Get (or create) the chunk vector cache attached to a chunks vector storage"""
+    cache = getattr(chunks_vdb, "_chunk_vector_cache", None)
+    if cache is None:
+        cache = VectorLRUCache(
+            get_env_value(
+                "CHUNK_VECTOR_CACHE_SIZE", DEFAULT_CHUNK_VECTOR_CACHE_SIZE, int
+            )
+        )
+        chunks_vdb._chunk_vector_cache = cache
+    return cache
+
+
 async def pick_by_vector_similarity(
     query: str,
     text_chunks_storage: "BaseKVStorage",
@@ -2468,10 +2546,14 @@ async def pick_by_vector_similarity(
                 "Using pre-computed query embedding for vector similarity chunk selection"
             )
 
-        # Get chunk embeddings from vector database
-        chunk_vectors = await chunks_vdb.get_vectors_by_ids(all_chunk_ids)
+        # Get chunk embeddings from the cache, fetching only misses from the vector database
+        vector_cache = get_chunk_vector_cache(chunks_vdb)
+        chunk_vectors, missing_ids = vector_cache.get_many(all_chunk_ids)
+        if missing_ids:
+            fetched_vectors = await chunks_vdb.get_vectors_by_ids(missing_ids)
+            chunk_vectors.update(vector_cache.put_many(fetched_vectors))
         logger.debug(
-            f"Vector similarity chunk selection: {len(chunk_vectors)} chunk vectors Retrieved"
+            f"Vector similarity chunk selection: {len(chunk_vectors)} chunk vectors retrieved, {len(missing_ids)} from chunks_vdb (cache {vector_cache.stats()})"
         )
 
         if not chunk_vectors or len(chunk_vectors) != len(all_chunk_ids):
@@ -2485,29 +2567,20 @@ async def pick_by_vector_similarity(
                 )
             return []
 
-        # Calculate cosine similarities
-        similarities = []
-        valid_vectors = 0
-        for chunk_id in all_chunk_ids:
-            if chunk_id in chunk_vectors:
-                chunk_embedding = chunk_vectors[chunk_id]
-                try:
-                    # Calculate cosine similarity
-                    similarity = cosine_similarity(query_embedding, chunk_embedding)
-                    similarities.append((chunk_id, similarity))
-                    valid_vectors += 1
-                except Exception as e:
-                    logger.warning(
-                        f"Vector similarity chunk selection: failed to calculate similarity for chunk {chunk_id}: {e}"
-                    )
-            else:
-                logger.warning(
-                    f"Vector similarity chunk selection:  no vector found for chunk {chunk_id}"
-                )
+        # Cached vectors are unit length, so one matrix-vector product yields cosine similarities
+        chunk_matrix = np.stack([chunk_vectors[chunk_id] for chunk_id in all_chunk_ids])
+        query_vector = _normalize_vector(query_embedding)
+        similarities = chunk_matrix @ query_vector
 
-        # Sort by similarity (highest first) and select top num_of_chunks
-        similarities.sort(key=lambda x: x[1], reverse=True)
-        selected_chunks = [chunk_id for chunk_id, _ in similarities[:num_of_chunks]]
+        # Select top num_of_chunks without a full sort, then order them (highest first)
+        if num_of_chunks < len(all_chunk_ids):
+            top_indices = np.argpartition(-similarities, num_of_chunks - 1)[
+                :num_of_chunks
+            ]
+        else:
+            top_indices = np.arange(len(all_chunk_ids))
+        top_indices = top_indices[np.argsort(-similarities[top_indices], kind="stable")]
+        selected_chunks = [all_chunk_ids[i] for i in top_indices]
 
         logger.debug(
             f"Vector similarity chunk selection: {len(selected_chunks)} chunks from {len(all_chunk_ids)} candidates"
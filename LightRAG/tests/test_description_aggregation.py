@@ -0,0 +1,147 @@
+"""
+Tests for the incremental aggregation of entity / relation descriptions
+(rolling summary plus a bounded reservoir of recent fragments).
+"""
+
+import pytest
+
+from lightrag.constants import GRAPH_FIELD_SEP
+from lightrag.operate import _aggregate_descriptions, _rebuild_descriptions
+from lightrag.utils import Tokenizer
+
+
+class _WordTokenizer:
+    def encode(self, content):
+        return list(range(len(content.split())))
+
+    def decode(self, tokens):
+        return ""
+
+
+class _FakeSummaryLLM:
+    def __init__(self):
+        self.calls = 0
+
+    async def __call__(self, prompt, **kwargs):
+        self.calls += 1
+        return f"summary {self.calls}"
+
+
+def _global_config(llm, drift):
+    return {
+        "llm_model_func": llm,
+        "tokenizer": Tokenizer("words", _WordTokenizer()),
+        "addon_params": {},
+        "summary_length_recommended": 100,
+        "summary_context_size": 10000,
+        "summary_max_tokens": 60,
+        "force_llm_summary_on_merge": 4,
+        "description_summary_drift": drift,
+        "description_reservoir_size": 6,
+    }
+
+
+async def _merge_fragments(global_config, count):
+    """Merge fragments one at a time as a graph storage would store them"""
+    stored = {}
+    refreshes = []
+    for i in range(count):
+        already = stored["description"].split(GRAPH_FIELD_SEP) if stored else []
+        description, llm_was_used, properties = await _aggregate_descriptions(
+            "Entity",
+            "Paris",
+            already,
+            stored,
+            [f"fragment {i} about Paris"],
+            global_config,
+        )
+        stored = {"description": description, **properties}
+        if llm_was_used:
+            refreshes.append(i)
+    return stored, refreshes
+
+
+@pytest.mark.offline
+async def test_summary_refreshes_get_rarer_and_reservoir_stays_bounded():
+    llm = _FakeSummaryLLM()
+    stored, refreshes = await _merge_fragments(_global_config(llm, 0.5), 60)
+
+    # First summary at force_llm_summary_on_merge fragments, then after 50% growth
+    assert refreshes[:4] == [3, 7, 11, 17]
+    assert len(refreshes) == llm.calls < 10
+    assert stored["summarized_fragments"] + stored["pending_fragments"] == 60
+
+    fragments = stored["description"].split(GRAPH_FIELD_SEP)
+    assert fragments[0] == f"summary {llm.calls}"
+    assert (
+        fragments[1:]
+        == [
+            f"fragment {i} about Paris"
+            for i in range(60 - stored["pending_fragments"], 60)
+        ][-6:]
+    )
+
+
+@pytest.mark.offline
+async def test_reservoir_is_trimmed_to_the_token_budget():
+    llm = _FakeSummaryLLM()
+    stored = {"summarized_fragments": 100, "pending_fragments": 0}
+    description, llm_was_used, properties = await _aggregate_descriptions(
+        "Entity",
+        "Paris",
+        ["old summary"],
+        stored,
+        [" ".join(["word"] * 25) + f" {i}" for i in range(3)],
+        _global_config(llm, 0.5),
+    )
+    assert not llm_was_used and llm.calls == 0
+    # 2 + 26 + 26 tokens fit in summary_max_tokens, the oldest fragment is dropped
+    assert description.split(GRAPH_FIELD_SEP)[0] == "old summary"
+    assert [d.split()[-1] for d in description.split(GRAPH_FIELD_SEP)[1:]] == [
+        "1",
+        "2",
+    ]
+    assert properties == {"summarized_fragments": 100, "pending_fragments": 3}
+
+
+@pytest.mark.offline
+async def test_disabled_drift_resummarizes_all_fragments():
+    llm = _FakeSummaryLLM()
+    stored, refreshes = await _merge_fragments(_global_config(llm, 0), 12)
+    assert set(stored) == {"description"}
+    # The summary is merged as a fragment and summarized again every 3 fragments
+    assert refreshes == [3, 6, 9]
+
+
+@pytest.mark.offline
+async def test_rebuild_restarts_the_rolling_summary():
+    llm = _FakeSummaryLLM()
+    global_config = _global_config(llm, 0.5)
+    fragments = [f"fragment {i} about Paris" for i in range(40)]
+    stale = {"summarized_fragments": 50, "pending_fragments": 7}
+
+    # One summary of the newest reservoir fragments, covering all of them
+    description, properties = await _rebuild_descriptions(
+        "Entity", "Paris", fragments, stale, global_config
+    )
+    assert description == "summary 1" and llm.calls == 1
+    assert properties == {"summarized_fragments": 40, "pending_fragments": 0}
+
+    # Too few fragments to summarize: a plain join, counted as pending
+    description, properties = await _rebuild_descriptions(
+        "Entity", "Paris", fragments[:2], stale, global_config
+    )
+    assert description.split(GRAPH_FIELD_SEP) == fragments[:2]
+    assert properties == {"summarized_fragments": 0, "pending_fragments": 2}
+
+    # Without drift, stale counts are reset and absent ones not added
+    global_config["description_summary_drift"] = 0
+    description, properties = await _rebuild_descriptions(
+        "Entity", "Paris", fragments[:2], stale, global_config
+    )
+    assert properties == {"summarized_fragments": 0, "pending_fragments": 2}
+    assert (
+        await _rebuild_descriptions(
+            "Entity", "Paris", fragments[:2], {"description": ""}, global_config
+        )
+    )[1] == {}
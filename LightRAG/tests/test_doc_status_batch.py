@@ -0,0 +1,64 @@
+"""
+Tests for batched document status transitions (DocStatusStorage.update_status_batch).
+"""
+
+import pytest
+
+from lightrag.base import DocStatus
+from lightrag.kg.json_doc_status_impl import JsonDocStatusStorage
+from lightrag.kg.shared_storage import finalize_share_data, initialize_share_data
+
+
+@pytest.fixture(autouse=True)
+def setup_shared_data():
+    initialize_share_data()
+    yield
+    finalize_share_data()
+
+
+@pytest.mark.offline
+async def test_update_status_batch_keeps_other_fields(tmp_path):
+    storage = JsonDocStatusStorage(
+        namespace="doc_status",
+        workspace="test",
+        global_config={"working_dir": str(tmp_path)},
+        embedding_func=None,
+    )
+    await storage.initialize()
+    await storage.upsert(
+        {
+            f"doc-{i}": {
+                "content_summary": f"summary {i}",
+                "content_length": 10,
+                "status": DocStatus.PROCESSING,
+                "file_path": "places.jsonl",
+                "chunks_list": [f"chunk-{i}"],
+                "metadata": {"processing_start_time": 1},
+                "created_at": "2025-01-01T00:00:00+00:00",
+                "updated_at": "2025-01-01T00:00:00+00:00",
+            }
+            for i in range(3)
+        }
+    )
+
+    await storage.update_status_batch(
+        ["doc-0", "doc-1", "missing"], DocStatus.FAILED, error_msg="timeout"
+    )
+
+    failed = await storage.get_docs_by_status(DocStatus.FAILED)
+    assert sorted(failed) == ["doc-0", "doc-1"]
+    assert failed["doc-0"].error_msg == "timeout"
+    assert failed["doc-0"].chunks_list == ["chunk-0"]
+    assert failed["doc-0"].metadata == {"processing_start_time": 1}
+    assert failed["doc-0"].updated_at != "2025-01-01T00:00:00+00:00"
+    assert await storage.get_by_id("missing") is None
+
+    await storage.update_status_batch(
+        ["doc-0", "doc-1", "doc-2"], DocStatus.PENDING, error_msg="", metadata={}
+    )
+    pending = await storage.get_docs_by_status(DocStatus.PENDING)
+    assert sorted(pending) == ["doc-0", "doc-1", "doc-2"]
+    assert pending["doc-0"].metadata == {}
+    assert await storage.get_status_counts() == {
+        status.value: 3 if status == DocStatus.PENDING else 0 for status in DocStatus
+    }
@@ -0,0 +1,89 @@
+"""
+Tests for coalescing embedding requests of concurrent callers.
+"""
+
+import asyncio
+
+import numpy as np
+import pytest
+
+from lightrag.embedding_coalescer import EmbeddingCoalescer
+from lightrag.utils import EmbeddingFunc, Tokenizer
+
+
+class _WordTokenizer:
+    def encode(self, content):
+        return content.split()
+
+    def decode(self, tokens):
+        return " ".join(tokens)
+
+
+def _make_embedding_func(calls, max_token_size=None):
+    async def embed(texts, **kwargs):
+        calls.append((list(texts), kwargs.get("_priority")))
+        await asyncio.sleep(0.01)
+        if "bad" in texts:
+            raise RuntimeError("rejected text")
+        return np.array([[len(text), 1.0] for text in texts])
+
+    return EmbeddingFunc(embedding_dim=2, func=embed, max_token_size=max_token_size)
+
+
+@pytest.mark.offline
+async def test_concurrent_requests_share_batches():
+    calls = []
+    embed = EmbeddingCoalescer(
+        _make_embedding_func(calls), batch_size=4, max_wait=0.05
+    ).as_embedding_func()
+    assert embed.embedding_dim == 2
+
+    results = await asyncio.gather(
+        embed(["a", "bb"]),
+        embed(["bb", "ccc"]),
+        embed(["dddd"]),
+        embed(["eeeee", "a"]),
+    )
+
+    # Duplicates are embedded once, batches hold at most batch_size texts
+    assert [texts for texts, _ in calls] == [["a", "bb", "ccc", "dddd"], ["eeeee"]]
+    expected = [["a", "bb"], ["bb", "ccc"], ["dddd"], ["eeeee", "a"]]
+    for result, texts in zip(results, expected):
+        assert result.tolist() == [[len(text), 1.0] for text in texts]
+
+
+@pytest.mark.offline
+async def test_batches_keep_priority_and_token_limits():
+    calls = []
+    embed = EmbeddingCoalescer(
+        _make_embedding_func(calls, max_token_size=3),
+        batch_size=10,
+        max_tokens=5,
+        max_wait=0.05,
+        tokenizer=Tokenizer("words", _WordTokenizer()),
+    ).as_embedding_func()
+
+    await asyncio.gather(
+        embed(["one two", "three four"]),
+        embed(["five", "one two"], _priority=5),
+        embed(["six seven eight nine"]),
+    )
+
+    assert sorted(calls, key=str) == sorted(
+        [
+            # "one two" was promoted to the higher priority (lower value) batch
+            (["one two", "five"], 5),
+            (["three four"], None),
+            # Longer than max_token_size, sent on its own
+            (["six seven eight nine"], None),
+        ],
+        key=str,
+    )
+
+    # Failures reach every caller waiting for a text of the failed batch only
+    calls.clear()
+    results = await asyncio.gather(
+        embed(["bad", "ok"]), embed(["ok"]), return_exceptions=True
+    )
+    assert all(isinstance(r, RuntimeError) for r in results)
+    assert (await embed(["ok"])).tolist() == [[2, 1.0]]
@@ -0,0 +1,153 @@
+"""
+Tests for micro-batched entity extraction (several chunks packed into one prompt).
+"""
+
+import re
+
+import pytest
+
+from lightrag.extraction_batch import (
+    EntityExtractionBatcher,
+    split_batched_extraction_result,
+)
+from lightrag.kg.json_kv_impl import JsonKVStorage
+from lightrag.kg.shared_storage import finalize_share_data, initialize_share_data
+from lightrag.operate import _get_cached_extraction_results, extract_entities
+
+CHUNKS = {
+    "chunk-louvre": "Louvre is a museum in Paris.",
+    "chunk-prado": "Prado is a museum in Madrid.",
+    "chunk-uffizi": "Uffizi is a gallery in Florence.",
+}
+
+
+@pytest.fixture(autouse=True)
+def setup_shared_data():
+    initialize_share_data()
+    yield
+    finalize_share_data()
+
+
+class _FakeExtractionLLM:
+    """Extracts the first word of every input section as an entity"""
+
+    def __init__(self, dropped_sections=()):
+        self.dropped_sections = set(dropped_sections)
+        self.packed_calls = 0
+        self.single_calls = 0
+
+    async def __call__(self, prompt, system_prompt=None, **kwargs):
+        input_text = system_prompt.split("---Real Data to be Processed---")[1]
+        input_text = input_text.split("Text:\n```\n")[1].rsplit("\n```", 1)[0]
+        sections = re.findall(r"<\|CHUNK\|>(\d+)\n([^\n]+)", input_text)
+        if not sections:
+            self.single_calls += 1
+            return f"{self._entity(input_text)}\n<|COMPLETE|>"
+
+        self.packed_calls += 1
+        lines = [
+            f"<|CHUNK|>{label}\n{self._entity(content)}"
+            for label, content in sections
+            if label not in self.dropped_sections
+        ]
+        return "\n".join(lines + ["<|COMPLETE|>"])
+
+    @staticmethod
+    def _entity(content):
+        name = content.split()[0]
+        return f"entity<|#|>{name}<|#|>location<|#|>{content.strip()}"
+
+
+async def _make_kv(working_dir, namespace) -> JsonKVStorage:
+    storage = JsonKVStorage(
+        namespace=namespace,
+        workspace="test",
+        global_config={
+            "working_dir": str(working_dir),
+            "enable_llm_cache_for_entity_extract": True,
+        },
+        embedding_func=None,
+    )
+    await storage.initialize()
+    return storage
+
+
+@pytest.mark.offline
+def test_split_batched_extraction_result():
+    result = (
+        "<|CHUNK|>1\nentity<|#|>A<|#|>location<|#|>A desc\n"
+        "<|chunk|> 2\n"
+        "<|CHUNK|>3\nentity<|#|>C<|#|>location<|#|>C desc\n<|COMPLETE|>"
+    )
+    sections = split_batched_extraction_result(result)
+    assert list(sections) == ["1", "2", "3"]
+    assert sections["1"] == "entity<|#|>A<|#|>location<|#|>A desc\n<|COMPLETE|>"
+    assert sections["2"] == "<|COMPLETE|>"  # nothing extracted from section 2
+
+    # Response cut off before the completion delimiter: last section is unreliable
+    truncated = split_batched_extraction_result(result.replace("<|COMPLETE|>", ""))
+    assert list(truncated) == ["1", "2"]
+
+
+@pytest.mark.offline
+async def test_batched_extraction_keeps_per_chunk_cache(tmp_path):
+    llm_cache = await _make_kv(tmp_path, "llm_response_cache")
+    text_chunks = await _make_kv(tmp_path, "text_chunks")
+    chunks = {
+        chunk_id: {
+            "content": content,
+            "tokens": 10,
+            "full_doc_id": f"doc-{chunk_id}",
+            "chunk_order_index": 0,
+            "file_path": "places.jsonl",
+        }
+        for chunk_id, content in CHUNKS.items()
+    }
+    await text_chunks.upsert(
+        {chunk_id: {**dp, "llm_cache_list": []} for chunk_id, dp in chunks.items()}
+    )
+
+    llm = _FakeExtractionLLM(dropped_sections={"2"})
+    global_config = {
+        "llm_model_func": llm,
+        "entity_extract_max_gleaning": 0,
+        "addon_params": {},
+        "llm_model_max_async": 4,
+    }
+    batcher = EntityExtractionBatcher(batch_size=3, max_tokens=1000, max_wait=0.05)
+
+    results = await extract_entities(
+        chunks,
+        global_config,
+        llm_response_cache=llm_cache,
+        text_chunks_storage=text_chunks,
+        extraction_batcher=batcher,
+    )
+
+    # One packed call, plus one for the chunk missing from the packed response
+    assert (llm.packed_calls, llm.single_calls) == (1, 1)
+    sources = {
+        name: nodes[0]["source_id"]
+        for maybe_nodes, _ in results
+        for name, nodes in maybe_nodes.items()
+    }
+    assert sources == {
+        "Louvre": "chunk-louvre",
+        "Prado": "chunk-prado",
+        "Uffizi": "chunk-uffizi",
+    }
+
+    # Rebuilds find one extraction result per chunk
+    cached = await _get_cached_extraction_results(llm_cache, set(chunks), text_chunks)
+    assert set(cached) == set(chunks)
+    assert all(len(entries) == 1 for entries in cached.values())
+    assert "Prado" in cached["chunk-prado"][0][0]
+
+    # Cache entries are keyed by the single-chunk prompt, so an unbatched run hits them
+    await extract_entities(
+        chunks,
+        global_config,
+        llm_response_cache=llm_cache,
+        text_chunks_storage=text_chunks,
+    )
+    assert (llm.packed_calls, llm.single_calls) == (1, 1)
@@ -0,0 +1,172 @@
+"""
+Tests for FaissVectorDBStorage ID lookup, tombstoned deletes, compaction and
+ANN index types.
+"""
+
+import json
+import os
+
+import numpy as np
+import pytest
+
+pytest.importorskip("faiss")
+
+from lightrag.kg import faiss_impl  # noqa: E402
+from lightrag.kg.faiss_impl import FaissVectorDBStorage  # noqa: E402
+from lightrag.kg.shared_storage import (  # noqa: E402
+    finalize_share_data,
+    initialize_share_data,
+)
+from lightrag.utils import EmbeddingFunc  # noqa: E402
+
+# Each content names the axis of its embedding
+AXES = {"north": 0, "east": 1, "south": 2, "west": 3}
+
+
+@pytest.fixture(autouse=True)
+def setup_shared_data():
+    initialize_share_data()
+    yield
+    finalize_share_data()
+
+
+async def _embed(texts: list[str], **kwargs) -> np.ndarray:
+    vectors = np.zeros((len(texts), 4))
+    for i, text in enumerate(texts):
+        vectors[i, AXES[text]] = 1.0
+    return vectors
+
+
+async def _make_storage(working_dir) -> FaissVectorDBStorage:
+    storage = FaissVectorDBStorage(
+        namespace="entities",
+        workspace="test",
+        global_config={
+            "working_dir": str(working_dir),
+            "embedding_batch_num": 10,
+            "vector_db_storage_cls_kwargs": {"cosine_better_than_threshold": 0.5},
+        },
+        embedding_func=EmbeddingFunc(embedding_dim=4, func=_embed),
+        meta_fields={"entity_name"},
+    )
+    await storage.initialize()
+    return storage
+
+
+@pytest.mark.offline
+async def test_reupsert_and_delete_tombstone_without_rebuild(tmp_path, monkeypatch):
+    monkeypatch.setenv("FAISS_COMPACT_RATIO", "0.5")
+    storage = await _make_storage(tmp_path)
+    await storage.upsert(
+        {f"ent-{axis}": {"content": axis, "entity_name": axis.title()} for axis in AXES}
+    )
+    index = storage._index
+
+    # Re-importing a changed entity appends to the same index object
+    await storage.upsert({"ent-north": {"content": "east", "entity_name": "North"}})
+    await storage.delete(["ent-west"])
+    assert storage._index is index
+    assert index.ntotal == 5
+    assert storage._tombstones == {0, 3}
+
+    results = await storage.query("east", top_k=5)
+    assert sorted(r["id"] for r in results) == ["ent-east", "ent-north"]
+    assert await storage.query("north", top_k=5) == []
+    assert await storage.query("west", top_k=5) == []
+    assert (await storage.get_by_id("ent-north"))["entity_name"] == "North"
+    assert await storage.get_by_id("ent-west") is None
+    assert list(await storage.get_vectors_by_ids(["ent-north", "ent-west"])) == [
+        "ent-north"
+    ]
+
+    # Tombstones survive a save below the compaction ratio
+    assert await storage.index_done_callback()
+    reloaded = await _make_storage(tmp_path)
+    assert reloaded._index.ntotal == 5
+    assert reloaded._tombstones == {0, 3}
+    assert await reloaded.query("west", top_k=5) == []
+
+    # Past the ratio, saving drops the tombstoned vectors
+    await reloaded.delete(["ent-south"])
+    assert await reloaded.index_done_callback()
+    assert reloaded._index.ntotal == 2
+    assert reloaded._tombstones == set()
+    results = await reloaded.query("east", top_k=5)
+    assert sorted(r["id"] for r in results) == ["ent-east", "ent-north"]
+    assert reloaded._find_faiss_id_by_custom_id("ent-north") in (0, 1)
+
+
+@pytest.mark.offline
+@pytest.mark.parametrize("index_type", ["HNSW", "IVF", "IVFPQ"])
+async def test_ann_index_types(tmp_path, monkeypatch, index_type):
+    monkeypatch.setenv("FAISS_INDEX_TYPE", index_type)
+    rng = np.random.default_rng(0)
+    vectors = rng.normal(size=(2000, 16)).astype(np.float32)
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+    embeddings = {f"text-{i}": vector for i, vector in enumerate(vectors)}
+
+    async def embed(texts, **kwargs):
+        return np.array([embeddings[text] for text in texts])
+
+    storage = FaissVectorDBStorage(
+        namespace="chunks",
+        workspace="test",
+        global_config={
+            "working_dir": str(tmp_path),
+            "embedding_batch_num": 500,
+            "vector_db_storage_cls_kwargs": {
+                "cosine_better_than_threshold": -1.0,
+                "faiss_ivf_nprobe": 8,
+                "faiss_pq_m": 8,
+                # 39 * 2**5 training points fit in the 2000 vectors
+                "faiss_pq_nbits": 5,
+            },
+        },
+        embedding_func=EmbeddingFunc(embedding_dim=16, func=embed),
+    )
+    await storage.initialize()
+    await storage.upsert(
+        {f"chunk-{i}": {"content": text} for i, text in enumerate(embeddings)}
+    )
+
+    # IVF indexes stay exact until trained on save
+    expected_type = "HNSW" if index_type == "HNSW" else "FLAT"
+    assert faiss_impl._index_type_of(storage._index) == expected_type
+    assert await storage.index_done_callback()
+    assert faiss_impl._index_type_of(storage._index) == index_type
+
+    # Vectors are kept as float16 outside of the metadata file
+    vectors_file = storage._faiss_index_file + ".vectors.npy"
+    assert np.load(vectors_file, mmap_mode="r").dtype == np.float16
+    with open(storage._meta_file, encoding="utf-8") as f:
+        assert "__vector__" not in f.read()
+    stored = await storage.get_vectors_by_ids(["chunk-7"])
+    assert np.allclose(stored["chunk-7"], vectors[7], atol=1e-3)
+
+    # Recall of the nearest neighbours against exact search
+    queries = vectors[:50] + rng.normal(scale=0.1, size=(50, 16)).astype(np.float32)
+    exact = np.argsort(-(queries @ vectors.T), axis=1)[:, :10]
+    hits = 0
+    for query, nearest in zip(queries, exact):
+        results = await storage.query("", top_k=10, query_embedding=query.tolist())
+        hits += len({r["id"] for r in results} & {f"chunk-{i}" for i in nearest})
+    assert hits / exact.size >= 0.8
+
+    # Reloading keeps the trained index; metadata of older versions is migrated
+    with open(storage._meta_file, encoding="utf-8") as f:
+        meta = json.load(f)
+    meta["7"]["__vector__"] = vectors[7].tolist()
+    with open(storage._meta_file, "w", encoding="utf-8") as f:
+        json.dump(meta, f)
+    os.remove(vectors_file)
+    reloaded = FaissVectorDBStorage(
+        namespace="chunks",
+        workspace="test",
+        global_config=storage.global_config,
+        embedding_func=storage.embedding_func,
+    )
+    await reloaded.initialize()
+    assert faiss_impl._index_type_of(reloaded._index) == index_type
+    assert "__vector__" not in reloaded._id_to_meta[7]
+    stored = await reloaded.get_vectors_by_ids(["chunk-7"])
+    assert np.allclose(stored["chunk-7"], vectors[7], atol=1e-3)
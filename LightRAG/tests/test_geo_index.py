@@ -0,0 +1,155 @@
+"""
+Tests for the geo-spatial index and region-restricted vector search.
+"""
+
+import numpy as np
+import pytest
+
+from lightrag.base import QueryParam
+from lightrag.geo_index import GeoIndex, geo_cache_key, haversine_km
+from lightrag.operate import _get_edge_data, _query_vdb_in_region
+from lightrag.utils import compute_mdhash_id
+
+CENTRAL_PARK = (40.7825547, -73.9655834)
+TIMES_SQUARE = (40.7579747, -73.9855426)
+TAMPA = (27.9506, -82.4572)
+
+
+def _build_index() -> GeoIndex:
+    index = GeoIndex(cell_size=0.1)
+    index.add_chunk("chunk-park", *CENTRAL_PARK)
+    index.add_chunk("chunk-square", *TIMES_SQUARE)
+    index.add_chunk("chunk-tampa", *TAMPA)
+    index.link_entity("Central Park", ["chunk-park"])
+    index.link_entity("New York", ["chunk-park", "chunk-square"])
+    index.link_entity("Tampa", ["chunk-tampa", "chunk-unknown"])
+    index.link_relation("New York", "Central Park", ["chunk-park"])
+    return index
+
+
+@pytest.mark.offline
+def test_radius_and_bbox_queries():
+    index = _build_index()
+
+    assert 2.5 < haversine_km(*CENTRAL_PARK, *TIMES_SQUARE) < 3.5
+    assert index.chunks_within(*CENTRAL_PARK, radius_km=1) == {"chunk-park"}
+    assert index.chunks_within(*CENTRAL_PARK, radius_km=5) == {
+        "chunk-park",
+        "chunk-square",
+    }
+    # Wide radius walks the occupied cells instead of every covered cell
+    assert len(index.chunks_within(*CENTRAL_PARK, radius_km=2000)) == 3
+    assert index.chunks_in_bbox(27, -83, 29, -82) == {"chunk-tampa"}
+
+
+@pytest.mark.offline
+def test_resolve_links_entities_and_relations(tmp_path):
+    index = _build_index()
+
+    assert index.resolve(QueryParam()) is None
+
+    param = QueryParam(geo_center=CENTRAL_PARK, geo_radius_km=1)
+    geo_filter = index.resolve(param)
+    assert geo_filter.chunk_ids == {"chunk-park"}
+    assert geo_filter.entity_names == {"Central Park", "New York"}
+    assert geo_filter.relation_pairs == {("Central Park", "New York")}
+    assert compute_mdhash_id("Central Park", prefix="ent-") in (
+        geo_filter.entity_vdb_ids()
+    )
+    assert compute_mdhash_id("Central ParkNew York", prefix="rel-") in (
+        geo_filter.relation_vdb_ids()
+    )
+
+    file_name = str(tmp_path / "geo_index.json")
+    index.save(file_name)
+    loaded = GeoIndex.load(file_name)
+    assert len(loaded) == 3
+    assert loaded.resolve(param) == geo_filter
+    assert len(GeoIndex.load(str(tmp_path / "missing.json"))) == 0
+
+
+@pytest.mark.offline
+def test_geo_cache_key_only_set_with_region():
+    assert geo_cache_key(QueryParam()) == ""
+    assert geo_cache_key(QueryParam(geo_center=CENTRAL_PARK)) == ""
+    assert geo_cache_key(QueryParam(geo_bbox=(27, -83, 29, -82))) != geo_cache_key(
+        QueryParam(geo_center=CENTRAL_PARK, geo_radius_km=1)
+    )
+
+
+class _FakeVectorStorage:
+    def __init__(self, vectors: dict, max_candidates: int = 100):
+        self.vectors = vectors
+        self.global_config = {"geo_max_candidates": max_candidates}
+        self.cosine_better_than_threshold = 0.2
+        self.fetched = []
+
+    async def embedding_func(self, texts):
+        return np.array([[1.0, 0.0, 0.0]] * len(texts))
+
+    async def get_vectors_by_ids(self, ids):
+        self.fetched.extend(ids)
+        return {i: self.vectors[i] for i in ids if i in self.vectors}
+
+    async def get_by_ids(self, ids):
+        return [{"id": i, "content": f"content of {i}"} for i in ids]
+
+    async def query(self, query, top_k, query_embedding=None):
+        ranked = sorted(self.vectors, key=lambda i: -self.vectors[i][0])
+        return [{"id": i} for i in ranked[:top_k]]
+
+
+@pytest.mark.offline
+async def test_query_vdb_in_region_scores_only_candidates():
+    vdb = _FakeVectorStorage(
+        {
+            "a": [1.0, 0.0, 0.0],
+            "b": [0.6, 0.8, 0.0],
+            "c": [0.0, 1.0, 0.0],
+            "outside": [1.0, 0.01, 0.0],
+        }
+    )
+
+    results = await _query_vdb_in_region(vdb, "museum", 5, ["a", "b", "c"])
+    assert [r["id"] for r in results] == ["a", "b"]  # "c" is below the threshold
+    assert results[0]["content"] == "content of a"
+    assert results[0]["distance"] == pytest.approx(1.0)
+    assert "outside" not in vdb.fetched
+
+    assert await _query_vdb_in_region(vdb, "museum", 5, []) == []
+
+    # Too many candidates: filter an over-fetching index query instead
+    vdb.global_config["geo_max_candidates"] = 2
+    results = await _query_vdb_in_region(vdb, "museum", 2, ["a", "b", "c"])
+    assert [r["id"] for r in results] == ["a", "b"]
+
+
+class _FakeGraph:
+    async def get_edges_batch(self, pairs):
+        return {(p["src"], p["tgt"]): {"weight": 1.0} for p in pairs}
+
+    async def get_nodes_batch(self, node_ids):
+        return {node_id: {"entity_id": node_id} for node_id in node_ids}
+
+
+@pytest.mark.offline
+@pytest.mark.parametrize("max_candidates", [100, 1])
+async def test_region_relations_match_either_direction(max_candidates):
+    # Custom KGs store Place -> hub relations under their inserted direction,
+    # while the geo index keeps sorted pairs
+    index = GeoIndex(cell_size=0.1)
+    index.add_chunk("chunk-zoo", *TAMPA)
+    index.link_relation("Zoo (Tampa)", "Tampa", ["chunk-zoo"])
+    relation_id = compute_mdhash_id("Zoo (Tampa)Tampa", prefix="rel-")
+
+    class _RelationStorage(_FakeVectorStorage):
+        async def query(self, query, top_k, query_embedding=None):
+            return [{"id": relation_id, "src_id": "Zoo (Tampa)", "tgt_id": "Tampa"}]
+
+    vdb = _RelationStorage({relation_id: [1.0, 0.0, 0.0]}, max_candidates)
+    geo_filter = index.resolve(QueryParam(geo_center=TAMPA, geo_radius_km=1))
+    edges, entities = await _get_edge_data(
+        "zoo", _FakeGraph(), vdb, QueryParam(top_k=5), geo_filter
+    )
+    assert [(e["src_id"], e["tgt_id"]) for e in edges] == [("Tampa", "Zoo (Tampa)")]
+    assert {e["entity_name"] for e in entities} == {"Tampa", "Zoo (Tampa)"}
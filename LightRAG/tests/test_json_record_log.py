@@ -0,0 +1,162 @@
+"""
+Tests for the append-only record log format of JsonKVStorage and
+JsonDocStatusStorage (KV_STORAGE_FORMAT=log).
+"""
+
+import json
+import os
+
+import pytest
+
+from lightrag.base import DocStatus
+from lightrag.kg import json_record_log
+from lightrag.kg.json_doc_status_impl import JsonDocStatusStorage
+from lightrag.kg.json_kv_impl import JsonKVStorage
+from lightrag.kg.json_record_log import JsonRecordLog, export_json, read_record_log
+from lightrag.kg.shared_storage import (
+    finalize_share_data,
+    initialize_share_data,
+)
+
+
+@pytest.fixture(autouse=True)
+def setup_shared_data(monkeypatch):
+    monkeypatch.setenv("KV_STORAGE_FORMAT", "log")
+    initialize_share_data()
+    yield
+    finalize_share_data()
+
+
+async def _make_kv(working_dir) -> JsonKVStorage:
+    storage = JsonKVStorage(
+        namespace="text_chunks",
+        workspace="test",
+        global_config={"working_dir": str(working_dir)},
+        embedding_func=None,
+    )
+    await storage.initialize()
+    return storage
+
+
+async def _reload_kv(working_dir) -> JsonKVStorage:
+    # A fresh process loading the files
+    finalize_share_data()
+    initialize_share_data()
+    return await _make_kv(working_dir)
+
+
+@pytest.mark.offline
+async def test_kv_flush_appends_changed_records(tmp_path):
+    # An existing JSON file is imported into the log on first load
+    workspace_dir = tmp_path / "test"
+    workspace_dir.mkdir()
+    with open(workspace_dir / "kv_store_text_chunks.json", "w") as f:
+        json.dump({"chunk-old": {"content": "old", "llm_cache_list": []}}, f)
+    storage = await _make_kv(tmp_path)
+    log_file = storage._log.file_name
+    assert log_file == str(workspace_dir / "kv_store_text_chunks.log")
+    assert (await storage.get_by_id("chunk-old"))["content"] == "old"
+
+    await storage.upsert({f"chunk-{i}": {"content": f"text {i}"} for i in range(3)})
+    await storage.index_done_callback()
+    size = os.path.getsize(log_file)
+
+    # Later flushes only append the upserted and deleted keys
+    await storage.upsert({"chunk-1": {"content": "changed"}})
+    await storage.delete(["chunk-2", "missing"])
+    await storage.index_done_callback()
+    with open(log_file, "rb") as f:
+        f.seek(size)
+        appended = [json.loads(line) for line in f]
+    assert [(r["k"], r.get("d")) for r in appended] == [
+        ("chunk-1", None),
+        ("chunk-2", 1),
+    ]
+    data, index, end = read_record_log(log_file)
+    assert sorted(data) == ["chunk-0", "chunk-1", "chunk-old"]
+    assert sorted(index) == sorted(storage._log._index)
+    assert storage._log._index["chunk-1"][0] == size
+
+    # A record cut off by a crash is dropped on load
+    with open(log_file, "ab") as f:
+        f.write(b'{"k": "chunk-9", "v": {"con')
+    reloaded = await _reload_kv(tmp_path)
+    assert (await reloaded.get_by_id("chunk-1"))["content"] == "changed"
+    assert await reloaded.get_by_id("chunk-2") is None
+    assert await reloaded.get_by_id("chunk-9") is None
+    assert os.path.getsize(log_file) == end
+
+    assert (await reloaded.drop())["status"] == "success"
+    assert os.path.getsize(log_file) == 0
+    assert await (await _reload_kv(tmp_path)).is_empty()
+
+
+@pytest.mark.offline
+async def test_background_compaction_keeps_concurrent_flushes(tmp_path, monkeypatch):
+    monkeypatch.setattr(json_record_log, "KV_LOG_COMPACT_MIN_BYTES", 0)
+    monkeypatch.setenv("KV_LOG_COMPACT_RATIO", "1.5")
+    storage = await _make_kv(tmp_path)
+    await storage.upsert({f"chunk-{i}": {"content": f"text {i}"} for i in range(5)})
+    await storage.index_done_callback()
+    assert storage._log._compaction is None
+
+    # Flushed while the live records are being copied
+    copy_records = JsonRecordLog._copy_records
+
+    def copy_during_flush(log, entries, tmp_file):
+        new_index = copy_records(log, entries, tmp_file)
+        storage._data["chunk-0"] = {"content": "during compaction"}
+        storage._data.pop("chunk-4")
+        log.mark(["chunk-0", "chunk-4"])
+        log.flush(storage._data)
+        return new_index
+
+    monkeypatch.setattr(JsonRecordLog, "_copy_records", copy_during_flush)
+    for round in range(3):
+        await storage.upsert(
+            {f"chunk-{i}": {"content": f"text {i} v{round}"} for i in range(2)}
+        )
+        await storage.index_done_callback()
+    await storage._log.wait_compaction()
+
+    data, index, size = read_record_log(storage._log.file_name)
+    assert size == os.path.getsize(storage._log.file_name)
+    assert sorted(index.items()) == sorted(storage._log._index.items())
+    assert {k: v["content"] for k, v in data.items()} == {
+        "chunk-0": "during compaction",
+        "chunk-1": "text 1 v2",
+        "chunk-2": "text 2",
+        "chunk-3": "text 3",
+    }
+    assert storage._log._state["live"] == sum(length for _, length in index.values())
+
+
+@pytest.mark.offline
+async def test_doc_status_log_and_json_export(tmp_path):
+    storage = JsonDocStatusStorage(
+        namespace="doc_status",
+        workspace="",
+        global_config={"working_dir": str(tmp_path)},
+        embedding_func=None,
+    )
+    await storage.initialize()
+    # Doc status upserts flush immediately
+    await storage.upsert(
+        {
+            "doc-1": {
+                "content_summary": "Central Park",
+                "content_length": 12,
+                "status": DocStatus.PENDING,
+                "file_path": "places.jsonl",
+                "created_at": "2025-01-01T00:00:00+00:00",
+                "updated_at": "2025-01-01T00:00:00+00:00",
+            }
+        }
+    )
+    log_file = tmp_path / "kv_store_doc_status.log"
+    assert not (tmp_path / "kv_store_doc_status.json").exists()
+
+    exported = tmp_path / "export.json"
+    assert export_json(str(log_file), str(exported)) == 1
+    with open(exported, encoding="utf-8") as f:
+        assert json.load(f)["doc-1"]["status"] == "pending"
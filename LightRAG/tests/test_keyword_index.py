@@ -0,0 +1,177 @@
+"""
+Tests for local keyword extraction from graph entity names.
+"""
+
+import numpy as np
+import pytest
+
+from lightrag import LightRAG
+from lightrag.base import QueryParam
+from lightrag.keyword_index import EntityKeywordIndex, tokenize
+from lightrag.kg.networkx_impl import NetworkXStorage
+from lightrag.kg.shared_storage import finalize_share_data, initialize_share_data
+from lightrag.operate import get_keywords_from_query
+from lightrag.semantic_cache import bump_semantic_cache_generation
+from lightrag.utils import EmbeddingFunc, Tokenizer
+
+NODES = {
+    "New York": "city",
+    "New York City": "city",
+    "York": "city",
+    "Tampa": "city",
+    "Museums": "category",
+    "museum": "google_type",
+    "tourist_attraction": "google_type",
+    "Central Park": "place",
+    "The Best": "place",
+}
+
+
+@pytest.fixture(autouse=True)
+def setup_shared_data():
+    initialize_share_data()
+    yield
+    finalize_share_data()
+
+
+async def _embedding_func(texts: list[str]) -> np.ndarray:
+    return np.zeros((len(texts), 8))
+
+
+async def _build_index(tmp_path, **kwargs) -> EntityKeywordIndex:
+    graph = NetworkXStorage(
+        namespace="chunk_entity_relation",
+        workspace="test",
+        global_config={"working_dir": str(tmp_path)},
+        embedding_func=_embedding_func,
+    )
+    await graph.initialize()
+    for name, entity_type in NODES.items():
+        await graph.upsert_node(name, {"entity_id": name, "entity_type": entity_type})
+    return await EntityKeywordIndex.from_graph(graph, **kwargs)
+
+
+@pytest.mark.offline
+def test_tokenize_folds_plurals_and_underscores():
+    assert tokenize("Tourist_Attractions in the Cities") == [
+        "tourist",
+        "attraction",
+        "in",
+        "the",
+        "city",
+    ]
+    assert tokenize("Churches, bus, glass") == ["church", "bus", "glass"]
+
+
+@pytest.mark.offline
+async def test_entity_names_become_keywords(tmp_path):
+    index = await _build_index(tmp_path)
+    assert len(index) == len(NODES) - 1  # "The Best" is only stopwords
+
+    # Plural query words match, categories and types are high-level keywords
+    assert index.extract("What are the best museums in Tampa?") == (
+        ["Museums", "museum"],
+        ["Museums", "museum", "Tampa"],
+    )
+    # Longest match wins over names it contains
+    assert index.extract("Tourist attractions near Central Park, New York City") == (
+        ["tourist_attraction"],
+        ["tourist_attraction", "Central Park", "New York City"],
+    )
+    assert index.extract("New York museums", mode="local") == (
+        ["Museums", "museum"],
+        ["New York", "Museums", "museum"],
+    )
+
+    # Too little of the query is named in the graph, or nothing high-level for global
+    assert index.extract("Family friendly hiking trails around Tampa") is None
+    assert index.extract("What is there to do?") is None
+    assert index.extract("Tampa", mode="global") is None
+    assert index.extract("Tampa", mode="local") == ([], ["Tampa"])
+
+
+@pytest.mark.offline
+async def test_keywords_fall_back_to_llm(tmp_path):
+    index = await _build_index(tmp_path, min_coverage=1.0)
+    global_config = {"llm_model_func": None}
+
+    keywords = await get_keywords_from_query(
+        "Museums in Tampa", QueryParam(), global_config, keyword_index=index
+    )
+    assert keywords == (["Museums", "museum"], ["Museums", "museum", "Tampa"])
+
+    # Predefined keywords take precedence over the index
+    param = QueryParam(hl_keywords=["art"], ll_keywords=["Louvre"])
+    assert await get_keywords_from_query(
+        "Museums in Tampa", param, global_config, keyword_index=index
+    ) == (["art"], ["Louvre"])
+
+    async def llm_func(prompt, **kwargs):
+        return '{"high_level_keywords": ["hiking"], "low_level_keywords": ["Tampa"]}'
+
+    global_config = {
+        "llm_model_func": llm_func,
+        "addon_params": {},
+        "tokenizer": type("Tokenizer", (), {"encode": staticmethod(str.split)})(),
+    }
+    llm_cache = type("LLMCache", (), {"global_config": {"enable_llm_cache": False}})()
+    assert await get_keywords_from_query(
+        "Hiking in Tampa", QueryParam(), global_config, llm_cache, keyword_index=index
+    ) == (["hiking"], ["Tampa"])
+
+
+class _WordTokenizer:
+    def encode(self, content):
+        return content.split()
+
+    def decode(self, tokens):
+        return " ".join(tokens)
+
+
+@pytest.mark.offline
+async def test_index_follows_graph_changes_of_other_processes(tmp_path):
+    async def llm_func(prompt, **kwargs):
+        return ""
+
+    rag = LightRAG(
+        working_dir=str(tmp_path),
+        workspace="test",
+        llm_model_func=llm_func,
+        embedding_func=EmbeddingFunc(
+            embedding_dim=8, max_token_size=8192, func=_embedding_func
+        ),
+        tokenizer=Tokenizer("words", _WordTokenizer()),
+        enable_local_keywords=True,
+    )
+    await rag.initialize_storages()
+    try:
+        graph = rag.chunk_entity_relation_graph
+        await graph.upsert_node("Tampa", {"entity_id": "Tampa", "entity_type": "city"})
+        await graph.index_done_callback()
+        index = await rag._get_keyword_index()
+        assert await rag._get_keyword_index() is index
+        assert index.extract("Museums in Tampa") is None
+
+        # A worker persisting graph changes sets the update flags of all workers
+        worker_graph = NetworkXStorage(
+            namespace=graph.namespace,
+            workspace=graph.workspace,
+            global_config=graph.global_config,
+            embedding_func=_embedding_func,
+        )
+        await worker_graph.initialize()
+        await worker_graph.upsert_node(
+            "Museums", {"entity_id": "Museums", "entity_type": "category"}
+        )
+        await worker_graph.index_done_callback()
+        index = await rag._get_keyword_index()
+        assert index.extract("Museums in Tampa") == (["Museums"], ["Museums", "Tampa"])
+
+        # A separate import program only replaces the document generation
+        await graph.upsert_node("Miami", {"entity_id": "Miami", "entity_type": "city"})
+        assert await rag._get_keyword_index() is index
+        await bump_semantic_cache_generation(rag.llm_response_cache)
+        index = await rag._get_keyword_index()
+        assert index.extract("Museums in Miami") == (["Museums"], ["Museums", "Miami"])
+    finally:
+        await rag.finalize_storages()
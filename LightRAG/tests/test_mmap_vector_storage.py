@@ -0,0 +1,154 @@
+"""
+Tests for MmapVectorDBStorage: memory-mapped float16 vectors with a SQLite side
+table, appended upserts, compaction, reloads in other processes and migration of
+NanoVectorDB files.
+"""
+
+import glob
+import os
+
+import numpy as np
+import pytest
+
+from lightrag.kg.mmap_vector_db_impl import MmapVectorDBStorage
+from lightrag.kg.nano_vector_db_impl import NanoVectorDBStorage
+from lightrag.kg.shared_storage import (
+    finalize_share_data,
+    initialize_share_data,
+)
+from lightrag.utils import EmbeddingFunc
+
+# Each content names the axis of its embedding
+AXES = {"north": 0, "east": 1, "south": 2, "west": 3}
+
+
+@pytest.fixture(autouse=True)
+def setup_shared_data():
+    initialize_share_data()
+    yield
+    finalize_share_data()
+
+
+async def _embed(texts: list[str], **kwargs) -> np.ndarray:
+    vectors = np.zeros((len(texts), 4))
+    for i, text in enumerate(texts):
+        vectors[i, AXES[text]] = 2.0
+    return vectors
+
+
+async def _make_storage(working_dir, cls=MmapVectorDBStorage):
+    storage = cls(
+        namespace="relationships",
+        workspace="test",
+        global_config={
+            "working_dir": str(working_dir),
+            "embedding_batch_num": 10,
+            "vector_db_storage_cls_kwargs": {"cosine_better_than_threshold": 0.5},
+        },
+        embedding_func=EmbeddingFunc(embedding_dim=4, func=_embed),
+        meta_fields={"src_id", "tgt_id"},
+    )
+    await storage.initialize()
+    return storage
+
+
+def _relations():
+    return {
+        f"rel-{axis}": {"content": axis, "src_id": "Hub", "tgt_id": axis.title()}
+        for axis in AXES
+    }
+
+
+@pytest.mark.offline
+async def test_upsert_query_delete_and_compact(tmp_path, monkeypatch):
+    monkeypatch.setenv("MMAP_VECTOR_COMPACT_RATIO", "0.3")
+    storage = await _make_storage(tmp_path)
+    await storage.upsert(_relations())
+
+    # Unsaved rows are searchable in the writing process
+    results = await storage.query("east", top_k=5)
+    assert [r["id"] for r in results] == ["rel-east"]
+    assert results[0]["tgt_id"] == "East"
+    assert results[0]["distance"] == pytest.approx(1.0)
+    assert await storage.index_done_callback()
+    assert len(storage._vectors) == 4
+
+    # A replaced row is appended, the old one skipped
+    await storage.upsert(
+        {"rel-north": {"content": "east", "src_id": "Hub", "tgt_id": "North"}}
+    )
+    await storage.delete_entity_relation("West")
+    assert storage._alive.tolist() == [False, True, True, False, True]
+    results = await storage.query("east", top_k=5)
+    assert sorted(r["id"] for r in results) == ["rel-east", "rel-north"]
+    assert await storage.query("north", top_k=5) == []
+    assert await storage.get_by_id("rel-west") is None
+    records = await storage.get_by_ids(["rel-south", "rel-west"])
+    assert records[0]["tgt_id"] == "South" and records[1] is None
+    vectors = await storage.get_vectors_by_ids(["rel-north", "rel-west"])
+    assert list(vectors) == ["rel-north"]
+    assert np.allclose(vectors["rel-north"], [0, 1, 0, 0])
+
+    # Saving past the compaction ratio rewrites the live rows into a new file
+    assert await storage.index_done_callback()
+    assert storage._epoch == 1
+    assert len(storage._vectors) == 3 and storage._alive.all()
+    assert glob.glob(str(tmp_path / "test" / "*.f16")) == [storage._vectors_file(1)]
+    assert isinstance(storage._vectors, np.memmap)
+    assert storage._vectors.dtype == np.float16
+
+    reloaded = await _make_storage(tmp_path)
+    results = await reloaded.query("east", top_k=1)
+    assert len(results) == 1 and results[0]["id"] in ("rel-east", "rel-north")
+    assert sorted(dp["__id__"] for dp in (await reloaded.client_storage)["data"]) == [
+        "rel-east",
+        "rel-north",
+        "rel-south",
+    ]
+
+    assert (await reloaded.drop())["status"] == "success"
+    assert await reloaded.query("east", top_k=5) == []
+    assert await storage.query("east", top_k=5) == []
+
+
+@pytest.mark.offline
+async def test_other_process_reloads_and_detects_compaction(tmp_path, monkeypatch):
+    monkeypatch.setenv("MMAP_VECTOR_COMPACT_RATIO", "0.1")
+    writer = await _make_storage(tmp_path)
+    reader = await _make_storage(tmp_path)
+    await writer.upsert(_relations())
+
+    # Uncommitted rows are not visible to the reader
+    assert await reader.query("south", top_k=5) == []
+    assert await writer.index_done_callback()
+    assert [r["id"] for r in await reader.query("south", top_k=5)] == ["rel-south"]
+
+    # A compaction renumbers rows; a reader that has not seen the update flag
+    # yet notices the new epoch instead of returning the wrong records
+    await writer.delete(["rel-north", "rel-east"])
+    assert await writer.index_done_callback()
+    assert writer._epoch == 1
+    reader.storage_updated.value = False
+    assert reader._epoch == 0
+    results = await reader.query("west", top_k=5)
+    assert [(r["id"], r["tgt_id"]) for r in results] == [("rel-west", "West")]
+    assert reader._epoch == 1
+
+
+@pytest.mark.offline
+async def test_migrates_nano_vector_db_file(tmp_path):
+    nano = await _make_storage(tmp_path, cls=NanoVectorDBStorage)
+    await nano.upsert(_relations())
+    assert await nano.index_done_callback()
+    finalize_share_data()
+    initialize_share_data()
+
+    storage = await _make_storage(tmp_path)
+    assert os.path.exists(storage._vectors_file(0))
+    results = await storage.query("west", top_k=5)
+    assert [(r["id"], r["src_id"], r["tgt_id"]) for r in results] == [
+        ("rel-west", "Hub", "West")
+    ]
+    assert results[0]["distance"] == pytest.approx(1.0, abs=1e-3)
+    assert "vector" not in results[0]
+    assert (await storage.get_by_id("rel-north"))["created_at"] is not None
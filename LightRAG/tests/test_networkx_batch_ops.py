@@ -0,0 +1,167 @@
+"""
+Tests and micro-benchmark for the NetworkXStorage batch read operations.
+
+Run with -s to see the benchmark timings:
+    pytest tests/test_networkx_batch_ops.py -s
+"""
+
+import gc
+import random
+import time
+
+import numpy as np
+import pytest
+
+from lightrag.base import BaseGraphStorage, QueryParam
+from lightrag.kg.networkx_impl import NetworkXStorage
+from lightrag.kg.shared_storage import finalize_share_data, initialize_share_data
+from lightrag.operate import _find_most_related_edges_from_entities
+
+BATCH_METHODS = (
+    "get_nodes_batch",
+    "node_degrees_batch",
+    "get_edges_batch",
+    "edge_degrees_batch",
+    "get_nodes_edges_batch",
+)
+
+
+@pytest.fixture(autouse=True)
+def setup_shared_data():
+    initialize_share_data()
+    yield
+    finalize_share_data()
+
+
+async def _embedding_func(texts: list[str]) -> np.ndarray:
+    return np.zeros((len(texts), 8))
+
+
+async def _make_storage(working_dir) -> NetworkXStorage:
+    storage = NetworkXStorage(
+        namespace="chunk_entity_relation",
+        workspace="test",
+        global_config={"working_dir": str(working_dir)},
+        embedding_func=_embedding_func,
+    )
+    await storage.initialize()
+    return storage
+
+
+def _build_travel_graph(graph, places: int, seed: int = 42):
+    """Places linked to a city, categories and nearby places (~5 edges per place)"""
+    rng = random.Random(seed)
+    cities = [f"City {i}" for i in range(200)]
+    categories = [f"Category {i}" for i in range(100)]
+    for name in cities + categories:
+        graph.add_node(name, entity_type="location", description=name)
+    for i in range(places):
+        place = f"Place {i}"
+        graph.add_node(place, entity_type="place", description=f"{place} desc")
+        graph.add_edge(place, rng.choice(cities), keywords="located in", weight=1.0)
+        for category in rng.sample(categories, 2):
+            graph.add_edge(place, category, keywords="is a", weight=1.0)
+        for _ in range(2):
+            other = f"Place {rng.randrange(places)}"
+            if other != place:
+                graph.add_edge(place, other, keywords="near", weight=0.5)
+
+
+def _batch_args(graph, nodes: list[str], edges: list[tuple[str, str]]) -> dict:
+    return {
+        "get_nodes_batch": (nodes,),
+        "node_degrees_batch": (nodes,),
+        "get_edges_batch": ([{"src": src, "tgt": tgt} for src, tgt in edges],),
+        "edge_degrees_batch": (edges,),
+        "get_nodes_edges_batch": (nodes,),
+    }
+
+
+@pytest.mark.offline
+async def test_batch_ops_match_default_implementation(tmp_path):
+    storage = await _make_storage(tmp_path)
+    graph = await storage._get_graph()
+    _build_travel_graph(graph, places=50)
+    graph.add_edge("Place 1", "Place 1", keywords="self")
+
+    nodes = ["Place 1", "City 3", "Missing"]
+    edges = [("Place 1", "Place 1"), ("Place 2", "Missing"), ("Missing", "Place 3")]
+    edges += [tuple(edge) for edge in list(graph.edges("Place 4"))]
+
+    for method, args in _batch_args(graph, nodes, edges).items():
+        native = await getattr(storage, method)(*args)
+        default = await getattr(BaseGraphStorage, method)(storage, *args)
+        assert native == default, method
+
+
+@pytest.mark.offline
+async def test_top_edges_cap_hub_expansion(tmp_path):
+    storage = await _make_storage(tmp_path)
+    graph = await storage._get_graph()
+    _build_travel_graph(graph, places=300)
+    hub = max(graph.nodes, key=graph.degree)
+    nodes = [hub, "Place 1", "Missing"]
+
+    native = await storage.get_nodes_top_edges_batch(nodes, 10)
+    default = await BaseGraphStorage.get_nodes_top_edges_batch(storage, nodes, 10)
+    assert native == default
+    assert len(native[hub]) == 10
+    assert native["Place 1"] == list(graph.edges("Place 1"))
+    assert native["Missing"] == []
+    assert len((await storage.get_nodes_top_edges_batch([hub], 0))[hub]) == (
+        graph.degree(hub)
+    )
+
+    # A neighbor gaining edges moves up in the hub's precomputed ranking
+    outsider = next(n for _, n in graph.edges(hub) if (hub, n) not in native[hub])
+    for i in range(50):
+        await storage.upsert_edge(outsider, f"New place {i}", {"weight": 1.0})
+    top_edges = await storage.get_nodes_top_edges_batch([hub], 10)
+    assert top_edges[hub][0] == (hub, outsider)
+
+    relations = await _find_most_related_edges_from_entities(
+        [{"entity_name": hub}], QueryParam(max_edges_per_entity=10), storage
+    )
+    assert len(relations) == 10
+    assert relations[0]["src_tgt"] == tuple(sorted((hub, outsider)))
+
+
+@pytest.mark.offline
+async def test_batch_ops_benchmark(tmp_path):
+    """Batch reads of a query-sized working set on a 50k-edge travel graph"""
+    storage = await _make_storage(tmp_path)
+    graph = await storage._get_graph()
+    _build_travel_graph(graph, places=10000)
+    assert graph.number_of_edges() >= 45000
+
+    rng = random.Random(7)
+    nodes = rng.sample(list(graph.nodes), 2000)
+    edges = rng.sample(list(graph.edges), 5000)
+    args = _batch_args(graph, nodes, edges)
+
+    print(
+        f"\nNetworkX batch reads, {graph.number_of_nodes()} nodes / "
+        f"{graph.number_of_edges()} edges, {len(nodes)} nodes / {len(edges)} edges per batch"
+    )
+    for method in BATCH_METHODS:
+        # Both variants build the same result objects; keep collector pauses
+        # triggered by earlier allocations out of the comparison
+        gc.collect()
+        gc.disable()
+        try:
+            start = time.perf_counter()
+            default = await getattr(BaseGraphStorage, method)(storage, *args[method])
+            default_time = time.perf_counter() - start
+
+            start = time.perf_counter()
+            native = await getattr(storage, method)(*args[method])
+            native_time = time.perf_counter() - start
+        finally:
+            gc.enable()
+
+        assert native == default
+        print(
+            f"  {method:<22} per-item {default_time * 1000:8.2f} ms  "
+            f"batch {native_time * 1000:7.2f} ms  ({default_time / native_time:5.1f}x)"
+        )
+        assert native_time < default_time
@@ -0,0 +1,175 @@
+"""
+Tests for the NetworkXStorage msgpack snapshot format and delta log.
+"""
+
+import os
+
+import networkx as nx
+import numpy as np
+import pytest
+
+pytest.importorskip("msgpack")
+
+from lightrag.kg import networkx_impl  # noqa: E402
+from lightrag.kg.networkx_impl import (  # noqa: E402
+    NetworkXStorage,
+    read_msgpack_graph,
+    write_msgpack_graph,
+)
+from lightrag.kg.shared_storage import (  # noqa: E402
+    finalize_share_data,
+    initialize_share_data,
+)
+
+
+@pytest.fixture(autouse=True)
+def setup_shared_data():
+    initialize_share_data()
+    yield
+    finalize_share_data()
+
+
+async def _embedding_func(texts: list[str]) -> np.ndarray:
+    return np.zeros((len(texts), 8))
+
+
+async def _make_storage(working_dir) -> NetworkXStorage:
+    storage = NetworkXStorage(
+        namespace="chunk_entity_relation",
+        workspace="test",
+        global_config={"working_dir": str(working_dir)},
+        embedding_func=_embedding_func,
+    )
+    await storage.initialize()
+    return storage
+
+
+@pytest.mark.offline
+def test_msgpack_snapshot_round_trip(tmp_path):
+    graph = nx.Graph()
+    graph.add_node("A", entity_type="place", description="Museum")
+    graph.add_node("B", entity_type="city")
+    graph.add_node("C")
+    graph.add_edge("A", "B", weight=1.5, keywords="located in")
+    graph.add_edge("B", "C")
+
+    file_name = os.path.join(tmp_path, "graph.msgpack")
+    write_msgpack_graph(graph, file_name)
+    loaded = read_msgpack_graph(file_name)
+
+    assert dict(loaded.nodes(data=True)) == dict(graph.nodes(data=True))
+    assert {frozenset((u, v)): d for u, v, d in loaded.edges(data=True)} == {
+        frozenset((u, v)): d for u, v, d in graph.edges(data=True)
+    }
+    assert read_msgpack_graph(os.path.join(tmp_path, "missing.msgpack")) is None
+
+
+@pytest.mark.offline
+async def test_delta_log_replay_and_compaction(tmp_path, monkeypatch):
+    monkeypatch.setenv("NETWORKX_STORAGE_FORMAT", "msgpack")
+    monkeypatch.setenv("NETWORKX_DELTA_LOG", "true")
+    monkeypatch.setenv("NETWORKX_DELTA_MAX_OPS", "4")
+
+    storage = await _make_storage(tmp_path)
+    await storage.upsert_node("A", {"entity_type": "place"})
+    await storage.upsert_node("B", {"entity_type": "city"})
+    await storage.upsert_edge("A", "B", {"weight": 1.0})
+    # First persist writes the snapshot, there is nothing to append to yet
+    assert await storage.index_done_callback()
+    assert os.path.exists(storage._msgpack_file)
+    assert not os.path.exists(storage._delta_log_file)
+
+    await storage.upsert_node("C", {"entity_type": "place"})
+    await storage.upsert_edge("C", "B", {"weight": 2.0})
+    await storage.remove_edges([("A", "B")])
+    assert await storage.index_done_callback()
+    assert os.path.exists(storage._delta_log_file)
+
+    reloaded = await _make_storage(tmp_path)
+    assert await reloaded.has_node("C")
+    assert await reloaded.has_edge("B", "C")
+    assert not await reloaded.has_edge("A", "B")
+    assert reloaded._delta_ops == 3
+
+    # Exceeding NETWORKX_DELTA_MAX_OPS folds the log into a new snapshot
+    await reloaded.delete_node("A")
+    await reloaded.upsert_node("D", {})
+    assert await reloaded.index_done_callback()
+    assert not os.path.exists(reloaded._delta_log_file)
+
+    compacted = await _make_storage(tmp_path)
+    assert sorted(await compacted.get_all_labels()) == ["B", "C", "D"]
+
+
+@pytest.mark.offline
+async def test_graphml_migration_and_export(tmp_path, monkeypatch):
+    monkeypatch.setenv("NETWORKX_STORAGE_FORMAT", "graphml")
+    storage = await _make_storage(tmp_path)
+    await storage.upsert_node("A", {"entity_type": "place"})
+    await storage.upsert_node("B", {"entity_type": "city"})
+    await storage.upsert_edge("A", "B", {"keywords": "located in"})
+    assert await storage.index_done_callback()
+
+    monkeypatch.setenv("NETWORKX_STORAGE_FORMAT", "msgpack")
+    migrated = await _make_storage(tmp_path)
+    assert os.path.exists(migrated._msgpack_file)
+    assert await migrated.get_edge("A", "B") == {"keywords": "located in"}
+
+    export_file = await migrated.export_graphml(os.path.join(tmp_path, "out.graphml"))
+    exported = nx.read_graphml(export_file)
+    assert exported.nodes["A"] == {"entity_type": "place"}
+
+    result = await migrated.drop()
+    assert result["status"] == "success"
+    assert not os.path.exists(migrated._msgpack_file)
+    assert not os.path.exists(migrated._graphml_xml_file)
+
+
+@pytest.mark.offline
+async def test_other_processes_replay_new_delta_records(tmp_path, monkeypatch):
+    monkeypatch.setenv("NETWORKX_STORAGE_FORMAT", "msgpack")
+    monkeypatch.setenv("NETWORKX_DELTA_LOG", "true")
+    monkeypatch.setenv("NETWORKX_DELTA_MAX_OPS", "4")
+
+    writer = await _make_storage(tmp_path)
+    await writer.upsert_node("A", {"entity_type": "place"})
+    await writer.upsert_node("B", {"entity_type": "city"})
+    assert await writer.index_done_callback()
+
+    # Stands in for another process sharing the working directory
+    reader = await _make_storage(tmp_path)
+    assert await reader.has_node("A")
+
+    snapshot_reads = []
+    original_read = networkx_impl.read_msgpack_graph
+
+    def counting_read(file_name):
+        snapshot_reads.append(file_name)
+        return original_read(file_name)
+
+    monkeypatch.setattr(networkx_impl, "read_msgpack_graph", counting_read)
+
+    await writer.upsert_node("C", {"entity_type": "place"})
+    await writer.upsert_edge("C", "B", {"weight": 2.0})
+    assert await writer.index_done_callback()
+    assert reader.storage_updated.value
+
+    # Only the appended records are applied, the snapshot is not read again
+    assert await reader.has_edge("B", "C")
+    assert snapshot_reads == []
+    assert reader._delta_offset == os.path.getsize(writer._delta_log_file)
+
+    # A commit without changes neither writes nor notifies other processes
+    log_size = os.path.getsize(writer._delta_log_file)
+    assert await writer.index_done_callback()
+    assert os.path.getsize(writer._delta_log_file) == log_size
+    assert not reader.storage_updated.value
+
+    # After compaction rewrote the snapshot, other processes reload it fully
+    await writer.delete_node("A")
+    await writer.upsert_node("D", {})
+    await writer.upsert_edge("D", "B", {})
+    assert await writer.index_done_callback()
+    assert not os.path.exists(writer._delta_log_file)
+    assert sorted(await reader.get_all_labels()) == ["B", "C", "D"]
+    assert len(snapshot_reads) == 1
@@ -0,0 +1,237 @@
+"""
+Tests for the AGE-free PostgreSQL graph storage (PGRelationalGraphStorage).
+
+This test verifies, without a database:
+1. Both orientations of an edge resolve to the same stored row
+2. Batch reads are sent as a single statement
+3. Label search escapes LIKE wildcards in the query
+
+and against a real PostgreSQL (POSTGRES_* settings from .env, run with
+--run-integration):
+4. Upserts merge properties into existing nodes and edges
+5. get_knowledge_graph honours max_depth and truncates to the closest nodes
+6. get_nodes_top_edges_batch keeps the highest ranked edges of hub nodes
+"""
+
+import json
+
+import pytest
+from dotenv import load_dotenv
+
+pytest.importorskip("asyncpg")
+
+from lightrag.kg.postgres_impl import (  # noqa: E402
+    ClientManager,
+    PGRelationalGraphStorage,
+    PostgreSQLDB,
+)
+from lightrag.kg.shared_storage import (  # noqa: E402
+    finalize_share_data,
+    initialize_share_data,
+)
+
+# Load environment variables
+load_dotenv(dotenv_path=".env", override=False)
+
+# Graph rows of this workspace are dropped before and after each test
+TEST_WORKSPACE = "test_pg_relational_graph"
+
+
+class FakeDB:
+    """Answers edge lookups from a dict of stored edges and records statements"""
+
+    def __init__(self, edges: dict[tuple[str, str], dict]):
+        self.edges = {
+            PGRelationalGraphStorage._edge_key(src, tgt)[0]: properties
+            for (src, tgt), properties in edges.items()
+        }
+        self.queries: list[tuple[str, list]] = []
+
+    async def query(self, sql, params=None, multirows=False):
+        self.queries.append((sql, params))
+        if "FROM LIGHTRAG_GRAPH_EDGES" in sql and "id = ANY($2)" in sql:
+            return [
+                {"id": edge_id, "properties": json.dumps(self.edges[edge_id])}
+                for edge_id in params[1]
+                if edge_id in self.edges
+            ]
+        return []
+
+
+def _make_storage(db: FakeDB) -> PGRelationalGraphStorage:
+    return PGRelationalGraphStorage(
+        namespace="chunk_entity_relation",
+        workspace="test",
+        global_config={},
+        embedding_func=None,
+        db=db,
+    )
+
+
+@pytest.mark.offline
+async def test_edges_are_undirected():
+    db = FakeDB({("Tampa", "Florida Aquarium"): {"weight": 2.0}})
+    storage = _make_storage(db)
+
+    edges = await storage.get_edges_batch(
+        [
+            {"src": "Tampa", "tgt": "Florida Aquarium"},
+            {"src": "Florida Aquarium", "tgt": "Tampa"},
+            {"src": "Tampa", "tgt": "Miami"},
+        ]
+    )
+
+    assert edges == {
+        ("Tampa", "Florida Aquarium"): {"weight": 2.0},
+        ("Florida Aquarium", "Tampa"): {"weight": 2.0},
+    }
+    # One statement for the whole batch, the shared edge is looked up once
+    assert len(db.queries) == 1
+    assert len(db.queries[0][1][1]) == 2
+    assert await storage.get_edge("Florida Aquarium", "Tampa") == {"weight": 2.0}
+
+
+@pytest.mark.offline
+async def test_search_labels_escapes_wildcards():
+    db = FakeDB({})
+    storage = _make_storage(db)
+
+    await storage.search_labels(" 50%_Off ")
+
+    _, params = db.queries[0]
+    assert params[1:6] == [
+        "%50\\%\\_off%",
+        "50%_off",
+        "50\\%\\_off%",
+        "% 50\\%\\_off%",
+        "%\\_50\\%\\_off%",
+    ]
+    assert await storage.search_labels("  ") == []
+    assert len(db.queries) == 1
+
+
+@pytest.fixture
+async def pg_storage():
+    initialize_share_data()
+    db = PostgreSQLDB({**ClientManager.get_config(), "workspace": TEST_WORKSPACE})
+    await db.initdb()
+    await db.check_tables()
+    storage = PGRelationalGraphStorage(
+        namespace="chunk_entity_relation",
+        workspace=TEST_WORKSPACE,
+        global_config={"max_graph_nodes": 1000},
+        embedding_func=None,
+        db=db,
+    )
+    await storage.initialize()
+    await storage.drop()
+    try:
+        yield storage
+    finally:
+        await storage.drop()
+        await db.pool.close()
+        finalize_share_data()
+
+
+async def _build_city_graph(storage: PGRelationalGraphStorage):
+    """Tampa hub with three places, a chain of depth 3 behind the aquarium"""
+    edges = [
+        ("Tampa", "Florida Aquarium", 1.0),
+        ("Tampa", "Lowry Park Zoo", 1.0),
+        ("Tampa", "Tampa Museum of Art", 5.0),
+        ("Florida Aquarium", "Channelside", 1.0),
+        ("Ybor City", "Channelside", 1.0),
+    ]
+    for node_id in {node_id for edge in edges for node_id in edge[:2]}:
+        await storage.upsert_node(node_id, {"entity_id": node_id})
+    for source, target, weight in edges:
+        await storage.upsert_edge(source, target, {"weight": weight})
+
+
+@pytest.mark.integration
+@pytest.mark.requires_db
+async def test_upserts_merge_properties(pg_storage):
+    await pg_storage.upsert_node(
+        "Tampa", {"entity_id": "Tampa", "entity_type": "city", "description": "old"}
+    )
+    await pg_storage.upsert_node("Tampa", {"description": "new", "source_id": "c1"})
+    assert await pg_storage.get_node("Tampa") == {
+        "entity_id": "Tampa",
+        "entity_type": "city",
+        "description": "new",
+        "source_id": "c1",
+    }
+
+    # The reversed orientation updates the same undirected edge
+    await pg_storage.upsert_edge(
+        "Tampa", "Florida Aquarium", {"weight": 1.0, "description": "old"}
+    )
+    await pg_storage.upsert_edge("Florida Aquarium", "Tampa", {"weight": 3.0})
+    assert await pg_storage.get_edge("Tampa", "Florida Aquarium") == {
+        "weight": 3.0,
+        "description": "old",
+    }
+    assert len(await pg_storage.get_all_edges()) == 1
+    assert await pg_storage.node_degree("Tampa") == 1
+
+
+@pytest.mark.integration
+@pytest.mark.requires_db
+async def test_knowledge_graph_depth_and_truncation(pg_storage):
+    await _build_city_graph(pg_storage)
+
+    async def subgraph(node_label, **kwargs):
+        kg = await pg_storage.get_knowledge_graph(node_label, **kwargs)
+        edges = {tuple(sorted((edge.source, edge.target))) for edge in kg.edges}
+        return {node.id for node in kg.nodes}, edges, kg.is_truncated
+
+    nodes, edges, truncated = await subgraph("Tampa", max_depth=1)
+    assert nodes == {
+        "Tampa",
+        "Florida Aquarium",
+        "Lowry Park Zoo",
+        "Tampa Museum of Art",
+    }
+    assert len(edges) == 3 and not truncated
+    nodes, _, _ = await subgraph("Tampa", max_depth=2)
+    assert "Channelside" in nodes and "Ybor City" not in nodes
+    nodes, edges, truncated = await subgraph("Tampa", max_depth=3)
+    assert len(nodes) == 6 and len(edges) == 5 and not truncated
+
+    # Closest nodes first, then better connected ones, then by name
+    nodes, edges, truncated = await subgraph("Tampa", max_depth=3, max_nodes=3)
+    assert nodes == {"Tampa", "Florida Aquarium", "Lowry Park Zoo"}
+    assert edges == {("Florida Aquarium", "Tampa"), ("Lowry Park Zoo", "Tampa")}
+    assert truncated
+
+    # All nodes: highest degree first, ties by name
+    nodes, edges, truncated = await subgraph("*", max_nodes=2)
+    assert nodes == {"Tampa", "Channelside"} and truncated
+    assert edges == set()
+
+    assert await subgraph("Miami") == (set(), set(), False)
+
+
+@pytest.mark.integration
+@pytest.mark.requires_db
+async def test_top_edges_rank_hub_edges(pg_storage):
+    await _build_city_graph(pg_storage)
+
+    top_edges = await pg_storage.get_nodes_top_edges_batch(
+        ["Tampa", "Channelside", "Miami"], max_edges=2
+    )
+    # Hub edges by combined degree, then weight: the aquarium has a second edge,
+    # the museum outweighs the zoo
+    assert top_edges["Tampa"] == [
+        ("Tampa", "Florida Aquarium"),
+        ("Tampa", "Tampa Museum of Art"),
+    ]
+    # Nodes within the cap keep all their edges
+    assert set(top_edges["Channelside"]) == {
+        ("Channelside", "Florida Aquarium"),
+        ("Channelside", "Ybor City"),
+    }
+    assert top_edges["Miami"] == []
+
+    uncapped = await pg_storage.get_nodes_top_edges_batch(["Tampa"], max_edges=0)
+    assert len(uncapped["Tampa"]) == 3
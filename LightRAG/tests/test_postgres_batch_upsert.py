@@ -0,0 +1,163 @@
+"""
+Tests for batched PostgreSQL writes (PostgreSQLDB.executemany)
+
+This test verifies:
+1. Rows are sent with one executemany call per batch
+2. A failing batch is retried row by row and the failing IDs are reported
+3. Document status upserts are batched and status transitions are one statement
+"""
+
+import pytest
+
+pytest.importorskip("asyncpg")
+
+from lightrag.base import DocStatus  # noqa: E402
+from lightrag.kg.postgres_impl import (  # noqa: E402
+    PGBatchWriteError,
+    PGDocStatusStorage,
+    PostgreSQLDB,
+)
+
+
+class FakeTransaction:
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        return False
+
+
+class FakeConnection:
+    """Connection that fails any statement touching a row with a bad id"""
+
+    def __init__(self, bad_ids: set[str]):
+        self.bad_ids = bad_ids
+        self.executemany_calls: list[list[tuple]] = []
+        self.execute_calls: list[tuple] = []
+
+    def transaction(self):
+        return FakeTransaction()
+
+    async def executemany(self, sql, args):
+        self.executemany_calls.append(list(args))
+        if any(values[1] in self.bad_ids for values in args):
+            raise ValueError("bad row in batch")
+
+    async def execute(self, sql, *values):
+        self.execute_calls.append(values)
+        if isinstance(values[1], str) and values[1] in self.bad_ids:
+            raise ValueError(f"bad row {values[1]}")
+
+
+class FakeAcquire:
+    def __init__(self, connection):
+        self.connection = connection
+
+    async def __aenter__(self):
+        return self.connection
+
+    async def __aexit__(self, exc_type, exc, tb):
+        return False
+
+
+class FakePool:
+    def __init__(self, connection):
+        self.connection = connection
+
+    def acquire(self):
+        return FakeAcquire(self.connection)
+
+
+def _make_db(connection, batch_size: int) -> PostgreSQLDB:
+    db = PostgreSQLDB(
+        {
+            "host": "localhost",
+            "port": 5432,
+            "user": "postgres",
+            "password": "secret",
+            "database": "lightrag",
+            "workspace": "test",
+            "max_connections": 1,
+            "upsert_batch_size": batch_size,
+            "connection_retry_attempts": 1,
+            "connection_retry_backoff": 0.0,
+            "connection_retry_backoff_max": 0.0,
+            "pool_close_timeout": 1.0,
+        }
+    )
+    db.pool = FakePool(connection)
+    return db
+
+
+def _rows(count: int) -> list[dict]:
+    return [
+        {"workspace": "test", "id": f"doc-{i}", "content": f"c{i}"}
+        for i in range(count)
+    ]
+
+
+@pytest.mark.offline
+async def test_executemany_sends_one_round_trip_per_batch():
+    connection = FakeConnection(bad_ids=set())
+    db = _make_db(connection, batch_size=4)
+
+    await db.executemany("INSERT ...", _rows(10))
+
+    assert [len(call) for call in connection.executemany_calls] == [4, 4, 2]
+    assert connection.execute_calls == []
+
+
+@pytest.mark.offline
+async def test_executemany_reports_failed_ids():
+    connection = FakeConnection(bad_ids={"doc-1", "doc-6"})
+    db = _make_db(connection, batch_size=4)
+
+    with pytest.raises(PGBatchWriteError) as exc_info:
+        await db.executemany("INSERT ...", _rows(10))
+
+    assert exc_info.value.failed_ids == ["doc-1", "doc-6"]
+    # Only the two failing batches were replayed row by row
+    assert [values[1] for values in connection.execute_calls] == [
+        f"doc-{i}" for i in range(8)
+    ]
+
+
+@pytest.mark.offline
+async def test_doc_status_upsert_and_status_transition_are_batched():
+    connection = FakeConnection(bad_ids=set())
+    storage = PGDocStatusStorage(
+        namespace="doc_status",
+        workspace="test",
+        global_config={},
+        embedding_func=None,
+        db=_make_db(connection, batch_size=500),
+    )
+    docs = {
+        f"doc-{i}": {
+            "content_summary": f"summary {i}",
+            "content_length": 10,
+            "status": DocStatus.PENDING,
+            "file_path": "places.jsonl",
+            "created_at": "2025-01-01T00:00:00+00:00",
+            "updated_at": "2025-01-01T00:00:00+00:00",
+        }
+        for i in range(3)
+    }
+
+    await storage.upsert(docs)
+
+    assert [len(call) for call in connection.executemany_calls] == [3]
+    assert [row[1] for row in connection.executemany_calls[0]] == list(docs)
+    assert connection.execute_calls == []
+
+    await storage.update_status_batch(list(docs), DocStatus.FAILED, error_msg="timeout")
+
+    assert len(connection.execute_calls) == 1
+    workspace, ids, status, error_msg, metadata, _ = connection.execute_calls[0]
+    assert (workspace, ids, status, error_msg, metadata) == (
+        "test",
+        list(docs),
+        DocStatus.FAILED,
+        "timeout",
+        None,
+    )
@@ -0,0 +1,35 @@
+"""
+Tests for the binary pgvector codec used by PGVectorStorage
+
+This test verifies:
+1. NumPy embeddings round-trip through the binary wire format
+2. Legacy text literals are still accepted by the encoder
+"""
+
+import numpy as np
+import pytest
+
+pytest.importorskip("asyncpg")
+
+from lightrag.kg.postgres_impl import decode_pg_vector, encode_pg_vector  # noqa: E402
+
+
+@pytest.mark.offline
+def test_vector_codec_roundtrip():
+    embedding = np.random.default_rng(0).normal(size=1024).astype(np.float32)
+
+    data = encode_pg_vector(embedding)
+    decoded = decode_pg_vector(data)
+
+    assert len(data) == 4 + 1024 * 4
+    assert data[:4] == b"\x04\x00\x00\x00"
+    assert decoded.dtype == np.float32
+    assert np.array_equal(decoded, embedding)
+
+
+@pytest.mark.offline
+def test_vector_codec_accepts_text_literal():
+    assert np.allclose(
+        decode_pg_vector(encode_pg_vector("[0.5, -1.0, 2.0]")), [0.5, -1.0, 2.0]
+    )
+    assert np.allclose(decode_pg_vector(encode_pg_vector([1, 2])), [1.0, 2.0])
@@ -0,0 +1,152 @@
+"""
+Tests for the semantic query cache (cached results reused by similar queries).
+"""
+
+import json
+import time
+
+import numpy as np
+import pytest
+
+from lightrag.base import QueryParam
+from lightrag.operate import extract_keywords_only
+from lightrag.semantic_cache import (
+    SemanticQueryCache,
+    bump_semantic_cache_generation,
+)
+from lightrag.utils import generate_cache_key
+
+# Paraphrases share a direction, unrelated queries are orthogonal
+EMBEDDINGS = {
+    "museums in paris": [1.0, 0.0, 0.0],
+    "paris museums": [0.99, 0.1, 0.0],
+    "what are the museums in paris": [0.97, 0.2, 0.0],
+    "hiking near madrid": [0.0, 0.0, 1.0],
+}
+
+
+class _FakeCacheKV:
+    """Minimal LLM cache storage with an embedding function"""
+
+    def __init__(self, enable_llm_cache=True):
+        self.global_config = {"enable_llm_cache": enable_llm_cache}
+        self.data = {}
+        self.embedding_calls = 0
+
+    async def embedding_func(self, texts):
+        self.embedding_calls += len(texts)
+        return np.array([EMBEDDINGS[text] for text in texts])
+
+    async def get_by_id(self, id):
+        return self.data.get(id)
+
+    async def upsert(self, data):
+        self.data.update(data)
+
+
+async def _cache_result(kv, cache, text, param, cache_type, content):
+    cache_key = generate_cache_key(param.mode, cache_type, text)
+    kv.data[cache_key] = {"return": content, "create_time": 1}
+    await cache.add(kv, text, param, cache_type, cache_key)
+
+
+@pytest.mark.offline
+async def test_similar_queries_share_cached_results():
+    kv = _FakeCacheKV()
+    cache = SemanticQueryCache(similarity_threshold=0.95, ttl=60, max_entries=2)
+    param = QueryParam(mode="hybrid")
+    await _cache_result(kv, cache, "museums in paris", param, "query", "Louvre")
+
+    for paraphrase in ("paris museums", "what are the museums in paris"):
+        assert await cache.lookup(kv, paraphrase, param, "query") == ("Louvre", 1)
+    assert await cache.lookup(kv, "hiking near madrid", param, "query") is None
+
+    # Answers are scoped by mode and retrieval settings, keywords by mode only
+    assert (
+        await cache.lookup(kv, "paris museums", QueryParam(mode="local"), "query")
+        is None
+    )
+    assert await cache.lookup(kv, "paris museums", QueryParam(top_k=3), "query") is None
+    assert await cache.lookup(kv, "paris museums", param, "keywords") is None
+
+    # Entries expire, dangling entries are dropped and clear() forgets everything
+    cache.ttl = 0
+    time.sleep(0.01)
+    assert await cache.lookup(kv, "paris museums", param, "query") is None
+    cache.ttl = 60
+    kv.data.clear()
+    assert await cache.lookup(kv, "paris museums", param, "query") is None
+    await _cache_result(kv, cache, "museums in paris", param, "query", "Orsay")
+    cache.clear()
+    assert len(cache) == 0
+    assert await cache.lookup(kv, "paris museums", param, "query") is None
+
+    # Oldest entries are replaced once max_entries is reached
+    await _cache_result(kv, cache, "museums in paris", param, "query", "Louvre")
+    await _cache_result(kv, cache, "hiking near madrid", param, "query", "Sierra")
+    await _cache_result(kv, cache, "paris museums", param, "keywords", "{}")
+    assert len(cache) == 2
+    assert await cache.lookup(kv, "museums in paris", param, "query") is None
+    assert await cache.lookup(kv, "hiking near madrid", param, "query") == ("Sierra", 1)
+
+    # Every query text was embedded once
+    assert kv.embedding_calls == 4
+
+    # Entries point into the LLM cache, so nothing is reused when it is disabled
+    assert (
+        await cache.lookup(_FakeCacheKV(False), "paris museums", param, "keywords")
+        is None
+    )
+
+
+@pytest.mark.offline
+async def test_document_changes_of_other_processes_clear_the_cache():
+    kv = _FakeCacheKV()
+    # Two processes sharing the LLM cache storage, e.g. query server and import
+    server_cache = SemanticQueryCache(similarity_threshold=0.95)
+    param = QueryParam(mode="hybrid")
+    await _cache_result(kv, server_cache, "museums in paris", param, "query", "Louvre")
+    assert await server_cache.lookup(kv, "paris museums", param, "query")
+
+    await bump_semantic_cache_generation(kv)
+    assert await server_cache.lookup(kv, "paris museums", param, "query") is None
+    assert len(server_cache) == 0
+
+    # Entries added after the change are reused until the next one
+    await _cache_result(kv, server_cache, "museums in paris", param, "query", "Orsay")
+    assert await server_cache.lookup(kv, "paris museums", param, "query") == (
+        "Orsay",
+        1,
+    )
+
+
+@pytest.mark.offline
+async def test_keyword_extraction_reuses_similar_query_keywords():
+    kv = _FakeCacheKV()
+    cache = SemanticQueryCache(similarity_threshold=0.95)
+    llm_calls = []
+
+    async def llm_func(prompt, **kwargs):
+        llm_calls.append(prompt)
+        return json.dumps(
+            {"high_level_keywords": ["museums"], "low_level_keywords": ["Paris"]}
+        )
+
+    global_config = {
+        "llm_model_func": llm_func,
+        "addon_params": {},
+        "tokenizer": type("Tokenizer", (), {"encode": staticmethod(str.split)})(),
+    }
+    param = QueryParam(mode="hybrid")
+
+    first = await extract_keywords_only(
+        "museums in paris", param, global_config, kv, cache
+    )
+    second = await extract_keywords_only(
+        "paris museums", param, global_config, kv, cache
+    )
+    assert first == second == (["museums"], ["Paris"])
+    assert len(llm_calls) == 1
+
+    await extract_keywords_only("hiking near madrid", param, global_config, kv, cache)
+    assert len(llm_calls) == 2
@@ -0,0 +1,190 @@
+"""
+Tests for speculative retrieval overlapping query keyword extraction.
+"""
+
+import asyncio
+import json
+import time
+
+import numpy as np
+import pytest
+
+from lightrag.base import QueryParam
+from lightrag.kg.json_kv_impl import JsonKVStorage
+from lightrag.kg.networkx_impl import NetworkXStorage
+from lightrag.kg.shared_storage import finalize_share_data, initialize_share_data
+from lightrag.operate import kg_query
+from lightrag.utils import Tokenizer
+
+KEYWORD_LATENCY = 0.2
+
+
+@pytest.fixture(autouse=True)
+def setup_shared_data():
+    initialize_share_data()
+    yield
+    finalize_share_data()
+
+
+class _ByteTokenizer:
+    def encode(self, content):
+        return list(content.encode())
+
+    def decode(self, tokens):
+        return bytes(tokens).decode(errors="ignore")
+
+
+async def _embedding_func(texts: list[str]) -> np.ndarray:
+    return np.ones((len(texts), 4))
+
+
+class _FakeVectorStorage:
+    """Returns fixed results and records when each search started"""
+
+    def __init__(self, results, global_config):
+        self.results = results
+        self.global_config = global_config
+        self.cosine_better_than_threshold = 0.2
+        self.embedding_func = _embedding_func
+        self.searches = []
+
+    async def query(self, query, top_k, query_embedding=None):
+        self.searches.append((query, time.perf_counter()))
+        return [dict(r) for r in self.results]
+
+
+async def _make_storages(tmp_path):
+    global_config = {
+        "working_dir": str(tmp_path),
+        "tokenizer": Tokenizer("bytes", _ByteTokenizer()),
+        "kg_chunk_pick_method": "WEIGHT",
+        "related_chunk_number": 5,
+        "max_total_tokens": 30000,
+    }
+    graph = NetworkXStorage(
+        namespace="chunk_entity_relation",
+        workspace="test",
+        global_config=global_config,
+        embedding_func=_embedding_func,
+    )
+    await graph.initialize()
+    for name, entity_type in [("Tampa", "city"), ("Florida Aquarium", "place")]:
+        await graph.upsert_node(
+            name,
+            {
+                "entity_id": name,
+                "entity_type": entity_type,
+                "description": f"{name} description",
+                "source_id": "chunk-aquarium",
+            },
+        )
+    await graph.upsert_edge(
+        "Florida Aquarium",
+        "Tampa",
+        {
+            "description": "Florida Aquarium is located in Tampa.",
+            "keywords": "located in",
+            "weight": 1.0,
+            "source_id": "chunk-aquarium",
+        },
+    )
+
+    text_chunks = JsonKVStorage(
+        namespace="text_chunks",
+        workspace="test",
+        global_config=global_config,
+        embedding_func=_embedding_func,
+    )
+    await text_chunks.initialize()
+    await text_chunks.upsert(
+        {
+            "chunk-aquarium": {
+                "content": "The Florida Aquarium is an aquarium in Tampa.",
+                "file_path": "places.jsonl",
+                "full_doc_id": "doc-aquarium",
+            }
+        }
+    )
+
+    entities_vdb = _FakeVectorStorage(
+        [{"entity_name": "Tampa", "distance": 0.9}], global_config
+    )
+    relationships_vdb = _FakeVectorStorage([], global_config)
+    chunks_vdb = _FakeVectorStorage(
+        [
+            {
+                "id": "chunk-aquarium",
+                "content": "The Florida Aquarium is an aquarium in Tampa.",
+                "file_path": "places.jsonl",
+                "distance": 0.8,
+            }
+        ],
+        global_config,
+    )
+    return graph, entities_vdb, relationships_vdb, text_chunks, chunks_vdb
+
+
+@pytest.mark.offline
+async def test_speculative_retrieval_overlaps_keyword_extraction(tmp_path):
+    keyword_calls = []
+
+    async def llm_func(prompt, **kwargs):
+        await asyncio.sleep(KEYWORD_LATENCY)
+        keyword_calls.append(time.perf_counter())
+        return json.dumps(
+            {"high_level_keywords": ["aquariums"], "low_level_keywords": ["Tampa"]}
+        )
+
+    global_config = {
+        "llm_model_func": llm_func,
+        "addon_params": {},
+        "tokenizer": Tokenizer("bytes", _ByteTokenizer()),
+    }
+    llm_cache = type("LLMCache", (), {"global_config": {"enable_llm_cache": False}})()
+    (
+        graph,
+        entities_vdb,
+        relationships_vdb,
+        text_chunks,
+        chunks_vdb,
+    ) = await _make_storages(tmp_path)
+
+    results = {}
+    for speculative in (False, True):
+        param = QueryParam(
+            mode="mix",
+            only_need_context=True,
+            enable_rerank=False,
+            speculative_retrieval=speculative,
+        )
+        chunks_vdb.searches.clear()
+        entities_vdb.searches.clear()
+        results[speculative] = await kg_query(
+            "Aquariums in Tampa",
+            graph,
+            entities_vdb,
+            relationships_vdb,
+            text_chunks,
+            param,
+            global_config,
+            hashing_kv=llm_cache,
+            chunks_vdb=chunks_vdb,
+        )
+
+    # Chunk and raw query entity searches ran before the keywords arrived
+    assert len(chunks_vdb.searches) == 1
+    assert chunks_vdb.searches[0][1] < keyword_calls[-1]
+    assert [q for q, _ in entities_vdb.searches] == ["Aquariums in Tampa", "Tampa"]
+    assert entities_vdb.searches[0][1] < keyword_calls[-1]
+
+    # Same context, the raw query entity duplicates a keyword match
+    assert results[True].content == results[False].content
+    assert "Florida Aquarium" in results[True].content
+
+    timings = results[True].raw_data["metadata"]["timings"]
+    assert timings["keywords"] >= KEYWORD_LATENCY
+    assert timings["speculative_search"] < KEYWORD_LATENCY
+    assert set(results[False].raw_data["metadata"]["timings"]) == {
+        "keywords",
+        "retrieval",
+    }
@@ -0,0 +1,129 @@
+"""
+Tests for vectorized chunk selection in pick_by_vector_similarity
+
+This test verifies:
+1. Selected chunks match a brute-force cosine similarity ranking
+2. Chunk vectors are fetched from chunks_vdb only on cache misses
+3. The LRU cache evicts least recently used vectors and counts hits/misses
+"""
+
+import numpy as np
+import pytest
+
+from lightrag.utils import (
+    VectorLRUCache,
+    cosine_similarity,
+    get_chunk_vector_cache,
+    pick_by_vector_similarity,
+)
+
+
+class FakeChunksVDB:
+    """Minimal chunks vector storage recording get_vectors_by_ids calls"""
+
+    def __init__(self, vectors: dict[str, list[float]]):
+        self.vectors = vectors
+        self.requested: list[list[str]] = []
+
+    async def get_vectors_by_ids(self, ids: list[str]) -> dict[str, list[float]]:
+        self.requested.append(list(ids))
+        return {id_: self.vectors[id_] for id_ in ids if id_ in self.vectors}
+
+
+def _make_vectors(count: int, dim: int = 16, seed: int = 0) -> dict[str, list[float]]:
+    rng = np.random.default_rng(seed)
+    return {f"chunk-{i}": rng.normal(size=dim).tolist() for i in range(count)}
+
+
+@pytest.mark.offline
+async def test_pick_matches_bruteforce_ranking():
+    vectors = _make_vectors(50)
+    chunks_vdb = FakeChunksVDB(vectors)
+    query_embedding = np.random.default_rng(1).normal(size=16)
+    entity_info = [
+        {"sorted_chunks": list(vectors)[:30]},
+        {"sorted_chunks": list(vectors)[20:]},
+    ]
+
+    selected = await pick_by_vector_similarity(
+        query="parks in New York",
+        text_chunks_storage=None,
+        chunks_vdb=chunks_vdb,
+        num_of_chunks=7,
+        entity_info=entity_info,
+        embedding_func=None,
+        query_embedding=query_embedding,
+    )
+
+    expected = sorted(
+        vectors,
+        key=lambda chunk_id: cosine_similarity(query_embedding, vectors[chunk_id]),
+        reverse=True,
+    )[:7]
+    assert selected == expected
+
+
+@pytest.mark.offline
+async def test_pick_fetches_only_cache_misses():
+    vectors = _make_vectors(10)
+    chunks_vdb = FakeChunksVDB(vectors)
+    query_embedding = np.ones(16)
+
+    await pick_by_vector_similarity(
+        query="q",
+        text_chunks_storage=None,
+        chunks_vdb=chunks_vdb,
+        num_of_chunks=3,
+        entity_info=[{"sorted_chunks": ["chunk-0", "chunk-1", "chunk-2"]}],
+        embedding_func=None,
+        query_embedding=query_embedding,
+    )
+    await pick_by_vector_similarity(
+        query="q",
+        text_chunks_storage=None,
+        chunks_vdb=chunks_vdb,
+        num_of_chunks=3,
+        entity_info=[{"sorted_chunks": ["chunk-1", "chunk-2", "chunk-3"]}],
+        embedding_func=None,
+        query_embedding=query_embedding,
+    )
+
+    assert sorted(chunks_vdb.requested[0]) == ["chunk-0", "chunk-1", "chunk-2"]
+    assert chunks_vdb.requested[1] == ["chunk-3"]
+    assert get_chunk_vector_cache(chunks_vdb).stats() == {
+        "size": 4,
+        "hits": 2,
+        "misses": 4,
+    }
+
+
+@pytest.mark.offline
+async def test_pick_returns_empty_when_vectors_missing():
+    chunks_vdb = FakeChunksVDB(_make_vectors(2))
+
+    selected = await pick_by_vector_similarity(
+        query="q",
+        text_chunks_storage=None,
+        chunks_vdb=chunks_vdb,
+        num_of_chunks=2,
+        entity_info=[{"sorted_chunks": ["chunk-0", "chunk-1", "chunk-unknown"]}],
+        embedding_func=None,
+        query_embedding=np.ones(16),
+    )
+
+    assert selected == []
+
+
+@pytest.mark.offline
+def test_vector_lru_cache_eviction():
+    cache = VectorLRUCache(max_size=2)
+    cache.put_many({"a": [3.0, 4.0], "b": [1.0, 0.0]})
+    cache.get_many(["a"])  # "a" becomes most recently used
+    cache.put_many({"c": [0.0, 2.0]})
+
+    found, missing = cache.get_many(["a", "b", "c"])
+
+    assert missing == ["b"]
+    assert np.allclose(found["a"], [0.6, 0.8])
+    assert np.allclose(found["c"], [0.0, 1.0])
+    assert cache.stats() == {"size": 2, "hits": 3, "misses": 1}
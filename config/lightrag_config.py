@@ -3,9 +3,24 @@ LightRAG Configuration Module for Travel Planner
 配置 LightRAG 实例，集成 Qwen Plus LLM 和 PostgreSQL 存储
 """
 
+import asyncio
 import os
 from dotenv import load_dotenv
-from openai import OpenAI
+import httpx
+import numpy as np
+from openai import (
+    APIConnectionError,
+    APITimeoutError,
+    AsyncOpenAI,
+    InternalServerError,
+    RateLimitError,
+)
+from tenacity import (
+    retry,
+    retry_if_exception_type,
+    stop_after_attempt,
+    wait_exponential,
+)
 import sys
 from pathlib import Path
 
@@ -17,12 +32,12 @@ PROJECT_ROOT = Path(__file__).parent.parent
 # Try pip-installed lightrag first, fallback to local LightRAG directory
 try:
     from lightrag import LightRAG, QueryParam
-    from lightrag.utils import EmbeddingFunc
+    from lightrag.utils import EmbeddingFunc, TiktokenTokenizer, logger
 except ImportError:
     # Fallback: use local LightRAG directory
     sys.path.insert(0, str(PROJECT_ROOT / 'LightRAG'))
     from lightrag import LightRAG, QueryParam
-    from lightrag.utils import EmbeddingFunc
+    from lightrag.utils import EmbeddingFunc, TiktokenTokenizer, logger
 
 
 # ===== API 配置 =====
@@ -32,6 +47,19 @@ if not QWEN_API_KEY:
 
 QWEN_BASE_URL = os.getenv("QWEN_BASE_URL", "https://dashscope.aliyuncs.com/compatible-mode/v1")
 
+# HTTP 连接池：至少覆盖 llm_model_max_async + embedding_func_max_async 的并发
+QWEN_HTTP_CONFIG = {
+    "max_connections": int(os.getenv("QWEN_MAX_CONNECTIONS", 32)),
+    "max_keepalive_connections": int(os.getenv("QWEN_MAX_KEEPALIVE_CONNECTIONS", 24)),
+    "keepalive_expiry": float(os.getenv("QWEN_KEEPALIVE_EXPIRY", 60)),
+    "timeout": float(os.getenv("QWEN_TIMEOUT", 180)),
+}
+
+# text-embedding-v4: 1024 维，单次请求最多 10 条文本、每条最多 8192 tokens
+EMBEDDING_DIM = 1024
+EMBEDDING_MAX_TOKEN_SIZE = 8192
+EMBEDDING_BATCH_LIMIT = 10
+
 
 # ===== 数据库配置 =====
 POSTGRES_CONFIG = {
@@ -47,6 +75,10 @@ POSTGRES_CONFIG = {
 # ===== LightRAG 配置 =====
 LIGHTRAG_CONFIG = {
     "working_dir": os.getenv("LIGHTRAG_WORKING_DIR", "./travel_rag"),
+    # NetworkXStorage (local file) or PGRelationalGraphStorage (PostgreSQL tables, no AGE)
+    "graph_storage": os.getenv("LIGHTRAG_GRAPH_STORAGE", "NetworkXStorage"),
+    # Local mode only: MmapVectorDBStorage (memory-mapped float16 file) or NanoVectorDBStorage (JSON)
+    "vector_storage": os.getenv("LIGHTRAG_VECTOR_STORAGE", "MmapVectorDBStorage"),
     "chunk_token_size": 1200,
     "chunk_overlap_token_size": 100,
     "top_k": 20,
@@ -54,13 +86,69 @@ LIGHTRAG_CONFIG = {
 }
 
 
-# 创建 OpenAI 客户端（用于 Qwen API）
-client = OpenAI(
-    api_key=QWEN_API_KEY,
-    base_url=QWEN_BASE_URL
+class InvalidResponseError(Exception):
+    """Empty or malformed API response, raised to trigger a retry"""
+
+
+# Errors worth retrying: rate limits, network failures, timeouts and 5xx responses.
+# Anything else (bad request, auth) is raised to the caller immediately.
+RETRYABLE_ERRORS = (
+    retry_if_exception_type(RateLimitError)
+    | retry_if_exception_type(APIConnectionError)
+    | retry_if_exception_type(APITimeoutError)
+    | retry_if_exception_type(InternalServerError)
+    | retry_if_exception_type(InvalidResponseError)
 )
 
+# 每个事件循环共享一个异步客户端（httpx 连接池不能跨事件循环复用）
+_clients: dict = {}
+_tokenizer = None
+
+
+def get_qwen_client() -> AsyncOpenAI:
+    """
+    获取当前事件循环的 Qwen 异步客户端（连接池 + HTTP keep-alive）
+
+    Returns:
+        AsyncOpenAI: 共享的异步客户端
+    """
+    loop = asyncio.get_running_loop()
+    client = _clients.get(loop)
+    if client is None:
+        http_client = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=QWEN_HTTP_CONFIG["max_connections"],
+                max_keepalive_connections=QWEN_HTTP_CONFIG["max_keepalive_connections"],
+                keepalive_expiry=QWEN_HTTP_CONFIG["keepalive_expiry"],
+            ),
+            timeout=httpx.Timeout(QWEN_HTTP_CONFIG["timeout"], connect=10.0),
+        )
+        client = AsyncOpenAI(
+            api_key=QWEN_API_KEY,
+            base_url=QWEN_BASE_URL,
+            http_client=http_client,
+            # Retries are handled by tenacity below
+            max_retries=0,
+        )
+        # Drop clients of closed event loops (e.g. earlier asyncio.run calls)
+        for stale_loop in [lp for lp in _clients if lp.is_closed()]:
+            del _clients[stale_loop]
+        _clients[loop] = client
+    return client
+
+
+async def close_qwen_client():
+    """关闭当前事件循环的 Qwen 客户端"""
+    client = _clients.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.close()
+
 
+@retry(
+    stop=stop_after_attempt(3),
+    wait=wait_exponential(multiplier=1, min=4, max=10),
+    retry=RETRYABLE_ERRORS,
+)
 async def qwen_plus_llm_func(
     prompt: str,
     system_prompt: str = None,
@@ -78,6 +166,10 @@ async def qwen_plus_llm_func(
 
     Returns:
         str: LLM 生成的文本
+
+    Raises:
+        openai.APIError: 重试后仍失败的 API 错误
+        InvalidResponseError: 重试后仍返回空内容
     """
     messages = []
 
@@ -89,44 +181,88 @@ async def qwen_plus_llm_func(
 
     messages.append({"role": "user", "content": prompt})
 
-    try:
-        response = client.chat.completions.create(
-            model="qwen-plus",
-            messages=messages,
-            temperature=kwargs.get("temperature", 0.7),
-            max_tokens=kwargs.get("max_tokens", 2000),
-        )
-        return response.choices[0].message.content
+    response = await get_qwen_client().chat.completions.create(
+        model="qwen-plus",
+        messages=messages,
+        temperature=kwargs.get("temperature", 0.7),
+        max_tokens=kwargs.get("max_tokens", 2000),
+    )
+    if not response.choices or not response.choices[0].message.content:
+        raise InvalidResponseError("Qwen Plus API returned an empty response")
+    return response.choices[0].message.content
+
+
+def split_embedding_batches(
+    texts: list[str],
+    max_token_size: int = EMBEDDING_MAX_TOKEN_SIZE,
+    max_batch_size: int = EMBEDDING_BATCH_LIMIT,
+) -> list[list[str]]:
+    """
+    按 API 限制拆分 embedding 请求
 
-    except Exception as e:
-        print(f"Qwen Plus API error: {e}")
-        return f"API call failed: {str(e)}"
+    每个请求最多 max_batch_size 条文本；超过 max_token_size 的单条文本会被截断。
 
+    Args:
+        texts: 待向量化的文本
+        max_token_size: 单条文本的 token 上限
+        max_batch_size: 单次请求的文本条数上限
 
-async def qwen_embedding_func(texts: list[str]):
+    Returns:
+        List of text batches, in input order
+    """
+    global _tokenizer
+    if _tokenizer is None:
+        _tokenizer = TiktokenTokenizer()
+
+    fitted = []
+    for text in texts:
+        tokens = _tokenizer.encode(text)
+        if len(tokens) > max_token_size:
+            logger.warning(
+                f"Truncating embedding input from {len(tokens)} to {max_token_size} tokens"
+            )
+            text = _tokenizer.decode(tokens[:max_token_size])
+        fitted.append(text)
+
+    return [fitted[i:i + max_batch_size] for i in range(0, len(fitted), max_batch_size)]
+
+
+@retry(
+    stop=stop_after_attempt(3),
+    wait=wait_exponential(multiplier=1, min=4, max=60),
+    retry=RETRYABLE_ERRORS,
+)
+async def _embed_batch(texts: list[str]) -> list[list[float]]:
+    response = await get_qwen_client().embeddings.create(
+        model="text-embedding-v4",
+        input=texts,
+        dimensions=EMBEDDING_DIM,
+    )
+    if len(response.data) != len(texts):
+        raise InvalidResponseError(
+            f"Qwen Embedding API returned {len(response.data)} vectors for {len(texts)} texts"
+        )
+    return [item.embedding for item in sorted(response.data, key=lambda item: item.index)]
+
+
+async def qwen_embedding_func(texts: list[str]) -> np.ndarray:
     """
     Qwen Embedding function for LightRAG
 
+    Oversized inputs are split into API-sized batches which are sent concurrently.
+
     Args:
         texts: List of texts to vectorize
 
     Returns:
         numpy array: Embedding vectors
-    """
-    import numpy as np
 
-    try:
-        response = client.embeddings.create(
-            model="text-embedding-v4",
-            input=texts
-        )
-        embeddings = [item.embedding for item in response.data]
-        return np.array(embeddings)
-
-    except Exception as e:
-        print(f"Qwen Embedding API error: {e}")
-        # Return default dimension zero vectors
-        return np.array([[0.0] * 1024 for _ in texts])
+    Raises:
+        openai.APIError: API errors that persist after retries
+    """
+    batches = split_embedding_batches(texts)
+    results = await asyncio.gather(*(_embed_batch(batch) for batch in batches))
+    return np.array([vector for batch in results for vector in batch], dtype=np.float32)
 
 
 def create_lightrag_instance(
@@ -156,8 +292,8 @@ def create_lightrag_instance(
         "llm_model_func": qwen_plus_llm_func,
         "llm_model_name": "qwen-plus",
         "embedding_func": EmbeddingFunc(
-            embedding_dim=1024,  # text-embedding-v4 维度
-            max_token_size=8192,
+            embedding_dim=EMBEDDING_DIM,  # text-embedding-v4 维度
+            max_token_size=EMBEDDING_MAX_TOKEN_SIZE,
             func=qwen_embedding_func,
         ),
         "chunk_token_size": LIGHTRAG_CONFIG["chunk_token_size"],
@@ -169,12 +305,12 @@ def create_lightrag_instance(
     }
 
     # PostgreSQL storage configuration (recommended)
-    # Using NetworkX for graph storage (AGE extension not required)
+    # Graph storage needs no AGE extension: NetworkX or plain PostgreSQL tables
     if use_postgres:
         config.update({
             "kv_storage": "PGKVStorage",
             "vector_storage": "PGVectorStorage",
-            "graph_storage": "NetworkXStorage",  # Use NetworkX instead of PGGraphStorage (no AGE required)
+            "graph_storage": LIGHTRAG_CONFIG["graph_storage"],
             "doc_status_storage": "PGDocStatusStorage",
             "vector_db_storage_cls_kwargs": {
                 **POSTGRES_CONFIG,
@@ -188,7 +324,7 @@ def create_lightrag_instance(
         # 本地存储配置（测试用）
         config.update({
             "kv_storage": "JsonKVStorage",
-            "vector_storage": "NanoVectorDBStorage",
+            "vector_storage": LIGHTRAG_CONFIG["vector_storage"],
             "graph_storage": "NetworkXStorage",
         })
 
@@ -240,6 +376,8 @@ if __name__ == '__main__':
         print(f"Embedding dimension: {len(embeddings[0])}")
         print(f"First 5 values: {embeddings[0][:5]}")
 
+        await close_qwen_client()
+
         print("\n✅ All tests passed!")
 
     asyncio.run(test())
@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""
+Faiss index benchmark: recall and latency of HNSW / IVF / IVF-PQ against flat search
+
+Loads the entity and chunk vectors of an existing import, holds out a sample of
+them as queries and indexes the rest with FaissVectorDBStorage for every index
+type. Recall@k is measured against exact (flat) search on the same vectors.
+
+Vectors are read from PostgreSQL (LIGHTRAG_VDB_ENTITY / LIGHTRAG_VDB_CHUNKS) or,
+with --source local, from the Faiss, MmapVectorDB or NanoVectorDB files of a working
+directory.
+
+Usage:
+    python scripts/benchmark_faiss_index.py
+    python scripts/benchmark_faiss_index.py --source local --working-dir ./travel_rag
+    python scripts/benchmark_faiss_index.py --sets chunks --hnsw-ef 32,64,128 --nprobe 8,16,32
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+from dotenv import load_dotenv
+
+load_dotenv()
+
+PROJECT_ROOT = Path(__file__).parent.parent
+try:
+    from lightrag.utils import EmbeddingFunc
+except ImportError:
+    sys.path.insert(0, str(PROJECT_ROOT / 'LightRAG'))
+    from lightrag.utils import EmbeddingFunc
+
+from lightrag.kg.shared_storage import finalize_share_data, initialize_share_data
+
+VECTOR_SETS = {"entities": "LIGHTRAG_VDB_ENTITY", "chunks": "LIGHTRAG_VDB_CHUNKS"}
+
+
+async def load_postgres_vectors(name: str, workspace: str = None) -> np.ndarray:
+    """Read the vectors of one set from PostgreSQL"""
+    from lightrag.kg.postgres_impl import ClientManager
+
+    db = await ClientManager.get_client()
+    try:
+        workspace = workspace or db.workspace or "default"
+        rows = await db.query(
+            f"SELECT content_vector FROM {VECTOR_SETS[name]} WHERE workspace=$1",
+            [workspace],
+            multirows=True,
+        )
+    finally:
+        await ClientManager.release_client(db)
+    return np.array([row["content_vector"] for row in rows or []], dtype=np.float32)
+
+
+def load_local_vectors(name: str, working_dir: str, workspace: str = "") -> np.ndarray:
+    """Read the vectors of one set from Faiss, MmapVectorDB or NanoVectorDB files"""
+    directory = os.path.join(working_dir, workspace)
+    faiss_vectors = os.path.join(directory, f"faiss_index_{name}.index.vectors.npy")
+    if os.path.exists(faiss_vectors):
+        return np.load(faiss_vectors).astype(np.float32)
+
+    mmap_db = os.path.join(directory, f"vdb_{name}.sqlite")
+    if os.path.exists(mmap_db):
+        import sqlite3
+
+        with sqlite3.connect(mmap_db) as db:
+            info = dict(db.execute("SELECT key, value FROM info"))
+            rows = [row for (row,) in db.execute("SELECT row FROM vectors ORDER BY row")]
+        vectors = np.fromfile(os.path.join(directory, f"vdb_{name}.{info['epoch']}.f16"), dtype=np.float16)
+        return vectors.reshape(-1, info["dim"])[rows].astype(np.float32)
+
+    from nano_vectordb.dbs import load_storage
+
+    storage = load_storage(os.path.join(directory, f"vdb_{name}.json"))
+    if storage is None:
+        return np.empty((0, 0), dtype=np.float32)
+    return storage["matrix"].astype(np.float32)
+
+
+def index_variants(args) -> list[tuple[str, dict]]:
+    """(label, vector_db_storage_cls_kwargs) of every configuration to measure"""
+    variants = [("FLAT", {"faiss_index_type": "FLAT"})]
+    for ef in args.hnsw_ef:
+        variants.append((
+            f"HNSW M={args.hnsw_m} ef={ef}",
+            {"faiss_index_type": "HNSW", "faiss_hnsw_m": args.hnsw_m, "faiss_hnsw_ef_search": ef},
+        ))
+    for index_type in ("IVF", "IVFPQ"):
+        for nprobe in args.nprobe:
+            variants.append((
+                f"{index_type} nprobe={nprobe}",
+                {"faiss_index_type": index_type, "faiss_ivf_nprobe": nprobe},
+            ))
+    return variants
+
+
+async def run_variant(vectors: np.ndarray, queries: np.ndarray, kwargs: dict, top_k: int):
+    """Build one index in a temporary directory, return (index type, build s, results, query latencies)"""
+    from lightrag.kg.faiss_impl import FaissVectorDBStorage, _index_type_of
+
+    by_text = {str(i): vector for i, vector in enumerate(vectors)}
+
+    async def embed(texts, **_):
+        return np.array([by_text[text] for text in texts])
+
+    with tempfile.TemporaryDirectory() as working_dir:
+        storage = FaissVectorDBStorage(
+            namespace="benchmark",
+            workspace="",
+            global_config={
+                "working_dir": working_dir,
+                "embedding_batch_num": 1000,
+                "vector_db_storage_cls_kwargs": {"cosine_better_than_threshold": -1.0, **kwargs},
+            },
+            embedding_func=EmbeddingFunc(embedding_dim=vectors.shape[1], func=embed),
+        )
+        await storage.initialize()
+
+        start = time.perf_counter()
+        await storage.upsert({f"v-{text}": {"content": text} for text in by_text})
+        await storage.index_done_callback()  # trains IVF indexes
+        build_time = time.perf_counter() - start
+        # IVF indexes stay flat when there are too few vectors to train them
+        index_type = _index_type_of(storage._index)
+
+        results, latencies = [], []
+        for query in queries:
+            start = time.perf_counter()
+            found = await storage.query("", top_k=top_k, query_embedding=query.tolist())
+            latencies.append(time.perf_counter() - start)
+            results.append({int(r["id"][2:]) for r in found})
+    return index_type, build_time, results, np.array(latencies)
+
+
+async def benchmark_set(name: str, vectors: np.ndarray, args):
+    if len(vectors) <= args.queries:
+        print(f"\n{name}: only {len(vectors)} vectors, skipped")
+        return
+
+    rng = np.random.default_rng(args.seed)
+    vectors = vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+    order = rng.permutation(len(vectors))
+    queries, indexed = vectors[order[: args.queries]], vectors[order[args.queries :]]
+    exact = np.argsort(-(queries @ indexed.T), axis=1)[:, : args.top_k]
+
+    print(f"\n{name}: {len(indexed)} vectors x {vectors.shape[1]} dims, {len(queries)} held-out queries, recall@{args.top_k}")
+    print(f"{'index':<28} {'built':<6} {'build s':>8} {'recall':>7} {'mean ms':>8} {'p95 ms':>8}")
+    for label, kwargs in index_variants(args):
+        index_type, build_time, results, latencies = await run_variant(indexed, queries, kwargs, args.top_k)
+        hits = sum(len(found & set(nearest)) for found, nearest in zip(results, exact))
+        print(
+            f"{label:<28} {index_type:<6} {build_time:>8.2f} {hits / exact.size:>7.3f} "
+            f"{latencies.mean() * 1000:>8.2f} {np.percentile(latencies, 95) * 1000:>8.2f}"
+        )
+
+
+def parse_ints(value: str) -> list[int]:
+    return [int(v) for v in value.split(",") if v]
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Benchmark Faiss ANN index types against flat search")
+    parser.add_argument("--source", choices=["postgres", "local"], default="postgres", help="Where to read the vectors from (default: postgres)")
+    parser.add_argument("--working-dir", type=str, default=os.getenv("LIGHTRAG_WORKING_DIR", "./travel_rag"), help="Working directory for --source local")
+    parser.add_argument("--workspace", type=str, default=None, help="Workspace to read (default: POSTGRES_WORKSPACE or 'default'; none for local files)")
+    parser.add_argument("--sets", type=str, default="entities,chunks", help="Vector sets to benchmark (default: entities,chunks)")
+    parser.add_argument("--queries", type=int, default=200, help="Held-out query vectors per set (default: 200)")
+    parser.add_argument("--top-k", type=int, default=10, help="Recall@k (default: 10)")
+    parser.add_argument("--hnsw-m", type=int, default=32, help="HNSW neighbours per node (default: 32)")
+    parser.add_argument("--hnsw-ef", type=parse_ints, default=[32, 64, 128], help="HNSW efSearch values (default: 32,64,128)")
+    parser.add_argument("--nprobe", type=parse_ints, default=[8, 16, 32], help="IVF nprobe values (default: 8,16,32)")
+    parser.add_argument("--seed", type=int, default=0, help="Query sampling seed")
+    args = parser.parse_args()
+
+    initialize_share_data()
+    try:
+        for name in args.sets.split(","):
+            if args.source == "postgres":
+                vectors = await load_postgres_vectors(name, args.workspace)
+            else:
+                vectors = load_local_vectors(name, args.working_dir, args.workspace or "")
+            await benchmark_set(name, vectors, args)
+    finally:
+        finalize_share_data()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(asyncio.run(main()))
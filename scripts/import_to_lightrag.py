@@ -6,20 +6,29 @@ Features:
 - Reads JSONL format place descriptions
 - Initializes LightRAG with PostgreSQL + pgvector storage
 - Batch imports documents for knowledge graph construction
+- Streaming mode: bounded batches with a resumable checkpoint
+- Incremental mode: Google Place doc_id as document ID, re-extracts only changed places
+- Structured mode: builds Place/City/Category/GoogleType graph from metadata without LLM extraction
+- Geo index: locates chunks, entities and relations for radius/bbox queries
 - Progress tracking and statistics
 
 Usage:
     python scripts/import_to_lightrag.py --input data/places_test_50.jsonl --limit 50
     python scripts/import_to_lightrag.py --input data/places_export.jsonl
+    python scripts/import_to_lightrag.py --input data/places_export.jsonl --stream --batch-size 200
+    python scripts/import_to_lightrag.py --input data/places_export.jsonl --incremental
+    python scripts/import_to_lightrag.py --input data/places_export.jsonl --structured --extract-summary
 """
 
 import asyncio
+import hashlib
 import json
 import logging
 import os
+import re
 import sys
 from pathlib import Path
-from typing import List, Dict
+from typing import Dict, Iterator, List, Tuple
 from datetime import datetime
 from dotenv import load_dotenv
 from tqdm import tqdm
@@ -46,6 +55,14 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Content lines refreshed nightly from Google Places; they do not change the
+# place description and must not trigger re-extraction on their own.
+VOLATILE_LINE_PREFIXES = ('Rating:',)
+
+# First content line: "<name> is a <primary_category> in <city> <state>."
+PLACE_NAME_PATTERN = re.compile(r'^(?P<name>.+?) is an? ')
+SUMMARY_PREFIX = 'Summary:'
+
 
 def read_jsonl_documents(file_path: Path, limit: int = None) -> List[Dict]:
     """
@@ -68,6 +85,697 @@ def read_jsonl_documents(file_path: Path, limit: int = None) -> List[Dict]:
     return documents
 
 
+def iter_jsonl_batches(
+    file_path: Path,
+    batch_size: int,
+    start_offset: int = 0,
+    limit: int = None
+) -> Iterator[Tuple[List[Dict], int]]:
+    """
+    Lazily read a JSONL file in bounded batches
+
+    Only one batch is held in memory at a time, so memory use stays flat
+    regardless of file size.
+
+    Args:
+        file_path: Path to JSONL file
+        batch_size: Maximum number of records per batch
+        start_offset: Byte offset to start reading from (resume point)
+        limit: Maximum number of records to yield in total (optional)
+
+    Yields:
+        Tuple of (batch of document dictionaries, byte offset after the batch)
+    """
+    batch = []
+    yielded = 0
+    with open(file_path, 'rb') as f:
+        f.seek(start_offset)
+        while True:
+            if limit and yielded + len(batch) >= limit:
+                break
+            line = f.readline()
+            if not line:
+                break
+            line = line.strip()
+            if not line:
+                continue
+            batch.append(json.loads(line))
+            if len(batch) >= batch_size:
+                yielded += len(batch)
+                yield batch, f.tell()
+                batch = []
+        if batch:
+            yield batch, f.tell()
+
+
+def load_checkpoint(checkpoint_path: Path, input_path: Path) -> Dict:
+    """
+    Load the streaming import checkpoint
+
+    Args:
+        checkpoint_path: Path to checkpoint file
+        input_path: Input JSONL file the checkpoint must belong to
+
+    Returns:
+        Checkpoint dictionary (empty state if missing or for another file)
+    """
+    empty = {'input': str(input_path), 'offset': 0, 'records': 0, 'last_doc_id': None}
+    if not checkpoint_path.exists():
+        return empty
+
+    with open(checkpoint_path, 'r', encoding='utf-8') as f:
+        checkpoint = json.load(f)
+
+    if checkpoint.get('input') != str(input_path):
+        logger.warning(
+            f"Checkpoint {checkpoint_path} belongs to {checkpoint.get('input')}, ignoring it"
+        )
+        return empty
+    return checkpoint
+
+
+def save_checkpoint(checkpoint_path: Path, checkpoint: Dict):
+    """
+    Atomically persist the streaming import checkpoint
+
+    Args:
+        checkpoint_path: Path to checkpoint file
+        checkpoint: Checkpoint dictionary
+    """
+    checkpoint_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = checkpoint_path.with_suffix(checkpoint_path.suffix + '.tmp')
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(checkpoint, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, checkpoint_path)
+
+
+async def wait_for_pipeline_idle(rag, poll_interval: float = 1.0):
+    """
+    Block until no LightRAG worker is processing the document queue
+
+    This is the backpressure point of the streaming import: the next batch is
+    only enqueued once the pipeline has drained, so the queue never grows
+    beyond one batch even if another process owns the pipeline.
+
+    Args:
+        rag: LightRAG instance
+        poll_interval: Seconds between pipeline status checks
+    """
+    from lightrag.kg.shared_storage import get_namespace_data
+
+    pipeline_status = await get_namespace_data("pipeline_status", workspace=rag.workspace)
+    while pipeline_status.get("busy", False):
+        await asyncio.sleep(poll_interval)
+
+
+async def stream_import_documents(
+    rag,
+    input_path: Path,
+    checkpoint_path: Path,
+    batch_size: int = 100,
+    limit: int = None
+) -> Dict:
+    """
+    Import documents into LightRAG in bounded batches with a resumable checkpoint
+
+    Each batch is enqueued with apipeline_enqueue_documents and processed with
+    apipeline_process_enqueue_documents before the next one is read. The
+    checkpoint is advanced only after a batch has been processed, so an
+    interrupted import resumes at the first uncommitted batch; documents of
+    that batch already in doc_status are skipped or retried by LightRAG.
+
+    Args:
+        rag: LightRAG instance
+        input_path: Path to JSONL file
+        checkpoint_path: Path to checkpoint file
+        batch_size: Number of documents per batch
+        limit: Maximum number of records to import in this run (optional)
+
+    Returns:
+        Statistics dictionary
+    """
+    from lightrag.base import DocStatus
+
+    start_time = datetime.now()
+    checkpoint = load_checkpoint(checkpoint_path, input_path)
+    if checkpoint['records']:
+        logger.info(
+            f"Resuming after record {checkpoint['records']} "
+            f"(last doc_id: {checkpoint['last_doc_id']})"
+        )
+
+    processed = 0
+    failed = 0
+    progress = tqdm(total=limit, unit='doc', desc='Importing')
+
+    for batch, next_offset in iter_jsonl_batches(
+        input_path, batch_size, start_offset=checkpoint['offset'], limit=limit
+    ):
+        texts = [doc['content'] for doc in batch]
+        batch_ids = [doc['doc_id'] for doc in batch]
+
+        await wait_for_pipeline_idle(rag)
+        await rag.apipeline_enqueue_documents(texts, ids=batch_ids)
+        await rag.apipeline_process_enqueue_documents()
+        await wait_for_pipeline_idle(rag)
+
+        statuses = await rag.doc_status.get_by_ids(batch_ids)
+        batch_failed = sum(
+            1 for status in statuses
+            if status and status.get('status') == DocStatus.FAILED
+        )
+
+        processed += len(batch) - batch_failed
+        failed += batch_failed
+        checkpoint.update({
+            'offset': next_offset,
+            'records': checkpoint['records'] + len(batch),
+            'last_doc_id': batch[-1].get('doc_id'),
+            'updated_at': datetime.now().isoformat(),
+        })
+        save_checkpoint(checkpoint_path, checkpoint)
+        progress.update(len(batch))
+
+    progress.close()
+
+    end_time = datetime.now()
+    duration = (end_time - start_time).total_seconds()
+    total_docs = processed + failed
+
+    return {
+        'total': total_docs,
+        'processed': processed,
+        'failed': failed,
+        'duration': duration,
+        'speed': total_docs / duration if duration > 0 else 0
+    }
+
+
+def compute_description_hash(doc: Dict) -> str:
+    """
+    Hash the stable description of a place record
+
+    Lines starting with VOLATILE_LINE_PREFIXES (rating and review counts) are
+    excluded, so a ratings refresh alone does not mark a place as changed.
+
+    Args:
+        doc: Document dictionary with 'content'
+
+    Returns:
+        MD5 hex digest of the description
+    """
+    lines = [
+        line for line in doc['content'].splitlines()
+        if not line.startswith(VOLATILE_LINE_PREFIXES)
+    ]
+    return hashlib.md5('\n'.join(lines).encode('utf-8')).hexdigest()
+
+
+def load_manifest(manifest_path: Path) -> Dict[str, str]:
+    """
+    Load the place_id -> description hash manifest
+
+    Args:
+        manifest_path: Path to manifest file
+
+    Returns:
+        Manifest dictionary (empty if the file does not exist)
+    """
+    if not manifest_path.exists():
+        return {}
+    with open(manifest_path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def save_manifest(manifest_path: Path, manifest: Dict[str, str]):
+    """
+    Atomically persist the place_id -> description hash manifest
+
+    Args:
+        manifest_path: Path to manifest file
+        manifest: Manifest dictionary
+    """
+    manifest_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = manifest_path.with_suffix(manifest_path.suffix + '.tmp')
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False)
+    os.replace(tmp_path, manifest_path)
+
+
+async def delete_document(rag, doc_id: str) -> bool:
+    """
+    Delete a place document and its derived graph data from LightRAG
+
+    Args:
+        rag: LightRAG instance
+        doc_id: Google Place ID used as document ID
+
+    Returns:
+        True if the document is gone afterwards
+    """
+    await wait_for_pipeline_idle(rag)
+    result = await rag.adelete_by_doc_id(doc_id)
+    if result.status in ('success', 'not_found'):
+        return True
+    logger.error(f"Failed to delete {doc_id}: {result.message}")
+    return False
+
+
+async def incremental_import_documents(
+    rag,
+    input_path: Path,
+    manifest_path: Path,
+    batch_size: int = 100,
+    limit: int = None
+) -> Dict:
+    """
+    Re-import only places whose description changed since the last run
+
+    Places are inserted with their Google Place doc_id as LightRAG document ID.
+    A manifest maps each doc_id to its description hash: unchanged places are
+    skipped, changed places are deleted with adelete_by_doc_id and re-inserted,
+    and places no longer present in the input are deleted. The manifest is
+    updated only for documents that reached PROCESSED status, so an
+    interrupted run is simply repeated.
+
+    Args:
+        rag: LightRAG instance
+        input_path: Path to JSONL file
+        manifest_path: Path to manifest file
+        batch_size: Number of documents per batch
+        limit: Maximum number of records to read (optional, disables stale deletion)
+
+    Returns:
+        Statistics dictionary
+    """
+    from lightrag.base import DocStatus
+
+    start_time = datetime.now()
+    manifest = load_manifest(manifest_path)
+    logger.info(f"Loaded manifest with {len(manifest)} places")
+
+    seen_ids = set()
+    stats = {
+        'total': 0, 'new': 0, 'changed': 0, 'unchanged': 0, 'deleted': 0,
+        'processed': 0, 'failed': 0
+    }
+
+    for batch, _ in iter_jsonl_batches(input_path, batch_size, limit=limit):
+        stats['total'] += len(batch)
+        pending = []
+        for doc in batch:
+            doc_id = doc['doc_id']
+            seen_ids.add(doc_id)
+            description_hash = compute_description_hash(doc)
+            previous_hash = manifest.get(doc_id)
+            if previous_hash == description_hash:
+                stats['unchanged'] += 1
+                continue
+            if previous_hash is not None:
+                if not await delete_document(rag, doc_id):
+                    stats['failed'] += 1
+                    continue
+                stats['changed'] += 1
+            else:
+                stats['new'] += 1
+            pending.append((doc, description_hash))
+
+        if not pending:
+            continue
+
+        batch_ids = [doc['doc_id'] for doc, _ in pending]
+        await wait_for_pipeline_idle(rag)
+        await rag.apipeline_enqueue_documents(
+            [doc['content'] for doc, _ in pending], ids=batch_ids
+        )
+        await rag.apipeline_process_enqueue_documents()
+        await wait_for_pipeline_idle(rag)
+
+        statuses = await rag.doc_status.get_by_ids(batch_ids) or [None] * len(batch_ids)
+        for (doc, description_hash), status in zip(pending, statuses):
+            if status and status.get('status') == DocStatus.PROCESSED:
+                manifest[doc['doc_id']] = description_hash
+                stats['processed'] += 1
+            else:
+                stats['failed'] += 1
+        save_manifest(manifest_path, manifest)
+
+    if limit:
+        logger.info("Record limit set, skipping deletion of places missing from the input")
+    else:
+        for doc_id in [doc_id for doc_id in manifest if doc_id not in seen_ids]:
+            if await delete_document(rag, doc_id):
+                del manifest[doc_id]
+                stats['deleted'] += 1
+            else:
+                stats['failed'] += 1
+        save_manifest(manifest_path, manifest)
+
+    end_time = datetime.now()
+    duration = (end_time - start_time).total_seconds()
+    stats['duration'] = duration
+    stats['speed'] = stats['total'] / duration if duration > 0 else 0
+    return stats
+
+
+def parse_place_name(doc: Dict) -> str:
+    """
+    Extract the place name from the first content line
+
+    Args:
+        doc: Document dictionary with 'content'
+
+    Returns:
+        Place name (falls back to doc_id)
+    """
+    first_line = doc['content'].split('\n', 1)[0]
+    match = PLACE_NAME_PATTERN.match(first_line)
+    return match.group('name').strip() if match else doc['doc_id']
+
+
+def parse_summary(doc: Dict) -> str:
+    """
+    Extract the free-text summary from the content
+
+    Args:
+        doc: Document dictionary with 'content'
+
+    Returns:
+        Summary text, empty string if the record has none
+    """
+    for line in doc['content'].splitlines():
+        if line.startswith(SUMMARY_PREFIX):
+            return line[len(SUMMARY_PREFIX):].strip()
+    return ''
+
+
+def hub_entity_name(value: str) -> str:
+    """
+    Entity name of a shared City/Category/GoogleType node
+
+    Hub names never contain parentheses, place names always end with a
+    parenthesized qualifier, so the two can never collide.
+
+    Args:
+        value: Metadata value (city, primary category or Google type)
+
+    Returns:
+        Entity name
+    """
+    return re.sub(r'\s+', ' ', re.sub(r'[()]', ' ', value)).strip()
+
+
+def place_entity_name(doc: Dict, place_names: Dict[str, str]) -> str:
+    """
+    Unique entity name of a place: "<name> (<city>)"
+
+    Chains such as Starbucks share a display name, and several places are named
+    after their city. Places sharing both name and city (or without a city) are
+    told apart by their doc_id.
+
+    Args:
+        doc: Document dictionary
+        place_names: Entity names assigned so far or taken in the graph -> doc_id
+            (updated in place)
+
+    Returns:
+        Entity name
+    """
+    doc_id = doc['doc_id']
+    name = parse_place_name(doc)
+    city = (doc.get('metadata') or {}).get('city')
+    entity_name = f"{name} ({city})" if city else f"{name} ({doc_id})"
+    if place_names.get(entity_name, doc_id) != doc_id:
+        entity_name = f"{name} ({city}, {doc_id})"
+    place_names[entity_name] = doc_id
+    return entity_name
+
+
+async def reserve_graph_place_names(
+    rag,
+    documents: List[Dict],
+    place_names: Dict[str, str]
+) -> None:
+    """
+    Record which "<name> (<city>)" names of a batch earlier imports already gave to a place
+
+    A name is owned by the doc_id of the chunks the Place node was built from
+    (the structured chunk, or its "<doc_id>-summary" document). Names owned by
+    another place make place_entity_name fall back to the doc_id qualifier, so
+    a second input file or a full run after a --limit run never merges two
+    places into one node.
+
+    Args:
+        rag: LightRAG instance
+        documents: List of document dictionaries
+        place_names: Entity names assigned so far -> doc_id (updated in place)
+    """
+    from lightrag.constants import GRAPH_FIELD_SEP
+
+    candidates = {}
+    for doc in documents:
+        city = (doc.get('metadata') or {}).get('city')
+        entity_name = f"{parse_place_name(doc)} ({city})"
+        if city and entity_name not in place_names:
+            candidates.setdefault(entity_name, set()).add(doc['doc_id'])
+    if not candidates:
+        return
+
+    nodes = await rag.chunk_entity_relation_graph.get_nodes_batch(list(candidates))
+    node_chunks = {
+        entity_name: (node.get('source_id') or '').split(GRAPH_FIELD_SEP)
+        for entity_name, node in nodes.items()
+    }
+    chunk_ids = list({chunk_id for ids in node_chunks.values() for chunk_id in ids if chunk_id})
+    chunks = dict(zip(chunk_ids, await rag.text_chunks.get_by_ids(chunk_ids)))
+
+    for entity_name, ids in node_chunks.items():
+        owners = {
+            chunks[chunk_id]['full_doc_id'].removesuffix('-summary')
+            for chunk_id in ids
+            if chunks.get(chunk_id) and chunks[chunk_id].get('full_doc_id')
+        }
+        # Unknown owners count as another place, which only costs a longer name
+        place_names[entity_name] = min(owners & candidates[entity_name] or owners, default='')
+
+
+def build_structured_kg(
+    documents: List[Dict],
+    hub_entities: Dict[str, Dict],
+    place_names: Dict[str, str]
+) -> Tuple[Dict, Dict[str, str]]:
+    """
+    Build a LightRAG custom KG from place metadata
+
+    Creates one chunk and one Place node per record, and LOCATED_IN, IS_A and
+    HAS_TYPE edges to shared City, Category and GoogleType nodes. Shared nodes
+    are collected into hub_entities instead of the returned KG so each one is
+    inserted only once across batches.
+
+    Args:
+        documents: List of document dictionaries
+        hub_entities: Shared City/Category/GoogleType entities by name (updated in place)
+        place_names: Place entity names assigned in earlier batches (updated in place)
+
+    Returns:
+        custom_kg dictionary for LightRAG.ainsert_custom_kg, and the Place
+        entity name of each doc_id
+    """
+    chunks, entities, relationships = [], [], []
+    entity_names = {}
+
+    def add_hub(value: str, entity_type: str, description: str, source_id: str) -> str:
+        name = hub_entity_name(value)
+        if name not in hub_entities:
+            hub_entities[name] = {
+                'entity_name': name,
+                'entity_type': entity_type,
+                'description': description,
+                'source_id': source_id,
+            }
+        return name
+
+    def add_edge(src: str, tgt: str, keywords: str, description: str, source_id: str):
+        relationships.append({
+            'src_id': src,
+            'tgt_id': tgt,
+            'description': description,
+            'keywords': keywords,
+            'weight': 1.0,
+            'source_id': source_id,
+        })
+
+    for doc in documents:
+        doc_id = doc['doc_id']
+        metadata = doc.get('metadata') or {}
+        name = place_entity_name(doc, place_names)
+        entity_names[doc_id] = name
+        city = metadata.get('city')
+        state = metadata.get('state')
+        category = metadata.get('primary_category')
+
+        chunks.append({'content': doc['content'], 'source_id': doc_id})
+
+        description_lines = [doc['content'].split('\n', 1)[0]]
+        if metadata.get('rating') is not None:
+            description_lines.append(
+                f"Rating: {metadata['rating']} ({metadata.get('reviews_count') or 0} reviews)"
+            )
+        if metadata.get('latitude') is not None and metadata.get('longitude') is not None:
+            description_lines.append(
+                f"Location: {metadata['latitude']}, {metadata['longitude']}"
+            )
+        summary = parse_summary(doc)
+        if summary:
+            description_lines.append(summary)
+        entities.append({
+            'entity_name': name,
+            'entity_type': 'place',
+            'description': '\n'.join(description_lines),
+            'source_id': doc_id,
+        })
+
+        if city:
+            location = f"{city}, {state}" if state else city
+            city_hub = add_hub(city, 'city', f"{location} is a city with travel destinations.", doc_id)
+            add_edge(name, city_hub, 'located in, city', f"{name} is located in {location}.", doc_id)
+        if category:
+            category_hub = add_hub(category, 'category', f"{category} is a category of travel destinations.", doc_id)
+            add_edge(name, category_hub, 'is a, category', f"{name} is one of the {category}.", doc_id)
+        for google_type in metadata.get('google_types') or []:
+            type_hub = add_hub(google_type, 'google_type', f"{google_type} is a Google Places type.", doc_id)
+            add_edge(name, type_hub, 'has type, google type', f"{name} has Google type {google_type}.", doc_id)
+
+    custom_kg = {'chunks': chunks, 'entities': entities, 'relationships': relationships}
+    return custom_kg, entity_names
+
+
+async def structured_import_documents(
+    rag,
+    input_path: Path,
+    batch_size: int = 500,
+    limit: int = None,
+    extract_summary: bool = False
+) -> Dict:
+    """
+    Import places by building graph nodes from metadata instead of LLM extraction
+
+    Each batch is written with a single ainsert_custom_kg call, which embeds
+    chunks, entities and relations in batches. Shared City/Category/GoogleType
+    nodes are only inserted the first time they are seen so existing ones keep
+    their data. With extract_summary, the free-text summary of each place is
+    additionally run through the regular LLM extraction pipeline.
+
+    Structured places are not registered in doc_status, so they cannot be
+    deleted per document; re-running the import over the same input upserts
+    the same chunks, nodes and edges again. Only the "<doc_id>-summary"
+    documents go through the pipeline and are tracked.
+
+    Args:
+        rag: LightRAG instance
+        input_path: Path to JSONL file
+        batch_size: Number of documents per ainsert_custom_kg call
+        limit: Maximum number of records to import (optional)
+        extract_summary: Run LLM entity extraction on the summaries
+
+    Returns:
+        Statistics dictionary
+    """
+    from lightrag.base import DocStatus
+
+    start_time = datetime.now()
+    hub_entities: Dict[str, Dict] = {}
+    place_names: Dict[str, str] = {}
+    inserted_hubs = set()
+    total_docs = 0
+    failed = 0
+    progress = tqdm(total=limit, unit='doc', desc='Building graph')
+
+    for batch, _ in iter_jsonl_batches(input_path, batch_size, limit=limit):
+        await reserve_graph_place_names(rag, batch, place_names)
+        custom_kg, entity_names = build_structured_kg(batch, hub_entities, place_names)
+
+        new_hubs = [name for name in hub_entities if name not in inserted_hubs]
+        existing = await rag.chunk_entity_relation_graph.get_nodes_batch(new_hubs)
+        custom_kg['entities'].extend(
+            hub_entities[name] for name in new_hubs if name not in existing
+        )
+        inserted_hubs.update(new_hubs)
+
+        await rag.ainsert_custom_kg(custom_kg)
+
+        if extract_summary:
+            # Named like the Place node so extracted facts merge into it
+            summaries = [
+                (f"{doc['doc_id']}-summary", f"{entity_names[doc['doc_id']]}: {parse_summary(doc)}")
+                for doc in batch if parse_summary(doc)
+            ]
+            if summaries:
+                summary_ids = [summary_id for summary_id, _ in summaries]
+                await wait_for_pipeline_idle(rag)
+                await rag.apipeline_enqueue_documents(
+                    [text for _, text in summaries], ids=summary_ids
+                )
+                await rag.apipeline_process_enqueue_documents()
+                await wait_for_pipeline_idle(rag)
+
+                statuses = await rag.doc_status.get_by_ids(summary_ids)
+                failed += sum(
+                    1 for status in statuses
+                    if not status or status.get('status') != DocStatus.PROCESSED
+                )
+
+        total_docs += len(batch)
+        progress.update(len(batch))
+
+    progress.close()
+
+    end_time = datetime.now()
+    duration = (end_time - start_time).total_seconds()
+
+    return {
+        'total': total_docs,
+        'processed': total_docs,
+        'failed': failed,
+        'hub_entities': len(hub_entities),
+        'duration': duration,
+        'speed': total_docs / duration if duration > 0 else 0
+    }
+
+
+async def build_geo_index(rag, input_path: Path) -> Dict:
+    """
+    Rebuild the spatial index from the latitude/longitude of every record
+
+    Documents imported through the pipeline (including "<doc_id>-summary"
+    documents) are located via their doc_id. Structured-mode chunks have no doc
+    status, so their chunk ids are derived from the content the same way
+    ainsert_custom_kg does.
+
+    Args:
+        rag: LightRAG instance
+        input_path: Path to JSONL file
+
+    Returns:
+        Index statistics (located chunks, entities, relations)
+    """
+    from lightrag.utils import compute_mdhash_id, sanitize_text_for_encoding
+
+    doc_locations, chunk_locations = {}, {}
+    for batch, _ in iter_jsonl_batches(input_path, batch_size=1000):
+        for doc in batch:
+            metadata = doc.get('metadata', {})
+            lat, lon = metadata.get('latitude'), metadata.get('longitude')
+            if lat is None or lon is None:
+                continue
+            doc_locations[doc['doc_id']] = (lat, lon)
+            doc_locations[f"{doc['doc_id']}-summary"] = (lat, lon)
+            chunk_id = compute_mdhash_id(sanitize_text_for_encoding(doc['content']), prefix='chunk-')
+            chunk_locations[chunk_id] = (lat, lon)
+
+    return await rag.abuild_geo_index(doc_locations, chunk_locations)
+
+
 async def import_documents(
     rag,
     documents: List[Dict]
@@ -87,8 +795,9 @@ async def import_documents(
 
     logger.info(f"Starting import of {total_docs} documents")
 
-    # Extract text content
+    # Extract text content, keeping the Google Place ID as document ID
     texts = [doc['content'] for doc in documents]
+    ids = [doc['doc_id'] for doc in documents]
 
     # Import with progress tracking
     logger.info("Inserting documents into LightRAG...")
@@ -96,7 +805,7 @@ async def import_documents(
 
     try:
         # Batch insert
-        await rag.ainsert(texts)
+        await rag.ainsert(texts, ids=ids)
 
         logger.info("Document insertion completed")
 
@@ -124,8 +833,19 @@ async def main():
     parser.add_argument('--limit', type=int, default=None, help='Limit number of records')
     parser.add_argument('--use-postgres', action='store_true', default=True, help='Use PostgreSQL storage (default: True)')
     parser.add_argument('--working-dir', type=str, default='./travel_rag', help='LightRAG working directory')
+    mode_group = parser.add_mutually_exclusive_group()
+    mode_group.add_argument('--stream', action='store_true', help='Stream the input in bounded batches with a resumable checkpoint')
+    parser.add_argument('--batch-size', type=int, default=100, help='Documents per batch in streaming mode')
+    parser.add_argument('--checkpoint', type=str, default=None, help='Checkpoint file for streaming mode (default: <input>.checkpoint.json)')
+    parser.add_argument('--reset-checkpoint', action='store_true', help='Discard an existing checkpoint and start from the beginning')
+    mode_group.add_argument('--incremental', action='store_true', help='Only re-extract places whose description changed, delete places missing from the input')
+    mode_group.add_argument('--structured', action='store_true', help='Build the graph from place metadata without LLM entity extraction')
+    parser.add_argument('--extract-summary', action='store_true', help='In structured mode, run LLM extraction on the free-text summaries only')
+    parser.add_argument('--manifest', type=str, default=None, help='Manifest file for incremental mode (default: <input>.manifest.json)')
 
     args = parser.parse_args()
+    if args.extract_summary and not args.structured:
+        parser.error('--extract-summary requires --structured')
 
     # Output configuration
     logger.info("=" * 60)
@@ -135,13 +855,37 @@ async def main():
     logger.info(f"Record limit: {args.limit or 'No limit'}")
     logger.info(f"Working directory: {args.working_dir}")
     logger.info(f"Storage backend: {'PostgreSQL + pgvector' if args.use_postgres else 'Local files'}")
+    if args.structured:
+        import_mode = f"Structured (batch size {args.batch_size}{', summary extraction' if args.extract_summary else ''})"
+    elif args.incremental:
+        import_mode = f'Incremental (batch size {args.batch_size})'
+    elif args.stream:
+        import_mode = f'Streaming (batch size {args.batch_size})'
+    else:
+        import_mode = 'Single batch'
+    logger.info(f"Import mode: {import_mode}")
     logger.info("=" * 60)
 
-    # Read data
     input_path = PROJECT_ROOT / args.input
-    logger.info(f"Reading file: {input_path}")
-    documents = read_jsonl_documents(input_path, limit=args.limit)
-    logger.info(f"Successfully read {len(documents)} records")
+    if args.incremental:
+        manifest_path = (
+            PROJECT_ROOT / args.manifest if args.manifest
+            else input_path.with_suffix('.manifest.json')
+        )
+        logger.info(f"Manifest file: {manifest_path}")
+    elif args.stream:
+        checkpoint_path = (
+            PROJECT_ROOT / args.checkpoint if args.checkpoint
+            else input_path.with_suffix('.checkpoint.json')
+        )
+        if args.reset_checkpoint and checkpoint_path.exists():
+            checkpoint_path.unlink()
+        logger.info(f"Checkpoint file: {checkpoint_path}")
+    elif not args.structured:
+        # Read data
+        logger.info(f"Reading file: {input_path}")
+        documents = read_jsonl_documents(input_path, limit=args.limit)
+        logger.info(f"Successfully read {len(documents)} records")
 
     # Initialize LightRAG using config module
     logger.info("Initializing LightRAG...")
@@ -164,7 +908,34 @@ async def main():
 
     try:
         # Import data
-        stats = await import_documents(rag, documents)
+        if args.structured:
+            stats = await structured_import_documents(
+                rag,
+                input_path,
+                batch_size=args.batch_size,
+                limit=args.limit,
+                extract_summary=args.extract_summary
+            )
+        elif args.incremental:
+            stats = await incremental_import_documents(
+                rag,
+                input_path,
+                manifest_path,
+                batch_size=args.batch_size,
+                limit=args.limit
+            )
+        elif args.stream:
+            stats = await stream_import_documents(
+                rag,
+                input_path,
+                checkpoint_path,
+                batch_size=args.batch_size,
+                limit=args.limit
+            )
+        else:
+            stats = await import_documents(rag, documents)
+
+        geo_stats = await build_geo_index(rag, input_path)
 
         # Output statistics
         logger.info("=" * 60)
@@ -172,6 +943,19 @@ async def main():
         logger.info("=" * 60)
         logger.info(f"Total documents: {stats['total']}")
         logger.info(f"Successfully imported: {stats['processed']}")
+        if args.structured:
+            logger.info(f"Shared City/Category/GoogleType nodes: {stats['hub_entities']}")
+        if args.incremental:
+            logger.info(
+                f"New: {stats['new']}, changed: {stats['changed']}, "
+                f"unchanged: {stats['unchanged']}, deleted: {stats['deleted']}"
+            )
+        if stats.get('failed'):
+            logger.info(f"Failed (will be retried on next run): {stats['failed']}")
+        logger.info(
+            f"Geo index: {geo_stats['chunks']} chunks, {geo_stats['entities']} entities, "
+            f"{geo_stats['relations']} relations located"
+        )
         logger.info(f"Processing time: {stats['duration']:.1f} seconds")
         logger.info(f"Average speed: {stats['speed']:.2f} documents/second")
         logger.info("=" * 60)
@@ -2,9 +2,14 @@
 """
 Simple LightRAG Query CLI
 
+Sends the question to a running query server (scripts/query_server.py) and
+falls back to initializing LightRAG in-process when no server is listening.
+
 Usage:
     python scripts/query.py -q "What attractions are in New York?"
     python scripts/query.py -q "Tell me about Central Park" --verbose
+    python scripts/query.py -q "Museums in Tampa" --no-server
+    python scripts/query.py -q "Things to do nearby" --near 40.7826,-73.9656 --radius-km 2
 """
 
 import sys
@@ -13,12 +18,50 @@ import argparse
 import warnings
 from pathlib import Path
 
+from query_server import DEFAULT_QUERY_MODE, DEFAULT_SOCKET_PATH, request_query
+
 # Parse args early to check verbose flag
 parser = argparse.ArgumentParser(description="Query LightRAG Travel Planner")
 parser.add_argument("-q", "--query", type=str, required=True, help="Your question")
-parser.add_argument("-v", "--verbose", action="store_true", help="Show detailed logs")
+parser.add_argument("-v", "--verbose", action="store_true", help="Show detailed logs and stage timings")
+parser.add_argument("-m", "--mode", type=str, default=DEFAULT_QUERY_MODE, help="Query mode (default: mix)")
+parser.add_argument("--socket", type=str, default=DEFAULT_SOCKET_PATH, help="Query server Unix socket")
+parser.add_argument("--port", type=int, default=None, help="Query server localhost TCP port")
+parser.add_argument("--no-server", action="store_true", help="Always run the query in-process")
+parser.add_argument("--near", type=str, default=None, help="Restrict retrieval around LAT,LON (use with --radius-km)")
+parser.add_argument("--radius-km", type=float, default=5.0, help="Search radius around --near in km (default: 5)")
+parser.add_argument("--bbox", type=str, default=None, help="Restrict retrieval to MIN_LAT,MIN_LON,MAX_LAT,MAX_LON")
 args = parser.parse_args()
 
+geo = {}
+if args.bbox:
+    geo["geo_bbox"] = [float(v) for v in args.bbox.split(",")]
+elif args.near:
+    geo["geo_center"] = [float(v) for v in args.near.split(",")]
+    geo["geo_radius_km"] = args.radius_km
+
+
+def print_timings(timings: dict, source: str):
+    stages = ", ".join(f"{stage}={seconds:.2f}s" for stage, seconds in timings.items())
+    print(f"\n[{source}] {stages}", file=sys.stderr)
+
+
+# Answer from a warm query server when one is running
+if not args.no_server:
+    try:
+        response = request_query(args.query, args.mode, socket_path=args.socket, port=args.port, geo=geo)
+    except (FileNotFoundError, ConnectionRefusedError) as e:
+        if args.verbose:
+            print(f"Query server unavailable ({e}), running in-process", file=sys.stderr)
+    else:
+        if response.get("status") != "success":
+            print(f"Query server error: {response.get('message')}", file=sys.stderr)
+            sys.exit(1)
+        print(response["result"])
+        if args.verbose:
+            print_timings(response["timings"], "server")
+        sys.exit(0)
+
 
 class QuietOutput:
     """Suppress stdout/stderr"""
@@ -45,7 +88,8 @@ from dotenv import load_dotenv
 load_dotenv(PROJECT_ROOT / '.env')
 
 import asyncio
-from config.lightrag_config import initialize_rag_async, QueryParam
+from config.lightrag_config import initialize_rag_async
+from query_server import run_timed_query
 
 
 async def main():
@@ -56,8 +100,14 @@ async def main():
         sys.stdout = _original_stdout
         sys.stderr = _original_stderr
 
-    result = await rag.aquery(args.query, param=QueryParam(mode="mix"))
-    print(result)
+    try:
+        response = await run_timed_query(rag, args.query, args.mode, geo)
+    except RuntimeError as e:
+        print(f"Query failed: {e}", file=sys.stderr)
+        sys.exit(1)
+    print(response["result"])
+    if args.verbose:
+        print_timings(response["timings"], "in-process")
 
 
 if __name__ == '__main__':
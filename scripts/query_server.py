@@ -0,0 +1,265 @@
+#!/usr/bin/env python3
+"""
+LightRAG Query Server: keeps one initialized LightRAG instance warm for queries
+
+Features:
+- Initializes storages, the graph and the Postgres pool once at startup
+- Listens on a Unix socket (default) or a localhost TCP port
+- Serves concurrent queries, bounded by --max-concurrent
+- Reports per-stage timings (queue wait, keyword extraction, retrieval, generation)
+
+Protocol: one JSON object per line in each direction.
+    request:  {"query": "...", "mode": "mix"}  or  {"command": "ping"}
+              optional region: "geo_center": [lat, lon] + "geo_radius_km", or "geo_bbox"
+    response: {"status": "success", "result": "...", "timings": {...}}
+              {"status": "error", "message": "..."}
+
+The server does not see documents imported after it started; restart it after
+running import_to_lightrag.py.
+
+Usage:
+    python scripts/query_server.py
+    python scripts/query_server.py --port 8765 --max-concurrent 4
+    python scripts/query.py -q "What attractions are in New York?"
+"""
+
+import asyncio
+import json
+import logging
+import os
+import signal
+import socket
+import sys
+import time
+from pathlib import Path
+from typing import Dict, Optional
+
+PROJECT_ROOT = Path(__file__).parent.parent
+
+DEFAULT_SOCKET_PATH = os.getenv('LIGHTRAG_QUERY_SOCKET', '/tmp/travel_planner_query.sock')
+DEFAULT_QUERY_MODE = 'mix'
+# Answers are long-form LLM output; generous limit for a single response line
+MAX_LINE_BYTES = 16 * 1024 * 1024
+# QueryParam fields restricting retrieval to a region
+GEO_FIELDS = ('geo_center', 'geo_radius_km', 'geo_bbox')
+
+logger = logging.getLogger(__name__)
+
+
+def request_query(
+    query: str,
+    mode: str = DEFAULT_QUERY_MODE,
+    socket_path: str = DEFAULT_SOCKET_PATH,
+    port: Optional[int] = None,
+    timeout: float = 300.0,
+    geo: Optional[Dict] = None,
+) -> Dict:
+    """
+    Send one query to a running query server
+
+    Uses only the standard library so callers do not pay the lightrag import cost.
+
+    Args:
+        query: Question to answer
+        mode: LightRAG query mode
+        socket_path: Unix socket of the server (ignored when port is set)
+        port: Localhost TCP port of the server
+        timeout: Seconds to wait for the answer
+        geo: Optional region, see GEO_FIELDS
+
+    Returns:
+        Response dictionary from the server
+
+    Raises:
+        ConnectionError / FileNotFoundError: No server is listening
+    """
+    if port is not None:
+        sock = socket.create_connection(('127.0.0.1', port), timeout=timeout)
+    else:
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(timeout)
+        try:
+            sock.connect(socket_path)
+        except OSError:
+            sock.close()
+            raise
+
+    with sock:
+        request = {'query': query, 'mode': mode, **(geo or {})}
+        sock.sendall(json.dumps(request).encode('utf-8') + b'\n')
+        with sock.makefile('rb') as reader:
+            line = reader.readline()
+    if not line:
+        raise ConnectionError('Query server closed the connection without a response')
+    return json.loads(line)
+
+
+async def run_timed_query(
+    rag, query: str, mode: str = DEFAULT_QUERY_MODE, geo: Optional[Dict] = None
+) -> Dict:
+    """
+    Run one query and measure where the time went
+
+    Knowledge graph modes report their own stage timings (keywords, retrieval,
+    generation, plus speculative_search when retrieval overlaps keyword
+    extraction). For other modes, LLM calls are routed through a timing wrapper
+    via QueryParam.model_func: keyword extraction and answer generation are
+    timed separately, and the remainder of the query is reported as retrieval.
+    geo holds optional QueryParam region fields (see GEO_FIELDS).
+
+    Returns:
+        {"result": str, "timings": {stage: seconds}}
+
+    Raises:
+        RuntimeError: aquery_llm reported a failure instead of an answer
+    """
+    from lightrag import QueryParam
+
+    timings = {'keywords': 0.0, 'generation': 0.0}
+
+    async def timed_model_func(prompt, **kwargs):
+        stage = 'keywords' if kwargs.get('keyword_extraction') else 'generation'
+        # Same priority kg_query gives the global LLM function
+        kwargs.setdefault('_priority', 5)
+        start = time.perf_counter()
+        try:
+            return await rag.llm_model_func(prompt, **kwargs)
+        finally:
+            timings[stage] += time.perf_counter() - start
+
+    start = time.perf_counter()
+    response = await rag.aquery_llm(
+        query, param=QueryParam(mode=mode, model_func=timed_model_func, **(geo or {}))
+    )
+    total = time.perf_counter() - start
+    result = (response.get('llm_response') or {}).get('content')
+    # aquery_llm reports errors in the response instead of raising; queries
+    # without results still carry the fail_response answer
+    if response.get('status') == 'failure' and result is None:
+        raise RuntimeError(response.get('message') or 'Query failed')
+
+    stage_timings = (response.get('metadata') or {}).get('timings')
+    if stage_timings:
+        timings = dict(stage_timings)
+    else:
+        timings['retrieval'] = max(total - timings['keywords'] - timings['generation'], 0.0)
+    timings['total'] = total
+    return {'result': result, 'timings': {k: round(v, 4) for k, v in timings.items()}}
+
+
+class QueryServer:
+    """Serves newline-delimited JSON queries against one warm LightRAG instance"""
+
+    def __init__(self, rag, max_concurrent: int = 8):
+        self.rag = rag
+        self.semaphore = asyncio.Semaphore(max_concurrent)
+        self.served = 0
+        self.active = 0
+
+    async def handle_request(self, request: Dict) -> Dict:
+        command = request.get('command')
+        if command == 'ping':
+            return {'status': 'success', 'served': self.served, 'active': self.active}
+        if command is not None:
+            return {'status': 'error', 'message': f'Unknown command: {command}'}
+
+        query = request.get('query')
+        if not query:
+            return {'status': 'error', 'message': 'Missing "query"'}
+
+        queued_at = time.perf_counter()
+        async with self.semaphore:
+            queue_wait = time.perf_counter() - queued_at
+            self.active += 1
+            try:
+                geo = {key: request[key] for key in GEO_FIELDS if request.get(key) is not None}
+                response = await run_timed_query(
+                    self.rag, query, request.get('mode', DEFAULT_QUERY_MODE), geo
+                )
+            finally:
+                self.active -= 1
+                self.served += 1
+
+        response['timings']['queue_wait'] = round(queue_wait, 4)
+        logger.info(f"Query served in {response['timings']['total']:.2f}s: {query[:80]}")
+        return {'status': 'success', **response}
+
+    async def handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while line := await reader.readline():
+                try:
+                    response = await self.handle_request(json.loads(line))
+                except json.JSONDecodeError as e:
+                    response = {'status': 'error', 'message': f'Invalid request: {e}'}
+                except Exception as e:
+                    logger.error(f'Query failed: {e}')
+                    response = {'status': 'error', 'message': str(e)}
+                writer.write(json.dumps(response, ensure_ascii=False).encode('utf-8') + b'\n')
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+
+async def serve(socket_path: str, port: Optional[int], max_concurrent: int):
+    sys.path.insert(0, str(PROJECT_ROOT))
+    from config.lightrag_config import close_qwen_client, initialize_rag_async
+
+    start = time.perf_counter()
+    rag = await initialize_rag_async()
+    logger.info(f'LightRAG initialized in {time.perf_counter() - start:.2f}s')
+
+    query_server = QueryServer(rag, max_concurrent=max_concurrent)
+    if port is not None:
+        server = await asyncio.start_server(
+            query_server.handle_connection, '127.0.0.1', port, limit=MAX_LINE_BYTES
+        )
+        address = f'127.0.0.1:{port}'
+    else:
+        if os.path.exists(socket_path):
+            os.remove(socket_path)
+        server = await asyncio.start_unix_server(
+            query_server.handle_connection, socket_path, limit=MAX_LINE_BYTES
+        )
+        address = socket_path
+
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop.set)
+
+    logger.info(f'Query server listening on {address} (max concurrent queries: {max_concurrent})')
+    try:
+        async with server:
+            await stop.wait()
+    finally:
+        logger.info(f'Shutting down after {query_server.served} queries')
+        if port is None and os.path.exists(socket_path):
+            os.remove(socket_path)
+        await rag.finalize_storages()
+        await close_qwen_client()
+
+
+def main():
+    import argparse
+
+    from dotenv import load_dotenv
+
+    load_dotenv(PROJECT_ROOT / '.env')
+
+    parser = argparse.ArgumentParser(description='Serve LightRAG queries from a warm instance')
+    parser.add_argument('--socket', type=str, default=DEFAULT_SOCKET_PATH, help='Unix socket path')
+    parser.add_argument('--port', type=int, default=None, help='Listen on this localhost TCP port instead of a Unix socket')
+    parser.add_argument('--max-concurrent', type=int, default=8, help='Maximum queries processed at the same time')
+    args = parser.parse_args()
+
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(levelname)s - %(message)s',
+    )
+    asyncio.run(serve(args.socket, args.port, args.max_concurrent))
+
+
+if __name__ == '__main__':
+    main()